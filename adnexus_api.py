@@ -0,0 +1,520 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Projection API
+Created: December 2025
+
+Lightweight ASGI service exposing the projection engine as JSON endpoints
+for other internal tools, without running Streamlit:
+
+    POST /projections      calculate_projections (columns use adnexus_schema names)
+    POST /unit-economics   calculate_unit_economics
+    POST /scenarios        scenario table: months remaining, IRR, NPV, MOIC per growth rate
+    GET  /health, /stats
+
+Identical in-flight requests are coalesced onto one computation, concurrent
+projection requests are micro-batched into one batch_projections call, and
+encoded responses are cached by parameter hash. Errors are JSON {"error": ...}
+bodies: 400 for parameters that fail validation or that the engine rejects
+with a ValueError, 500 for anything else (failed responses are not cached).
+
+Run with:
+    uvicorn adnexus_api:app --workers 4
+    python adnexus_api.py [--host 127.0.0.1] [--port 8600]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from adnexus_engine import MAX_PROJECTION_MONTHS, batch_projections, calculate_unit_economics, schedule_array
+from adnexus_returns import investor_cash_flows, investor_returns
+from adnexus_schema import COLUMN_SCHEMA, from_paise, to_paise
+from adnexus_memory import memory_key
+
+API_CACHE_ENTRIES = int(os.environ.get('ADNEXUS_API_CACHE_ENTRIES', 10_000))
+API_MAX_BATCH = int(os.environ.get('ADNEXUS_API_MAX_BATCH', 512))
+API_BATCH_DELAY = float(os.environ.get('ADNEXUS_API_BATCH_DELAY_MS', 2)) / 1000
+
+# Request parameters and defaults per endpoint (schedules are JSON lists)
+PROJECTION_PARAMS = {
+    'current_revenue': 10.0,
+    'growth_rate': 9.65,
+    'redemption_rate': 50.0,
+    'revenue_share_pct': 5.0,
+    'months': MAX_PROJECTION_MONTHS,
+    'current_month': 1,
+    'investment_amount': 75.0,
+    'already_paid': 0.0,
+}
+UNIT_ECONOMICS_PARAMS = {
+    'mau': 10000,
+    'arpu': 100.0,
+    'user_growth_rate': 7.5,
+    'arpu_growth_rate': 2.0,
+    'churn_rate': 20.0,
+    'ltv_method': 'churn_based',
+    'ltv_months': 6,
+    'starting_cac': 30.0,
+    'cac_monthly_increase': 2.0,
+    'months': 36,
+    'cac_schedule': None,
+}
+SCENARIO_PARAMS = {
+    **PROJECTION_PARAMS,
+    'discount_rate': 12.0,
+    # Same scenarios as the Risk Analysis tab; None = the request's growth_rate
+    'scenarios': [
+        {'name': 'Pessimistic', 'growth_rate': 5.0, 'probability': 20},
+        {'name': 'Base Case', 'growth_rate': None, 'probability': 50},
+        {'name': 'Optimistic', 'growth_rate': 10.0, 'probability': 25},
+        {'name': 'Best Case', 'growth_rate': 12.0, 'probability': 5},
+    ],
+}
+SCHEDULE_PARAMS = {'growth_rate', 'redemption_rate', 'user_growth_rate', 'arpu_growth_rate', 'churn_rate',
+                   'cac_schedule'}
+TEXT_PARAMS = {'ltv_method': ('churn_based', 'fixed_months')}
+
+# Projection matrices from batch_projections -> response column (adnexus_schema compact names)
+PROJECTION_COLUMNS = {
+    'gross_revenue': COLUMN_SCHEMA['Gross Revenue (₹L)'][0],
+    'redemptions': COLUMN_SCHEMA['Redemptions (₹L)'][0],
+    'payments': COLUMN_SCHEMA['Payment to Vinmo (₹L)'][0],
+    'cumulative_paid': COLUMN_SCHEMA['Cumulative Paid (₹L)'][0],
+    'balance': COLUMN_SCHEMA['Balance (₹L)'][0],
+}
+
+
+class RequestError(ValueError):
+    """Invalid request parameters (answered with HTTP 400)."""
+
+
+def _number(name, value):
+    """Validated finite number parameter."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise RequestError(f"'{name}' must be a finite number")
+    return value
+
+
+def parse_params(body, defaults):
+    """
+    Validate a JSON request body against an endpoint's parameters.
+
+    Args:
+        body: Decoded JSON object
+        defaults: Endpoint parameter defaults (e.g. PROJECTION_PARAMS)
+
+    Returns:
+        Dict of every parameter, defaults filled in; schedules as tuples
+
+    Raises:
+        RequestError: On unknown parameters or invalid values
+    """
+    if not isinstance(body, dict):
+        raise RequestError("Request body must be a JSON object")
+    unknown = set(body) - set(defaults)
+    if unknown:
+        raise RequestError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    params = dict(defaults)
+    for name, value in body.items():
+        if name == 'scenarios':
+            params[name] = _parse_scenarios(value)
+        elif name in TEXT_PARAMS:
+            if value not in TEXT_PARAMS[name]:
+                raise RequestError(f"'{name}' must be one of {', '.join(TEXT_PARAMS[name])}")
+            params[name] = value
+        elif name in SCHEDULE_PARAMS and isinstance(value, list):
+            if not value:
+                raise RequestError(f"'{name}' schedule must not be empty")
+            params[name] = tuple(float(_number(name, item)) for item in value)
+        elif value is None and defaults[name] is None:
+            params[name] = None
+        else:
+            params[name] = _number(name, value)
+    # Floats throughout so 10 and 10.0 share a cache entry
+    params.update({name: float(value) for name, value in params.items() if isinstance(value, (int, float))})
+    if 'months' in params:
+        if params['months'] != int(params['months']) or not 1 <= params['months'] <= MAX_PROJECTION_MONTHS:
+            raise RequestError(f"'months' must be a whole number from 1 to {MAX_PROJECTION_MONTHS}")
+        params['months'] = int(params['months'])
+    if 'current_month' in params:
+        if params['current_month'] != int(params['current_month']) or params['current_month'] < 1:
+            raise RequestError("'current_month' must be a whole number from 1")
+        params['current_month'] = int(params['current_month'])
+    return params
+
+
+def _parse_scenarios(scenarios):
+    """Validated scenario list for /scenarios."""
+    if not isinstance(scenarios, list) or not scenarios:
+        raise RequestError("'scenarios' must be a non-empty list")
+    parsed = []
+    for index, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict) or set(scenario) - {'name', 'growth_rate', 'probability'}:
+            raise RequestError("Each scenario takes 'name', 'growth_rate' and 'probability'")
+        growth = scenario.get('growth_rate')
+        parsed.append({
+            'name': str(scenario.get('name', f"Scenario {index + 1}")),
+            'growth_rate': None if growth is None else _number('growth_rate', growth),
+            'probability': _number('probability', scenario.get('probability', 0)),
+        })
+    return tuple(tuple(sorted(scenario.items())) for scenario in parsed)
+
+
+def _jsonable(value):
+    """Arrays and NumPy scalars as JSON types; NaN and infinities as null."""
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f' and not np.isfinite(value).all():
+            return np.where(np.isfinite(value), value, None).tolist()
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+def encode(payload):
+    """Compact JSON response body."""
+    return json.dumps(_jsonable(payload), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def projection_batch(requests):
+    """
+    Projections for many requests in as few batch_projections calls as possible.
+
+    Requests are grouped by horizon and by which rates are schedules, so each
+    group is one vectorized call with results identical to calculate_projections.
+
+    Args:
+        requests: List of parameter dicts from parse_params(..., PROJECTION_PARAMS)
+
+    Returns:
+        List of response dicts in request order
+    """
+    groups = {}
+    for index, params in enumerate(requests):
+        shape = (params['months'], isinstance(params['growth_rate'], tuple),
+                 isinstance(params['redemption_rate'], tuple))
+        groups.setdefault(shape, []).append(index)
+
+    responses = [None] * len(requests)
+    for (months, growth_schedule, redemption_schedule), indices in groups.items():
+        group = [requests[index] for index in indices]
+        values = lambda name: np.array([params[name] for params in group], dtype=float)
+        growth = (np.array([schedule_array(params['growth_rate'], months) for params in group])
+                  if growth_schedule else values('growth_rate'))
+        redemption = (np.array([schedule_array(params['redemption_rate'], months + 1) for params in group])
+                      if redemption_schedule else values('redemption_rate'))
+        outcome = batch_projections(values('current_revenue'), growth, redemption, values('revenue_share_pct'),
+                                    months=months, investment_amount=values('investment_amount'),
+                                    already_paid=values('already_paid'), columns=True)
+        for row, (index, params) in enumerate(zip(indices, group)):
+            complete = bool(outcome['complete'][row])
+            rows = int(outcome['months_remaining'][row]) + 1 if complete else months + 1
+            columns = {COLUMN_SCHEMA['Month'][0]: params['current_month'] + np.arange(rows)}
+            for name, column in PROJECTION_COLUMNS.items():
+                columns[column] = outcome[name][row, :rows]
+            columns[COLUMN_SCHEMA['Net Revenue (₹L)'][0]] = from_paise(
+                to_paise(columns[PROJECTION_COLUMNS['gross_revenue']]) -
+                to_paise(columns[PROJECTION_COLUMNS['redemptions']]))
+            responses[index] = {
+                'months_remaining': rows - 1,
+                'complete': complete,
+                'payoff_month': int(params['current_month'] + rows - 1) if complete else None,
+                'total_recovered': float(outcome['total_recovered'][row]),
+                'final_balance': float(outcome['final_balance'][row]),
+                'projections': columns,
+            }
+    return responses
+
+
+def unit_economics_response(params):
+    """
+    /unit-economics response.
+
+    Args:
+        params: Parameter dict from parse_params(..., UNIT_ECONOMICS_PARAMS)
+
+    Returns:
+        Dict with the unit-economics columns under 'unit_economics'
+    """
+    df = calculate_unit_economics(params['mau'], params['arpu'], params['user_growth_rate'],
+                                  params['arpu_growth_rate'], params['churn_rate'],
+                                  ltv_method=params['ltv_method'], ltv_months=params['ltv_months'],
+                                  starting_cac=params['starting_cac'],
+                                  cac_monthly_increase=params['cac_monthly_increase'], months=params['months'],
+                                  cac_schedule=params['cac_schedule'])
+    return {'unit_economics': {COLUMN_SCHEMA.get(name, (name,))[0]: df[name].to_numpy() for name in df.columns}}
+
+
+def scenario_response(params, projections):
+    """
+    /scenarios response from the projections of each scenario.
+
+    Args:
+        params: Parameter dict from parse_params(..., SCENARIO_PARAMS)
+        projections: projection_batch responses, one per scenario
+
+    Returns:
+        Dict with per-scenario rows and the probability-weighted months remaining
+    """
+    payments = [projection['projections'][PROJECTION_COLUMNS['payments']] for projection in projections]
+    returns = investor_returns(
+        investor_cash_flows(payments, params['investment_amount'], params['already_paid'], params['current_month']),
+        discount_rate=params['discount_rate'], current_month=params['current_month'])
+    scenarios = [dict(scenario) for scenario in params['scenarios']]
+    rows = [{
+        'name': scenario['name'],
+        'growth_rate': params['growth_rate'] if scenario['growth_rate'] is None else scenario['growth_rate'],
+        'probability': scenario['probability'],
+        'months_remaining': projection['months_remaining'],
+        'complete': projection['complete'],
+        'annual_irr': returns['annual_irr'][index],
+        'npv': returns['npv'][index],
+        'moic': returns['moic'][index],
+    } for index, (scenario, projection) in enumerate(zip(scenarios, projections))]
+    total_probability = sum(row['probability'] for row in rows)
+    expected = (sum(row['probability'] * row['months_remaining'] for row in rows) / total_probability
+                if total_probability else None)
+    return {'scenarios': rows, 'expected_months_remaining': expected,
+            'expected_is_lower_bound': not all(row['complete'] for row in rows)}
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for up to `max_delay` seconds (or `max_batch`
+    requests) and computes them in one call on a worker thread.
+    """
+
+    def __init__(self, compute, max_batch=API_MAX_BATCH, max_delay=API_BATCH_DELAY):
+        """
+        Args:
+            compute: Callable taking a list of requests and returning a list of results
+            max_batch: Requests per batch before flushing early
+            max_delay: Seconds to wait for more requests after the first
+        """
+        self._compute = compute
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.batched = 0
+
+    async def submit(self, request):
+        """Result for one request, computed with whatever else arrives meanwhile."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.batched += len(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self._compute, [request for request, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class ProjectionService:
+    """
+    Endpoint logic with response caching and coalescing of identical in-flight requests.
+    """
+
+    def __init__(self, cache_entries=API_CACHE_ENTRIES, max_batch=API_MAX_BATCH, max_delay=API_BATCH_DELAY):
+        """
+        Args:
+            cache_entries: Encoded responses kept by parameter hash (LRU)
+            max_batch: Projection requests per engine call
+            max_delay: Seconds a projection request waits for batch-mates
+        """
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()    # parameter hash -> encoded response
+        self._inflight = {}            # parameter hash -> task computing the response
+        self.projections = MicroBatcher(self._projection_batch, max_batch, max_delay)
+        self.counters = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'computed': 0, 'errors': 0}
+
+    async def respond(self, endpoint, params):
+        """
+        Encoded response for an endpoint, from the cache, an identical in-flight
+        request or a new computation.
+
+        Args:
+            endpoint: 'projections', 'unit-economics' or 'scenarios'
+            params: Parameters from parse_params
+
+        Returns:
+            Tuple of (body bytes, source) with source 'hit', 'coalesced' or 'miss'
+        """
+        self.counters['requests'] += 1
+        key = memory_key(endpoint, params)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.counters['cache_hits'] += 1
+            return self._cache[key], 'hit'
+        if key in self._inflight:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(self._inflight[key]), 'coalesced'
+        task = asyncio.ensure_future(self._compute(endpoint, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._store(key, done))
+        return await asyncio.shield(task), 'miss'
+
+    @staticmethod
+    def _projection_batch(requests):
+        # Encoding on the worker thread keeps the event loop free for I/O
+        return [(response, encode(response)) for response in projection_batch(requests)]
+
+    def _store(self, key, task):
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            self.counters['errors'] += 1
+            return
+        self._cache[key] = task.result()
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    async def _compute(self, endpoint, params):
+        self.counters['computed'] += 1
+        loop = asyncio.get_running_loop()
+        if endpoint == 'projections':
+            _, body = await self.projections.submit(params)
+            return body
+        if endpoint == 'unit-economics':
+            return encode(await loop.run_in_executor(None, unit_economics_response, params))
+        # Each scenario joins the projection micro-batch alongside concurrent /projections requests
+        scenario_requests = []
+        for scenario in params['scenarios']:
+            growth = dict(scenario)['growth_rate']
+            request = {name: params[name] for name in PROJECTION_PARAMS}
+            if growth is not None:
+                request['growth_rate'] = float(growth)
+            scenario_requests.append(request)
+        results = await asyncio.gather(*(self.projections.submit(request) for request in scenario_requests))
+        return encode(scenario_response(params, [response for response, _ in results]))
+
+    def stats(self):
+        """
+        Service counters for instrumentation.
+
+        Returns:
+            Dict of request, cache, coalescing and batching counts
+        """
+        batches = self.projections.batches
+        return {**self.counters, 'cached_responses': len(self._cache), 'in_flight': len(self._inflight),
+                'batches': batches, 'mean_batch_size': self.projections.batched / batches if batches else 0.0}
+
+
+ENDPOINTS = {
+    ('POST', '/projections'): ('projections', PROJECTION_PARAMS),
+    ('POST', '/unit-economics'): ('unit-economics', UNIT_ECONOMICS_PARAMS),
+    ('POST', '/scenarios'): ('scenarios', SCENARIO_PARAMS),
+}
+
+
+def create_app(service=None):
+    """
+    ASGI application for a projection service.
+
+    Args:
+        service: ProjectionService (default: a new one)
+
+    Returns:
+        ASGI callable
+    """
+    service = service or ProjectionService()
+
+    async def send_json(send, status, body, headers=()):
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())] + list(headers)})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        method, path = scope['method'], scope['path'].rstrip('/') or '/'
+        if method == 'GET' and path == '/health':
+            return await send_json(send, 200, b'{"status":"ok"}')
+        if method == 'GET' and path == '/stats':
+            return await send_json(send, 200, encode(service.stats()))
+        if (method, path) not in ENDPOINTS:
+            return await send_json(send, 404, encode({'error': f"No endpoint {method} {path}"}))
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        endpoint, defaults = ENDPOINTS[(method, path)]
+        try:
+            params = parse_params(json.loads(body or b'{}'), defaults)
+        except (ValueError, TypeError) as error:
+            return await send_json(send, 400, encode({'error': str(error)}))
+        try:
+            response, source = await service.respond(endpoint, params)
+        except ValueError as error:
+            # Parameters that parse but that the engine cannot project
+            return await send_json(send, 400, encode({'error': str(error)}))
+        except Exception as error:
+            return await send_json(send, 500, encode({'error': f"{type(error).__name__}: {error}"}))
+        await send_json(send, 200, response, [(b'x-cache', source.encode())])
+
+    app.service = service
+    return app
+
+
+app = create_app()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Serve the AdNexus projection API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--workers', type=int, default=1)
+    options = parser.parse_args()
+    uvicorn.run('adnexus_api:app', host=options.host, port=options.port, workers=options.workers,
+                log_level='warning')
@@ -0,0 +1,238 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Scenario Comparison
+Created: December 2025
+
+Pinned-baseline comparison: the baseline's full-horizon revenue, payment and
+ledger arrays are kept, and each variant is derived from them by recomputing
+only the months from the first point where its inputs diverge (a redemption
+change from month 13 leaves months 0-12 untouched). Results are identical to
+calculate_projections on the variant's inputs.
+"""
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import (
+    MAX_PROJECTION_MONTHS,
+    growth_path,
+    projection_frame,
+    repayment_ledger,
+    resume_ledger,
+    schedule_array,
+)
+from adnexus_schema import from_paise
+
+# Inputs of a compared scenario (calculate_projections argument names)
+COMPARISON_INPUTS = ('current_revenue', 'growth_rate', 'redemption_rate', 'revenue_share_pct',
+                     'investment_amount', 'already_paid')
+
+# Most variants pinned next to the baseline
+MAX_PINNED_VARIANTS = 4
+
+
+def _first_difference(a, b):
+    """Index of the first differing element of two equal-length arrays (len(a) if none)."""
+    differs = np.flatnonzero(a != b)
+    return int(differs[0]) if len(differs) else len(a)
+
+
+def divergence(baseline, variant, months=MAX_PROJECTION_MONTHS):
+    """
+    First month indexes where a variant's projection can differ from the baseline's.
+
+    Args:
+        baseline: Dict of COMPARISON_INPUTS
+        variant: Dict of COMPARISON_INPUTS
+        months: Projection horizon
+
+    Returns:
+        Tuple (paths_start, ledger_start): first index of the revenue/payment
+        paths and of the ledger that must be recomputed (months + 1 = identical)
+    """
+    horizon = months + 1
+    starts = [horizon]
+    if (baseline['current_revenue'] != variant['current_revenue'] or
+            baseline['revenue_share_pct'] != variant['revenue_share_pct']):
+        starts.append(0)
+
+    base_growth, variant_growth = baseline['growth_rate'], variant['growth_rate']
+    if np.ndim(base_growth) != np.ndim(variant_growth):
+        # Closed-form power vs cumulative product: not comparable month by month
+        starts.append(0)
+    elif np.ndim(base_growth) == 0:
+        if base_growth != variant_growth:
+            starts.append(1)    # month 0 has no growth
+    else:
+        changed = _first_difference(schedule_array(base_growth, months), schedule_array(variant_growth, months))
+        starts.append(changed + 1)    # rate i grows month i + 1
+
+    starts.append(_first_difference(schedule_array(baseline['redemption_rate'], horizon),
+                                    schedule_array(variant['redemption_rate'], horizon)))
+    paths_start = min(starts)
+
+    terms_changed = (baseline['investment_amount'] != variant['investment_amount'] or
+                     baseline['already_paid'] != variant['already_paid'])
+    return paths_start, 0 if terms_changed else paths_start
+
+
+def projection_state(inputs, months=MAX_PROJECTION_MONTHS):
+    """
+    Full-horizon projection arrays of one scenario (the cached form of a baseline).
+
+    Args:
+        inputs: Dict of COMPARISON_INPUTS
+        months: Projection horizon
+
+    Returns:
+        Dict with 'inputs', 'months', 'growth_factors', 'gross_revenue', 'redemptions',
+        'calculated_payment', 'ledger' and 'recomputed_from' (0: everything computed)
+    """
+    factors = growth_path(inputs['growth_rate'], months)
+    gross_revenue = inputs['current_revenue'] * factors
+    redemptions = gross_revenue * (schedule_array(inputs['redemption_rate'], months + 1) / 100)
+    calculated_payment = (gross_revenue - redemptions) * (inputs['revenue_share_pct'] / 100)
+    return {
+        'inputs': dict(inputs),
+        'months': months,
+        'growth_factors': factors,
+        'gross_revenue': gross_revenue,
+        'redemptions': redemptions,
+        'calculated_payment': calculated_payment,
+        'ledger': repayment_ledger(calculated_payment, inputs['investment_amount'], inputs['already_paid']),
+        'recomputed_from': 0,
+    }
+
+
+def variant_state(baseline_state, inputs):
+    """
+    Projection arrays of a variant, reusing the baseline's months before the divergence.
+
+    Args:
+        baseline_state: projection_state of the baseline
+        inputs: Dict of COMPARISON_INPUTS for the variant
+
+    Returns:
+        Dict as returned by projection_state; 'recomputed_from' is the first
+        recomputed month index (months + 1 when nothing changed)
+    """
+    months = baseline_state['months']
+    paths_start, ledger_start = divergence(baseline_state['inputs'], inputs, months)
+    if paths_start == 0:
+        return projection_state(inputs, months)
+
+    start = paths_start
+    growth = inputs['growth_rate']
+    factors = baseline_state['growth_factors'].copy()
+    if start <= months:
+        if np.ndim(growth) == 0:
+            factors[start:] = (1 + float(growth) / 100) ** np.arange(start, months + 1)
+        else:
+            # Continue the cumulative product from the last shared month (same rounding as growth_path)
+            rates = schedule_array(growth, months)
+            factors[start:] = np.cumprod(np.concatenate([[factors[start - 1]], 1 + rates[start - 1:] / 100]))[1:]
+
+    gross_revenue = baseline_state['gross_revenue'].copy()
+    redemptions = baseline_state['redemptions'].copy()
+    calculated_payment = baseline_state['calculated_payment'].copy()
+    gross_revenue[start:] = inputs['current_revenue'] * factors[start:]
+    redemptions[start:] = gross_revenue[start:] * (schedule_array(inputs['redemption_rate'], months + 1)[start:] / 100)
+    calculated_payment[start:] = (gross_revenue[start:] - redemptions[start:]) * (inputs['revenue_share_pct'] / 100)
+
+    if ledger_start == 0:
+        ledger = repayment_ledger(calculated_payment, inputs['investment_amount'], inputs['already_paid'])
+    elif ledger_start > months:
+        ledger = baseline_state['ledger']
+    else:
+        ledger = resume_ledger(baseline_state['ledger'], calculated_payment, ledger_start)
+
+    return {
+        'inputs': dict(inputs),
+        'months': months,
+        'growth_factors': factors,
+        'gross_revenue': gross_revenue,
+        'redemptions': redemptions,
+        'calculated_payment': calculated_payment,
+        'ledger': ledger,
+        'recomputed_from': ledger_start,
+    }
+
+
+def state_frame(state, current_month=1, backend='numpy'):
+    """
+    Projection table of a state, identical to calculate_projections on its inputs.
+
+    Args:
+        state: projection_state or variant_state result
+        current_month: Current month number in the timeline
+        backend: Column storage, 'numpy' or 'arrow'
+
+    Returns:
+        DataFrame truncated at payoff
+    """
+    return projection_frame(state['gross_revenue'], state['redemptions'], state['ledger'], current_month, backend)
+
+
+def months_remaining(state):
+    """Months after the current month until payoff (the horizon if never repaid)."""
+    ledger = state['ledger']
+    return int(ledger['payoff_index']) if ledger['complete'] else state['months']
+
+
+def comparison_frame(baseline_state, compared_state, current_month=1):
+    """
+    Month-by-month deltas of a variant against the baseline.
+
+    Rows run until both scenarios are repaid (or the horizon), so the months
+    where only one of them is still paying are included.
+
+    Args:
+        baseline_state: projection_state of the baseline
+        compared_state: variant_state of the variant
+        current_month: Current month number in the timeline
+
+    Returns:
+        DataFrame with baseline, variant and delta columns for payment,
+        cumulative paid and balance
+    """
+    rows = max(months_remaining(baseline_state), months_remaining(compared_state)) + 1
+    columns = {'Month': current_month + np.arange(rows)}
+    for label, key in [('Payment', 'payment'), ('Cumulative Paid', 'cumulative_paid'), ('Balance', 'balance')]:
+        base = from_paise(baseline_state['ledger'][key][:rows])
+        variant = from_paise(compared_state['ledger'][key][:rows])
+        columns[f'Baseline {label} (₹L)'] = base
+        columns[f'Variant {label} (₹L)'] = variant
+        columns[f'Δ {label} (₹L)'] = from_paise(compared_state['ledger'][key][:rows] -
+                                                baseline_state['ledger'][key][:rows])
+    return pd.DataFrame(columns)
+
+
+def comparison_summary(baseline_state, variants, target_months=36):
+    """
+    One row per scenario with its months remaining and deltas against the baseline.
+
+    Args:
+        baseline_state: projection_state of the baseline
+        variants: Dict of label -> variant_state
+        target_months: Month index at which recovery is compared
+
+    Returns:
+        DataFrame indexed by scenario label ('Baseline' first)
+    """
+    target = min(target_months, baseline_state['months'])
+    base_months = months_remaining(baseline_state)
+    base_paid = baseline_state['ledger']['cumulative_paid'][target]
+    rows = []
+    for label, state in {'Baseline': baseline_state, **variants}.items():
+        remaining = months_remaining(state)
+        complete = bool(state['ledger']['complete'])
+        rows.append({
+            'Scenario': label,
+            'Months Remaining': remaining if complete else f'>{remaining}',
+            'Δ Months': remaining - base_months,
+            f'Paid by Month +{target} (₹L)': from_paise(state['ledger']['cumulative_paid'][target]),
+            f'Δ Paid by Month +{target} (₹L)': from_paise(state['ledger']['cumulative_paid'][target] - base_paid),
+            'Recomputed From': ('—' if label == 'Baseline' or state['recomputed_from'] > state['months']
+                                else f"+{state['recomputed_from']}"),
+        })
+    return pd.DataFrame(rows).set_index('Scenario')
@@ -0,0 +1,1058 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Vectorized Projection Engine
+Created: December 2025
+
+Projection calculations shared by the Streamlit dashboard, written as NumPy
+array operations. Unlike the app script, this module has no Streamlit
+dependency, so it can be imported directly by the test scripts and evaluated
+over whole parameter grids at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from adnexus_schema import to_paise, from_paise
+
+# Matches the 120-month loop limit in calculate_projections (121 rows incl. current month)
+MAX_PROJECTION_MONTHS = 120
+
+# Sub-monthly resolutions: periods per (average calendar) month, period column and days per period
+DAYS_PER_MONTH = 365.25 / 12
+PERIODS_PER_MONTH = {'monthly': 1, 'weekly': DAYS_PER_MONTH / 7, 'daily': DAYS_PER_MONTH}
+PERIOD_COLUMNS = {'weekly': 'Week', 'daily': 'Day'}
+PERIOD_DAYS = {'weekly': 7, 'daily': 1}
+
+# Points drawn per chart series; longer series are downsampled (see downsample_indices)
+MAX_CHART_POINTS = 600
+
+# Rollup lengths in months; with a calendar, quarters, halves and years follow the April–March fiscal year
+ROLLUP_MONTHS = {'Month': 1, 'Quarter': 3, 'Half-Year': 6, 'Fiscal Year': 12}
+FISCAL_YEAR_START_MONTH = 4
+
+# How rows roll up into months, quarters and years: flows are summed, levels taken at the period end
+PERIOD_AGGREGATIONS = {
+    'Gross Revenue (₹L)': 'sum',
+    'Redemptions (₹L)': 'sum',
+    'Net Revenue (₹L)': 'sum',
+    'Payment to Vinmo (₹L)': 'sum',
+    'Cumulative Paid (₹L)': 'last',
+    'Balance (₹L)': 'last',
+    'MAU': 'last',
+    'ARPU': 'last',
+    'LTV': 'last',
+    'CAC': 'last',
+    'LTV/CAC': 'last',
+}
+
+
+def column_frame(columns, backend='numpy'):
+    """
+    Wrap column arrays in a DataFrame without copying them.
+
+    'numpy' keeps each array as its own NumPy-backed column; 'arrow' moves the
+    buffers into Arrow-backed columns (pd.ArrowDtype), which Streamlit and
+    pyarrow read without any further conversion. Both are zero-copy for
+    contiguous numeric arrays.
+
+    Args:
+        columns: Dict of column name -> 1D array
+        backend: 'numpy' or 'arrow' (requires pyarrow)
+
+    Returns:
+        DataFrame over the given buffers
+    """
+    if backend == 'arrow':
+        import pyarrow as pa
+        return pa.table(columns).to_pandas(types_mapper=pd.ArrowDtype)
+    return pd.DataFrame(columns, copy=False)
+
+
+def schedule_array(schedule, periods):
+    """
+    Expand a scalar or per-month schedule to exactly `periods` values.
+
+    Scalars are repeated; shorter schedules hold their last value, longer ones
+    are truncated.
+
+    Args:
+        schedule: Scalar or sequence of per-month values
+        periods: Number of months required
+
+    Returns:
+        Float array of length `periods`
+    """
+    values = np.atleast_1d(np.asarray(schedule, dtype=float))
+    if len(values) >= periods:
+        return values[:periods]
+    return np.concatenate([values, np.full(periods - len(values), values[-1])])
+
+
+def decay_schedule(initial_rate, floor_rate, half_life, periods):
+    """
+    Growth rate decaying exponentially from `initial_rate` toward `floor_rate`.
+
+    Args:
+        initial_rate: Growth in the first projected month (%)
+        floor_rate: Long-run growth rate (%)
+        half_life: Months for the excess over the floor to halve
+        periods: Number of months
+
+    Returns:
+        Array of monthly growth rates (%)
+    """
+    months_ahead = np.arange(periods)
+    return floor_rate + (initial_rate - floor_rate) * 0.5 ** (months_ahead / max(half_life, 1e-9))
+
+
+def logistic_schedule(initial_rate, current_level, capacity, periods):
+    """
+    Monthly growth rates of a logistic (S-curve) path saturating at `capacity`.
+
+    The logistic steepness is chosen so the first projected month grows at
+    `initial_rate`; growth then slows as the level approaches capacity.
+
+    Args:
+        initial_rate: Growth in the first projected month (%)
+        current_level: Current level, e.g. MAU
+        capacity: Saturation level, e.g. addressable MAU
+        periods: Number of months
+
+    Returns:
+        Array of monthly growth rates (%)
+    """
+    first_level = current_level * (1 + initial_rate / 100)
+    if initial_rate <= 0 or first_level >= capacity:
+        return np.zeros(periods)
+    gap = capacity / current_level - 1
+    steepness = -np.log((capacity / first_level - 1) / gap)
+    levels = capacity / (1 + gap * np.exp(-steepness * np.arange(periods + 1)))
+    return (levels[1:] / levels[:-1] - 1) * 100
+
+
+def piecewise_schedule(segments, periods, default=0.0):
+    """
+    Step-function schedule from (from_month, value) segments.
+
+    Args:
+        segments: Iterable of (from_month, value) pairs; from_month counts projected
+            months ahead starting at 1. Missing values (None/NaN) are skipped.
+        periods: Number of months
+        default: Value before the first segment starts
+
+    Returns:
+        Array of per-month values
+    """
+    starts, values = [], []
+    for start, value in sorted((int(start), value) for start, value in segments
+                               if value is not None and not pd.isna(value) and not pd.isna(start)):
+        starts.append(start)
+        values.append(float(value))
+    if not starts:
+        return np.full(periods, float(default))
+    lookup = np.concatenate([[float(default)], values])
+    return lookup[np.searchsorted(starts, np.arange(1, periods + 1), side='right')]
+
+
+def growth_path(growth_rate, periods):
+    """
+    Compound growth factors for the current month (index 0) and `periods` future months.
+
+    A scalar rate uses the closed-form power; a per-month schedule is applied
+    through a cumulative product, so both cost the same single vectorized pass.
+
+    Args:
+        growth_rate: Monthly growth rate (%) or per-month schedule
+        periods: Number of future months
+
+    Returns:
+        Array of length periods + 1 starting at 1.0
+    """
+    if np.ndim(growth_rate) == 0:
+        return (1 + float(growth_rate) / 100) ** np.arange(periods + 1)
+    rates = schedule_array(growth_rate, periods)
+    return np.concatenate([[1.0], np.cumprod(1 + rates / 100)])
+
+
+def _month_growth(growth_rate, months_elapsed):
+    """Whole months, growth factor at their start and growth rate within them, for fractional month times."""
+    months_elapsed = np.asarray(months_elapsed, dtype=float)
+    whole = np.floor(months_elapsed).astype(int)
+    horizon = int(whole.max()) + 1 if whole.size else 1
+    return whole, growth_path(growth_rate, horizon)[whole], schedule_array(growth_rate, horizon)[whole] / 100
+
+
+def growth_at(growth_rate, months_elapsed):
+    """
+    Growth factor at fractional month times, compounding smoothly within each month.
+
+    Agrees with growth_path at whole months; in between, month k's rate is
+    applied pro rata, (1 + g_k)^(t - k).
+
+    Args:
+        growth_rate: Monthly growth rate (%) or per-month schedule
+        months_elapsed: Times in months after the start of the current month (array, >= 0)
+
+    Returns:
+        Array of growth factors
+    """
+    whole, start, rate = _month_growth(growth_rate, months_elapsed)
+    return start * np.exp(np.log1p(rate) * (np.asarray(months_elapsed, dtype=float) - whole))
+
+
+def growth_integral(growth_rate, months_elapsed):
+    """
+    Integral of the revenue rate from the start of the current month, in current-month revenues.
+
+    The rate within month k is scaled so that month k integrates to exactly
+    its growth_path factor: the revenue between two whole months equals the
+    monthly projection's, however finely the months are divided.
+
+    Args:
+        growth_rate: Monthly growth rate (%) or per-month schedule
+        months_elapsed: Times in months after the start of the current month (array, >= 0)
+
+    Returns:
+        Array of cumulative revenue (1.0 = one current month's revenue)
+    """
+    whole, start, rate = _month_growth(growth_rate, months_elapsed)
+    fraction = np.asarray(months_elapsed, dtype=float) - whole
+    horizon = int(whole.max()) + 1 if whole.size else 1
+    before = np.concatenate([[0.0], np.cumsum(growth_path(growth_rate, horizon))])[whole]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        within = np.where(rate != 0, np.expm1(fraction * np.log1p(rate)) / rate, fraction)
+    return before + start * within
+
+
+def combine_growth(user_growth_rate, arpu_growth_rate):
+    """
+    Revenue growth from user and ARPU growth (Revenue = MAU × ARPU).
+
+    Accepts scalars or per-month schedules.
+    """
+    return ((1 + np.asarray(user_growth_rate, dtype=float) / 100) *
+            (1 + np.asarray(arpu_growth_rate, dtype=float) / 100) - 1) * 100
+
+
+def retention_curve(churn_rate, periods):
+    """
+    Share of a cohort still active k months after acquisition, k = 0..periods.
+
+    Args:
+        churn_rate: Monthly churn rate (%) or per-month-of-age schedule
+        periods: Number of months after acquisition
+
+    Returns:
+        Array of length periods + 1 starting at 1.0
+    """
+    return growth_path(-np.asarray(churn_rate, dtype=float), periods)
+
+
+def cohort_convolution(acquisitions, retention):
+    """
+    Active users from stacked cohorts: sum over s <= t of acquisitions[s] * retention[t - s].
+
+    Long horizons use an FFT convolution (O(n log n)), so thousands of daily or
+    monthly cohorts cost milliseconds; a single short series uses direct
+    convolution. Leading axes of `acquisitions` and `retention` are treated as
+    a batch and broadcast against each other.
+
+    Args:
+        acquisitions: New users per period, shape (..., n)
+        retention: Retention by cohort age, shape (..., m) with m >= n
+
+    Returns:
+        Array of the broadcast batch shape with n periods
+    """
+    acquisitions = np.asarray(acquisitions, dtype=float)
+    periods = acquisitions.shape[-1]
+    retention = np.asarray(retention, dtype=float)[..., :periods]
+    if periods <= 64 and acquisitions.ndim == 1 and retention.ndim == 1:
+        return np.convolve(acquisitions, retention)[:periods]
+    size = 1 << int(np.ceil(np.log2(2 * periods - 1)))
+    spectrum = np.fft.rfft(acquisitions, size, axis=-1) * np.fft.rfft(retention, size, axis=-1)
+    return np.fft.irfft(spectrum, size, axis=-1)[..., :periods]
+
+
+def cohort_layers(acquisitions, retention, group_size=12):
+    """
+    Active users split by acquisition period group (e.g. year), for stacked charts.
+
+    All groups are convolved in one batched call.
+
+    Args:
+        acquisitions: New users per period (index 0 = existing base)
+        retention: Retention by cohort age
+        group_size: Periods per group (default: 12)
+
+    Returns:
+        Array of shape (groups, periods); row 0 is the existing base
+    """
+    acquisitions = np.asarray(acquisitions, dtype=float)
+    periods = len(acquisitions)
+    # Group 0 is the existing base; later groups are consecutive blocks of new cohorts
+    group = np.concatenate([[0], (np.arange(1, periods) - 1) // group_size + 1])
+    masks = group[np.newaxis, :] == np.arange(group.max() + 1)[:, np.newaxis]
+    return cohort_convolution(acquisitions * masks, retention)
+
+
+def cac_path(starting_cac=30, cac_monthly_increase=2, cac_schedule=None, periods=MAX_PROJECTION_MONTHS):
+    """
+    CAC (₹) in each projected month: a linear increase unless a per-month schedule is given.
+
+    Returns:
+        Array of length periods (index 0 = first projected month)
+    """
+    if cac_schedule is None:
+        return starting_cac + np.arange(periods) * cac_monthly_increase
+    return schedule_array(cac_schedule, periods)
+
+
+def cohort_acquisitions(mau, acquisition_spend, spend_growth_rate=0.0, starting_cac=30,
+                        cac_monthly_increase=2, cac_schedule=None, periods=MAX_PROJECTION_MONTHS):
+    """
+    Users entering each cohort: the current base at index 0, then spend ÷ CAC per projected month.
+
+    Args:
+        mau: Current Monthly Active Users (the month-0 cohort)
+        acquisition_spend: Marketing spend in the first projected month (₹ Lakhs) or per-month schedule
+        spend_growth_rate: Monthly growth of a scalar acquisition spend (%)
+        starting_cac: Initial Customer Acquisition Cost (₹)
+        cac_monthly_increase: CAC increase per month (₹)
+        cac_schedule: Optional per-month CAC (₹) overriding the linear increase
+        periods: Number of future months
+
+    Returns:
+        Array of length periods + 1
+    """
+    if np.ndim(acquisition_spend) == 0:
+        spend = acquisition_spend * growth_path(spend_growth_rate, periods - 1)
+    else:
+        spend = schedule_array(acquisition_spend, periods)
+    cac = cac_path(starting_cac, cac_monthly_increase, cac_schedule, periods)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_users = np.where(cac > 0, spend * 100000 / cac, 0.0)
+    # No acquisition in the current month
+    return np.concatenate([[float(mau)], new_users])
+
+
+def calculate_cohort_revenue(mau, arpu, churn_rate, arpu_growth_rate, acquisition_spend,
+                             spend_growth_rate=0.0, starting_cac=30, cac_monthly_increase=2,
+                             cac_schedule=None, periods=MAX_PROJECTION_MONTHS):
+    """
+    Cohort-based MAU and revenue for the current month (index 0) and `periods` future months.
+
+    New users each month are acquisition spend divided by that month's CAC; every
+    cohort, including the current user base, then decays along the churn
+    retention curve. Revenue is MAU × ARPU.
+
+    Args:
+        mau: Current Monthly Active Users
+        arpu: Current Average Revenue Per User (₹)
+        churn_rate: Monthly churn rate (%) or per-month-of-age schedule
+        arpu_growth_rate: Monthly ARPU growth (%) or per-month schedule
+        acquisition_spend: Marketing spend in the first projected month (₹ Lakhs) or per-month schedule
+        spend_growth_rate: Monthly growth of a scalar acquisition spend (%)
+        starting_cac: Initial Customer Acquisition Cost (₹)
+        cac_monthly_increase: CAC increase per month (₹)
+        cac_schedule: Optional per-month CAC (₹) overriding the linear increase
+        periods: Number of future months
+
+    Returns:
+        Dict of arrays (length periods + 1): 'acquisitions' (index 0 = existing base),
+        'retention', 'mau', 'arpu', 'revenue' (₹ Lakhs)
+    """
+    acquisitions = cohort_acquisitions(mau, acquisition_spend, spend_growth_rate, starting_cac,
+                                       cac_monthly_increase, cac_schedule, periods)
+    retention = retention_curve(churn_rate, periods)
+    active_users = np.maximum(cohort_convolution(acquisitions, retention), 0.0)
+    projected_arpu = arpu * growth_path(arpu_growth_rate, periods)
+
+    return {
+        'acquisitions': acquisitions,
+        'retention': retention,
+        'mau': active_users,
+        'arpu': projected_arpu,
+        'revenue': active_users * projected_arpu / 100000
+    }
+
+
+def batch_cohort_growth(acquisitions, churn_rate, arpu_growth_rate, periods=MAX_PROJECTION_MONTHS):
+    """
+    Revenue growth schedules from the cohort model for many churn / ARPU-growth pairs.
+
+    Every scenario's retention curve is convolved with the shared acquisition
+    path in one batched FFT.
+
+    Args:
+        acquisitions: Users per cohort from cohort_acquisitions (length periods + 1)
+        churn_rate: Monthly churn per scenario (%, shape (n,))
+        arpu_growth_rate: Monthly ARPU growth per scenario (%, shape (n,))
+        periods: Number of future months
+
+    Returns:
+        Array of revenue growth rates (%) with shape (n, periods)
+    """
+    ages = np.arange(periods + 1)
+    retention = (1 - np.asarray(churn_rate, dtype=float).reshape(-1, 1) / 100) ** ages
+    active_users = np.maximum(cohort_convolution(acquisitions, retention), 0.0)
+    revenue = active_users * (1 + np.asarray(arpu_growth_rate, dtype=float).reshape(-1, 1) / 100) ** ages
+    return growth_from_path(revenue)
+
+
+def growth_from_path(path):
+    """
+    Per-month growth schedule (%) that reproduces a level path from its first value.
+
+    Lets a revenue or MAU path from another model drive calculate_projections,
+    which scales growth from the dashboard's current revenue. Works along the
+    last axis, so a batch of paths gives a batch of schedules.
+    """
+    path = np.asarray(path, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(path[..., :-1] > 0, path[..., 1:] / path[..., :-1], 0.0)
+    return (ratio - 1) * 100
+
+
+def repayment_ledger(calculated_payment, investment_amount=75.0, already_paid=0.0):
+    """
+    Capped repayment ledger in integer paise.
+
+    Payments due are converted to whole paise once; the running total is then
+    an integer cumulative sum clipped at the outstanding balance, so the
+    final payment is capped exactly and completion is an exact comparison
+    with zero. Works along the last axis, so a batch of scenarios is one call.
+
+    Args:
+        calculated_payment: Uncapped payment per month (₹ Lakhs), shape (T,) or (n, T)
+        investment_amount: Total investment (₹ Lakhs, scalar or shape (n,))
+        already_paid: Amount repaid before the first month (₹ Lakhs, scalar or shape (n,))
+
+    Returns:
+        Dict of int64 paise arrays shaped like calculated_payment: 'payment',
+        'cumulative_paid' (including already_paid) and 'balance'; plus 'complete'
+        (balance reached zero) and 'payoff_index' (first month index with zero
+        balance, -1 if never)
+    """
+    investment = to_paise(investment_amount)[..., np.newaxis]
+    prior = to_paise(already_paid)[..., np.newaxis]
+    outstanding = np.maximum(investment - prior, 0)
+    # No single month can pay more than the outstanding balance, which keeps the sum in int64
+    due = np.minimum(to_paise(calculated_payment), outstanding)
+
+    paid = np.minimum(np.cumsum(due, axis=-1), outstanding)
+    balance = outstanding - paid
+    repaid = balance == 0
+    complete = repaid.any(axis=-1)
+    return {
+        'payment': np.diff(paid, axis=-1, prepend=0),
+        'cumulative_paid': prior + paid,
+        'balance': balance,
+        'complete': complete,
+        'payoff_index': np.where(complete, repaid.argmax(axis=-1), -1)
+    }
+
+
+def resume_ledger(ledger, calculated_payment, start):
+    """
+    Ledger for a payment path that only differs from an existing ledger's from index `start`.
+
+    Months before `start` are copied; the capped running total continues from
+    the paise paid by then, so the result equals repayment_ledger on the full
+    path. The investment and prior repayments must be the same as the
+    existing ledger's.
+
+    Args:
+        ledger: repayment_ledger result for one scenario (1D arrays)
+        calculated_payment: Uncapped payment per month for the full horizon (₹ Lakhs)
+        start: First month index whose payment may differ
+
+    Returns:
+        Dict as returned by repayment_ledger
+    """
+    # Recover the ledger's terms from its first month: paid[0] == payment[0]
+    prior = ledger['cumulative_paid'][0] - ledger['payment'][0]
+    outstanding = ledger['balance'][0] + ledger['payment'][0]
+    paid_before = ledger['cumulative_paid'][start - 1] - prior if start > 0 else 0
+    due = np.minimum(to_paise(calculated_payment[start:]), outstanding)
+
+    paid = np.concatenate([ledger['cumulative_paid'][:start] - prior,
+                           np.minimum(paid_before + np.cumsum(due), outstanding)])
+    balance = outstanding - paid
+    repaid = balance == 0
+    complete = repaid.any()
+    return {
+        'payment': np.diff(paid, prepend=0),
+        'cumulative_paid': prior + paid,
+        'balance': balance,
+        'complete': complete,
+        'payoff_index': repaid.argmax() if complete else -1
+    }
+
+
+def calculate_projections(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5, months=120,
+                          current_month=1, investment_amount=75.0, already_paid=0.0, backend='numpy',
+                          granularity='monthly', start_date=None):
+    """
+    Calculate monthly (or daily/weekly) revenue projections until investment is repaid.
+
+    With granularity 'daily' or 'weekly' the same horizon (the current month
+    plus `months`) is split into days or weeks (3,683 days for 120 months).
+    Revenue accrues continuously within each month, scaled so every whole
+    month's revenue equals the monthly projection's, and each period's
+    payment goes through the paise ledger, so the payoff falls on a day or
+    week instead of at the end of a month. Rates stay monthly: growth,
+    redemption and schedules are interpreted exactly as in monthly mode.
+
+    Args:
+        current_revenue: Starting monthly revenue (₹ Lakhs)
+        growth_rate: Monthly growth rate (%), or a per-month schedule for the
+            projected months after the current month
+        redemption_rate: Percentage of revenue that is redeemed (%, default: 50), or a
+            per-month schedule starting with the current month
+        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
+        months: Maximum months to project (default: 120)
+        current_month: Current month number in the timeline (default: 1)
+        investment_amount: Total investment to be repaid (₹ Lakhs, default: 75.0)
+        already_paid: Amount already repaid before current month (₹ Lakhs, default: 0.0)
+        backend: Column storage for the result, 'numpy' or 'arrow' (see column_frame)
+        granularity: 'monthly', 'weekly' or 'daily' (see PERIODS_PER_MONTH)
+        start_date: Date the current month starts (daily/weekly only); adds a Date column
+
+    Returns:
+        DataFrame with one row per month (or day/week, numbered in a Day/Week
+        column, with the Month it falls in); money is exact to the paisa (see
+        repayment_ledger) and attrs['complete'] flags whether the balance reached zero
+    """
+    if granularity not in PERIODS_PER_MONTH:
+        raise ValueError(f"Unknown granularity: {granularity!r} (expected {', '.join(PERIODS_PER_MONTH)})")
+    if granularity == 'monthly':
+        # Month 0 (current month) has NO growth - shows current state
+        gross_revenue = current_revenue * growth_path(growth_rate, months)
+        redemption_amount = gross_revenue * (schedule_array(redemption_rate, months + 1) / 100)
+    else:
+        periods_per_month = PERIODS_PER_MONTH[granularity]
+        # The last day/week is cut short at the horizon, so the total matches the monthly projection's
+        edges = np.minimum(np.arange(int(np.ceil((months + 1) * periods_per_month)) + 1) / periods_per_month,
+                           months + 1)
+        gross_revenue = current_revenue * np.diff(growth_integral(growth_rate, edges))
+        month_index = np.floor(edges[:-1]).astype(int)
+        redemption_amount = gross_revenue * (schedule_array(redemption_rate, months + 1)[month_index] / 100)
+    net_revenue = gross_revenue - redemption_amount
+    calculated_payment = net_revenue * (revenue_share_pct / 100)
+
+    # Integer-paise ledger: the final payment is capped to the remaining balance exactly
+    ledger = repayment_ledger(calculated_payment, investment_amount, already_paid)
+    return projection_frame(gross_revenue, redemption_amount, ledger, current_month, backend,
+                            granularity=granularity, start_date=start_date)
+
+
+def period_columns(rows, current_month=1, granularity='monthly', start_date=None):
+    """
+    Leading time columns of a projection or unit-economics frame.
+
+    Args:
+        rows: Number of periods from the start of the current month
+        current_month: Current month number in the timeline (default: 1)
+        granularity: 'monthly', 'weekly' or 'daily'
+        start_date: Date the current month starts (daily/weekly only)
+
+    Returns:
+        Dict with 'Month' (monthly); or the 1-based Day/Week number (int32),
+        the Month each period starts in (int16) and, with a start date, its Date
+    """
+    if granularity == 'monthly':
+        return {'Month': current_month + np.arange(rows)}
+    index = np.arange(rows)
+    columns = {
+        PERIOD_COLUMNS[granularity]: (index + 1).astype(np.int32),
+        'Month': (current_month + np.floor(index / PERIODS_PER_MONTH[granularity])).astype(np.int16),
+    }
+    if start_date is not None:
+        columns['Date'] = np.datetime64(start_date, 'D') + index * PERIOD_DAYS[granularity]
+    return columns
+
+
+def projection_frame(gross_revenue, redemption_amount, ledger, current_month=1, backend='numpy',
+                     granularity='monthly', start_date=None):
+    """
+    Projection table from the revenue paths and repayment ledger, truncated at payoff.
+
+    Args:
+        gross_revenue: Gross revenue per period from the current month (₹ Lakhs)
+        redemption_amount: Redemptions per period from the current month (₹ Lakhs)
+        ledger: repayment_ledger result for the same periods
+        current_month: Current month number in the timeline (default: 1)
+        backend: Column storage for the result, 'numpy' or 'arrow' (see column_frame)
+        granularity: Period length, 'monthly', 'weekly' or 'daily'
+        start_date: Date the current month starts (daily/weekly only)
+
+    Returns:
+        DataFrame as returned by calculate_projections
+    """
+    rows = int(ledger['payoff_index']) + 1 if ledger['complete'] else len(gross_revenue)
+    gross_paise = to_paise(gross_revenue[:rows])
+    redemption_paise = to_paise(redemption_amount[:rows])
+
+    df = column_frame({
+        **period_columns(rows, current_month, granularity, start_date),
+        'Gross Revenue (₹L)': from_paise(gross_paise),
+        'Redemptions (₹L)': from_paise(redemption_paise),
+        'Net Revenue (₹L)': from_paise(gross_paise - redemption_paise),
+        'Payment to Vinmo (₹L)': from_paise(ledger['payment'][:rows]),
+        'Cumulative Paid (₹L)': from_paise(ledger['cumulative_paid'][:rows]),
+        'Balance (₹L)': from_paise(ledger['balance'][:rows])
+    }, backend)
+    df.attrs['complete'] = bool(ledger['complete'])
+    df.attrs['balance_paise'] = int(ledger['balance'][rows - 1])
+    if granularity != 'monthly':
+        df.attrs['granularity'] = granularity
+    return df
+
+
+def batch_projections(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5,
+                      months=MAX_PROJECTION_MONTHS, investment_amount=75.0, already_paid=0.0, columns=False):
+    """
+    Repayment outcomes for many scenarios in one array pass.
+
+    Same payment rules as calculate_projections, but every argument may be a
+    per-scenario array of shape (n,), and growth_rate / redemption_rate may also
+    be per-scenario schedules of shape (n, months) / (n, months + 1). No
+    DataFrame is built, so tens of thousands of scenarios evaluate at once.
+
+    With columns=True the result also holds the paise-exact 'gross_revenue',
+    'redemptions', 'cumulative_paid' and 'balance' matrices (the columns of
+    calculate_projections, every scenario padded to months + 1).
+
+    Returns:
+        Dict with per-scenario arrays 'months_remaining', 'complete',
+        'total_recovered', 'final_balance' (₹ Lakhs) and the capped
+        'payments' matrix of shape (n, months + 1)
+    """
+    def column(values):
+        values = np.asarray(values, dtype=float)
+        return values.reshape(-1, 1) if values.ndim <= 1 else values
+
+    growth = np.asarray(growth_rate, dtype=float)
+    if growth.ndim <= 1:
+        factors = (1 + growth.reshape(-1, 1) / 100) ** np.arange(months + 1)
+    else:
+        factors = np.concatenate([np.ones((len(growth), 1)),
+                                  np.cumprod(1 + growth[:, :months] / 100, axis=1)], axis=1)
+
+    gross_revenue = column(current_revenue) * factors
+    calculated_payment = gross_revenue * (1 - column(redemption_rate) / 100) * (column(revenue_share_pct) / 100)
+
+    ledger = repayment_ledger(calculated_payment, investment_amount=np.ravel(investment_amount),
+                              already_paid=np.ravel(already_paid))
+    complete = np.broadcast_to(ledger['complete'], (len(calculated_payment),))
+
+    result = {
+        'months_remaining': np.where(complete, ledger['payoff_index'], months),
+        'complete': complete,
+        'total_recovered': from_paise(ledger['cumulative_paid'][:, -1]),
+        'final_balance': from_paise(ledger['balance'][:, -1]),
+        'payments': from_paise(ledger['payment'])
+    }
+    if columns:
+        gross_paise = to_paise(gross_revenue)
+        result.update({
+            'gross_revenue': from_paise(gross_paise),
+            'redemptions': from_paise(to_paise(gross_revenue * (column(redemption_rate) / 100))),
+            'cumulative_paid': from_paise(ledger['cumulative_paid']),
+            'balance': from_paise(ledger['balance'])
+        })
+    return result
+
+
+def calculate_unit_economics(mau, arpu, user_growth_rate, arpu_growth_rate, churn_rate,
+                             ltv_method='churn_based', ltv_months=6,
+                             starting_cac=30, cac_monthly_increase=2, months=36, cac_schedule=None,
+                             backend='numpy', granularity='monthly', start_date=None):
+    """
+    Calculate unit economics over time.
+
+    With granularity 'daily' or 'weekly' each row is the end of a day or week
+    of the same horizon: MAU and ARPU compound within the month (growth_at),
+    while churn and CAC hold their value for the month the period falls in.
+
+    Args:
+        mau: Starting Monthly Active Users
+        arpu: Starting Average Revenue Per User (₹)
+        user_growth_rate: Monthly user growth (%) or per-month schedule
+        arpu_growth_rate: Monthly ARPU growth (%) or per-month schedule
+        churn_rate: Monthly churn rate (%) or per-month schedule
+        ltv_method: 'churn_based' or 'fixed_months'
+        ltv_months: Months for LTV if using fixed method
+        starting_cac: Initial Customer Acquisition Cost (₹)
+        cac_monthly_increase: CAC increase per month (₹)
+        months: Months to project
+        cac_schedule: Optional per-month CAC (₹) overriding the linear increase
+        backend: Column storage for the result, 'numpy' or 'arrow' (see column_frame)
+        granularity: 'monthly', 'weekly' or 'daily' (see PERIODS_PER_MONTH)
+        start_date: Date the current month starts (daily/weekly only); adds a Date column
+
+    Returns:
+        DataFrame with unit economics metrics
+    """
+    if granularity not in PERIODS_PER_MONTH:
+        raise ValueError(f"Unknown granularity: {granularity!r} (expected {', '.join(PERIODS_PER_MONTH)})")
+    if granularity == 'monthly':
+        # Apply compound growth (consistent with projections); month 1 is the first grown month
+        projected_mau = mau * growth_path(user_growth_rate, months)[1:]
+        projected_arpu = arpu * growth_path(arpu_growth_rate, months)[1:]
+        month_index = np.arange(months)
+        time_columns = {'Month': month_index + 1}
+    else:
+        # Period ends after the start of the current month; the month index is the month each one ends in
+        ends = np.arange(1, int(months * PERIODS_PER_MONTH[granularity]) + 1) / PERIODS_PER_MONTH[granularity]
+        projected_mau = mau * growth_at(user_growth_rate, ends)
+        projected_arpu = arpu * growth_at(arpu_growth_rate, ends)
+        month_index = np.ceil(ends - 1e-9).astype(int) - 1
+        time_columns = period_columns(len(ends), 1, granularity, start_date)
+        time_columns['Month'] = (month_index + 1).astype(np.int16)
+    churn = schedule_array(churn_rate, months)[month_index] / 100
+
+    # Calculate LTV based on selected method
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if ltv_method == 'churn_based':
+            # LTV = ARPU / churn_rate (geometric series)
+            ltv = np.where(churn > 0, projected_arpu / churn, projected_arpu * ltv_months)
+        else:
+            # Fixed months method
+            ltv = projected_arpu * ltv_months
+
+        # Calculate CAC with linear increase unless a schedule is given
+        if cac_schedule is None:
+            cac = starting_cac + month_index * cac_monthly_increase
+        else:
+            cac = schedule_array(cac_schedule, months)[month_index]
+
+        # Calculate LTV/CAC ratio
+        ltv_cac = np.where(cac > 0, ltv / cac, 0)
+
+    return column_frame({
+        **time_columns,
+        'MAU': projected_mau.astype(int),
+        'ARPU': np.round(projected_arpu, 2),
+        'LTV': np.round(ltv, 2),
+        'CAC': np.round(cac, 2),
+        'LTV/CAC': np.round(ltv_cac, 2)
+    }, backend)
+
+
+def rollup_segments(months, by='Quarter', start_date=None):
+    """
+    Where each month, quarter, half-year or fiscal year starts in a run of rows.
+
+    Rows must be in time order (daily and weekly rows repeat their month), so
+    every group is a contiguous segment and can be reduced with a segment sum
+    instead of a groupby.
+
+    Args:
+        months: Timeline month number of each row
+        by: 'Month', 'Quarter', 'Half-Year' or 'Fiscal Year' (see ROLLUP_MONTHS)
+        start_date: Date in the first row's month; groups then follow the
+            April–March fiscal year (labels like 'FY2026-27 Q1'). Without it they
+            count from timeline month 1 ('Q13', 'H7', 'Year 4')
+
+    Returns:
+        Tuple of (segment start row indices, labels): month numbers for 'Month',
+        label strings otherwise
+    """
+    if by not in ROLLUP_MONTHS:
+        raise ValueError(f"Unknown rollup: {by!r} (expected {', '.join(ROLLUP_MONTHS)})")
+    size = ROLLUP_MONTHS[by]
+    months = np.asarray(months, dtype=np.int64)
+    if start_date is None:
+        index = months - 1
+    else:
+        # Months since April 1970: fiscal quarters, halves and years are whole multiples
+        first = np.datetime64(start_date, 'M').astype(np.int64) - (FISCAL_YEAR_START_MONTH - 1)
+        index = first + months - months[0]
+    group = index // size
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]]) if len(group) else np.zeros(0, dtype=int)
+    if by == 'Month':
+        return starts, months[starts]
+
+    labels = []
+    for first_month in index[starts]:
+        if start_date is None:
+            number = first_month // size + 1
+            labels.append(f'Year {number}' if by == 'Fiscal Year' else f'{by[0]}{number}')
+        else:
+            year = 1970 + first_month // 12
+            fiscal_year = f'FY{year}-{(year + 1) % 100:02d}'
+            part = f' {by[0]}{first_month % 12 // size + 1}' if by != 'Fiscal Year' else ''
+            labels.append(fiscal_year + part)
+    return starts, labels
+
+
+def segment_rollup(values, starts, how='sum'):
+    """
+    Reduce contiguous segments of the last axis: sums or the last value of each segment.
+
+    Works on a single column (T,) or a batch of scenarios (n, T) in one call.
+
+    Args:
+        values: Array whose last axis is time
+        starts: Segment start indices from rollup_segments
+        how: 'sum' or 'last'
+
+    Returns:
+        Array with one entry per segment along the last axis
+    """
+    values = np.asarray(values)
+    if how == 'sum':
+        return np.add.reduceat(values, starts, axis=-1)
+    return values[..., np.r_[starts[1:], values.shape[-1]] - 1]
+
+
+def aggregate_periods(df, by='Month', start_date=None):
+    """
+    Roll a projection or unit-economics frame up to months, quarters, half-years or fiscal years.
+
+    Revenue, redemptions and payments are summed in integer paise (so the
+    totals stay exact); cumulative paid, balance and unit-economics levels
+    are taken at the last row of each group. Monthly, weekly and daily
+    frames are all accepted.
+
+    Args:
+        df: Frame from calculate_projections / calculate_unit_economics
+        by: 'Month', 'Quarter', 'Half-Year' or 'Fiscal Year' (see rollup_segments)
+        start_date: Date in the frame's first month, for April–March fiscal periods
+
+    Returns:
+        DataFrame with one row per group: its label, the number of Days/Weeks
+        (or Months) in it, the Date it starts (if df has dates) and the
+        aggregated columns of df
+    """
+    period = next((column for column in PERIOD_COLUMNS.values() if column in df.columns), None)
+    starts, labels = rollup_segments(df['Month'].to_numpy(), by, start_date)
+    columns = {by: labels, f'{period or "Month"}s': np.diff(np.r_[starts, len(df)])}
+    if 'Date' in df.columns:
+        columns['Date'] = df['Date'].to_numpy()[starts]
+    for name, how in PERIOD_AGGREGATIONS.items():
+        if name not in df.columns:
+            continue
+        if how == 'sum':
+            columns[name] = from_paise(segment_rollup(to_paise(df[name].to_numpy(dtype=float)), starts))
+        else:
+            columns[name] = segment_rollup(df[name].to_numpy(), starts, how)
+    return pd.DataFrame(columns)
+
+
+def projection_rollups(df, start_date=None):
+    """
+    Quarter, half-year and fiscal-year rollups of a projection frame.
+
+    Args:
+        df: Frame from calculate_projections (any granularity)
+        start_date: Date in the current month, for April–March fiscal periods
+
+    Returns:
+        Dict of 'Quarter', 'Half-Year' and 'Fiscal Year' -> DataFrame (see aggregate_periods)
+    """
+    return {by: aggregate_periods(df, by, start_date) for by in ROLLUP_MONTHS if by != 'Month'}
+
+
+def batch_rollups(result, by='Fiscal Year', current_month=1, start_date=None):
+    """
+    Roll the column matrices of many scenarios up to quarters, half-years or fiscal years at once.
+
+    Every scenario's first column is the same (current) month, so one set of
+    segments serves the whole batch and each matrix is reduced with a single
+    segment sum.
+
+    Args:
+        result: batch_projections(..., columns=True) result
+        by: 'Month', 'Quarter', 'Half-Year' or 'Fiscal Year'
+        current_month: Timeline month of the first column (used without a start date)
+        start_date: Date in the current month, for April–March fiscal periods
+
+    Returns:
+        Dict with 'labels' and (n, groups) matrices 'gross_revenue', 'redemptions'
+        and 'payments' (sums, exact to the paisa) and 'cumulative_paid' and
+        'balance' (at the end of each group), in ₹ Lakhs
+    """
+    columns = result['payments'].shape[-1]
+    starts, labels = rollup_segments(current_month + np.arange(columns), by, start_date)
+    rollup = {'labels': labels}
+    for name in ('gross_revenue', 'redemptions', 'payments'):
+        rollup[name] = from_paise(segment_rollup(to_paise(result[name]), starts))
+    for name in ('cumulative_paid', 'balance'):
+        rollup[name] = segment_rollup(result[name], starts, 'last')
+    return rollup
+
+
+def downsample_indices(values, max_points=MAX_CHART_POINTS):
+    """
+    Rows to draw for a long series: the minimum and maximum of each bucket.
+
+    Keeps peaks, troughs and steps (a redemption schedule change, the final
+    capped payment) that plain striding would skip, and the first and last
+    rows, in at most `max_points` points however long the series is.
+
+    Args:
+        values: 1D series to chart
+        max_points: Most points to return
+
+    Returns:
+        Sorted int array of row indices (all rows when the series is short enough)
+    """
+    values = np.asarray(values, dtype=float)
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count)
+    size = -(-count // max(max_points // 2 - 1, 1))
+    buckets = -(-count // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:count] = values
+    padded = padded.reshape(buckets, size)
+    filled = np.where(np.isnan(padded), np.inf, padded)
+    lows = filled.argmin(axis=1)
+    highs = np.where(np.isnan(padded), -np.inf, padded).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    return np.unique(np.concatenate([[0, count - 1], offsets + lows, offsets + highs]))
+
+
+def effective_payment_rate(redemption_rate, revenue_share_pct=5):
+    """
+    Fraction of gross revenue paid to the investor each month.
+
+    Args:
+        redemption_rate: Percentage of revenue that is redeemed (%, scalar or array)
+        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
+
+    Returns:
+        Effective payment rate as a fraction of gross revenue
+    """
+    return (1 - np.asarray(redemption_rate, dtype=float) / 100) * (np.asarray(revenue_share_pct, dtype=float) / 100)
+
+
+def repayment_multiple(current_revenue, redemption_rate=50, revenue_share_pct=5,
+                       investment_amount=75.0, already_paid=0.0):
+    """
+    Outstanding balance expressed in current-month payments.
+
+    A value of K means the balance equals K payments at today's revenue, so a
+    flat revenue line repays in K months (including the current month).
+
+    Returns:
+        Array of repayment multiples (inf when no net revenue reaches the investor)
+    """
+    first_payment = np.asarray(current_revenue, dtype=float) * effective_payment_rate(redemption_rate, revenue_share_pct)
+    remaining = np.asarray(investment_amount, dtype=float) - np.asarray(already_paid, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        multiple = np.where(first_payment > 0, remaining / first_payment, np.inf)
+    return np.maximum(multiple, 0.0)
+
+
+def cumulative_growth_factor(growth_rate, months):
+    """
+    Sum of (1 + g)^k for k = 0..months, i.e. revenue paid out through month index `months`
+    in units of the current month's revenue.
+
+    Args:
+        growth_rate: Monthly growth rate (%, scalar or array)
+        months: Months after the current month (scalar or array, broadcast with growth_rate)
+
+    Returns:
+        Array of geometric sums
+    """
+    g = np.asarray(growth_rate, dtype=float) / 100
+    n = np.asarray(months, dtype=float) + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # expm1/log1p keep the sum accurate for tiny growth rates
+        series = np.where(g != 0, np.expm1(n * np.log1p(g)) / g, n)
+    return series
+
+
+def payoff_months_continuous(growth_rate, redemption_rate, current_revenue, investment_amount=75.0,
+                             already_paid=0.0, revenue_share_pct=5):
+    """
+    Months remaining until repayment as a continuous value.
+
+    Solves sum_{k=0..t} (1 + g)^k = K for t in closed form, where K is the
+    repayment multiple. All arguments broadcast, so a whole growth x redemption
+    grid is evaluated in one pass. Rounding the result up gives the same
+    "Months Remaining" figure as calculate_projections (before the 120-month cap).
+
+    Args:
+        growth_rate: Monthly revenue growth rate (%)
+        redemption_rate: Percentage of revenue that is redeemed (%)
+        current_revenue: Starting monthly revenue (₹ Lakhs)
+        investment_amount: Total investment to be repaid (₹ Lakhs, default: 75.0)
+        already_paid: Amount already repaid before current month (₹ Lakhs, default: 0.0)
+        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
+
+    Returns:
+        Array of months remaining (0 = repaid in the current month, inf = never)
+    """
+    g = np.asarray(growth_rate, dtype=float) / 100
+    multiple = repayment_multiple(current_revenue, redemption_rate, revenue_share_pct,
+                                  investment_amount, already_paid)
+    g, multiple = np.broadcast_arrays(g, multiple)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        periods = np.where(g > 0, np.log1p(multiple * g) / np.log1p(g), multiple)
+    return np.maximum(periods - 1, 0.0)
+
+
+def payoff_months(growth_rate, redemption_rate, current_revenue, investment_amount=75.0,
+                  already_paid=0.0, revenue_share_pct=5, months=MAX_PROJECTION_MONTHS):
+    """
+    Whole months remaining until repayment, capped like calculate_projections.
+
+    Returns:
+        Tuple of (months_remaining, complete) arrays. Incomplete scenarios report
+        the projection limit, matching the ">120" display in the dashboard.
+    """
+    continuous = payoff_months_continuous(growth_rate, redemption_rate, current_revenue,
+                                          investment_amount, already_paid, revenue_share_pct)
+    # Small tolerance so exact boundaries don't round up on floating point noise
+    whole = np.ceil(continuous - 1e-9)
+    complete = whole <= months
+    return np.where(complete, whole, months).astype(int), complete
+
+
+def iso_repayment_growth(target_months, redemption_rate, current_revenue, investment_amount=75.0,
+                         already_paid=0.0, revenue_share_pct=5, max_growth=100.0, iterations=60):
+    """
+    Minimum monthly growth rate that repays within `target_months` months remaining.
+
+    Uses a vectorized bisection on the geometric repayment sum, which is
+    monotonic in growth, so every (target, redemption) pair is solved at once.
+    The result is an exact boundary: any growth at or above it completes
+    repayment within the target.
+
+    Args:
+        target_months: Months remaining to solve for (scalar or array)
+        redemption_rate: Percentage of revenue that is redeemed (%, scalar or array)
+        current_revenue: Starting monthly revenue (₹ Lakhs)
+        investment_amount: Total investment to be repaid (₹ Lakhs, default: 75.0)
+        already_paid: Amount already repaid before current month (₹ Lakhs, default: 0.0)
+        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
+        max_growth: Upper search bound for growth (%, default: 100)
+        iterations: Bisection steps (default: 60, well below float resolution)
+
+    Returns:
+        Array of required growth rates (%); 0 when flat revenue already suffices,
+        NaN when even `max_growth` is not enough
+    """
+    multiple = repayment_multiple(current_revenue, redemption_rate, revenue_share_pct,
+                                  investment_amount, already_paid)
+    target, multiple = np.broadcast_arrays(np.asarray(target_months, dtype=float), multiple)
+
+    low = np.zeros(target.shape)
+    high = np.full(target.shape, float(max_growth))
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        reached = cumulative_growth_factor(mid, target) >= multiple
+        high = np.where(reached, mid, high)
+        low = np.where(reached, low, mid)
+
+    required = high
+    required = np.where(cumulative_growth_factor(0.0, target) >= multiple, 0.0, required)
+    required = np.where(cumulative_growth_factor(max_growth, target) >= multiple, required, np.nan)
+    return required
@@ -0,0 +1,110 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Exit Valuation
+Created: December 2025
+
+Combines revenue-share recovery with the equity stake's proceeds at an exit,
+over an exit-month × revenue-multiple grid solved in one broadcasted pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+from adnexus_returns import investor_cash_flows, batch_irr, batch_npv
+
+
+def exit_valuation_grid(payments, gross_revenue, exit_months, revenue_multiples, equity_stake_pct=17.5,
+                        investment_amount=75.0, already_paid=0.0, current_month=1, discount_rate=12.0,
+                        settle_balance=True):
+    """
+    Total investor return for every (exit month, revenue multiple) pair.
+
+    The company is valued at the multiple × annualised gross revenue (12 × the
+    exit month's revenue) and the investor receives the equity stake of it.
+    Revenue-share payments are received up to and including the exit month;
+    with settle_balance, any unpaid balance is repaid at the exit as well.
+
+    Args:
+        payments: 'Payment to Vinmo' per month from the current month (e.g. from
+            calculate_projections; months after payoff may be omitted)
+        gross_revenue: Gross revenue per month from the current month (₹ Lakhs),
+            covering the latest exit month
+        exit_months: Deal month numbers of the exits (>= current_month)
+        revenue_multiples: Valuation multiples of annual revenue
+        equity_stake_pct: Investor's equity stake (%)
+        investment_amount: Total investment (₹ Lakhs)
+        already_paid: Amount repaid before the current month (₹ Lakhs)
+        current_month: Current month number in the deal timeline
+        discount_rate: Annual discount rate for NPV (%)
+        settle_balance: Repay the outstanding revenue-share balance at the exit
+
+    Returns:
+        Dict of arrays of shape (len(exit_months), len(revenue_multiples)):
+        'revenue_share', 'equity_proceeds', 'total_return' (₹ Lakhs), 'moic',
+        'annual_irr' (fraction) and 'npv' (₹ Lakhs); plus 'exit_months' and
+        'revenue_multiples'
+    """
+    exit_months = np.asarray(exit_months, dtype=int)
+    multiples = np.asarray(revenue_multiples, dtype=float)
+    offsets = exit_months - current_month
+    horizon = int(offsets.max()) + 1
+
+    schedule = np.zeros(horizon)
+    received = np.asarray(payments, dtype=float)[:horizon]
+    schedule[:len(received)] = received
+    revenue = np.asarray(gross_revenue, dtype=float)[:horizon]
+
+    # Revenue share stops at the exit: one masked row of flows per exit month
+    received_by_exit = np.where(np.arange(horizon) <= offsets[:, np.newaxis], schedule, 0.0)
+    flows = investor_cash_flows(received_by_exit, investment_amount, already_paid, current_month)
+    exit_columns = current_month + offsets
+    revenue_share = already_paid + received_by_exit.sum(axis=1)
+    if settle_balance:
+        settlement = np.maximum(0.0, investment_amount - revenue_share)
+        flows[np.arange(len(offsets)), exit_columns] += settlement
+        revenue_share = revenue_share + settlement
+
+    equity_proceeds = (equity_stake_pct / 100) * multiples * 12 * revenue[offsets][:, np.newaxis]
+
+    # Broadcast to (exits, multiples, months) and solve every scenario at once
+    grid_flows = np.repeat(flows[:, np.newaxis, :], len(multiples), axis=1)
+    grid_flows[np.arange(len(offsets)), :, exit_columns] += equity_proceeds
+    flat = grid_flows.reshape(-1, grid_flows.shape[-1])
+    monthly_irr = batch_irr(flat, high=5.0).reshape(equity_proceeds.shape)
+    monthly_discount = (1 + discount_rate / 100) ** (1 / 12) - 1
+    total_return = revenue_share[:, np.newaxis] + equity_proceeds
+
+    return {
+        'exit_months': exit_months,
+        'revenue_multiples': multiples,
+        'revenue_share': np.broadcast_to(revenue_share[:, np.newaxis], equity_proceeds.shape),
+        'equity_proceeds': equity_proceeds,
+        'total_return': total_return,
+        'moic': total_return / investment_amount,
+        'annual_irr': (1 + monthly_irr) ** 12 - 1,
+        'npv': batch_npv(monthly_discount, flat).reshape(equity_proceeds.shape)
+    }
+
+
+def exit_grid_frame(grid):
+    """
+    Long-format table of an exit valuation grid, one row per scenario.
+
+    Args:
+        grid: Result of exit_valuation_grid
+
+    Returns:
+        DataFrame with 'Exit Month', 'Revenue Multiple', 'Revenue Share (₹L)',
+        'Equity Proceeds (₹L)', 'Total Return (₹L)', 'MOIC', 'IRR (Annual %)', 'NPV (₹L)'
+    """
+    exit_months, multiples = np.meshgrid(grid['exit_months'], grid['revenue_multiples'], indexing='ij')
+    return pd.DataFrame({
+        'Exit Month': exit_months.ravel(),
+        'Revenue Multiple': multiples.ravel(),
+        'Revenue Share (₹L)': np.round(grid['revenue_share'].ravel(), 2),
+        'Equity Proceeds (₹L)': np.round(grid['equity_proceeds'].ravel(), 2),
+        'Total Return (₹L)': np.round(grid['total_return'].ravel(), 2),
+        'MOIC': np.round(grid['moic'].ravel(), 2),
+        'IRR (Annual %)': np.round(grid['annual_irr'].ravel() * 100, 2),
+        'NPV (₹L)': np.round(grid['npv'].ravel(), 2)
+    })
@@ -0,0 +1,355 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Growth Fitting
+Created: December 2025
+
+Estimates monthly MAU, ARPU and revenue growth from uploaded history with a
+log-linear least-squares fit and a robust (Huber) fit, and puts confidence
+intervals on both with a moving-block bootstrap. The bootstrap is vectorized:
+each resample is a row of observation counts, so thousands of resampled
+fits are a handful of matrix products. The bootstrapped growth rates feed
+straight into batch_projections (months-remaining distribution) and into the
+scenario probabilities.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import DAYS_PER_MONTH, MAX_PROJECTION_MONTHS, batch_projections, combine_growth, schedule_array
+
+# Series fitted when present in the uploaded history
+FIT_SERIES = ('MAU', 'ARPU', 'Revenue')
+FIT_METHODS = {'loglinear': 'Log-linear', 'robust': 'Robust (Huber)'}
+
+FIT_WORKERS = int(os.environ.get('ADNEXUS_FIT_WORKERS', os.cpu_count() or 1))
+BOOTSTRAP_RESAMPLES = 2000
+HUBER_DELTA = 1.345
+HUBER_ITERATIONS = 50
+
+
+def load_history(source):
+    """
+    Historical series per deal from an uploaded table.
+
+    Args:
+        source: CSV path or file-like object, or a DataFrame, with a 'Month'
+            (month number) or 'Date' (daily or monthly dates) column, any of
+            the FIT_SERIES columns and an optional 'Deal' column; other
+            columns (e.g. Payment_to_Vinmo) are ignored
+
+    Returns:
+        Dict of deal name -> DataFrame with 'Months' (months since the first
+        observation) and the fitted series columns, sorted by time
+    """
+    table = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    series = [name for name in FIT_SERIES if name in table.columns]
+    if not series:
+        raise ValueError(f"History needs at least one of the columns: {', '.join(FIT_SERIES)}")
+    if 'Month' in table.columns:
+        time = pd.to_numeric(table['Month'], errors='coerce').astype(float)
+    elif 'Date' in table.columns:
+        dates = pd.to_datetime(table['Date'], errors='coerce')
+        time = (dates - dates.min()).dt.days.astype(float) / DAYS_PER_MONTH
+    else:
+        raise ValueError("History needs a 'Month' or 'Date' column")
+    if time.isna().any():
+        raise ValueError("History has blank or unreadable Month/Date values")
+
+    frame = pd.DataFrame({'Months': time.to_numpy()})
+    for name in series:
+        frame[name] = pd.to_numeric(table[name], errors='coerce').astype(float).to_numpy()
+    frame['Deal'] = table['Deal'].astype(str).to_numpy() if 'Deal' in table.columns else 'Deal 1'
+    frame = frame.sort_values(['Deal', 'Months'], kind='stable')
+    frame['Months'] -= frame.groupby('Deal', sort=False)['Months'].transform('min')
+
+    order = pd.unique(table['Deal'].astype(str)) if 'Deal' in table.columns else ['Deal 1']
+    groups = dict(list(frame.groupby('Deal', sort=False)))
+    return {deal: groups[deal].drop(columns='Deal').reset_index(drop=True) for deal in order}
+
+
+def _solve_weighted(sw, st, stt, sy, sty):
+    """Weighted least-squares slope of log value on time from the weighted sums."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (sw * sty - st * sy) / (sw * stt - st * st)
+
+
+def _weighted_fit(t, log_values, weights):
+    """Intercept and slope per column for (n,) times, (n, k) log values and (n, k) weights."""
+    t = t[:, np.newaxis]
+    sw = weights.sum(axis=0)
+    st = (weights * t).sum(axis=0)
+    sy = (weights * log_values).sum(axis=0)
+    slope = _solve_weighted(sw, st, (weights * t * t).sum(axis=0), sy, (weights * t * log_values).sum(axis=0))
+    return (sy - slope * st) / sw, slope
+
+
+def huber_weights(t, log_values, observed, delta=HUBER_DELTA, iterations=HUBER_ITERATIONS):
+    """
+    Observation weights of a Huber regression of log value on time (IRLS).
+
+    Residuals are scaled by their median absolute deviation; observations
+    beyond delta scaled residuals are down-weighted in proportion.
+
+    Args:
+        t: Times (months) of shape (n,)
+        log_values: Log values of shape (n, k), any value where not observed
+        observed: Boolean mask of shape (n, k)
+        delta: Huber threshold in robust standard deviations
+        iterations: Maximum reweighting iterations
+
+    Returns:
+        Weights of shape (n, k), zero where not observed
+    """
+    base = observed.astype(float)
+    weights = base
+    for _ in range(iterations):
+        intercept, slope = _weighted_fit(t, log_values, weights)
+        residuals = np.abs(log_values - intercept - slope * t[:, np.newaxis])
+        scale = np.array([np.median(residuals[observed[:, column], column])
+                          for column in range(residuals.shape[1])]) / 0.6745
+        with np.errstate(divide='ignore', invalid='ignore'):
+            updated = np.where(residuals * base > delta * scale, delta * scale / residuals, 1.0) * base
+        updated[:, ~(scale > 0)] = base[:, ~(scale > 0)]    # exact fit: nothing to down-weight
+        if np.allclose(updated, weights, atol=1e-8):
+            break
+        weights = updated
+    return weights
+
+
+@lru_cache(maxsize=16)
+def block_bootstrap_counts(observations, resamples=BOOTSTRAP_RESAMPLES, block=None, seed=42):
+    """
+    Moving-block bootstrap as a matrix of observation counts.
+
+    Row b counts how often each observation appears in resample b, so a
+    weighted fit with weights counts[b] is the fit on that resample. Blocks of
+    consecutive observations keep the serial correlation of daily data.
+    Cached per length: deals with the same number of observations share it.
+
+    Args:
+        observations: Number of observations n
+        resamples: Number of bootstrap resamples B
+        block: Block length (default: n ** (1/3), at least 1)
+        seed: Random seed
+
+    Returns:
+        Read-only float array of shape (B, n); every row sums to n
+    """
+    block = block or max(1, int(round(observations ** (1 / 3))))
+    block = min(block, observations)
+    blocks = -(-observations // block)
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, observations - block + 1, size=(resamples, blocks))
+    picks = (starts[:, :, np.newaxis] + np.arange(block)).reshape(resamples, -1)[:, :observations]
+    flat = (picks + (np.arange(resamples) * observations)[:, np.newaxis]).ravel()
+    counts = np.bincount(flat, minlength=resamples * observations).reshape(resamples, observations)
+    counts = counts.astype(float)
+    counts.flags.writeable = False
+    return counts
+
+
+def _growth_pct(slope):
+    """Monthly growth (%) from a log-linear slope per month."""
+    return (np.exp(slope) - 1) * 100
+
+
+def fit_growth(history, resamples=BOOTSTRAP_RESAMPLES, confidence=0.9, block=None, seed=42):
+    """
+    Log-linear and robust growth fits with bootstrap confidence intervals.
+
+    All series share the same resamples, so the joint distribution (e.g. of
+    MAU and ARPU growth) keeps their correlation. The robust bootstrap keeps
+    the full-sample Huber weights fixed on each resample, which makes every
+    resample one weighted least-squares solve.
+
+    Args:
+        history: One deal's DataFrame from load_history
+        resamples: Number of bootstrap resamples
+        confidence: Confidence level of the intervals
+        block: Bootstrap block length in observations (default: n ** (1/3))
+        seed: Random seed
+
+    Returns:
+        Dict with 'observations', 'span_months' and 'series': series name ->
+        method ('loglinear', 'robust') -> dict of 'growth' (% monthly),
+        'low', 'high' and the bootstrap 'samples' array
+    """
+    names = [name for name in FIT_SERIES if name in history.columns]
+    t = history['Months'].to_numpy(dtype=float)
+    values = history[names].to_numpy(dtype=float)
+    observed = np.isfinite(values) & (values > 0)
+    too_short = [name for name, count in zip(names, observed.sum(axis=0)) if count < 3]
+    if too_short:
+        raise ValueError(f"Need at least 3 positive observations to fit {', '.join(too_short)}")
+    if np.ptp(t) <= 0:
+        raise ValueError("History covers a single point in time")
+
+    t = t - t.mean()    # centred for well-conditioned sums; slopes are unchanged
+    log_values = np.where(observed, np.log(np.where(observed, values, 1.0)), 0.0)
+    counts = block_bootstrap_counts(len(t), resamples, block, seed)
+    tail = (1 - confidence) / 2 * 100
+
+    methods = {'loglinear': observed.astype(float), 'robust': huber_weights(t, log_values, observed)}
+    # Every weighted sum of every method and series for all resamples in one matrix product
+    columns = []
+    for weights in methods.values():
+        wt = weights * t[:, np.newaxis]
+        columns += [weights, wt, wt * t[:, np.newaxis], weights * log_values, wt * log_values]
+    sums = np.split(counts @ np.hstack(columns), 5 * len(methods), axis=1)
+
+    fits = {}
+    for index, (method, weights) in enumerate(methods.items()):
+        _, slope = _weighted_fit(t, log_values, weights)
+        samples = _growth_pct(_solve_weighted(*sums[5 * index:5 * index + 5]))
+        percentile = np.percentile if np.isfinite(samples).all() else np.nanpercentile
+        low, high = percentile(samples, [tail, 100 - tail], axis=0)
+        fits[method] = {'growth': _growth_pct(slope), 'low': low, 'high': high, 'samples': samples}
+
+    return {
+        'observations': len(t),
+        'span_months': float(np.ptp(t)),
+        'series': {name: {method: {key: (value[:, column] if key == 'samples' else float(value[column]))
+                                   for key, value in fit.items()}
+                          for method, fit in fits.items()}
+                   for column, name in enumerate(names)},
+    }
+
+
+def fit_portfolio(histories, workers=None, **options):
+    """
+    Fit every deal's history, optionally across a process pool.
+
+    Args:
+        histories: Dict of deal name -> DataFrame (from load_history)
+        workers: Number of worker processes (None or 1 = fit in-process)
+        **options: fit_growth keyword arguments
+
+    Returns:
+        Dict of deal name -> fit_growth result
+    """
+    fit = partial(fit_growth, **options)
+    if not workers or workers <= 1 or len(histories) == 1:
+        return {deal: fit(history) for deal, history in histories.items()}
+    # Spawned, not forked: the dashboard fits uploads from a thread of the multi-threaded app server
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        chunk = max(1, len(histories) // (workers * 4))
+        return dict(zip(histories, pool.map(fit, histories.values(), chunksize=chunk)))
+
+
+def growth_table(fits, confidence=0.9):
+    """
+    One row per deal and series with both fits and their confidence intervals.
+
+    Args:
+        fits: Dict of deal name -> fit_growth result
+        confidence: Confidence level the fits were run with (column labels)
+
+    Returns:
+        DataFrame
+    """
+    level = f"{confidence * 100:g}%"
+    rows = []
+    for deal, fit in fits.items():
+        for name, methods in fit['series'].items():
+            row = {'Deal': deal, 'Series': name, 'Observations': fit['observations'],
+                   'Span (Months)': round(fit['span_months'], 1)}
+            for method, label in FIT_METHODS.items():
+                estimate = methods[method]
+                row[f'{label} Growth %'] = round(estimate['growth'], 2)
+                row[f'{label} {level} CI'] = f"{estimate['low']:.2f} – {estimate['high']:.2f}"
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def fitted_growth(fit, method='robust'):
+    """
+    Point estimates and bootstrap samples that drive the projections.
+
+    Revenue growth combines the MAU and ARPU fits resample by resample (as the
+    sidebar does); a history with only a Revenue column uses its own fit.
+
+    Args:
+        fit: fit_growth result
+        method: 'loglinear' or 'robust'
+
+    Returns:
+        Dict with 'user_growth', 'arpu_growth' (None when not fitted),
+        'revenue_growth' point estimates (% monthly) and 'revenue_samples'
+    """
+    series = fit['series']
+    if 'MAU' in series and 'ARPU' in series:
+        user, arpu = series['MAU'][method], series['ARPU'][method]
+        return {
+            'user_growth': user['growth'],
+            'arpu_growth': arpu['growth'],
+            'revenue_growth': float(combine_growth(user['growth'], arpu['growth'])),
+            'revenue_samples': combine_growth(user['samples'], arpu['samples']),
+        }
+    if 'Revenue' in series:
+        revenue = series['Revenue'][method]
+        return {'user_growth': None, 'arpu_growth': None,
+                'revenue_growth': revenue['growth'], 'revenue_samples': revenue['samples']}
+    raise ValueError("Fitting revenue growth needs MAU and ARPU, or Revenue")
+
+
+def repayment_distribution(revenue_samples, current_revenue, redemption_rate=50, revenue_share_pct=5,
+                           investment_amount=75.0, already_paid=0.0, months=MAX_PROJECTION_MONTHS,
+                           target_months=36):
+    """
+    Months remaining until payoff across the bootstrapped revenue growth rates.
+
+    Args:
+        revenue_samples: Bootstrapped monthly revenue growth rates (%)
+        current_revenue: Current monthly revenue (₹ Lakhs)
+        redemption_rate: Redemption rate (%) or schedule
+        revenue_share_pct: Revenue share to the investor (%)
+        investment_amount: Total investment (₹ Lakhs)
+        already_paid: Amount already repaid (₹ Lakhs)
+        months: Projection horizon
+        target_months: Months within which repayment is counted as on target
+
+    Returns:
+        Dict with the per-sample 'months_remaining' and 'complete' arrays,
+        'p10', 'p50', 'p90' months and 'on_target' probability (0-1)
+    """
+    samples = np.asarray(revenue_samples, dtype=float)
+    samples = samples[np.isfinite(samples)]
+    # One redemption schedule row shared by every resample
+    outcome = batch_projections(current_revenue, samples,
+                                redemption_rate=schedule_array(redemption_rate, months + 1)[np.newaxis, :],
+                                revenue_share_pct=revenue_share_pct, months=months,
+                                investment_amount=investment_amount, already_paid=already_paid)
+    remaining = outcome['months_remaining']
+    p10, p50, p90 = np.percentile(remaining, [10, 50, 90])
+    return {
+        'months_remaining': remaining,
+        'complete': outcome['complete'],
+        'p10': float(p10),
+        'p50': float(p50),
+        'p90': float(p90),
+        'on_target': float(np.mean(outcome['complete'] & (remaining <= target_months))),
+    }
+
+
+def scenario_probabilities(revenue_samples, scenario_rates):
+    """
+    Scenario probabilities as the share of bootstrapped growth rates nearest each scenario.
+
+    Args:
+        revenue_samples: Bootstrapped monthly revenue growth rates (%)
+        scenario_rates: Dict of scenario name -> monthly revenue growth rate (%)
+
+    Returns:
+        Dict of scenario name -> probability (%), summing to 100
+    """
+    samples = np.asarray(revenue_samples, dtype=float)
+    samples = samples[np.isfinite(samples)]
+    rates = np.array(list(scenario_rates.values()), dtype=float)
+    nearest = np.abs(samples[:, np.newaxis] - rates).argmin(axis=1)
+    shares = np.bincount(nearest, minlength=len(rates)) / len(samples) * 100
+    return dict(zip(scenario_rates, shares.tolist()))
@@ -0,0 +1,299 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Derived Value Graph
+Created: December 2025
+
+Small dataflow layer for the dashboard's derived quantities. Each derived
+value is a function whose parameter names declare its inputs (model inputs
+or other derived values); it is keyed by the hashes of those inputs only, so
+it is recomputed when one of them changes and reused otherwise. Changing
+`already_paid`, for example, rebuilds the repayment ledger but keeps the
+revenue path.
+
+Values are evaluated lazily: a tab that never asks for the sensitivity grid
+never computes it.
+"""
+
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import (
+    effective_payment_rate as payment_rate_of,
+    calculate_projections,
+    growth_path,
+    projection_frame,
+    projection_rollups,
+    repayment_ledger,
+    schedule_array,
+)
+from adnexus_lookup import lookup_payoff
+from adnexus_memory import memory_key
+from adnexus_returns import investor_cash_flows, investor_returns
+
+
+class LatestValues:
+    """
+    Default node cache: the most recent value of each derived quantity.
+
+    Called as cache(name, key, compute) like the app's per-session remember().
+    """
+
+    def __init__(self):
+        self._values = {}    # name -> (key, value)
+
+    def __call__(self, name, key, compute):
+        stored = self._values.get(name)
+        if stored is not None and stored[0] == key:
+            return stored[1]
+        value = compute()
+        self._values[name] = (key, value)
+        return value
+
+
+class DerivedGraph:
+    """
+    Registry of derived quantities and the inputs each one depends on.
+    """
+
+    def __init__(self):
+        self._nodes = {}    # name -> (input names, compute)
+
+    def derive(self, compute):
+        """
+        Register a derived quantity (decorator); its parameter names are its inputs.
+
+        Args:
+            compute: Function named after the quantity
+
+        Returns:
+            The function, unchanged
+        """
+        self._nodes[compute.__name__] = (tuple(inspect.signature(compute).parameters), compute)
+        return compute
+
+    @property
+    def names(self):
+        """Names of the registered derived quantities."""
+        return list(self._nodes)
+
+    def inputs_of(self, name):
+        """Declared inputs of a derived quantity."""
+        return self._nodes[name][0]
+
+    def evaluate(self, inputs, cache=None, resources=None):
+        """
+        Lazy view of every derived quantity for one set of model inputs.
+
+        Args:
+            inputs: Dict of model input values (hashed to key the derived values)
+            cache: Callable cache(name, key, compute) (default: a new LatestValues;
+                pass the same cache on every rerun to reuse unchanged values)
+            resources: Dict of process-wide constants (e.g. the payoff lookup
+                table) passed to nodes without being hashed
+
+        Returns:
+            Evaluation; index it by name to get a value
+        """
+        return Evaluation(self, inputs, LatestValues() if cache is None else cache, resources or {})
+
+
+class Evaluation:
+    """
+    Derived values for one set of inputs, computed on first access.
+    """
+
+    def __init__(self, graph, inputs, cache, resources):
+        self._graph = graph
+        self._inputs = inputs
+        self._cache = cache
+        self._resources = resources
+        self._keys = {}
+        self._values = {}
+        self.computed = []    # derived quantities recomputed in this evaluation (dependencies first)
+        self.reused = []      # derived quantities served from the cache
+
+    def key(self, name):
+        """
+        Hash of everything a quantity depends on.
+
+        Args:
+            name: Model input, resource or derived quantity
+
+        Returns:
+            Hex digest string
+        """
+        if name not in self._keys:
+            if name in self._graph._nodes:
+                self._keys[name] = memory_key(name, [self.key(dependency)
+                                                     for dependency in self._graph.inputs_of(name)])
+            elif name in self._resources:
+                self._keys[name] = memory_key('resource', name)
+            elif name in self._inputs:
+                self._keys[name] = memory_key(self._inputs[name])
+            else:
+                raise KeyError(f"No input or derived value named '{name}'")
+        return self._keys[name]
+
+    def __getitem__(self, name):
+        if name in self._values:
+            return self._values[name]
+        if name not in self._graph._nodes:
+            if name in self._resources:
+                return self._resources[name]
+            if name in self._inputs:
+                return self._inputs[name]
+            raise KeyError(f"No input or derived value named '{name}'")
+
+        dependencies, compute = self._graph._nodes[name]
+        recomputed = []
+
+        def run():
+            recomputed.append(name)
+            return compute(**{dependency: self[dependency] for dependency in dependencies})
+
+        value = self._cache(name, self.key(name), run)
+        (self.computed if recomputed else self.reused).append(name)
+        self._values[name] = value
+        return value
+
+
+# Derived quantities of the dashboard (model inputs are named as in the app's sidebar/assumptions)
+DASHBOARD = DerivedGraph()
+
+# Fixed growth rates charted and tabled next to the selected growth curve
+SCENARIO_GROWTH_RATES = {'Pessimistic': 5.0, 'Optimistic': 10.0, 'Best Case': 12.0}
+SCENARIO_PROBABILITIES = {'Pessimistic': 20, 'Base Case': 50, 'Optimistic': 25, 'Best Case': 5}
+
+
+@DASHBOARD.derive
+def revenue_path(current_revenue, revenue_growth_schedule, months):
+    """Gross revenue for the current month and each projected month (₹ Lakhs)."""
+    return current_revenue * growth_path(revenue_growth_schedule, months)
+
+
+@DASHBOARD.derive
+def redemption_path(revenue_path, redemption_schedule):
+    """Redemptions per month (₹ Lakhs)."""
+    return revenue_path * (schedule_array(redemption_schedule, len(revenue_path)) / 100)
+
+
+@DASHBOARD.derive
+def payment_path(revenue_path, redemption_path, revenue_share):
+    """Uncapped revenue-share payment per month (₹ Lakhs)."""
+    return (revenue_path - redemption_path) * (revenue_share / 100)
+
+
+@DASHBOARD.derive
+def ledger(payment_path, investment_amount, already_paid):
+    """Integer-paise repayment ledger: capped payments, cumulative paid and balance."""
+    return repayment_ledger(payment_path, investment_amount, already_paid)
+
+
+@DASHBOARD.derive
+def projections(revenue_path, redemption_path, ledger, current_month):
+    """Projection table, identical to calculate_projections for the same inputs."""
+    return projection_frame(revenue_path, redemption_path, ledger, current_month, backend='arrow')
+
+
+@DASHBOARD.derive
+def effective_payment_rate(redemption_rate, revenue_share):
+    """Fraction of this month's gross revenue paid to the investor."""
+    return float(payment_rate_of(redemption_rate, revenue_share))
+
+
+@DASHBOARD.derive
+def current_payment(current_revenue, effective_payment_rate):
+    """This month's payment to the investor (₹ Lakhs)."""
+    return current_revenue * effective_payment_rate
+
+
+@DASHBOARD.derive
+def rollups(projections, start_date):
+    """
+    Quarter, half-year and fiscal-year rollups of the projections (segment sums, see projection_rollups).
+
+    start_date places the current month on the calendar (April–March fiscal
+    periods); None counts quarters from timeline month 1.
+    """
+    return projection_rollups(projections, start_date)
+
+
+@DASHBOARD.derive
+def cashflow(projections, rollups):
+    """Projection table with the Quarter each month falls in."""
+    quarters = rollups['Quarter']
+    return projections.assign(Quarter=np.repeat(quarters['Quarter'].to_numpy(), quarters['Months'].to_numpy()))
+
+
+@DASHBOARD.derive
+def fixed_rate_projections(current_revenue, redemption_schedule, revenue_share, months, current_month,
+                           investment_amount, already_paid):
+    """Projections at each of the SCENARIO_GROWTH_RATES (independent of the selected growth curve)."""
+    return {name: calculate_projections(current_revenue, rate, redemption_rate=redemption_schedule,
+                                        revenue_share_pct=revenue_share, months=months,
+                                        current_month=current_month, investment_amount=investment_amount,
+                                        already_paid=already_paid)
+            for name, rate in SCENARIO_GROWTH_RATES.items()}
+
+
+@DASHBOARD.derive
+def base_returns(projections, investment_amount, already_paid, current_month, discount_rate):
+    """Investor returns (IRR, XIRR, NPV, MOIC) of the projected payment stream."""
+    returns = investor_returns(
+        investor_cash_flows([projections['Payment to Vinmo (₹L)'].to_numpy()], investment_amount,
+                            already_paid, current_month),
+        discount_rate=discount_rate, current_month=current_month
+    )
+    return {metric: values[0] for metric, values in returns.items()}
+
+
+@DASHBOARD.derive
+def scenario_table(fixed_rate_projections, projections, revenue_growth_rate, scenario_probabilities,
+                   investment_amount, already_paid, current_month, discount_rate):
+    """
+    Probability-weighted scenario table; the Base Case follows the selected growth curve.
+
+    scenario_probabilities maps each scenario to its probability (%), e.g.
+    SCENARIO_PROBABILITIES or the shares of a bootstrapped growth fit.
+
+    Returns:
+        Dict with the 'table' DataFrame and per-scenario 'months_remaining' and 'incomplete' lists
+    """
+    frames = {**fixed_rate_projections, 'Base Case': projections}
+    names = list(scenario_probabilities)
+    months_remaining = [len(frames[name]) - 1 for name in names]
+    incomplete = [not frames[name].attrs['complete'] for name in names]
+    scenario_returns = investor_returns(
+        investor_cash_flows([frames[name]['Payment to Vinmo (₹L)'].to_numpy() for name in names],
+                            investment_amount, already_paid, current_month),
+        discount_rate=discount_rate, current_month=current_month
+    )
+    table = pd.DataFrame({
+        'Scenario': names,
+        'Growth Rate': [SCENARIO_GROWTH_RATES.get(name, revenue_growth_rate) for name in names],
+        'Probability': [scenario_probabilities[name] for name in names],
+        'Months Remaining': [f'>{months}' if short else months for months, short in zip(months_remaining, incomplete)],
+        'IRR (Annual %)': np.round(scenario_returns['annual_irr'] * 100, 2),
+        f'NPV @ {discount_rate:g}% (₹L)': np.round(scenario_returns['npv'], 2),
+        'MOIC': np.round(scenario_returns['moic'], 2),
+    })
+    return {'table': table, 'months_remaining': months_remaining, 'incomplete': incomplete}
+
+
+# Growth × redemption grid of the Risk Analysis sensitivity heatmap
+SENSITIVITY_GROWTH_RATES = [3, 5, 7, 9, 11]
+SENSITIVITY_REDEMPTION_RATES = [30, 40, 50, 60, 70]
+
+
+@DASHBOARD.derive
+def sensitivity_grid(payoff_table, current_revenue, investment_amount, already_paid, revenue_share):
+    """Payoff lookups over the growth × redemption grid (rows: redemption, columns: growth)."""
+    return lookup_payoff(payoff_table,
+                         np.array(SENSITIVITY_GROWTH_RATES)[np.newaxis, :],
+                         np.array(SENSITIVITY_REDEMPTION_RATES)[:, np.newaxis],
+                         current_revenue,
+                         investment_amount=investment_amount,
+                         already_paid=already_paid,
+                         revenue_share_pct=revenue_share)
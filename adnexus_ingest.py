@@ -0,0 +1,284 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Transaction Ingestion
+Created: December 2025
+
+Streams raw revenue and redemption transaction logs (CSV or Parquet) into
+monthly actuals per deal: gross revenue, redemptions and the observed
+redemption rate. Files are read in fixed-size blocks (CSV) or memory-mapped
+record batches (Parquet) and every batch is reduced to per-month integer-paise
+sums before the next one is read, so memory stays bounded by the block size
+however large the log is. The aggregates are persisted with a fingerprint of
+the source file, and re-ingesting an unchanged file is skipped.
+
+Transaction columns: Date (date or timestamp), Amount (₹), Type ('revenue' or
+'redemption') and optionally Deal.
+
+Command line:
+    python adnexus_ingest.py transactions.csv [actuals.parquet]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from adnexus_schema import from_paise
+
+ACTUALS_PATH = os.environ.get('ADNEXUS_ACTUALS_PATH', 'actuals.parquet')
+INGEST_BLOCK_BYTES = int(float(os.environ.get('ADNEXUS_INGEST_BLOCK_MB', 4)) * 2 ** 20)
+PARQUET_BATCH_ROWS = 1_000_000
+
+TRANSACTION_TYPES = ('revenue', 'redemption')
+PAISE_PER_RUPEE = 100
+
+# Persisted aggregate columns (money in integer paise)
+AGGREGATE_COLUMNS = ['deal', 'month', 'gross_paise', 'redemption_paise', 'transactions', 'last_day']
+AGGREGATIONS = {'gross_paise': 'sum', 'redemption_paise': 'sum', 'transactions': 'sum', 'last_day': 'max'}
+
+
+def _fingerprint(path):
+    """Size and modification time of a source file (changes when it is rewritten or appended to)."""
+    stat = os.stat(path)
+    return {'source': os.path.abspath(path), 'size': str(stat.st_size), 'mtime_ns': str(stat.st_mtime_ns)}
+
+
+def iter_transaction_batches(path, block_bytes=INGEST_BLOCK_BYTES):
+    """
+    Stream a transaction file as Arrow record batches.
+
+    Args:
+        path: CSV or Parquet (.parquet / .pq) file
+        block_bytes: CSV block size (Parquet is read in PARQUET_BATCH_ROWS batches)
+
+    Yields:
+        pyarrow.RecordBatch with Date, Amount, Type and Deal (null when absent) columns
+    """
+    import pyarrow as pa
+
+    if path.lower().endswith(('.parquet', '.pq')):
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(path, memory_map=True)
+        names = source.schema_arrow.names
+        missing = {'Date', 'Amount', 'Type'} - set(names)
+        if missing:
+            raise ValueError(f"Transaction file is missing columns: {', '.join(sorted(missing))}")
+        columns = [name for name in ('Date', 'Amount', 'Type', 'Deal') if name in names]
+        for batch in source.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=columns):
+            if 'Deal' not in columns:
+                batch = batch.append_column('Deal', pa.nulls(batch.num_rows, pa.string()))
+            yield batch
+        return
+
+    import pyarrow.csv as pacsv
+
+    with open(path, newline='') as file:
+        header = next(iter(file), '').strip().split(',')
+    missing = {'Date', 'Amount', 'Type'} - set(header)
+    if missing:
+        raise ValueError(f"Transaction file is missing columns: {', '.join(sorted(missing))}")
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=block_bytes),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=['Date', 'Amount', 'Type', 'Deal'],
+            include_missing_columns=True,
+            column_types={'Date': pa.timestamp('s'), 'Amount': pa.float64(), 'Type': pa.string(),
+                          'Deal': pa.string()},
+        ),
+    )
+    for batch in reader:
+        yield batch
+
+
+def aggregate_batch(batch):
+    """
+    Per deal and month sums of one record batch.
+
+    Args:
+        batch: pyarrow.RecordBatch from iter_transaction_batches
+
+    Returns:
+        DataFrame indexed by (deal, month) with AGGREGATE_COLUMNS values
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    kinds = pc.utf8_lower(pc.utf8_trim_whitespace(batch.column('Type').cast(pa.string())))
+    known = pc.is_in(kinds, value_set=pa.array(TRANSACTION_TYPES))
+    if not pc.all(pc.fill_null(known, False)).as_py():
+        unknown = pc.unique(pc.filter(kinds, pc.invert(pc.fill_null(known, False)))).to_pylist()[:5]
+        raise ValueError(f"Unknown transaction types: {unknown} (expected {', '.join(TRANSACTION_TYPES)})")
+
+    days = batch.column('Date').cast(pa.timestamp('s')).to_numpy(zero_copy_only=False).astype('datetime64[D]')
+    if np.isnat(days).any():
+        raise ValueError("Transaction file has blank or unreadable dates")
+    months = days.astype('datetime64[M]')
+    paise = np.rint(batch.column('Amount').to_numpy(zero_copy_only=False) * PAISE_PER_RUPEE)
+    if np.isnan(paise).any():
+        raise ValueError("Transaction file has blank or unreadable amounts")
+    paise = paise.astype(np.int64)
+    redemption = pc.equal(kinds, 'redemption').to_numpy(zero_copy_only=False)
+
+    # Deal names as dictionary codes: no Python string per transaction
+    deals = pc.dictionary_encode(pc.fill_null(batch.column('Deal').cast(pa.string()), 'Deal 1'))
+    frame = pd.DataFrame({
+        'deal': pd.Categorical.from_codes(deals.indices.to_numpy(zero_copy_only=False),
+                                          deals.dictionary.to_pylist()),
+        'month': months,
+        'gross_paise': np.where(redemption, 0, paise),
+        'redemption_paise': np.where(redemption, paise, 0),
+        'transactions': np.ones(len(paise), dtype=np.int64),
+        'last_day': (days - months).astype(np.int64) + 1,
+    })
+    sums = frame.groupby(['deal', 'month'], sort=False, observed=True).agg(AGGREGATIONS)
+    return sums.set_axis(sums.index.set_levels(sums.index.levels[0].astype(str), level=0))
+
+
+def aggregate_transactions(path, block_bytes=INGEST_BLOCK_BYTES):
+    """
+    Monthly actuals of a transaction file, read batch by batch.
+
+    Args:
+        path: CSV or Parquet transaction file
+        block_bytes: CSV block size
+
+    Returns:
+        DataFrame with AGGREGATE_COLUMNS, one row per deal and month
+    """
+    totals = None
+    for batch in iter_transaction_batches(path, block_bytes):
+        if batch.num_rows == 0:
+            continue
+        sums = aggregate_batch(batch)
+        if totals is None:
+            totals = sums
+        else:
+            # Fold into the running totals (a few rows per deal-month, not per transaction)
+            combined = pd.concat([totals, sums])
+            totals = combined.groupby(level=[0, 1], sort=False).agg(AGGREGATIONS)
+    if totals is None:
+        raise ValueError("Transaction file has no rows")
+    return totals.sort_index().reset_index()[AGGREGATE_COLUMNS]
+
+
+def ingest(path, store=ACTUALS_PATH, block_bytes=INGEST_BLOCK_BYTES):
+    """
+    Aggregate a transaction file and persist the result, skipping unchanged files.
+
+    Args:
+        path: CSV or Parquet transaction file
+        store: Parquet file for the aggregates
+        block_bytes: CSV block size
+
+    Returns:
+        Tuple of (aggregates DataFrame, reused): reused is True when the store
+        already held the aggregates of this exact file
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fingerprint = _fingerprint(path)
+    if os.path.exists(store):
+        stored = pq.read_schema(store).metadata or {}
+        metadata = {key.decode(): value.decode() for key, value in stored.items()}
+        if all(metadata.get(key) == value for key, value in fingerprint.items()):
+            return load_actuals(store), True
+
+    table = pa.Table.from_pandas(aggregate_transactions(path, block_bytes), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **fingerprint})
+    pq.write_table(table, store)
+    return load_actuals(store), False
+
+
+def load_actuals(store=ACTUALS_PATH):
+    """
+    Persisted aggregates, or None when nothing has been ingested.
+
+    Args:
+        store: Parquet file written by ingest
+
+    Returns:
+        DataFrame with AGGREGATE_COLUMNS or None
+    """
+    if not os.path.exists(store):
+        return None
+    return pd.read_parquet(store)[AGGREGATE_COLUMNS]
+
+
+def monthly_actuals(aggregates, deal=None):
+    """
+    Display table of one deal's monthly actuals.
+
+    The latest month is marked incomplete unless a transaction falls on its
+    last day (the log may end mid-month).
+
+    Args:
+        aggregates: DataFrame from aggregate_transactions / load_actuals
+        deal: Deal name (default: the first deal)
+
+    Returns:
+        DataFrame with Month, Gross Revenue (₹L), Redemptions (₹L),
+        Redemption Rate (%), Transactions and Complete columns
+    """
+    deal = aggregates['deal'].iloc[0] if deal is None else deal
+    rows = aggregates[aggregates['deal'] == deal].sort_values('month')
+    months = pd.to_datetime(rows['month']).dt.to_period('M')
+    gross = rows['gross_paise'].to_numpy()
+    redemptions = rows['redemption_paise'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(gross > 0, redemptions / gross * 100, np.nan)
+    complete = np.ones(len(rows), dtype=bool)
+    if len(rows):
+        complete[-1] = rows['last_day'].iloc[-1] >= months.iloc[-1].days_in_month
+    return pd.DataFrame({
+        'Month': months.astype(str).to_numpy(),
+        'Gross Revenue (₹L)': from_paise(gross),
+        'Redemptions (₹L)': from_paise(redemptions),
+        'Redemption Rate (%)': rate,
+        'Transactions': rows['transactions'].to_numpy(),
+        'Complete': complete,
+    })
+
+
+def actuals_summary(actuals, trailing_months=3):
+    """
+    Starting values for the dashboard from a deal's monthly actuals.
+
+    Args:
+        actuals: DataFrame from monthly_actuals
+        trailing_months: Complete months averaged for the redemption rate
+
+    Returns:
+        Dict with 'current_month' (number of complete months), 'latest_month'
+        label, 'current_revenue' (₹ Lakhs, latest complete month) and
+        'redemption_rate' (%, revenue-weighted over the trailing months), or
+        None when there is no complete month
+    """
+    complete = actuals[actuals['Complete']]
+    if complete.empty:
+        return None
+    recent = complete.tail(trailing_months)
+    gross = recent['Gross Revenue (₹L)'].sum()
+    return {
+        'current_month': len(complete),
+        'latest_month': complete['Month'].iloc[-1],
+        'current_revenue': float(complete['Gross Revenue (₹L)'].iloc[-1]),
+        'redemption_rate': float(recent['Redemptions (₹L)'].sum() / gross * 100) if gross > 0 else None,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregate a raw transaction log into monthly actuals.')
+    parser.add_argument('transactions', help='CSV or Parquet with Date, Amount, Type and optional Deal columns')
+    parser.add_argument('store', nargs='?', default=ACTUALS_PATH, help='Parquet file for the aggregates')
+    parser.add_argument('--block-mb', type=float, default=INGEST_BLOCK_BYTES / 2 ** 20,
+                        help='CSV block size in MB (bounds memory use)')
+    options = parser.parse_args()
+
+    aggregates, reused = ingest(options.transactions, options.store, int(options.block_mb * 2 ** 20))
+    print(f"{'Unchanged, kept' if reused else 'Wrote'} {len(aggregates)} deal-months "
+          f"({aggregates['transactions'].sum():,} transactions, {aggregates['deal'].nunique()} deals) "
+          f"in {options.store}")
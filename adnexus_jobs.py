@@ -0,0 +1,214 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Background Jobs
+Created: December 2025
+
+Runs heavy analyses (sensitivity grids, simulations, portfolio exports) on a
+worker pool so a script rerun never waits for them. Jobs report progress and
+partial results as they go, and each owner (a session's analysis slot) has at
+most one live job: submitting new inputs cancels the stale one at its next
+progress report. Finished jobs, failures included, are kept by input key, so
+a rerun with unchanged inputs never resubmits a computation that failed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.environ.get('ADNEXUS_JOB_WORKERS', 4))
+
+# Finished (done or failed) jobs kept by input key, shared by every owner
+JOB_RESULTS = 32
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been superseded or cancelled."""
+
+
+class Job:
+    """
+    Handle of one background computation.
+
+    The task receives the job as its first argument and calls report() to
+    publish progress and partial results; report() raises JobCancelled once
+    the job is cancelled, which ends the task at its next checkpoint.
+    """
+
+    def __init__(self, key, owner=None):
+        """
+        Args:
+            key: Input key identifying the computation
+            owner: Slot the job was submitted for
+        """
+        self.key = key
+        self.owner = owner
+        self.status = 'queued'     # queued, running, done, cancelled, failed
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        """True once the job is done, cancelled or failed."""
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        """True once cancellation has been requested."""
+        return self._cancel.is_set()
+
+    def report(self, progress, partial=None):
+        """
+        Publish progress (0-1) and an optional partial result from inside the task.
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+        self.progress = float(progress)
+        if partial is not None:
+            self.partial = partial
+
+    def cancel(self):
+        """Request cancellation; a queued job never starts."""
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        """
+        Block until the job finishes.
+
+        Args:
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            True if the job finished within the timeout
+        """
+        return self._finished.wait(timeout)
+
+    def _finish(self, status, result=None, error=None):
+        self.status, self.result, self.error = status, result, error
+        if status == 'done':
+            self.progress = 1.0
+        self._finished.set()
+
+
+class JobRunner:
+    """
+    Worker pool with one live job per owner and a shared cache of finished jobs.
+
+    Done and failed jobs are both cached by key: the same inputs return the
+    same outcome, and only new inputs start a new computation.
+
+    Only unfinished jobs are tracked per owner, so owners that go away (closed
+    sessions) leave nothing behind once their last job ends.
+
+    Thread-safe: one instance serves every session of a server process.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, max_results=JOB_RESULTS):
+        """
+        Args:
+            workers: Pool threads (NumPy kernels release the GIL, so batches run concurrently)
+            max_results: Finished jobs kept by key (least recently used dropped first)
+        """
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='adnexus-job')
+        self._lock = threading.Lock()
+        self._live = {}                  # owner -> Job
+        self._results = OrderedDict()    # key -> finished Job
+        self.max_results = max_results
+        self.counters = {'submitted': 0, 'reused': 0, 'completed': 0, 'cancelled': 0, 'failed': 0}
+
+    def submit(self, owner, key, task, *args, **kwargs):
+        """
+        Start task(job, *args, **kwargs) for an owner unless it is already running or cached
+        (a cached job may have failed: its error is returned again until the key changes).
+
+        A different key cancels the owner's previous job.
+
+        Args:
+            owner: Slot identifier, e.g. session ID plus analysis name
+            key: Input key of the computation (hashable)
+            task: Callable taking the Job first; its return value becomes job.result
+            *args, **kwargs: Passed to the task
+
+        Returns:
+            Job for the key (possibly already finished)
+        """
+        with self._lock:
+            current = self._live.get(owner)
+            if current is not None and current.key == key and not current.cancelled:
+                return current
+            if current is not None:
+                current.cancel()
+                del self._live[owner]
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.counters['reused'] += 1
+                return self._results[key]
+            job = Job(key, owner)
+            self.counters['submitted'] += 1
+            self._live[owner] = job
+            self._pool.submit(self._run, job, task, args, kwargs)
+            return job
+
+    def job(self, owner):
+        """Unfinished job of an owner (or None)."""
+        with self._lock:
+            return self._live.get(owner)
+
+    def cancel(self, owner):
+        """
+        Cancel and forget an owner's job.
+
+        Returns:
+            True if a job was cancelled
+        """
+        with self._lock:
+            job = self._live.pop(owner, None)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def _run(self, job, task, args, kwargs):
+        """Pool entry point: run the task unless cancelled while queued."""
+        if job.cancelled:
+            self._record(job, 'cancelled')
+            return
+        job.status = 'running'
+        try:
+            result = task(job, *args, **kwargs)
+        except JobCancelled:
+            self._record(job, 'cancelled')
+        except Exception as error:
+            self._record(job, 'failed', error=error)
+        else:
+            self._record(job, 'done', result=result)
+
+    def _record(self, job, status, result=None, error=None):
+        job._finish(status, result, error)
+        with self._lock:
+            self.counters['completed' if status == 'done' else status] += 1
+            if self._live.get(job.owner) is job:
+                del self._live[job.owner]
+            if status in ('done', 'failed'):
+                self._results[job.key] = job
+                self._results.move_to_end(job.key)
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+
+    def stats(self):
+        """
+        Job counts for instrumentation.
+
+        Returns:
+            Dict with 'running' (unfinished jobs), 'cached' (finished jobs kept) and the
+            submitted/reused/completed/cancelled/failed counters
+        """
+        with self._lock:
+            return {'running': len(self._live), 'cached': len(self._results), **self.counters}
@@ -0,0 +1,215 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Live Revenue Feed
+Created: December 2025
+
+Tails an append-only NDJSON or CSV event file of revenue and redemption
+transactions and keeps per-deal monthly aggregates up to date. Each poll
+reads only the bytes appended since the previous one (the file offset is
+kept), and each event updates its month's integer-paise totals in O(1), so
+a tick costs time proportional to the new events, not to the file or to the
+projection horizon.
+
+Events use the transaction columns of adnexus_ingest.py: Date, Amount (₹),
+Type ('revenue' or 'redemption') and optionally Deal. NDJSON lines are
+objects with those keys; CSV files start with a header line.
+"""
+
+import csv
+import json
+import math
+import os
+import threading
+import time
+
+import pandas as pd
+
+from adnexus_ingest import PAISE_PER_RUPEE, TRANSACTION_TYPES
+from adnexus_schema import from_paise
+
+LIVE_FEED_PATH = os.environ.get('ADNEXUS_LIVE_FEED')
+LIVE_REFRESH_SECONDS = float(os.environ.get('ADNEXUS_LIVE_REFRESH_SECONDS', 2))
+
+# Most bytes read per poll: a large backlog is caught up over several ticks
+LIVE_MAX_READ_BYTES = 8 * 2 ** 20
+
+
+class LiveFeed:
+    """
+    Incremental monthly aggregates of an append-only event file.
+
+    Thread-safe: one instance per file is shared by every session.
+    """
+
+    def __init__(self, path, max_read_bytes=LIVE_MAX_READ_BYTES, clock=time.time):
+        """
+        Args:
+            path: NDJSON (.ndjson / .jsonl) or CSV event file
+            max_read_bytes: Most bytes read per poll
+            clock: Wall clock in seconds (injectable for tests)
+        """
+        self.path = path
+        self.max_read_bytes = max_read_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._csv = not path.lower().endswith(('.ndjson', '.jsonl', '.json'))
+        self.version = 0     # bumped whenever the aggregates change; never reused, even across resets
+        self._reset()
+
+    def _reset(self):
+        """Forget everything read so far (new file or truncated/rotated file)."""
+        self._offset = 0
+        self._inode = None
+        self._pending = b''
+        self._header = None
+        self._months = {}    # (deal, 'YYYY-MM') -> [gross paise, redemption paise, events]
+        self._latest = {}    # deal -> latest 'YYYY-MM' with events
+        self.events = 0
+        self.rejected = 0
+        self.last_event = None
+        self.last_poll = None
+
+    def _parse(self, line):
+        """Event dict from one line, or None for a CSV header."""
+        if not self._csv:
+            return json.loads(line)
+        values = next(csv.reader([line]))
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return None
+        return dict(zip(self._header, values))
+
+    def apply(self, event):
+        """
+        Fold one event into its month's totals (O(1)).
+
+        Args:
+            event: Dict with Date, Amount, Type and optional Deal
+
+        Returns:
+            (deal, month) key that changed
+        """
+        date = str(event['Date']).strip()
+        month = date[:7]
+        if len(month) != 7 or month[4] != '-' or not month.replace('-', '').isdigit():
+            raise ValueError(f"Unreadable date: {date!r}")
+        kind = str(event['Type']).strip().lower()
+        if kind not in TRANSACTION_TYPES:
+            raise ValueError(f"Unknown transaction type: {kind!r}")
+        amount = float(event['Amount'])
+        if not math.isfinite(amount):
+            raise ValueError(f"Non-finite amount: {event['Amount']!r}")
+        paise = int(round(amount * PAISE_PER_RUPEE))
+        deal = str(event.get('Deal') or 'Deal 1')
+
+        key = (deal, month)
+        totals = self._months.get(key)
+        if totals is None:
+            totals = self._months[key] = [0, 0, 0]
+        totals[1 if kind == 'redemption' else 0] += paise
+        totals[2] += 1
+        if month > self._latest.get(deal, ''):
+            self._latest[deal] = month
+        self.events += 1
+        self.last_event = date
+        return key
+
+    def poll(self):
+        """
+        Read and apply the events appended since the previous poll.
+
+        Returns:
+            Dict with 'events' (applied this poll), 'rejected', 'changed'
+            (set of (deal, month) keys) and 'version'
+        """
+        with self._lock:
+            self.last_poll = self._clock()
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return {'events': 0, 'rejected': 0, 'changed': set(), 'version': self.version}
+            if stat.st_size < self._offset or (self._inode is not None and stat.st_ino != self._inode):
+                self._reset()    # truncated or replaced: start over
+                self.version += 1
+            self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return {'events': 0, 'rejected': 0, 'changed': set(), 'version': self.version}
+
+            with open(self.path, 'rb') as file:
+                file.seek(self._offset)
+                chunk = file.read(self.max_read_bytes)
+            self._offset += len(chunk)
+            lines = (self._pending + chunk).split(b'\n')
+            self._pending = lines.pop()    # incomplete last line: finished by a later append
+
+            applied, rejected, changed = 0, 0, set()
+            for raw in lines:
+                line = raw.decode('utf-8', errors='replace').strip()
+                if not line:
+                    continue
+                try:
+                    event = self._parse(line)
+                    if event is not None:
+                        changed.add(self.apply(event))
+                        applied += 1
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    rejected += 1
+            self.rejected += rejected
+            if applied:
+                self.version += 1
+            return {'events': applied, 'rejected': rejected, 'changed': changed, 'version': self.version}
+
+    @property
+    def backlog_bytes(self):
+        """Bytes appended to the file but not read yet."""
+        try:
+            return max(0, os.path.getsize(self.path) - self._offset)
+        except FileNotFoundError:
+            return 0
+
+    def deals(self):
+        """Deals seen so far, in order of first event."""
+        with self._lock:
+            return list(self._latest)
+
+    def latest_month(self, deal):
+        """Latest month ('YYYY-MM') with events for a deal, or None."""
+        with self._lock:
+            return self._latest.get(deal)
+
+    def month_totals(self, deal, month):
+        """
+        One month's running totals.
+
+        Returns:
+            Dict with 'gross' and 'redemptions' (₹ Lakhs), 'redemption_rate' (%,
+            None before any revenue) and 'events'
+        """
+        with self._lock:
+            gross, redeemed, events = self._months.get((deal, month), (0, 0, 0))
+        return {
+            'gross': float(from_paise(gross)),
+            'redemptions': float(from_paise(redeemed)),
+            'redemption_rate': redeemed / gross * 100 if gross > 0 else None,
+            'events': events,
+        }
+
+    def monthly_frame(self, deal):
+        """
+        Monthly aggregates of one deal (built for display; one row per month).
+
+        Returns:
+            DataFrame with Month, Gross Revenue (₹L), Redemptions (₹L),
+            Redemption Rate (%) and Events columns, sorted by month
+        """
+        with self._lock:
+            rows = sorted((month, totals[:]) for (name, month), totals in self._months.items() if name == deal)
+        gross = [totals[0] for _, totals in rows]
+        redeemed = [totals[1] for _, totals in rows]
+        return pd.DataFrame({
+            'Month': [month for month, _ in rows],
+            'Gross Revenue (₹L)': from_paise(gross),
+            'Redemptions (₹L)': from_paise(redeemed),
+            'Redemption Rate (%)': [r / g * 100 if g > 0 else float('nan') for g, r in zip(gross, redeemed)],
+            'Events': [totals[2] for _, totals in rows],
+        })
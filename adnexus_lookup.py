@@ -0,0 +1,211 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Payoff Lookup Table
+Created: December 2025
+
+Precomputed payoff lattice stored as a memory-mapped .npy file, so every
+worker process shares one read-only copy through the OS page cache.
+
+Under constant growth the repayment timeline depends only on the growth rate
+and the repayment multiple K (outstanding balance in current-month payments),
+so a 2D growth x log10(K) lattice covers current revenue, redemption,
+revenue share, investment and already-paid at once. The table holds payoff
+months only: the balance left at the horizon has a closed form as cheap as
+the lookup, so it is always computed exactly.
+
+Build the table offline with:
+    python adnexus_lookup.py [path]
+(the Docker image does this at build time). The app only opens an existing
+table; without one, lookups fall back to the exact closed-form solver.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from adnexus_engine import (
+    MAX_PROJECTION_MONTHS,
+    repayment_multiple,
+    cumulative_growth_factor,
+    payoff_months_continuous,
+)
+
+LOOKUP_PATH = os.environ.get('ADNEXUS_LOOKUP_PATH', 'payoff_lookup.npy')
+
+# Lattice axes: monthly growth 0-50% and repayment multiples 0.01-10,000 payments
+LOOKUP_GROWTH_AXIS = np.linspace(0.0, 50.0, 1001)
+LOOKUP_LOG_MULTIPLE_AXIS = np.linspace(-2.0, 4.0, 1201)
+
+# Table layers, in storage order
+LOOKUP_FIELDS = ('months',)
+
+# Interpolated payoff months this close to a whole month are recomputed exactly
+# (worst-case interpolation error within the 120-month horizon is about 0.03 months)
+BOUNDARY_TOLERANCE = 0.05
+
+
+def build_payoff_table(path=LOOKUP_PATH):
+    """
+    Evaluate the payoff lattice and write it as a .npy file.
+
+    The table is written to a temporary file in the same directory and moved
+    into place with os.replace, so processes that already have the old file
+    memory-mapped keep reading it intact and concurrent builders never see a
+    half-written table.
+
+    Layers (float32, shape (len(LOOKUP_FIELDS), growth, multiple)):
+    - months: continuous months remaining until repayment
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Path of the written table
+    """
+    growth = LOOKUP_GROWTH_AXIS[:, np.newaxis]
+    multiple = 10 ** LOOKUP_LOG_MULTIPLE_AXIS[np.newaxis, :]
+
+    # Unit revenue, unit payment rate: the balance equals the repayment multiple
+    payoff = payoff_months_continuous(growth, 0.0, 1.0, investment_amount=multiple, revenue_share_pct=100)
+
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.payoff_lookup-',
+                                         suffix='.npy')
+    os.close(handle)
+    try:
+        table = np.lib.format.open_memmap(temporary, mode='w+', dtype=np.float32,
+                                          shape=(len(LOOKUP_FIELDS),) + payoff.shape)
+        table[0] = payoff
+        table.flush()
+        del table
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return path
+
+
+def load_payoff_table(path=LOOKUP_PATH, build=False):
+    """
+    Open the payoff table read-only as a memory map.
+
+    Args:
+        path: Table file path
+        build: Build the table when it is missing or stale (offline tools
+            only; app workers just load and fall back to the exact solver)
+
+    Returns:
+        Read-only memory-mapped array of shape (len(LOOKUP_FIELDS), growth,
+        multiple), or None when there is no usable table and build is False
+    """
+    expected_shape = (len(LOOKUP_FIELDS), len(LOOKUP_GROWTH_AXIS), len(LOOKUP_LOG_MULTIPLE_AXIS))
+    if os.path.exists(path):
+        table = np.load(path, mmap_mode='r')
+        if table.shape == expected_shape:
+            return table
+    if not build:
+        return None
+    build_payoff_table(path)
+    return np.load(path, mmap_mode='r')
+
+
+def interpolate_payoff(table, growth_rate, log_multiple):
+    """
+    Bilinear interpolation of every table layer at lattice coordinates.
+
+    Args:
+        table: Array from load_payoff_table
+        growth_rate: Monthly growth rate (%, array)
+        log_multiple: log10 of the repayment multiple (array, broadcast with growth_rate)
+
+    Returns:
+        Tuple of (values, on_lattice): values has shape (len(LOOKUP_FIELDS),) + broadcast
+        shape; on_lattice marks points inside the lattice bounds
+    """
+    growth_rate, log_multiple = np.broadcast_arrays(np.asarray(growth_rate, dtype=float),
+                                                    np.asarray(log_multiple, dtype=float))
+    growth_axis, multiple_axis = LOOKUP_GROWTH_AXIS, LOOKUP_LOG_MULTIPLE_AXIS
+    on_lattice = ((growth_rate >= growth_axis[0]) & (growth_rate <= growth_axis[-1]) &
+                  (log_multiple >= multiple_axis[0]) & (log_multiple <= multiple_axis[-1]))
+
+    # Fractional lattice positions; off-lattice points read the first cell and are discarded by the caller
+    row = np.where(on_lattice, (growth_rate - growth_axis[0]) / (growth_axis[1] - growth_axis[0]), 0.0)
+    column = np.where(on_lattice, (log_multiple - multiple_axis[0]) / (multiple_axis[1] - multiple_axis[0]), 0.0)
+    row0 = np.minimum(row.astype(int), len(growth_axis) - 2)
+    column0 = np.minimum(column.astype(int), len(multiple_axis) - 2)
+    row_weight, column_weight = row - row0, column - column0
+
+    values = ((1 - row_weight) * (1 - column_weight) * table[:, row0, column0] +
+              (1 - row_weight) * column_weight * table[:, row0, column0 + 1] +
+              row_weight * (1 - column_weight) * table[:, row0 + 1, column0] +
+              row_weight * column_weight * table[:, row0 + 1, column0 + 1])
+    return values, on_lattice
+
+
+def lookup_payoff(table, growth_rate, redemption_rate, current_revenue, investment_amount=75.0,
+                  already_paid=0.0, revenue_share_pct=5, months=MAX_PROJECTION_MONTHS):
+    """
+    Payoff month by table lookup, with the final balance and growth multiple.
+
+    Off-lattice points, and points whose interpolated payoff lands within
+    BOUNDARY_TOLERANCE of a whole month (where rounding could flip), are
+    recomputed exactly with the closed-form engine; the growth multiple then
+    follows from the whole payoff month. The final balance is computed in
+    closed form for every point. All arguments broadcast.
+
+    Args:
+        table: Array from load_payoff_table, or None to compute every point exactly
+        growth_rate: Monthly revenue growth rate (%)
+        redemption_rate: Percentage of revenue that is redeemed (%)
+        current_revenue: Starting monthly revenue (₹ Lakhs)
+        investment_amount: Total investment to be repaid (₹ Lakhs, default: 75.0)
+        already_paid: Amount already repaid before current month (₹ Lakhs, default: 0.0)
+        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
+        months: Projection horizon (months remaining are capped at it)
+
+    Returns:
+        Dict of arrays: 'months_remaining' (int, capped at the horizon), 'complete',
+        'final_balance' (₹ Lakhs), 'growth_multiple', 'exact' (points computed exactly)
+    """
+    growth = np.asarray(growth_rate, dtype=float)
+    multiple = repayment_multiple(current_revenue, redemption_rate, revenue_share_pct,
+                                  investment_amount, already_paid)
+    growth, multiple = np.broadcast_arrays(growth, multiple)
+    with np.errstate(divide='ignore'):
+        log_multiple = np.log10(multiple)
+
+    if table is None:
+        continuous, on_lattice = np.zeros(growth.shape), np.zeros(growth.shape, dtype=bool)
+    else:
+        (continuous,), on_lattice = interpolate_payoff(table, growth, log_multiple)
+
+    near_boundary = np.abs(continuous - np.round(continuous)) < BOUNDARY_TOLERANCE
+    exact = ~on_lattice | near_boundary
+    if np.any(exact):
+        exact_months = payoff_months_continuous(growth[exact], 0.0, 1.0, investment_amount=multiple[exact],
+                                                revenue_share_pct=100)
+        continuous = np.where(exact, 0.0, continuous)
+        continuous[exact] = exact_months
+
+    # Share of the outstanding balance still unpaid after the horizon (no net revenue: all of it)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance_fraction = np.maximum(0.0, 1 - cumulative_growth_factor(growth, months) / multiple)
+    balance_fraction = np.nan_to_num(balance_fraction, nan=1.0)
+
+    whole = np.ceil(continuous - 1e-9)
+    complete = whole <= months
+    months_remaining = np.where(complete, whole, months).astype(int)
+    remaining = np.maximum(0.0, np.asarray(investment_amount, dtype=float) - np.asarray(already_paid, dtype=float))
+    return {
+        'months_remaining': months_remaining,
+        'complete': complete,
+        'final_balance': np.where(complete, 0.0, balance_fraction * remaining),
+        'growth_multiple': (1 + growth / 100) ** months_remaining,
+        'exact': exact
+    }
+
+
+if __name__ == '__main__':
+    output = build_payoff_table(sys.argv[1] if len(sys.argv) > 1 else LOOKUP_PATH)
+    print(f"Wrote payoff lookup table to {output}")
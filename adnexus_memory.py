@@ -0,0 +1,273 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Session Memory Manager
+Created: December 2025
+
+Bounded per-session store for heavy results (projection frames, figures and
+export payloads). Each session gets a byte budget enforced with LRU eviction,
+and the entries of sessions idle for longer than the TTL are freed, so one
+server process can serve many analysts without growing without limit.
+
+Configured through environment variables:
+    ADNEXUS_SESSION_BUDGET_MB   per-session budget (default 32)
+    ADNEXUS_SESSION_TTL         idle seconds before a session is freed (default 1800)
+    ADNEXUS_CACHE_MAX_ENTRIES   entries per shared st.cache_data function (default 32)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SESSION_BUDGET_BYTES = int(float(os.environ.get('ADNEXUS_SESSION_BUDGET_MB', 32)) * 1024 ** 2)
+SESSION_TTL_SECONDS = float(os.environ.get('ADNEXUS_SESSION_TTL', 1800))
+CACHE_MAX_ENTRIES = int(os.environ.get('ADNEXUS_CACHE_MAX_ENTRIES', 32))
+
+
+def estimate_size(value):
+    """
+    Approximate memory footprint of a stored result in bytes.
+
+    Frames are measured with deep memory usage, arrays by their buffers and
+    Plotly figures through their JSON-able dict; containers are summed.
+
+    Args:
+        value: Frame, array, figure, string/bytes payload or container of those
+
+    Returns:
+        Size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, 'to_plotly_json'):
+        return estimate_size(value.to_plotly_json())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _update_digest(digest, part):
+    """Feed one key part into a hash, tagging types so different parts cannot collide."""
+    if isinstance(part, np.ndarray):
+        digest.update(f'ndarray:{part.dtype.str}:{part.shape}:'.encode())
+        digest.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(part, dict):
+        digest.update(f'dict:{len(part)}:'.encode())
+        for key in sorted(part, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, part[key])
+    elif isinstance(part, (list, tuple)):
+        digest.update(f'{type(part).__name__}:{len(part)}:'.encode())
+        for item in part:
+            _update_digest(digest, item)
+    else:
+        text = repr(part)
+        digest.update(f'{type(part).__name__}:{len(text)}:{text}'.encode())
+
+
+def memory_key(*parts):
+    """
+    Compact hash key for a set of inputs (scalars, arrays, lists and dicts).
+
+    Args:
+        *parts: Inputs that determine a stored result
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_digest(digest, part)
+    return digest.hexdigest()
+
+
+class SessionMemory:
+    """
+    Per-session LRU store with a byte budget and idle-session expiry.
+
+    Thread-safe: one instance is shared by every session of a server process.
+    """
+
+    def __init__(self, budget_bytes=SESSION_BUDGET_BYTES, ttl_seconds=SESSION_TTL_SECONDS, clock=time.monotonic):
+        """
+        Args:
+            budget_bytes: Maximum bytes held per session
+            ttl_seconds: Idle time after which a session's entries are freed
+            clock: Monotonic clock in seconds (injectable for tests)
+        """
+        self.budget_bytes = budget_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}     # session -> OrderedDict(key -> (value, nbytes)), least recent first
+        self._used = {}        # session -> bytes held
+        self._last_seen = {}   # session -> clock time of the last access
+        self._evictions = {}   # session -> LRU evictions
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired_sessions': 0,
+                         'expired_bytes': 0, 'oversized': 0}
+
+    def _session(self, session_id):
+        """Entries of a session, marking it as seen now (caller holds the lock)."""
+        self._last_seen[session_id] = self._clock()
+        if session_id not in self._entries:
+            self._entries[session_id] = OrderedDict()
+            self._used[session_id] = 0
+            self._evictions[session_id] = 0
+        return self._entries[session_id]
+
+    def get(self, session_id, key, default=None):
+        """
+        Stored value for a key, marking it most recently used.
+
+        Args:
+            session_id: Session identifier
+            key: Entry key
+            default: Returned when the key is not stored
+
+        Returns:
+            Stored value or default
+        """
+        with self._lock:
+            entries = self._session(session_id)
+            if key not in entries:
+                self.counters['misses'] += 1
+                return default
+            entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entries[key][0]
+
+    def put(self, session_id, key, value):
+        """
+        Store a value, evicting least recently used entries to stay within budget.
+
+        Values larger than the whole budget are not stored.
+
+        Args:
+            session_id: Session identifier
+            key: Entry key
+            value: Value to store
+
+        Returns:
+            The value (stored or not)
+        """
+        nbytes = estimate_size(value)
+        with self._lock:
+            entries = self._session(session_id)
+            if key in entries:
+                self._used[session_id] -= entries.pop(key)[1]
+            if nbytes > self.budget_bytes:
+                self.counters['oversized'] += 1
+                return value
+            while entries and self._used[session_id] + nbytes > self.budget_bytes:
+                _, (_, evicted_bytes) = entries.popitem(last=False)
+                self._used[session_id] -= evicted_bytes
+                self._evictions[session_id] += 1
+                self.counters['evictions'] += 1
+            entries[key] = (value, nbytes)
+            self._used[session_id] += nbytes
+        return value
+
+    def get_or_compute(self, session_id, key, compute):
+        """
+        Stored value for a key, computing and storing it on a miss.
+
+        The computation runs outside the lock so other sessions are not blocked.
+
+        Args:
+            session_id: Session identifier
+            key: Entry key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Stored or freshly computed value
+        """
+        missing = object()
+        value = self.get(session_id, key, missing)
+        if value is missing:
+            value = self.put(session_id, key, compute())
+        return value
+
+    def drop_session(self, session_id):
+        """
+        Free every entry of a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Bytes freed
+        """
+        with self._lock:
+            return self._drop(session_id)
+
+    def _drop(self, session_id):
+        """Remove a session (caller holds the lock)."""
+        self._entries.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+        self._evictions.pop(session_id, None)
+        return self._used.pop(session_id, 0)
+
+    def expire_idle(self):
+        """
+        Free the entries of sessions idle for longer than the TTL.
+
+        Returns:
+            Number of sessions expired
+        """
+        with self._lock:
+            cutoff = self._clock() - self.ttl_seconds
+            idle = [session_id for session_id, seen in self._last_seen.items() if seen < cutoff]
+            for session_id in idle:
+                self.counters['expired_bytes'] += self._drop(session_id)
+            self.counters['expired_sessions'] += len(idle)
+            return len(idle)
+
+    def session_stats(self, session_id):
+        """
+        Usage of one session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Dict with 'entries', 'bytes', 'budget_bytes', 'evictions' and 'sizes'
+            (bytes per key, least recently used first)
+        """
+        with self._lock:
+            entries = self._entries.get(session_id, {})
+            return {
+                'entries': len(entries),
+                'bytes': self._used.get(session_id, 0),
+                'budget_bytes': self.budget_bytes,
+                'evictions': self._evictions.get(session_id, 0),
+                'sizes': {key: nbytes for key, (_, nbytes) in entries.items()}
+            }
+
+    def stats(self):
+        """
+        Process-wide usage across sessions.
+
+        Returns:
+            Dict with 'sessions', 'entries', 'bytes', 'budget_bytes', 'ttl_seconds'
+            and the hit/miss/eviction/expiry counters
+        """
+        with self._lock:
+            return {
+                'sessions': len(self._entries),
+                'entries': sum(len(entries) for entries in self._entries.values()),
+                'bytes': sum(self._used.values()),
+                'budget_bytes': self.budget_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                **self.counters
+            }
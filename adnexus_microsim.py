@@ -0,0 +1,224 @@
+"""
+AdNexus - Vinmo Investment Tracker
+User-Level Microsimulation
+Created: December 2025
+
+Simulates individual users instead of expected values: the current base and
+every month's new users (a Poisson draw around spend ÷ CAC) each get their
+own ARPU multiplier (lognormal, mean 1) and churn at random along the churn
+schedule. Aggregate formulas such as MAU × (1 + g)^t and LTV = ARPU ÷ churn
+give the mean; the simulation gives the spread around it, which matters for
+small deals where a few hundred users decide the payoff month.
+
+User state is two compact arrays (float32 ARPU multiplier, int32 run × cohort
+key; 8 bytes per live user) stepped one month at a time for every user at
+once, with churned users dropped each month. Runs are simulated in batches of
+at most MICROSIM_BATCH_USERS users, so memory stays bounded however many runs
+are requested (about 30 MB of peak working memory per million live users).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import batch_projections, growth_from_path, growth_path, schedule_array
+
+MICROSIM_RUNS = 200
+
+# Simulated users per batch of runs (bounds memory; a larger run is simulated on its own)
+MICROSIM_BATCH_USERS = int(os.environ.get('ADNEXUS_MICROSIM_BATCH_USERS', 1_000_000))
+
+# Coefficient of variation of per-user ARPU (0 = every user pays the average)
+ARPU_DISPERSION = 0.8
+
+MICROSIM_PERCENTILES = (10, 50, 90)
+
+
+def _simulate_batch(acquisitions, hazard, runs, arpu_dispersion, rng):
+    """
+    Step every user of a batch of runs through the horizon.
+
+    Args:
+        acquisitions: Expected users entering each cohort (index 0 = current base)
+        hazard: float32 churn probability by month of age
+        runs: Runs in this batch
+        arpu_dispersion: Coefficient of variation of per-user ARPU
+        rng: NumPy random generator
+
+    Returns:
+        Dict of (runs, months + 1) arrays 'mau', 'arpu_units' (sum of live
+        users' ARPU multipliers), 'survivors' (live users by cohort age, summed
+        over cohorts) and 'sizes' (users entering each cohort), plus
+        'peak_users' (most live users at once)
+    """
+    width = len(acquisitions)
+    sizes = np.empty((runs, width), dtype=np.int64)
+    sizes[:, 0] = round(acquisitions[0])
+    sizes[:, 1:] = rng.poisson(acquisitions[1:], size=(runs, width - 1))
+    sigma = np.float32(np.sqrt(np.log1p(arpu_dispersion ** 2)))
+    constant_hazard = bool(np.all(hazard == hazard[0]))
+
+    def join(month):
+        """State of the users entering in a month: run × cohort key and ARPU multiplier."""
+        cohort = np.repeat(np.arange(runs, dtype=np.int32) * width + month, sizes[:, month])
+        value = np.exp(sigma * rng.standard_normal(cohort.size, dtype=np.float32) - sigma * sigma / 2)
+        return cohort, value
+
+    mau = np.zeros((runs, width), dtype=np.int64)
+    arpu_units = np.zeros((runs, width))
+    survivors = np.zeros((runs, width), dtype=np.int64)
+    cohort, value = join(0)
+    peak_users = cohort.size
+
+    for month in range(width):
+        if month > 0:
+            # Churn: each live user leaves with the hazard of its age (months since its cohort joined)
+            draw = rng.random(cohort.size, dtype=np.float32)
+            age_hazard = hazard[0] if constant_hazard else hazard[month - 1 - cohort % width]
+            keep = draw >= age_hazard
+            new_cohort, new_value = join(month)
+            cohort = np.concatenate([cohort[keep], new_cohort])
+            value = np.concatenate([value[keep], new_value])
+            peak_users = max(peak_users, cohort.size)
+
+        counts = np.bincount(cohort, minlength=runs * width).reshape(runs, width)
+        mau[:, month] = counts.sum(axis=1)
+        units = np.bincount(cohort, weights=value, minlength=runs * width)
+        arpu_units[:, month] = units.reshape(runs, width).sum(axis=1)
+        # Cohort j is month - j months old
+        survivors[:, :month + 1] += counts[:, month::-1]
+
+    return {'mau': mau, 'arpu_units': arpu_units, 'survivors': survivors, 'sizes': sizes, 'peak_users': peak_users}
+
+
+def iter_simulate_users(acquisitions, arpu, churn_rate, arpu_growth_rate, runs=MICROSIM_RUNS,
+                        arpu_dispersion=ARPU_DISPERSION, batch_users=MICROSIM_BATCH_USERS, seed=0):
+    """
+    Progressive user-level simulation: the runs completed so far after each batch.
+
+    Args:
+        acquisitions: Expected users entering each cohort, index 0 = current
+            base (e.g. calculate_cohort_revenue()['acquisitions']); its length
+            sets the horizon
+        arpu: Current Average Revenue Per User (₹)
+        churn_rate: Monthly churn rate (%) or per-month-of-age schedule
+        arpu_growth_rate: Monthly ARPU growth (%) or per-month schedule
+        runs: Number of simulated runs
+        arpu_dispersion: Coefficient of variation of per-user ARPU
+        batch_users: Users simulated together (at least one run per batch)
+        seed: Random seed
+
+    Yields:
+        Tuple of (fraction done, result dict): (runs, months + 1) arrays
+        'mau', 'revenue' (₹ Lakhs) and 'retention' (share of each cohort
+        still active by age, pooled over cohorts), per-run 'acquired' (new
+        users), and 'runs', 'users' (users simulated), 'peak_users' and
+        'state_mb' (largest user state held at once)
+    """
+    acquisitions = np.maximum(np.asarray(acquisitions, dtype=float), 0.0)
+    months = len(acquisitions) - 1
+    hazard = np.clip(schedule_array(churn_rate, max(months, 1)) / 100, 0, 1).astype(np.float32)
+    arpu_path = arpu * growth_path(arpu_growth_rate, months)
+    per_batch = int(np.clip(batch_users // max(acquisitions.sum(), 1.0), 1, runs))
+    rng = np.random.default_rng(seed)
+
+    parts = []
+    for start in range(0, runs, per_batch):
+        parts.append(_simulate_batch(acquisitions, hazard, min(per_batch, runs - start), arpu_dispersion, rng))
+        combined = {name: np.concatenate([part[name] for part in parts])
+                    for name in ('mau', 'arpu_units', 'survivors', 'sizes')}
+        # Age a is observed only for cohorts that joined at least a months before the horizon
+        exposed = np.cumsum(combined['sizes'], axis=1)[:, ::-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            retention = np.where(exposed > 0, combined['survivors'] / exposed, np.nan)
+        peak_users = max(part['peak_users'] for part in parts)
+        yield len(combined['mau']) / runs, {
+            'mau': combined['mau'],
+            'revenue': combined['arpu_units'] * arpu_path / 100000,
+            'retention': retention,
+            'acquired': combined['sizes'][:, 1:].sum(axis=1),
+            'runs': len(combined['mau']),
+            'users': int(combined['sizes'].sum()),
+            'peak_users': peak_users,
+            'state_mb': peak_users * 8 / 1e6,
+        }
+
+
+def simulate_users(acquisitions, arpu, churn_rate, arpu_growth_rate, runs=MICROSIM_RUNS, **options):
+    """
+    User-level simulation of every run (runs iter_simulate_users to the end).
+
+    Returns:
+        Result dict of the last batch (see iter_simulate_users)
+    """
+    result = None
+    for _, result in iter_simulate_users(acquisitions, arpu, churn_rate, arpu_growth_rate, runs, **options):
+        pass
+    return result
+
+
+def microsim_repayment(simulation, current_revenue, redemption_rate=50, revenue_share_pct=5,
+                       investment_amount=75.0, already_paid=0.0, target_months=36):
+    """
+    Months remaining until payoff in every simulated run.
+
+    Each run's revenue path drives the projection from the current revenue,
+    like the cohort revenue model, so the spread comes from the simulated
+    users and not from the month-0 draw.
+
+    Args:
+        simulation: simulate_users result
+        current_revenue: Current monthly revenue (₹ Lakhs)
+        redemption_rate: Redemption rate (%) or schedule
+        revenue_share_pct: Revenue share to the investor (%)
+        investment_amount: Total investment (₹ Lakhs)
+        already_paid: Amount already repaid (₹ Lakhs)
+        target_months: Months within which repayment is counted as on target
+
+    Returns:
+        Dict with the per-run 'months_remaining' and 'complete' arrays,
+        'p10', 'p50', 'p90' months and 'on_target' probability (0-1), as in
+        adnexus_fit.repayment_distribution; runs not repaid within the
+        simulated horizon count at the horizon
+    """
+    growth = growth_from_path(simulation['revenue'])
+    months = growth.shape[1]
+    outcome = batch_projections(current_revenue, growth,
+                                redemption_rate=schedule_array(redemption_rate, months + 1)[np.newaxis, :],
+                                revenue_share_pct=revenue_share_pct, months=months,
+                                investment_amount=investment_amount, already_paid=already_paid)
+    remaining = outcome['months_remaining']
+    p10, p50, p90 = np.percentile(remaining, MICROSIM_PERCENTILES)
+    return {
+        'months_remaining': remaining,
+        'complete': outcome['complete'],
+        'p10': float(p10),
+        'p50': float(p50),
+        'p90': float(p90),
+        'on_target': float(np.mean(outcome['complete'] & (remaining <= target_months))),
+    }
+
+
+def microsim_bands(simulation, current_month=1):
+    """
+    Percentile bands of MAU, revenue and retention across the simulated runs.
+
+    Args:
+        simulation: simulate_users result
+        current_month: Timeline month of the current month
+
+    Returns:
+        DataFrame with Month, Age (months since acquisition, for the
+        retention columns) and P10/P50/P90 columns of MAU, Revenue (₹L) and
+        Retention (%)
+    """
+    months = simulation['mau'].shape[1]
+    bands = {'Month': current_month + np.arange(months), 'Age': np.arange(months)}
+    series = {'MAU': simulation['mau'], 'Revenue (₹L)': simulation['revenue'],
+              'Retention (%)': simulation['retention'] * 100}
+    for name, values in series.items():
+        for percentile, band in zip(MICROSIM_PERCENTILES, np.nanpercentile(values, MICROSIM_PERCENTILES, axis=0)):
+            label, _, unit = name.partition(' ')
+            bands[f'{label} P{percentile}{" " + unit if unit else ""}'] = band
+    return pd.DataFrame(bands)
@@ -0,0 +1,269 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Marketing Spend Optimizer
+Created: December 2025
+
+Chooses how to spread a fixed acquisition budget over a planning window to
+minimise the payoff month or maximise blended LTV/CAC. Each candidate
+schedule runs through the cohort model: spend ÷ CAC acquires users, cohorts
+decay with churn, MAU × ARPU scales the current revenue and the paise ledger
+turns it into repayments. A whole population of schedules is one batched
+FFT convolution and one ledger pass, so the gradient-free search (a
+cross-entropy method over the budget shares) evaluates tens of thousands of
+schedules per second.
+
+CAC rises with the month's spend (diminishing returns): spending
+`cac_doubling_spend` in one month doubles that month's CAC. Without it the
+cheapest plan would always be to spend the whole budget in the first month.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import (
+    MAX_PROJECTION_MONTHS,
+    cac_path,
+    cohort_convolution,
+    growth_path,
+    repayment_ledger,
+    retention_curve,
+    schedule_array,
+)
+from adnexus_schema import from_paise, to_paise
+
+OPTIMIZER_OBJECTIVES = {'payoff': 'Minimise payoff month', 'ltv_cac': 'Maximise LTV/CAC'}
+
+DEFAULT_PLAN_MONTHS = 24
+
+# Cross-entropy search: candidates per round, rounds and share of candidates kept as elites
+SEARCH_POPULATION = 256
+SEARCH_ROUNDS = 60
+ELITE_FRACTION = 0.1
+
+
+def spend_model(mau, arpu, churn_rate, arpu_growth_rate, current_revenue, redemption_rate=50,
+                revenue_share_pct=5, investment_amount=75.0, already_paid=0.0, starting_cac=30,
+                cac_monthly_increase=2, cac_schedule=None, cac_doubling_spend=5.0, ltv_months=6,
+                months=MAX_PROJECTION_MONTHS):
+    """
+    Fixed terms of the spend model, precomputed once for every evaluation.
+
+    Args:
+        mau, arpu, churn_rate, arpu_growth_rate: As in calculate_cohort_revenue
+        current_revenue, redemption_rate, revenue_share_pct, investment_amount,
+        already_paid: As in calculate_projections
+        starting_cac, cac_monthly_increase, cac_schedule: Base CAC per month (see cac_path)
+        cac_doubling_spend: Monthly spend (₹ Lakhs) that doubles the month's CAC
+        ltv_months: LTV horizon when churn is zero (as in calculate_unit_economics)
+        months: Projection horizon
+
+    Returns:
+        Dict of arrays and terms used by evaluate_spend
+    """
+    projected_arpu = arpu * growth_path(arpu_growth_rate, months)
+    churn = schedule_array(churn_rate, months + 1) / 100
+    with np.errstate(divide='ignore'):
+        ltv = np.where(churn > 0, projected_arpu / churn, projected_arpu * ltv_months)
+    return {
+        'mau': float(mau),
+        'arpu': projected_arpu,
+        'retention': retention_curve(churn_rate, months),
+        'ltv': ltv,
+        'cac': cac_path(starting_cac, cac_monthly_increase, cac_schedule, months),
+        'cac_doubling_spend': float(cac_doubling_spend),
+        # Revenue is scaled from the current month like the dashboard's cohort model
+        'revenue_scale': current_revenue / (float(mau) * arpu) if mau > 0 and arpu > 0 else 0.0,
+        'payment_rate': (1 - schedule_array(redemption_rate, months + 1) / 100) * (revenue_share_pct / 100),
+        'investment_amount': investment_amount,
+        'already_paid': already_paid,
+        'months': months,
+    }
+
+
+def evaluate_spend(spend, model, paths=False):
+    """
+    Repayment and unit economics of many spend schedules in one batched pass.
+
+    Args:
+        spend: Acquisition spend (₹ Lakhs) per projected month from month 1,
+            shape (W,) or (n, W); no spend after the last column
+        model: spend_model result
+        paths: Also return the per-month matrices (for display)
+
+    Returns:
+        Dict of per-schedule arrays: 'payoff' (fractional payoff month, horizon
+        + remaining share of the investment when not repaid), 'months_remaining',
+        'complete', 'final_balance' (₹ Lakhs), 'users' (acquired), 'ltv_cac'
+        (blended: lifetime value of acquired users ÷ spend); with paths=True
+        also 'cac', 'new_users', 'mau', 'revenue', 'payments' and 'balance'
+    """
+    spend = np.atleast_2d(np.asarray(spend, dtype=float))
+    months = model['months']
+    window = min(spend.shape[1], months)
+    spend = spend[:, :window]
+
+    # Diminishing returns: the month's CAC grows with the month's spend
+    cac = model['cac'][:window] * (1 + spend / model['cac_doubling_spend'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_users = np.where(cac > 0, spend * 100000 / cac, 0.0)
+    acquisitions = np.zeros((len(spend), months + 1))
+    acquisitions[:, 0] = model['mau']
+    acquisitions[:, 1:window + 1] = new_users
+
+    mau = np.maximum(cohort_convolution(acquisitions, model['retention']), 0.0)
+    revenue = mau * model['arpu'] * model['revenue_scale']
+    due = revenue * model['payment_rate']
+    ledger = repayment_ledger(due, model['investment_amount'], model['already_paid'])
+
+    # Fractional payoff: the share of the payoff month's (uncapped) payment needed to clear the balance
+    index = np.maximum(ledger['payoff_index'], 0)
+    rows = np.arange(len(spend))
+    outstanding = ledger['balance'][:, 0] + ledger['payment'][:, 0]
+    before = np.where(index > 0, ledger['balance'][rows, index - 1], outstanding)
+    due_paise = to_paise(due[rows, index])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        needed = np.where(due_paise > 0, np.minimum(before / due_paise, 1.0), 1.0)
+        unpaid = np.where(outstanding > 0, ledger['balance'][:, -1] / outstanding, 0.0)
+    complete = ledger['complete']
+    payoff = np.where(complete, index - 1 + needed, months + unpaid)
+
+    total_spend = spend.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ltv_cac = np.where(total_spend > 0,
+                           (new_users * model['ltv'][1:window + 1]).sum(axis=1) / (total_spend * 100000), 0.0)
+    result = {
+        'payoff': payoff,
+        'months_remaining': np.where(complete, ledger['payoff_index'], months),
+        'complete': complete,
+        'final_balance': from_paise(ledger['balance'][:, -1]),
+        'users': new_users.sum(axis=1),
+        'ltv_cac': ltv_cac,
+    }
+    if paths:
+        result.update({'cac': cac, 'new_users': new_users, 'mau': mau, 'revenue': revenue,
+                       'payments': from_paise(ledger['payment']), 'balance': from_paise(ledger['balance'])})
+    return result
+
+
+def _scores(spend, model, objective):
+    """Values to minimise for a batch of schedules."""
+    outcome = evaluate_spend(spend, model)
+    return outcome['payoff'] if objective == 'payoff' else -outcome['ltv_cac']
+
+
+def iter_optimize_spend(model, budget, objective='payoff', plan_months=DEFAULT_PLAN_MONTHS, initial=(),
+                        population=SEARCH_POPULATION, rounds=SEARCH_ROUNDS, elite_fraction=ELITE_FRACTION,
+                        seed=0):
+    """
+    Progressive spend optimisation: the best schedule so far after each round.
+
+    Candidates are budget shares (a softmax of Gaussian logits), so every
+    schedule spends exactly the budget. Each round evaluates the population in
+    one batch and refits the logit distribution to the elite candidates.
+
+    Args:
+        model: spend_model result
+        budget: Total spend over the planning window (₹ Lakhs)
+        objective: 'payoff' or 'ltv_cac' (see OPTIMIZER_OBJECTIVES)
+        plan_months: Planning window (months of spend from month 1)
+        initial: Schedules to include in the first round (e.g. the current plan), rescaled to the budget
+        population: Candidates per round
+        rounds: Number of rounds
+        elite_fraction: Share of each round kept to refit the distribution
+        seed: Random seed
+
+    Yields:
+        Tuple of (fraction done, result dict with 'spend' (best schedule),
+        'score', 'evaluations', 'evaluations_per_second' and 'history' (best
+        score after each round))
+    """
+    if objective not in OPTIMIZER_OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective!r} (expected {', '.join(OPTIMIZER_OBJECTIVES)})")
+    rng = np.random.default_rng(seed)
+    elites = max(2, int(population * elite_fraction))
+    mean, spread = np.zeros(plan_months), np.full(plan_months, 1.0)
+
+    # Seed candidates: an even spread plus any given plans
+    seeds = [np.full(plan_months, 1.0)] + [schedule_array(plan, plan_months) for plan in initial]
+    seeds = np.array([plan / plan.sum() for plan in seeds if plan.sum() > 0])
+    best_spend, best_score, history = None, np.inf, []
+    evaluations, started = 0, time.perf_counter()
+
+    for round_index in range(rounds):
+        logits = mean + spread * rng.standard_normal((population, plan_months))
+        shares = np.exp(logits - logits.max(axis=1, keepdims=True))
+        shares /= shares.sum(axis=1, keepdims=True)
+        if round_index == 0:
+            shares = np.vstack([seeds, shares])
+        scores = _scores(shares * budget, model, objective)
+        evaluations += len(shares)
+
+        order = np.argsort(scores, kind='stable')
+        if scores[order[0]] < best_score:
+            best_score, best_spend = float(scores[order[0]]), shares[order[0]] * budget
+        # Refit to the elites in logit space (log shares, centred)
+        elite_logits = np.log(np.maximum(shares[order[:elites]], 1e-12))
+        elite_logits -= elite_logits.mean(axis=1, keepdims=True)
+        mean = 0.7 * elite_logits.mean(axis=0) + 0.3 * mean
+        spread = np.maximum(0.7 * elite_logits.std(axis=0) + 0.3 * spread, 0.05)
+        history.append(best_score)
+
+        elapsed = time.perf_counter() - started
+        yield (round_index + 1) / rounds, {
+            'spend': best_spend,
+            'score': best_score,
+            'evaluations': evaluations,
+            'evaluations_per_second': evaluations / elapsed if elapsed > 0 else float('inf'),
+            'history': list(history),
+        }
+
+
+def optimize_spend(model, budget, objective='payoff', plan_months=DEFAULT_PLAN_MONTHS, initial=(), **search):
+    """
+    Best spend schedule for a budget (runs iter_optimize_spend to the end).
+
+    Returns:
+        Result dict of the last round (see iter_optimize_spend)
+    """
+    result = None
+    for _, result in iter_optimize_spend(model, budget, objective, plan_months, initial, **search):
+        pass
+    return result
+
+
+def spend_plan_frame(plans, model, current_month=1):
+    """
+    Month-by-month comparison of spend plans.
+
+    Args:
+        plans: Dict of plan name -> spend schedule (₹ Lakhs per month from month 1)
+        model: spend_model result
+        current_month: Timeline month of the current month
+
+    Returns:
+        Tuple of (summary DataFrame with one row per plan: Plan, Spend (₹L),
+        Users Acquired, Months Remaining, Complete, Final Balance (₹L), LTV/CAC;
+        detail DataFrame
+        with Month and each plan's Spend (₹L), CAC (₹) and MAU columns)
+    """
+    window = max(len(spend) for spend in plans.values())
+    # Shorter plans stop spending after their last month
+    spend = np.array([np.pad(np.asarray(plan, dtype=float), (0, window - len(plan))) for plan in plans.values()])
+    outcome = evaluate_spend(spend, model, paths=True)
+    summary = pd.DataFrame({
+        'Plan': list(plans),
+        'Spend (₹L)': spend.sum(axis=1),
+        'Users Acquired': outcome['users'].round().astype(int),
+        'Months Remaining': outcome['months_remaining'],
+        'Complete': outcome['complete'],
+        'Final Balance (₹L)': outcome['final_balance'],
+        'LTV/CAC': outcome['ltv_cac'].round(2),
+    })
+    detail = {'Month': current_month + np.arange(1, window + 1)}
+    for index, name in enumerate(plans):
+        detail[f'{name} Spend (₹L)'] = spend[index]
+        detail[f'{name} CAC (₹)'] = outcome['cac'][index].round(2)
+        detail[f'{name} MAU'] = outcome['mau'][index, 1:window + 1].astype(int)
+    return summary, pd.DataFrame(detail)
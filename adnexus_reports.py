@@ -0,0 +1,505 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Investor Reports
+Created: December 2025
+
+Self-contained HTML or PDF investor reports with static charts rendered
+locally by matplotlib. Portfolio runs render deals in parallel worker
+processes, and chart images are cached on disk by input fingerprint so
+unchanged deals are not re-rendered at the next month end. Workers are
+spawned rather than forked: portfolio runs start from the dashboard's
+threaded server, where a forked child can inherit a held lock. The cache
+keeps the CHART_CACHE_FILES most recently used charts.
+
+Generate a portfolio from a deals CSV (one row per deal, columns named as in
+DEAL_DEFAULTS; missing columns take the defaults) with:
+    python adnexus_reports.py deals.csv [output_dir] [--format html|pdf] [--workers N]
+"""
+
+import argparse
+import base64
+import html
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import batch_projections, batch_rollups, calculate_projections
+from adnexus_returns import investor_cash_flows, investor_returns
+from adnexus_memory import memory_key
+
+CHART_CACHE_DIR = os.environ.get('ADNEXUS_CHART_CACHE', '.chart_cache')
+# Most chart images kept in the cache (least recently used are evicted)
+CHART_CACHE_FILES = int(os.environ.get('ADNEXUS_CHART_CACHE_FILES', 2000))
+REPORT_WORKERS = int(os.environ.get('ADNEXUS_REPORT_WORKERS', os.cpu_count() or 1))
+
+# Bump when chart styling changes so cached renders are not reused
+CHART_VERSION = 1
+
+REPORT_FORMATS = ('html', 'pdf')
+
+# Deal inputs and their defaults (the dashboard's baseline deal)
+DEAL_DEFAULTS = {
+    'name': 'AdNexus',
+    'current_revenue': 10.0,
+    'growth_rate': 9.65,
+    'redemption_rate': 50.0,
+    'revenue_share_pct': 5.0,
+    'current_month': 1,
+    'investment_amount': 75.0,
+    'already_paid': 0.0,
+    'discount_rate': 12.0,
+}
+
+# Deal inputs that determine the charts (the name only appears in the report text)
+CHART_INPUTS = [name for name in DEAL_DEFAULTS if name != 'name']
+
+
+def deal_fingerprint(deal):
+    """
+    Hash of the inputs that determine a deal's charts.
+
+    Args:
+        deal: Deal dict (see DEAL_DEFAULTS)
+
+    Returns:
+        Hex digest string
+    """
+    return memory_key(CHART_VERSION, {name: deal[name] for name in CHART_INPUTS})
+
+
+def deal_report_data(deal):
+    """
+    Projections and investor returns for one deal.
+
+    Args:
+        deal: Deal dict; missing inputs take DEAL_DEFAULTS (growth and redemption
+            may be per-month schedules as in calculate_projections)
+
+    Returns:
+        Dict with the completed 'deal', 'projections' frame, 'complete' flag,
+        'months_remaining', 'payoff_month' and the 'annual_irr', 'npv' and 'moic' floats
+    """
+    deal = {**DEAL_DEFAULTS, **deal}
+    df = calculate_projections(deal['current_revenue'], deal['growth_rate'],
+                               redemption_rate=deal['redemption_rate'],
+                               revenue_share_pct=deal['revenue_share_pct'],
+                               current_month=int(deal['current_month']),
+                               investment_amount=deal['investment_amount'],
+                               already_paid=deal['already_paid'])
+    flows = investor_cash_flows([df['Payment to Vinmo (₹L)'].to_numpy()], deal['investment_amount'],
+                                deal['already_paid'], int(deal['current_month']))
+    returns = investor_returns(flows, discount_rate=deal['discount_rate'], current_month=int(deal['current_month']))
+    return {
+        'deal': deal,
+        'projections': df,
+        'complete': bool(df.attrs['complete']),
+        'months_remaining': len(df) - 1,
+        'payoff_month': int(df['Month'].iloc[-1]),
+        'annual_irr': float(returns['annual_irr'][0]),
+        'npv': float(returns['npv'][0]),
+        'moic': float(returns['moic'][0])
+    }
+
+
+def render_chart(kind, data):
+    """
+    Render one report chart to PNG with matplotlib (headless Agg backend).
+
+    Args:
+        kind: 'repayment' (cumulative paid vs balance) or 'payments' (monthly
+            payments with gross revenue)
+        data: Result of deal_report_data
+
+    Returns:
+        PNG bytes
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    df = data['projections']
+    months = df['Month'].to_numpy()
+    figure = Figure(figsize=(8, 3.2), dpi=110)
+    axis = figure.add_subplot()
+    if kind == 'repayment':
+        axis.fill_between(months, df['Balance (₹L)'], color='#f4a582', alpha=0.6, label='Balance')
+        axis.plot(months, df['Cumulative Paid (₹L)'], color='#2166ac', linewidth=2, label='Cumulative Paid')
+        axis.axhline(data['deal']['investment_amount'], color='gray', linestyle='--', linewidth=1,
+                     label='Investment')
+        axis.set_title('Repayment Progress')
+        axis.set_ylabel('₹ Lakhs')
+    elif kind == 'payments':
+        axis.bar(months, df['Payment to Vinmo (₹L)'], color='#1b7837', label='Payment to Vinmo')
+        axis.set_ylabel('Payment (₹ Lakhs)')
+        revenue_axis = axis.twinx()
+        revenue_axis.plot(months, df['Gross Revenue (₹L)'], color='#762a83', linewidth=1.5, label='Gross Revenue')
+        revenue_axis.set_ylabel('Gross Revenue (₹ Lakhs)')
+        revenue_axis.legend(loc='upper right', fontsize=8)
+        axis.set_title('Monthly Payments and Revenue')
+    else:
+        raise ValueError(f"Unknown chart kind: {kind}")
+    axis.set_xlabel('Month')
+    axis.legend(loc='upper left', fontsize=8)
+    axis.grid(alpha=0.3)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def prune_chart_cache(cache_dir=CHART_CACHE_DIR, keep=CHART_CACHE_FILES):
+    """
+    Delete the least recently used chart images beyond the newest keep.
+
+    Safe to run from concurrent workers: files already removed are skipped.
+
+    Args:
+        cache_dir: Cache directory
+        keep: Chart images to keep
+
+    Returns:
+        Number of files deleted
+    """
+    charts = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.png'):
+            try:
+                charts.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    deleted = 0
+    for _, path in sorted(charts, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+def cached_chart(kind, data, cache_dir=CHART_CACHE_DIR):
+    """
+    Chart PNG from the on-disk render cache, rendering and storing it on a miss.
+
+    Files are written atomically, so concurrent workers can share the cache.
+    A hit refreshes the file's modification time and a miss prunes the cache
+    to CHART_CACHE_FILES charts, so the least recently used are evicted.
+
+    Args:
+        kind: Chart kind (see render_chart)
+        data: Result of deal_report_data
+        cache_dir: Cache directory (None disables caching)
+
+    Returns:
+        Tuple of (png_bytes, cache_hit)
+    """
+    if cache_dir is None:
+        return render_chart(kind, data), False
+    path = os.path.join(cache_dir, f"{deal_fingerprint(data['deal'])}-{kind}.png")
+    try:
+        with open(path, 'rb') as cached:
+            png = cached.read()
+        os.utime(path)
+        return png, True
+    except FileNotFoundError:
+        pass    # not cached yet, or evicted by another worker
+    png = render_chart(kind, data)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as output:
+        output.write(png)
+    os.replace(temporary, path)
+    prune_chart_cache(cache_dir)
+    return png, False
+
+
+def report_metrics(data):
+    """
+    Headline metrics of a report as (label, value) pairs.
+
+    Args:
+        data: Result of deal_report_data
+
+    Returns:
+        List of (label, formatted value) tuples
+    """
+    deal = data['deal']
+    df = data['projections']
+    months = data['months_remaining']
+    irr = data['annual_irr']
+    return [
+        ('Investment', f"₹{deal['investment_amount']:,.2f}L"),
+        ('Already Paid', f"₹{deal['already_paid']:,.2f}L"),
+        ('Months Remaining', f"{months}" if data['complete'] else f">{months}"),
+        ('Payoff Month', f"M{data['payoff_month']}" if data['complete'] else "Beyond projection"),
+        ('Total Received', f"₹{df['Cumulative Paid (₹L)'].iloc[-1]:,.2f}L"),
+        ('IRR (Annual)', f"{irr * 100:.1f}%" if np.isfinite(irr) else "N/A"),
+        (f"NPV @ {deal['discount_rate']:g}%", f"₹{data['npv']:,.2f}L"),
+        ('MOIC', f"{data['moic']:.2f}x"),
+    ]
+
+
+def render_html(data, charts):
+    """
+    Self-contained HTML report (inline CSS, charts embedded as base64 PNG).
+
+    Args:
+        data: Result of deal_report_data
+        charts: Dict of chart kind -> PNG bytes
+
+    Returns:
+        HTML document as a string
+    """
+    deal = data['deal']
+    metrics = ''.join(f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>"
+                      for label, value in report_metrics(data))
+    images = ''.join(f'<img alt="{kind}" src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+                     for kind, png in charts.items())
+    table = data['projections'].round(2).to_html(index=False, border=0, classes='projections')
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(deal['name'])} - Investor Report</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; margin: 2rem auto; max-width: 960px; color: #222; }}
+h1 {{ margin-bottom: 0; }}
+.meta {{ color: #666; margin-top: 0.2rem; }}
+table {{ border-collapse: collapse; margin: 1rem 0; }}
+th, td {{ padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }}
+th {{ text-align: left; background: #f0f2f6; }}
+img {{ width: 100%; margin: 0.5rem 0; }}
+.projections {{ font-size: 0.8rem; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(deal['name'])} - Investor Report</h1>
+<p class="meta">Vinmo Ventures revenue share | Generated {datetime.now().strftime('%Y-%m-%d %H:%M')} |
+Month {int(deal['current_month'])} | {deal['revenue_share_pct']:g}% of net revenue</p>
+<h2>Summary</h2>
+<table>{metrics}</table>
+<h2>Charts</h2>
+{images}
+<h2>Monthly Projections</h2>
+{table}
+</body>
+</html>
+"""
+
+
+def render_pdf(data, charts):
+    """
+    One-page A4 PDF report: headline metrics and the chart images.
+
+    Args:
+        data: Result of deal_report_data
+        charts: Dict of chart kind -> PNG bytes
+
+    Returns:
+        PDF bytes
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.image as mpimg
+    from matplotlib.figure import Figure
+
+    deal = data['deal']
+    page = Figure(figsize=(8.27, 11.69))
+    page.text(0.07, 0.95, f"{deal['name']} - Investor Report", fontsize=18, weight='bold')
+    page.text(0.07, 0.925, f"Vinmo Ventures revenue share | Generated {datetime.now().strftime('%Y-%m-%d %H:%M')} | "
+                           f"Month {int(deal['current_month'])}", fontsize=9, color='gray')
+    metrics = page.add_axes([0.07, 0.72, 0.86, 0.18])
+    metrics.axis('off')
+    table = metrics.table(cellText=[list(metric) for metric in report_metrics(data)], colWidths=[0.35, 0.25],
+                          cellLoc='left', loc='upper left', edges='horizontal')
+    table.set_fontsize(10)
+    table.scale(1, 1.3)
+    for index, png in enumerate(charts.values()):
+        image = page.add_axes([0.05, 0.38 - index * 0.33, 0.9, 0.32])
+        image.imshow(mpimg.imread(io.BytesIO(png), format='png'))
+        image.axis('off')
+
+    buffer = io.BytesIO()
+    page.savefig(buffer, format='pdf')
+    return buffer.getvalue()
+
+
+def generate_report(deal, fmt='html', cache_dir=CHART_CACHE_DIR):
+    """
+    Investor report for one deal.
+
+    Args:
+        deal: Deal dict (see DEAL_DEFAULTS)
+        fmt: 'html' or 'pdf'
+        cache_dir: Chart render cache directory (None disables caching)
+
+    Returns:
+        Dict with 'filename', 'content' (bytes) and 'chart_hits' (charts served from the cache)
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    data = deal_report_data(deal)
+    charts, hits = {}, 0
+    for kind in ('repayment', 'payments'):
+        charts[kind], hit = cached_chart(kind, data, cache_dir)
+        hits += hit
+    content = render_html(data, charts).encode('utf-8') if fmt == 'html' else render_pdf(data, charts)
+    slug = ''.join(char if char.isalnum() else '_' for char in str(data['deal']['name'])).strip('_').lower()
+    filename = f"{slug or 'deal'}_investor_report_{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    return {'filename': filename, 'content': content, 'chart_hits': hits}
+
+
+def generate_reports(deals, fmt='html', workers=None, cache_dir=CHART_CACHE_DIR, progress=None):
+    """
+    Investor reports for a portfolio, rendered in parallel worker processes.
+
+    Args:
+        deals: Sequence of deal dicts
+        fmt: 'html' or 'pdf'
+        workers: Number of worker processes (None or 1 = render in-process)
+        cache_dir: Chart render cache directory shared by the workers
+        progress: Optional callable(done, total) called as each report completes; an
+            exception it raises (e.g. job cancellation) stops the run
+
+    Returns:
+        List of generate_report results, in deal order
+    """
+    deals = list(deals)
+    reports = [None] * len(deals)
+    if not workers or workers <= 1 or len(deals) <= 1:
+        for index, deal in enumerate(deals):
+            reports[index] = generate_report(deal, fmt, cache_dir)
+            if progress is not None:
+                progress(index + 1, len(deals))
+        return reports
+    # Spawned, not forked: this can run on a job thread of the multi-threaded app server
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(generate_report, deal, fmt, cache_dir): index for index, deal in enumerate(deals)}
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                reports[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done, len(deals))
+        except BaseException:
+            # A failed report or a cancelling progress callback drops the queued deals
+            pool.shutdown(cancel_futures=True)
+            raise
+    return reports
+
+
+def load_deals(source):
+    """
+    Deal dicts from a portfolio table.
+
+    Args:
+        source: CSV path or file-like object, or a DataFrame, with one row per
+            deal and columns named as in DEAL_DEFAULTS (missing columns and blank
+            cells take the defaults)
+
+    Returns:
+        List of deal dicts
+    """
+    table = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    unknown = set(table.columns) - set(DEAL_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown deal columns: {', '.join(sorted(unknown))}")
+    deals = []
+    for index, row in enumerate(table.to_dict('records')):
+        deal = {name: value for name, value in row.items() if not pd.isna(value)}
+        deal.setdefault('name', f"Deal {index + 1}")
+        deals.append({**DEAL_DEFAULTS, **deal})
+    return deals
+
+
+def portfolio_rollup(deals, by='Fiscal Year', start_date=None):
+    """
+    Payments of every deal per fiscal year (or quarter / half-year) in one batch.
+
+    All deals are projected together with batch_projections and rolled up
+    with one segment sum per matrix; no per-deal frame is built.
+
+    Args:
+        deals: List of deal dicts with scalar inputs (see load_deals)
+        by: 'Quarter', 'Half-Year' or 'Fiscal Year'
+        start_date: Date in every deal's current month (default: today)
+
+    Returns:
+        DataFrame with one row per deal: Deal, then the payment (₹ Lakhs) of
+        each period, then Total and Balance at the end of the horizon
+    """
+    deals = [{**DEAL_DEFAULTS, **deal} for deal in deals]
+    inputs = {name: np.array([float(deal[name]) for deal in deals])
+              for name in ('current_revenue', 'growth_rate', 'redemption_rate', 'revenue_share_pct',
+                           'investment_amount', 'already_paid')}
+    result = batch_projections(inputs['current_revenue'], inputs['growth_rate'],
+                               redemption_rate=inputs['redemption_rate'],
+                               revenue_share_pct=inputs['revenue_share_pct'],
+                               investment_amount=inputs['investment_amount'],
+                               already_paid=inputs['already_paid'], columns=True)
+    rollup = batch_rollups(result, by, start_date=datetime.now().date() if start_date is None else start_date)
+    table = pd.DataFrame(rollup['payments'], columns=rollup['labels'])
+    table.insert(0, 'Deal', [deal['name'] for deal in deals])
+    table['Total'] = result['total_recovered']
+    table['Balance'] = result['final_balance']
+    return table
+
+
+def unique_filenames(reports):
+    """
+    File name per report, with a numeric suffix on repeated names.
+
+    Args:
+        reports: List of generate_report results
+
+    Returns:
+        List of file names in report order
+    """
+    seen, names = {}, []
+    for report in reports:
+        stem, extension = os.path.splitext(report['filename'])
+        count = seen.get(report['filename'], 0)
+        seen[report['filename']] = count + 1
+        names.append(f"{stem}_{count + 1}{extension}" if count else report['filename'])
+    return names
+
+
+def reports_archive(reports):
+    """
+    Zip archive of generated reports.
+
+    Args:
+        reports: List of generate_report results
+
+    Returns:
+        ZIP bytes
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for filename, report in zip(unique_filenames(reports), reports):
+            archive.writestr(filename, report['content'])
+    return buffer.getvalue()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate investor reports for a portfolio of deals.')
+    parser.add_argument('deals', help='CSV with one row per deal (columns as in DEAL_DEFAULTS)')
+    parser.add_argument('output_dir', nargs='?', default='reports', help='Directory for the reports')
+    parser.add_argument('--format', choices=REPORT_FORMATS, default='pdf')
+    parser.add_argument('--workers', type=int, default=REPORT_WORKERS)
+    options = parser.parse_args()
+
+    portfolio = load_deals(options.deals)
+    results = generate_reports(portfolio, options.format, workers=options.workers)
+    os.makedirs(options.output_dir, exist_ok=True)
+    for filename, report in zip(unique_filenames(results), results):
+        with open(os.path.join(options.output_dir, filename), 'wb') as output:
+            output.write(report['content'])
+    print(f"Wrote {len(results)} {options.format.upper()} reports to {options.output_dir} "
+          f"({sum(report['chart_hits'] for report in results)} charts served from the cache)")
@@ -0,0 +1,174 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Investor Return Metrics
+Created: December 2025
+
+IRR, NPV and MOIC for the investor's cash-flow stream, vectorized so
+thousands of scenarios or Monte Carlo paths are solved at once.
+"""
+
+import numpy as np
+
+
+def investor_cash_flows(payment_schedules, investment_amount=75.0, already_paid=0.0, current_month=1):
+    """
+    Investor cash flows by deal month: the investment out at month 0, payments back after.
+
+    Prior repayments are spread evenly over the months before the current
+    month (or netted at month 0 when the current month is the first).
+
+    Args:
+        payment_schedules: 'Payment to Vinmo' per month from the current month onward;
+            a 2D array (n, m) or a list of 1D arrays of different lengths
+        investment_amount: Total investment (₹ Lakhs, scalar or per scenario)
+        already_paid: Amount repaid before the current month (₹ Lakhs, scalar or per scenario)
+        current_month: Current month number in the deal timeline
+
+    Returns:
+        Array of shape (n, current_month + m) indexed by deal month
+    """
+    if isinstance(payment_schedules, np.ndarray) and payment_schedules.ndim == 2:
+        payments = payment_schedules.astype(float)
+    else:
+        schedules = [np.asarray(schedule, dtype=float) for schedule in payment_schedules]
+        payments = np.zeros((len(schedules), max(len(schedule) for schedule in schedules)))
+        for row, schedule in enumerate(schedules):
+            payments[row, :len(schedule)] = schedule
+
+    scenarios = len(payments)
+    investment = np.broadcast_to(np.asarray(investment_amount, dtype=float), (scenarios,))
+    prior = np.broadcast_to(np.asarray(already_paid, dtype=float), (scenarios,))
+
+    flows = np.zeros((scenarios, current_month + payments.shape[1]))
+    flows[:, 0] = -investment
+    if current_month > 1:
+        flows[:, 1:current_month] += (prior / (current_month - 1))[:, np.newaxis]
+    else:
+        flows[:, 0] += prior
+    flows[:, current_month:] += payments
+    return flows
+
+
+def cash_flow_dates(periods, current_month=1, today=None):
+    """
+    Calendar dates for monthly cash flows, with the current month falling in today's month.
+
+    Args:
+        periods: Number of monthly flows (deal months 0..periods-1)
+        current_month: Deal month number of the current calendar month
+        today: Reference date (default: today)
+
+    Returns:
+        Array of datetime64[D] month-start dates
+    """
+    this_month = np.datetime64('today' if today is None else today, 'M')
+    return (this_month + (np.arange(periods) - current_month)).astype('datetime64[D]')
+
+
+def batch_npv(rate, cash_flows, times=None):
+    """
+    Net present value of each cash-flow row at a per-period rate.
+
+    Args:
+        rate: Discount rate per period (fraction, scalar or shape (n,))
+        cash_flows: Array of shape (n, T)
+        times: Period of each flow, shape (T,) or (n, T) (default: 0..T-1)
+
+    Returns:
+        Array of NPVs, shape (n,)
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    times = np.arange(cash_flows.shape[1]) if times is None else np.asarray(times, dtype=float)
+    rate = np.asarray(rate, dtype=float).reshape(-1, 1)
+    return np.sum(cash_flows * (1 + rate) ** -times, axis=1)
+
+
+def batch_irr(cash_flows, times=None, low=-0.9, high=1.0, iterations=100, tolerance=1e-10):
+    """
+    Internal rate of return per period for every cash-flow row at once.
+
+    Safeguarded Newton: each step is taken only when it stays inside the
+    current sign-change bracket, otherwise the bracket is bisected, so every
+    row converges without a per-scenario Python loop.
+
+    Args:
+        cash_flows: Array of shape (n, T)
+        times: Period of each flow (default: 0..T-1); pass years from the first
+            date for an XIRR-style annual rate
+        low: Lower rate bound (default: -90% per period)
+        high: Upper rate bound (default: 100% per period)
+        iterations: Maximum iterations
+        tolerance: Convergence tolerance on the rate
+
+    Returns:
+        Array of rates, shape (n,); NaN where NPV does not change sign in the bracket
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    times = np.arange(cash_flows.shape[1]) if times is None else np.asarray(times, dtype=float)
+    scenarios = len(cash_flows)
+
+    lower = np.full(scenarios, float(low))
+    upper = np.full(scenarios, float(high))
+    npv_lower = batch_npv(lower, cash_flows, times)
+    npv_upper = batch_npv(upper, cash_flows, times)
+    bracketed = np.sign(npv_lower) != np.sign(npv_upper)
+
+    rate = np.zeros(scenarios)
+    for _ in range(iterations):
+        discount = (1 + rate[:, np.newaxis]) ** -times
+        npv = np.sum(cash_flows * discount, axis=1)
+        slope = np.sum(-times * cash_flows * discount / (1 + rate[:, np.newaxis]), axis=1)
+
+        # Shrink the bracket around the root
+        same_side = np.sign(npv) == np.sign(npv_lower)
+        lower = np.where(same_side, rate, lower)
+        npv_lower = np.where(same_side, npv, npv_lower)
+        upper = np.where(same_side, upper, rate)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate - npv / slope
+        inside = np.isfinite(newton) & (newton > lower) & (newton < upper)
+        next_rate = np.where(inside, newton, (lower + upper) / 2)
+
+        if np.all((np.abs(next_rate - rate) < tolerance) | ~bracketed):
+            rate = next_rate
+            break
+        rate = next_rate
+
+    return np.where(bracketed, rate, np.nan)
+
+
+def investor_returns(cash_flows, discount_rate=12.0, current_month=1, today=None):
+    """
+    Investor return metrics for each cash-flow row.
+
+    Args:
+        cash_flows: Array of shape (n, T) from investor_cash_flows
+        discount_rate: Annual discount rate for NPV (%)
+        current_month: Deal month number of the current calendar month (for XIRR dates)
+        today: Reference date for XIRR (default: today)
+
+    Returns:
+        Dict of arrays: 'monthly_irr', 'annual_irr', 'xirr' (fractions),
+        'npv' (₹ Lakhs), 'moic' (multiple)
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    monthly_irr = batch_irr(cash_flows)
+
+    dates = cash_flow_dates(cash_flows.shape[1], current_month, today)
+    years = (dates - dates[0]).astype(float) / 365.0
+    xirr = batch_irr(cash_flows, times=years, high=10.0)
+
+    monthly_discount = (1 + discount_rate / 100) ** (1 / 12) - 1
+    inflows = np.clip(cash_flows, 0, None).sum(axis=1)
+    outflows = -np.clip(cash_flows, None, 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moic = np.where(outflows > 0, inflows / outflows, np.nan)
+
+    return {
+        'monthly_irr': monthly_irr,
+        'annual_irr': (1 + monthly_irr) ** 12 - 1,
+        'xirr': xirr,
+        'npv': batch_npv(monthly_discount, cash_flows),
+        'moic': moic
+    }
@@ -0,0 +1,348 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Risk Analytics
+Created: December 2025
+
+Sensitivity and risk calculations for the Risk Analysis tab, built on the
+batched projection engine so thousands of scenarios evaluate in one pass.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from adnexus_engine import (
+    MAX_PROJECTION_MONTHS,
+    batch_projections,
+    batch_cohort_growth,
+    combine_growth,
+    schedule_array,
+)
+
+# Inputs varied by the sensitivity analyses, in sample-column order
+SENSITIVITY_INPUTS = [
+    'User Growth %',
+    'ARPU Growth %',
+    'Churn %',
+    'Redemption %',
+    'Starting Revenue (₹L)',
+    'Investment (₹L)',
+    'Already Paid (₹L)',
+]
+
+# Total recovery is measured at the 36-month target; over the full 120-month horizon
+# almost every scenario recovers the whole investment, which leaves nothing to explain
+SENSITIVITY_OUTPUTS = ['Months Remaining', 'Total Recovery by Target (₹L)']
+RECOVERY_TARGET_MONTHS = 36
+
+# Mitigation playbook per input, carried over from the original risk factor table
+RISK_MITIGATIONS = {
+    'User Growth %': 'Diversify channels',
+    'ARPU Growth %': 'Unique value prop',
+    'Churn %': 'Improve retention',
+    'Redemption %': 'Tighten redemption terms',
+    'Starting Revenue (₹L)': 'Accelerate monetisation',
+    'Investment (₹L)': 'Stage the investment',
+    'Already Paid (₹L)': 'Track actuals monthly',
+}
+
+
+def flex_schedule(schedule, current, values, periods):
+    """
+    Per-scenario copies of a schedule flexed to each sampled value.
+
+    The schedule is scaled by value ÷ current (shifted by value - current when
+    the current value is zero), so a scenario at the current value keeps the
+    schedule exactly.
+
+    Args:
+        schedule: Scalar rate or per-month schedule
+        current: Current value the schedule was built from
+        values: Sampled values, shape (n,)
+        periods: Schedule length
+
+    Returns:
+        Array of shape (n, periods)
+    """
+    schedule = schedule_array(schedule, periods)[np.newaxis, :]
+    values = np.asarray(values, dtype=float).reshape(-1, 1)
+    if current == 0:
+        return schedule + values
+    return schedule * (values / current)
+
+
+def scenario_projections(samples, fixed):
+    """
+    Batched projections for each row of a sample matrix of SENSITIVITY_INPUTS.
+
+    Args:
+        samples: Array of shape (n, len(SENSITIVITY_INPUTS))
+        fixed: Dict of non-varied terms: 'revenue_share_pct', 'months', 'revenue_model'
+            and, for the cohort model, 'acquisitions' from cohort_acquisitions.
+            Optional 'user_growth_schedule' and 'redemption_schedule' (the
+            dashboard's growth curve and redemption schedule) are flexed
+            relative to 'current_values' (see flex_schedule) instead of being
+            replaced by flat rates
+
+    Returns:
+        batch_projections result dict, plus 'already_paid' per scenario
+    """
+    user_growth, arpu_growth, churn, redemption, revenue, investment, paid = np.asarray(samples, dtype=float).T
+    months = fixed.get('months', MAX_PROJECTION_MONTHS)
+    current = fixed.get('current_values', {})
+
+    if fixed.get('user_growth_schedule') is not None:
+        user_growth = flex_schedule(fixed['user_growth_schedule'], current['User Growth %'], user_growth, months)
+    if fixed.get('redemption_schedule') is not None:
+        redemption = np.clip(flex_schedule(fixed['redemption_schedule'], current['Redemption %'], redemption,
+                                           months + 1), 0, 100)
+
+    if fixed.get('revenue_model') == 'cohort':
+        growth = batch_cohort_growth(fixed['acquisitions'], churn, arpu_growth, periods=months)
+    else:
+        # A flexed growth curve has one row per scenario
+        growth = combine_growth(user_growth, arpu_growth.reshape(-1, 1) if np.ndim(user_growth) == 2 else arpu_growth)
+
+    paid = np.minimum(paid, investment)
+    outcome = batch_projections(revenue, growth, redemption_rate=redemption,
+                                revenue_share_pct=fixed.get('revenue_share_pct', 5), months=months,
+                                investment_amount=investment, already_paid=paid)
+    outcome['already_paid'] = paid
+    return outcome
+
+
+def repayment_outcomes(samples, fixed):
+    """
+    Payoff month and total recovery for each row of a sample matrix.
+
+    Module-level (not a closure) so it can be shipped to worker processes.
+
+    Args:
+        samples: Array of shape (n, len(SENSITIVITY_INPUTS))
+        fixed: Terms for scenario_projections, plus optional 'recovery_months'
+
+    Returns:
+        Array of shape (n, len(SENSITIVITY_OUTPUTS))
+    """
+    outcome = scenario_projections(samples, fixed)
+    recovery_months = fixed.get('recovery_months', RECOVERY_TARGET_MONTHS)
+    recovered = outcome['already_paid'] + outcome['payments'][:, :recovery_months + 1].sum(axis=1)
+    return np.column_stack([outcome['months_remaining'], recovered])
+
+
+def evaluate_in_batches(model, samples, fixed, workers=None, chunk_size=8192):
+    """
+    Evaluate a batched model over a sample matrix, optionally across a process pool.
+
+    Args:
+        model: Module-level function (samples, fixed) -> outputs
+        samples: Array of shape (n, d)
+        fixed: Extra arguments passed to every call
+        workers: Number of worker processes (None or 1 = evaluate in-process)
+        chunk_size: Rows per batch
+
+    Returns:
+        Stacked model outputs for all rows
+    """
+    chunks = [samples[start:start + chunk_size] for start in range(0, len(samples), chunk_size)]
+    if not workers or workers <= 1 or len(chunks) == 1:
+        return np.concatenate([model(chunk, fixed) for chunk in chunks])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return np.concatenate(list(pool.map(model, chunks, repeat(fixed))))
+
+
+def saltelli_samples(bounds, base_samples=4096, seed=42):
+    """
+    Saltelli sample matrices A, B and the d "A with column i from B" matrices.
+
+    Uses a scrambled Sobol sequence over 2d dimensions so both base matrices
+    are low-discrepancy.
+
+    Args:
+        bounds: Sequence of (low, high) per input
+        base_samples: Rows per matrix (rounded up to a power of two)
+        seed: Random seed for scrambling
+
+    Returns:
+        Array of shape ((d + 2) * n, d): A, then B, then each AB_i
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    dims = len(bounds)
+    exponent = int(np.ceil(np.log2(max(base_samples, 2))))
+    unit = qmc.Sobol(d=2 * dims, scramble=True, seed=seed).random_base2(exponent)
+    low = np.tile(bounds[:, 0], 2)
+    span = np.tile(bounds[:, 1] - bounds[:, 0], 2)
+    scaled = low + unit * span
+    matrix_a, matrix_b = scaled[:, :dims], scaled[:, dims:]
+
+    mixed = np.repeat(matrix_a[np.newaxis, :, :], dims, axis=0)
+    mixed[np.arange(dims), :, np.arange(dims)] = matrix_b.T
+    return np.concatenate([matrix_a, matrix_b, mixed.reshape(-1, dims)])
+
+
+def sobol_indices(outputs, dims):
+    """
+    First-order (Saltelli 2010) and total-order (Jansen) Sobol indices.
+
+    Args:
+        outputs: Model outputs for the rows of saltelli_samples, shape ((d + 2) * n,) or ((d + 2) * n, k)
+        dims: Number of inputs d
+
+    Returns:
+        Tuple of (first_order, total_order), each of shape (d,) or (d, k)
+    """
+    outputs = np.asarray(outputs, dtype=float)
+    blocks = outputs.reshape(dims + 2, -1, *outputs.shape[1:])
+    f_a, f_b, f_ab = blocks[0], blocks[1], blocks[2:]
+    variance = np.var(np.concatenate([f_a, f_b]), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first_order = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+        total_order = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / variance
+    # A constant output has no variance to apportion
+    first_order = np.where(variance > 0, first_order, 0.0)
+    total_order = np.where(variance > 0, total_order, 0.0)
+    return first_order, total_order
+
+
+def global_sensitivity(bounds, fixed, base_samples=4096, seed=42, workers=None):
+    """
+    Sobol sensitivity of payoff month and total recovery to every sidebar input.
+
+    Args:
+        bounds: Dict mapping each name in SENSITIVITY_INPUTS to (low, high)
+        fixed: Non-varied terms for repayment_outcomes
+        base_samples: Rows per Saltelli matrix; evaluations = (d + 2) × base_samples
+        seed: Random seed for the Sobol sequence
+        workers: Optional number of worker processes
+
+    Returns:
+        DataFrame with one row per (input, output): 'Input', 'Output',
+        'First Order', 'Total Order', sorted by total order within each output
+    """
+    dims = len(SENSITIVITY_INPUTS)
+    samples = saltelli_samples([bounds[name] for name in SENSITIVITY_INPUTS], base_samples, seed)
+    outputs = evaluate_in_batches(repayment_outcomes, samples, fixed, workers=workers)
+    return sensitivity_frame(*sobol_indices(outputs, dims))
+
+
+def iter_global_sensitivity(bounds, fixed, base_samples=4096, seed=42, batch_rows=512):
+    """
+    Progressive global sensitivity: indices re-estimated after each batch of base rows.
+
+    Every batch evaluates the same rows of A, B and each AB_i, so the first m
+    rows form a complete smaller Saltelli design and the partial indices are
+    valid estimates that converge to global_sensitivity with the same seed.
+
+    Args:
+        bounds: Dict mapping each name in SENSITIVITY_INPUTS to (low, high)
+        fixed: Non-varied terms for repayment_outcomes
+        base_samples: Rows per Saltelli matrix; evaluations = (d + 2) × base_samples
+        seed: Random seed for the Sobol sequence
+        batch_rows: Base rows evaluated per batch
+
+    Yields:
+        Tuple of (fraction_done, frame) with frame as returned by global_sensitivity
+    """
+    dims = len(SENSITIVITY_INPUTS)
+    samples = saltelli_samples([bounds[name] for name in SENSITIVITY_INPUTS], base_samples, seed)
+    blocks = samples.reshape(dims + 2, -1, dims)
+    rows = blocks.shape[1]
+    outputs = np.empty((dims + 2, rows, len(SENSITIVITY_OUTPUTS)))
+    for start in range(0, rows, batch_rows):
+        stop = min(start + batch_rows, rows)
+        batch = blocks[:, start:stop].reshape(-1, dims)
+        outputs[:, start:stop] = repayment_outcomes(batch, fixed).reshape(dims + 2, stop - start, -1)
+        done = outputs[:, :stop].reshape(-1, len(SENSITIVITY_OUTPUTS))
+        yield stop / rows, sensitivity_frame(*sobol_indices(done, dims))
+
+
+def sensitivity_frame(first_order, total_order):
+    """
+    Sobol indices as a ranked table.
+
+    Args:
+        first_order: First-order indices, shape (d, k) for SENSITIVITY_INPUTS × SENSITIVITY_OUTPUTS
+        total_order: Total-order indices, same shape
+
+    Returns:
+        DataFrame with one row per (input, output): 'Input', 'Output',
+        'First Order', 'Total Order', sorted by total order within each output
+    """
+    rows = []
+    for output_index, output_name in enumerate(SENSITIVITY_OUTPUTS):
+        for input_index, input_name in enumerate(SENSITIVITY_INPUTS):
+            rows.append({
+                'Input': input_name,
+                'Output': output_name,
+                'First Order': float(np.clip(first_order[input_index, output_index], 0, 1)),
+                'Total Order': float(np.clip(total_order[input_index, output_index], 0, 1))
+            })
+    return (pd.DataFrame(rows)
+            .sort_values(['Output', 'Total Order'], ascending=[True, False])
+            .reset_index(drop=True))
+
+
+def tornado_analysis(current_values, bounds, fixed):
+    """
+    One-at-a-time swings in payoff month and balance for every input.
+
+    The base case and all 2 × N low/high perturbations are stacked into one
+    sample matrix and evaluated in a single batched call. Two balances are
+    reported: the final balance left at the end of the projection horizon
+    (zero whenever repayment completes) and the balance left at the end of
+    the 36-month target window (see SENSITIVITY_OUTPUTS).
+
+    Args:
+        current_values: Dict of current value per name in SENSITIVITY_INPUTS
+        bounds: Dict mapping each input to its (low, high) flex values
+        fixed: Non-varied terms for scenario_projections, plus optional 'recovery_months'
+
+    Returns:
+        DataFrame with one row per input, sorted by months swing (largest first)
+    """
+    base = np.array([current_values[name] for name in SENSITIVITY_INPUTS], dtype=float)
+    dims = len(base)
+    samples = np.repeat(base[np.newaxis, :], 2 * dims + 1, axis=0)
+    for index, name in enumerate(SENSITIVITY_INPUTS):
+        samples[1 + 2 * index, index], samples[2 + 2 * index, index] = bounds[name]
+
+    outcome = scenario_projections(samples, fixed)
+    months = outcome['months_remaining']
+    recovery_months = fixed.get('recovery_months', RECOVERY_TARGET_MONTHS)
+    recovered = outcome['already_paid'] + outcome['payments'][:, :recovery_months + 1].sum(axis=1)
+    balance = np.maximum(0, samples[:, SENSITIVITY_INPUTS.index('Investment (₹L)')] - recovered)
+    final_balance = outcome['final_balance']
+    complete = outcome['complete']
+
+    rows = []
+    for index, name in enumerate(SENSITIVITY_INPUTS):
+        low, high = 1 + 2 * index, 2 + 2 * index
+        # Worst side is whichever flex delays repayment more
+        worst_delta = max(months[low], months[high]) - months[0]
+        rows.append({
+            'Input': name,
+            'Low Value': samples[low, index],
+            'High Value': samples[high, index],
+            'Months @ Low': int(months[low]),
+            'Months @ High': int(months[high]),
+            'Low Complete': bool(complete[low]),
+            'High Complete': bool(complete[high]),
+            'Months Swing': int(abs(months[high] - months[low])),
+            'Final Balance @ Low (₹L)': final_balance[low],
+            'Final Balance @ High (₹L)': final_balance[high],
+            'Final Balance Swing (₹L)': abs(final_balance[high] - final_balance[low]),
+            'Target Balance @ Low (₹L)': balance[low],
+            'Target Balance @ High (₹L)': balance[high],
+            'Target Balance Swing (₹L)': abs(balance[high] - balance[low]),
+            'Impact': f'{worst_delta:+d} months'
+        })
+    df = pd.DataFrame(rows).sort_values(['Months Swing', 'Final Balance Swing (₹L)', 'Target Balance Swing (₹L)'],
+                                        ascending=False)
+    df.attrs['base_months'] = int(months[0])
+    df.attrs['base_complete'] = bool(complete[0])
+    df.attrs['base_balance'] = float(balance[0])
+    df.attrs['base_final_balance'] = float(final_balance[0])
+    return df.reset_index(drop=True)
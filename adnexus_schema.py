@@ -0,0 +1,164 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Compact Frame Schema
+Created: December 2025
+
+Compact storage for long projection frames and cached result arrays: short
+column names, int16 months, float32 or fixed-point int64 paise for money and
+an optional categorical deal ID. The dashboard keeps its daily/weekly frames
+and the exit valuation grid in this form; monthly frames (at most 121 rows)
+stay in display form, since the saving there is a few hundred bytes.
+Compact frames are mapped back to display names (display_frame) before they
+are shown, so the dashboard only ever refers to display column names.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 1 Lakh = ₹100,000 = 10,000,000 paise
+PAISE_PER_LAKH = 10_000_000
+
+# Saturation bound for paise conversions (runaway compound growth stays inside int64)
+MAX_PAISE = 2 ** 62
+
+# Display column -> (compact column, kind)
+COLUMN_SCHEMA = {
+    'Day': ('day', 'period'),
+    'Week': ('week', 'period'),
+    'Month': ('month', 'month'),
+    'Gross Revenue (₹L)': ('gross_revenue', 'money'),
+    'Redemptions (₹L)': ('redemptions', 'money'),
+    'Net Revenue (₹L)': ('net_revenue', 'money'),
+    'Payment to Vinmo (₹L)': ('payment', 'money'),
+    'Cumulative Paid (₹L)': ('cumulative_paid', 'money'),
+    'Balance (₹L)': ('balance', 'money'),
+    'MAU': ('mau', 'count'),
+    'ARPU': ('arpu', 'ratio'),
+    'LTV': ('ltv', 'ratio'),
+    'CAC': ('cac', 'ratio'),
+    'LTV/CAC': ('ltv_cac', 'ratio'),
+}
+DISPLAY_NAMES = {compact: display for display, (compact, _) in COLUMN_SCHEMA.items()}
+COLUMN_KINDS = {compact: kind for compact, kind in COLUMN_SCHEMA.values()}
+
+
+def to_paise(lakhs):
+    """
+    Convert ₹ Lakh amounts to whole paise.
+
+    Args:
+        lakhs: Amount(s) in ₹ Lakhs
+
+    Returns:
+        int64 array of paise (rounded to the nearest paisa, saturating at ±MAX_PAISE)
+    """
+    paise = np.rint(np.asarray(lakhs, dtype=float) * PAISE_PER_LAKH)
+    return np.clip(paise, -MAX_PAISE, MAX_PAISE).astype(np.int64)
+
+
+def from_paise(paise):
+    """
+    Convert paise to ₹ Lakhs.
+
+    Args:
+        paise: Amount(s) in paise
+
+    Returns:
+        float64 array of ₹ Lakhs
+    """
+    return np.asarray(paise, dtype=np.int64) / PAISE_PER_LAKH
+
+
+def compact_array(values, kind, money='float32'):
+    """
+    Store one column in its compact dtype.
+
+    Args:
+        values: Column values
+        kind: 'period', 'month', 'money', 'count' or 'ratio' (see COLUMN_SCHEMA)
+        money: 'float32' or 'paise' storage for money columns
+
+    Returns:
+        Array in the compact dtype
+    """
+    if kind == 'month':
+        return np.asarray(values).astype(np.int16)
+    if kind in ('period', 'count'):
+        return np.asarray(values).astype(np.int32)
+    if kind == 'money' and money == 'paise':
+        return to_paise(values)
+    return np.asarray(values, dtype=np.float32)
+
+
+def compact_frame(df, money='float32', deal_id=None):
+    """
+    Compact copy of a projection or unit-economics frame.
+
+    Args:
+        df: Frame with display column names (see COLUMN_SCHEMA)
+        money: 'float32' or 'paise' storage for money columns
+        deal_id: Optional deal identifier added as a categorical 'deal_id' column
+
+    Returns:
+        DataFrame with compact column names and dtypes; unknown columns and attrs are kept as-is
+    """
+    columns = {}
+    if deal_id is not None:
+        columns['deal_id'] = pd.Categorical([deal_id] * len(df))
+    for name in df.columns:
+        if name in COLUMN_SCHEMA:
+            compact, kind = COLUMN_SCHEMA[name]
+            columns[compact] = compact_array(df[name].to_numpy(), kind, money)
+        else:
+            columns[name] = df[name].to_numpy()
+    frame = pd.DataFrame(columns, copy=False)
+    frame.attrs.update(df.attrs)
+    frame.attrs['money'] = money
+    return frame
+
+
+def display_frame(compact):
+    """
+    Expand a compact frame back to display names, with money in float64 ₹ Lakhs.
+
+    Args:
+        compact: Frame from compact_frame
+
+    Returns:
+        DataFrame with display column names (deal ID shown as 'Deal') and the
+        compact frame's attrs
+    """
+    money = compact.attrs.get('money', 'float32')
+    columns = {}
+    for name in compact.columns:
+        values = compact[name]
+        kind = COLUMN_KINDS.get(name)
+        if name == 'deal_id':
+            columns['Deal'] = values
+        elif kind == 'money':
+            columns[DISPLAY_NAMES[name]] = (from_paise(values.to_numpy()) if money == 'paise'
+                                            else values.to_numpy(dtype=float))
+        elif kind == 'ratio':
+            columns[DISPLAY_NAMES[name]] = values.to_numpy(dtype=float)
+        elif kind is not None:
+            columns[DISPLAY_NAMES[name]] = values.to_numpy(dtype=np.int64)
+        else:
+            columns[name] = values
+    frame = pd.DataFrame(columns, copy=False)
+    frame.attrs.update({key: value for key, value in compact.attrs.items() if key != 'money'})
+    return frame
+
+
+def compact_arrays(arrays, dtype=np.float32):
+    """
+    Downcast the float64 arrays of a result dict (e.g. a cached scenario grid).
+
+    Args:
+        arrays: Dict of name -> array or other value
+        dtype: Target floating dtype
+
+    Returns:
+        Dict with float64 arrays stored as `dtype`; other entries unchanged
+    """
+    return {name: value.astype(dtype) if isinstance(value, np.ndarray) and value.dtype == np.float64 else value
+            for name, value in arrays.items()}
@@ -0,0 +1,222 @@
+"""
+AdNexus - Vinmo Investment Tracker
+Stress Testing
+Created: December 2025
+
+Path-dependent stress tests: sequences of shocks (revenue drops with a
+recovery, redemption spikes, payment holidays) applied month by month to the
+projected revenue and payment schedule. A scenario is a set of shock rows
+sharing a name; every scenario of a library is turned into (scenarios ×
+months) revenue-factor, redemption and holiday matrices and run through the
+paise ledger in one batched pass, so hundreds of scenarios cost about as much
+as one projection.
+"""
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import MAX_PROJECTION_MONTHS, growth_path, repayment_ledger, schedule_array
+from adnexus_risk import RECOVERY_TARGET_MONTHS
+from adnexus_schema import from_paise
+
+SHOCK_KINDS = ('Revenue Drop', 'Redemption Spike', 'Payment Holiday')
+
+# Shock table columns; Start Month counts months ahead of the current month (1 = next month)
+SHOCK_COLUMNS = ['Scenario', 'Shock', 'Start Month', 'Months', 'Depth %', 'Recovery Months', 'Redemption %']
+
+# Values used for blank cells of a shock table
+SHOCK_DEFAULTS = {'Months': 1, 'Depth %': 100.0, 'Recovery Months': 0, 'Redemption %': 90.0}
+
+# Grid of the built-in library (see stress_library)
+LIBRARY_STARTS = (1, 3, 6, 12, 24)
+LIBRARY_DURATIONS = (1, 3, 6)
+LIBRARY_DEPTHS = (25, 50, 75, 100)
+LIBRARY_RECOVERIES = (0, 6)
+LIBRARY_SPIKES = (70, 85, 95)
+LIBRARY_HOLIDAYS = (1, 3, 6, 12)
+
+
+def stress_library(starts=LIBRARY_STARTS):
+    """
+    Built-in library of single and compound stress scenarios.
+
+    Single shocks: revenue drops (25-100% for 1-6 months, recovering at once
+    or over 6 months), redemption spikes (70-95%) and payment holidays (1-12
+    months). Compound shocks: a drop with a redemption spike, a regulatory
+    pause (no revenue and no payments) and a double dip a year apart.
+
+    Args:
+        starts: Start months (ahead of the current month) of every shock
+
+    Returns:
+        DataFrame of shock rows with SHOCK_COLUMNS
+    """
+    rows = []
+
+    def add(name, shock, start, months, depth=np.nan, recovery=np.nan, redemption=np.nan):
+        rows.append((name, shock, start, months, depth, recovery, redemption))
+
+    for start in starts:
+        for months in LIBRARY_DURATIONS:
+            for depth in LIBRARY_DEPTHS:
+                for recovery in LIBRARY_RECOVERIES:
+                    suffix = f", {recovery}m recovery" if recovery else ""
+                    add(f"Drop {depth}% for {months}m from +{start}{suffix}", 'Revenue Drop', start, months,
+                        depth, recovery)
+            for rate in LIBRARY_SPIKES:
+                add(f"Redemptions {rate}% for {months}m from +{start}", 'Redemption Spike', start, months,
+                    redemption=rate)
+            name = f"Drop 50% + redemptions 85% for {months}m from +{start}"
+            add(name, 'Revenue Drop', start, months, 50, 6)
+            add(name, 'Redemption Spike', start, months, redemption=85)
+            name = f"Regulatory pause {months}m from +{start}"
+            add(name, 'Revenue Drop', start, months, 100, 3)
+            add(name, 'Payment Holiday', start, months)
+        for months in LIBRARY_HOLIDAYS:
+            add(f"Payment holiday {months}m from +{start}", 'Payment Holiday', start, months)
+        name = f"Double dip 50% from +{start} and +{start + 12}"
+        add(name, 'Revenue Drop', start, 3, 50, 6)
+        add(name, 'Revenue Drop', start + 12, 3, 50, 6)
+    return pd.DataFrame(rows, columns=SHOCK_COLUMNS)
+
+
+def shock_matrices(shocks, months=MAX_PROJECTION_MONTHS):
+    """
+    Month-by-month effect of every scenario's shocks.
+
+    Each shock row becomes one row over the horizon by broadcasting against
+    the month index; rows are then folded into their scenario with ufunc.at
+    (drops multiply, redemption spikes take the highest rate, holidays OR).
+
+    A revenue drop of Depth % lasts Months months; the shortfall then closes
+    linearly over Recovery Months. Overlapping drops compound.
+
+    Args:
+        shocks: DataFrame with SHOCK_COLUMNS (blank cells take SHOCK_DEFAULTS)
+        months: Projection horizon
+
+    Returns:
+        Dict with 'scenarios' (names in order of first appearance) and
+        (n, months + 1) matrices 'revenue_factor', 'redemption_floor' (%) and
+        'holiday' (bool)
+    """
+    shocks = shocks.fillna(SHOCK_DEFAULTS)
+    kinds = shocks['Shock'].to_numpy()
+    unknown = sorted(set(kinds) - set(SHOCK_KINDS))
+    if unknown:
+        raise ValueError(f"Unknown shocks: {', '.join(map(str, unknown))} (expected {', '.join(SHOCK_KINDS)})")
+    codes, scenarios = pd.factorize(shocks['Scenario'], sort=False)
+
+    def column(name):
+        return shocks[name].to_numpy(dtype=float)[:, np.newaxis]
+
+    month = np.arange(months + 1)
+    start = column('Start Month')
+    end = start + np.maximum(column('Months'), 0)
+    inside = (month >= start) & (month < end)
+    # After the drop: the remaining shortfall fraction falls linearly to zero over the recovery
+    recovering = np.clip(1 - (month - end + 1) / (np.maximum(column('Recovery Months'), 0) + 1), 0, 1)
+    shortfall = np.where(inside, 1.0, np.where(month >= end, recovering, 0.0))
+    depth = np.clip(column('Depth %'), 0, 100) / 100
+
+    shape = (len(scenarios), months + 1)
+    revenue_factor = np.ones(shape)
+    redemption_floor = np.zeros(shape)
+    holiday = np.zeros(shape, dtype=bool)
+    drop, spike, pause = (kinds == kind for kind in SHOCK_KINDS)
+    np.multiply.at(revenue_factor, codes[drop], (1 - depth * shortfall)[drop])
+    np.maximum.at(redemption_floor, codes[spike], np.where(inside, column('Redemption %'), 0.0)[spike])
+    np.logical_or.at(holiday, codes[pause], inside[pause])
+    return {'scenarios': list(scenarios), 'revenue_factor': revenue_factor,
+            'redemption_floor': redemption_floor, 'holiday': holiday}
+
+
+def stress_ledger(matrices, current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5,
+                  months=MAX_PROJECTION_MONTHS, investment_amount=75.0, already_paid=0.0):
+    """
+    Paise ledger of every stressed scenario in one batched pass.
+
+    The unstressed revenue path is computed once and the scenario matrices are
+    applied to it; a scenario without shocks reproduces calculate_projections.
+
+    Args:
+        matrices: shock_matrices result
+        current_revenue, growth_rate, redemption_rate, revenue_share_pct,
+        investment_amount, already_paid: As in calculate_projections
+        months: Projection horizon (must match the matrices)
+
+    Returns:
+        repayment_ledger result for the (n, months + 1) stressed payments
+    """
+    gross_revenue = current_revenue * growth_path(growth_rate, months) * matrices['revenue_factor']
+    redemption_pct = np.maximum(schedule_array(redemption_rate, months + 1), matrices['redemption_floor'])
+    redemption_amount = gross_revenue * (redemption_pct / 100)
+    calculated_payment = (gross_revenue - redemption_amount) * (revenue_share_pct / 100)
+    calculated_payment = np.where(matrices['holiday'], 0.0, calculated_payment)
+    return repayment_ledger(calculated_payment, investment_amount, already_paid)
+
+
+def stress_test(shocks, current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5,
+                months=MAX_PROJECTION_MONTHS, investment_amount=75.0, already_paid=0.0,
+                target_months=RECOVERY_TARGET_MONTHS):
+    """
+    Payoff month and shortfall of every stress scenario, worst first.
+
+    Args:
+        shocks: DataFrame of shock rows with SHOCK_COLUMNS (e.g. stress_library())
+        current_revenue, growth_rate, redemption_rate, revenue_share_pct,
+        investment_amount, already_paid: As in calculate_projections
+        months: Projection horizon
+        target_months: Month (ahead of the current month) the shortfall is measured at
+
+    Returns:
+        DataFrame with one row per scenario: Scenario, Months Remaining,
+        Complete, Delay (Months), Shortfall @ Target (₹L) (balance at the
+        target month), Final Balance (₹L) and Payments Lost (₹L) (by the
+        target, vs the unstressed schedule). attrs hold the base case
+        ('base_months', 'base_complete', 'base_shortfall') and the worst case
+        ('worst_months', 'worst_complete', 'worst_scenario', 'max_shortfall',
+        'max_shortfall_scenario', 'missed_target')
+    """
+    matrices = shock_matrices(shocks, months)
+    # The unstressed schedule rides along as the last row of the batch
+    batch = {
+        'revenue_factor': np.vstack([matrices['revenue_factor'], np.ones(months + 1)]),
+        'redemption_floor': np.vstack([matrices['redemption_floor'], np.zeros(months + 1)]),
+        'holiday': np.vstack([matrices['holiday'], np.zeros(months + 1, dtype=bool)]),
+    }
+    ledger = stress_ledger(batch, current_revenue, growth_rate, redemption_rate, revenue_share_pct,
+                           months, investment_amount, already_paid)
+    target = min(target_months, months)
+    months_remaining = np.where(ledger['complete'], ledger['payoff_index'], months)
+    shortfall = from_paise(ledger['balance'][:, target])
+    paid_by_target = ledger['cumulative_paid'][:, target]
+
+    df = pd.DataFrame({
+        'Scenario': matrices['scenarios'],
+        'Months Remaining': months_remaining[:-1],
+        'Complete': ledger['complete'][:-1],
+        'Delay (Months)': months_remaining[:-1] - months_remaining[-1],
+        'Shortfall @ Target (₹L)': shortfall[:-1],
+        'Final Balance (₹L)': from_paise(ledger['balance'][:-1, -1]),
+        'Payments Lost (₹L)': from_paise(paid_by_target[-1] - paid_by_target[:-1]),
+    }).sort_values(['Months Remaining', 'Final Balance (₹L)', 'Shortfall @ Target (₹L)'], ascending=False)
+    df = df.reset_index(drop=True)
+
+    # With no scenarios the worst case is the base case
+    base = {'months': int(months_remaining[-1]), 'complete': bool(ledger['complete'][-1]),
+            'shortfall': float(shortfall[-1])}
+    deepest = df['Shortfall @ Target (₹L)'].idxmax() if len(df) else None
+    df.attrs.update({
+        'base_months': base['months'],
+        'base_complete': base['complete'],
+        'base_shortfall': base['shortfall'],
+        'target_months': target,
+        'worst_months': int(df['Months Remaining'].iloc[0]) if len(df) else base['months'],
+        'worst_complete': bool(df['Complete'].iloc[0]) if len(df) else base['complete'],
+        'worst_scenario': df['Scenario'].iloc[0] if len(df) else None,
+        'max_shortfall': float(df.loc[deepest, 'Shortfall @ Target (₹L)']) if len(df) else base['shortfall'],
+        'max_shortfall_scenario': df.loc[deepest, 'Scenario'] if len(df) else None,
+        'missed_target': int((df['Shortfall @ Target (₹L)'] > 0).sum()),
+    })
+    return df
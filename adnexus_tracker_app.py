@@ -10,7 +10,93 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+import io
+import os
+import uuid
 import plotly.figure_factory as ff
+from adnexus_risk import (
+    SENSITIVITY_INPUTS,
+    SENSITIVITY_OUTPUTS,
+    RISK_MITIGATIONS,
+    RECOVERY_TARGET_MONTHS,
+    iter_global_sensitivity,
+    tornado_analysis,
+)
+from adnexus_optimize import (
+    DEFAULT_PLAN_MONTHS,
+    OPTIMIZER_OBJECTIVES,
+    SEARCH_POPULATION,
+    SEARCH_ROUNDS,
+    iter_optimize_spend,
+    spend_model,
+    spend_plan_frame,
+)
+from adnexus_microsim import ARPU_DISPERSION, MICROSIM_RUNS, iter_simulate_users, microsim_bands, microsim_repayment
+from adnexus_stress import SHOCK_COLUMNS, SHOCK_KINDS, shock_matrices, stress_ledger, stress_library, stress_test
+from adnexus_engine import (
+    MAX_CHART_POINTS,
+    PERIOD_COLUMNS,
+    PERIODS_PER_MONTH,
+    ROLLUP_MONTHS,
+    aggregate_periods,
+    calculate_projections,
+    calculate_unit_economics,
+    downsample_indices,
+    calculate_cohort_revenue,
+    cohort_layers,
+    retention_curve,
+    growth_from_path,
+    growth_path,
+    combine_growth,
+    decay_schedule,
+    logistic_schedule,
+    piecewise_schedule,
+    payoff_months_continuous,
+    iso_repayment_growth,
+)
+from adnexus_exit import exit_valuation_grid, exit_grid_frame
+from adnexus_lookup import load_payoff_table
+from adnexus_schema import compact_arrays, compact_frame, display_frame, from_paise
+from adnexus_memory import SessionMemory, memory_key, CACHE_MAX_ENTRIES, SESSION_TTL_SECONDS
+from adnexus_jobs import JobRunner
+from adnexus_graph import (
+    DASHBOARD,
+    SCENARIO_GROWTH_RATES,
+    SCENARIO_PROBABILITIES,
+    SENSITIVITY_GROWTH_RATES,
+    SENSITIVITY_REDEMPTION_RATES,
+)
+from adnexus_compare import (
+    MAX_PINNED_VARIANTS,
+    comparison_frame,
+    comparison_summary,
+    divergence,
+    months_remaining as state_months_remaining,
+    projection_state,
+    variant_state,
+)
+from adnexus_fit import (
+    FIT_METHODS,
+    FIT_WORKERS,
+    fit_portfolio,
+    fitted_growth,
+    growth_table,
+    load_history,
+    repayment_distribution,
+    scenario_probabilities,
+)
+from adnexus_ingest import ACTUALS_PATH, actuals_summary, load_actuals, monthly_actuals
+from adnexus_live import LIVE_FEED_PATH, LIVE_REFRESH_SECONDS, LiveFeed
+from adnexus_reports import (
+    REPORT_FORMATS,
+    REPORT_WORKERS,
+    DEAL_DEFAULTS,
+    generate_report,
+    generate_reports,
+    load_deals,
+    portfolio_rollup,
+    reports_archive,
+)
 
 # Page configuration
 st.set_page_config(
@@ -43,14 +129,50 @@ st.markdown("### Real-time Revenue Share & Growth Analytics Dashboard")
 st.sidebar.header("📊 Current Metrics")
 st.sidebar.markdown("Update your actuals here:")
 
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS)
+def ingested_actuals(path, modified):
+    """
+    Monthly aggregates written by adnexus_ingest.py (re-read when the file changes).
+
+    Args:
+        path: Aggregates file
+        modified: File modification time (cache key only)
+
+    Returns:
+        DataFrame of per-deal monthly aggregates
+    """
+    return load_actuals(path)
+
+# Ingested transaction actuals (python adnexus_ingest.py ...) seed the current metrics
+actuals_start = None
+deal_actuals = None
+if os.path.exists(ACTUALS_PATH):
+    actuals_table = ingested_actuals(ACTUALS_PATH, os.path.getmtime(ACTUALS_PATH))
+    actuals_deals = list(dict.fromkeys(actuals_table['deal']))
+    actuals_deal = (st.sidebar.selectbox("Actuals Deal", actuals_deals, key="actuals_deal")
+                    if len(actuals_deals) > 1 else actuals_deals[0])
+    deal_actuals = monthly_actuals(actuals_table, actuals_deal)
+    actuals_start = actuals_summary(deal_actuals)
+    if actuals_start is not None:
+        st.sidebar.caption(f"Starting from ingested actuals through {actuals_start['latest_month']} "
+                           f"({actuals_start['current_month']} complete months)")
+
 # Current metrics inputs
 current_month = st.sidebar.number_input(
     "Current Month #",
     min_value=1,
     max_value=60,
-    value=1,
+    value=min(actuals_start['current_month'], 60) if actuals_start else 1,
     help="What month are you currently in? (1 = first month, etc.). Projections will show future months from this point."
 )
+current_month_start = st.sidebar.date_input(
+    "Current Month Starts",
+    value=(pd.Period(actuals_start['latest_month'], 'M').start_time.date() if actuals_start
+           else datetime.now().date().replace(day=1)),
+    key="period_start",
+    help="Calendar date of the current month: places projections in April–March fiscal years and gives "
+         "daily payoff dates."
+)
 current_mau = st.sidebar.number_input(
     "Current MAU",
     min_value=1000,
@@ -71,7 +193,7 @@ current_monthly_revenue = st.sidebar.number_input(
     "Current Monthly Revenue (₹ Lakhs)",
     min_value=1.0,
     max_value=1000.0,
-    value=10.0,
+    value=min(max(round(actuals_start['current_revenue'], 2), 1.0), 1000.0) if actuals_start else 10.0,
     step=1.0,
     help="Your current monthly revenue. Should equal MAU × ARPU ÷ 100,000"
 )
@@ -79,30 +201,42 @@ current_monthly_revenue = st.sidebar.number_input(
 st.sidebar.markdown("---")
 st.sidebar.header("🎯 Growth Assumptions")
 
-# Growth inputs
-monthly_user_growth = st.sidebar.slider(
-    "Monthly User Growth %",
-    min_value=0.0,
-    max_value=20.0,
-    value=7.5,
-    step=0.5,
-    help="NET user growth rate (new users - churned users). This is used for revenue projections."
-)
-monthly_arpu_growth = st.sidebar.slider(
-    "Monthly ARPU Growth %",
-    min_value=0.0,
-    max_value=10.0,
-    value=2.0,
-    step=0.5,
-    help="Expected monthly growth in Average Revenue Per User"
+# Growth inputs (or the growth fitted to uploaded history in Assumptions)
+growth_fit = st.session_state.get('growth_fit')
+use_fitted_growth = growth_fit is not None and st.sidebar.toggle(
+    f"Use fitted growth ({growth_fit['deal']})",
+    key="use_fitted_growth",
+    help="Growth estimated from the uploaded history in Assumptions; scenario probabilities follow its bootstrap"
 )
+if use_fitted_growth:
+    monthly_user_growth = growth_fit['user_growth']
+    monthly_arpu_growth = growth_fit['arpu_growth']
+    st.sidebar.caption(f"Fitted ({growth_fit['method']}): user growth {monthly_user_growth:.2f}%, "
+                       f"ARPU growth {monthly_arpu_growth:.2f}% monthly")
+else:
+    monthly_user_growth = st.sidebar.slider(
+        "Monthly User Growth %",
+        min_value=0.0,
+        max_value=20.0,
+        value=7.5,
+        step=0.5,
+        help="NET user growth rate (new users - churned users). This is used for revenue projections."
+    )
+    monthly_arpu_growth = st.sidebar.slider(
+        "Monthly ARPU Growth %",
+        min_value=0.0,
+        max_value=10.0,
+        value=2.0,
+        step=0.5,
+        help="Expected monthly growth in Average Revenue Per User"
+    )
 churn_rate = st.sidebar.slider(
     "Monthly Churn %",
     min_value=5.0,
     max_value=30.0,
     value=20.0,
     step=1.0,
-    help="Percentage of users who churn each month. Used for LTV calculations only, not revenue projections."
+    help="Percentage of users who churn each month. Used for LTV, and for revenue projections when the Cohort revenue model is selected in Assumptions."
 )
 
 st.sidebar.markdown("---")
@@ -135,138 +269,207 @@ st.info(
 
 st.markdown("---")
 
-# Main calculation functions
-def calculate_projections(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5, months=120, current_month=1, investment_amount=75.0, already_paid=0.0):
+# Main calculation functions (projection engine lives in adnexus_engine.py)
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS)
+def calculate_iso_repayment_surface(current_revenue, investment_amount, already_paid, revenue_share_pct,
+                                    target_months=(24, 36, 48, 60)):
     """
-    Calculate monthly revenue projections until investment is repaid.
+    Continuous payoff surface and exact iso-repayment boundaries over growth x redemption.
+
+    Cached per deal terms; growth and redemption are covered by the dense grid,
+    so moving those sliders never triggers a recompute.
 
     Args:
         current_revenue: Starting monthly revenue (₹ Lakhs)
-        growth_rate: Monthly growth rate (%)
-        redemption_rate: Percentage of revenue that is redeemed (%, default: 50)
-        revenue_share_pct: Percentage of net revenue paid to investor (%, default: 5)
-        months: Maximum months to project (default: 120)
-        current_month: Current month number in the timeline (default: 1)
-        investment_amount: Total investment to be repaid (₹ Lakhs, default: 75.0)
-        already_paid: Amount already repaid before current month (₹ Lakhs, default: 0.0)
+        investment_amount: Total investment to be repaid (₹ Lakhs)
+        already_paid: Amount already repaid before current month (₹ Lakhs)
+        revenue_share_pct: Percentage of net revenue paid to investor (%)
+        target_months: Months-remaining levels to trace boundaries for
 
     Returns:
-        DataFrame with monthly projections
+        Tuple of (growth_grid, redemption_grid, months_surface, boundaries) where
+        boundaries maps each target to the required growth per redemption rate
     """
-    projections = []
-    cumulative_payment = already_paid  # Start from prior payments
-
-    # Add Month 0 (current month) with NO growth - shows current state
-    net_revenue_current = current_revenue * (1 - redemption_rate/100)
-    remaining_balance = investment_amount - cumulative_payment
-    payment_current = min(net_revenue_current * (revenue_share_pct / 100), remaining_balance)
-    cumulative_payment += payment_current
-
-    projections.append({
-        'Month': current_month,
-        'Gross Revenue (₹L)': round(current_revenue, 2),
-        'Redemptions (₹L)': round(current_revenue * (redemption_rate / 100), 2),
-        'Net Revenue (₹L)': round(net_revenue_current, 2),
-        'Payment to Vinmo (₹L)': round(payment_current, 2),
-        'Cumulative Paid (₹L)': round(cumulative_payment, 2),
-        'Balance (₹L)': max(0, investment_amount - cumulative_payment)
-    })
-
-    # If already repaid in current month, return
-    if cumulative_payment >= investment_amount:
-        return pd.DataFrame(projections)
-
-    for month in range(months):
-        # Future months with growth
-        month_number = month + 1
-        actual_month = current_month + month + 1  # Shift by 1 (Month 0 is current)
-
-        # Calculate gross revenue with compound growth
-        gross_revenue = current_revenue * ((1 + growth_rate/100) ** month_number)
-
-        # Calculate net revenue after redemptions
-        redemption_amount = gross_revenue * (redemption_rate / 100)
-        net_revenue = gross_revenue - redemption_amount
-
-        # Calculate payment to investor - CAP to remaining balance
-        remaining_balance = investment_amount - cumulative_payment
-        calculated_payment = net_revenue * (revenue_share_pct / 100)
-        payment = min(calculated_payment, remaining_balance)  # Don't overpay
-        cumulative_payment += payment
-
-        projections.append({
-            'Month': actual_month,
-            'Gross Revenue (₹L)': round(gross_revenue, 2),
-            'Redemptions (₹L)': round(redemption_amount, 2),
-            'Net Revenue (₹L)': round(net_revenue, 2),
-            'Payment to Vinmo (₹L)': round(payment, 2),
-            'Cumulative Paid (₹L)': round(cumulative_payment, 2),
-            'Balance (₹L)': max(0, investment_amount - cumulative_payment)
-        })
-
-        if cumulative_payment >= investment_amount:
-            break
-
-    return pd.DataFrame(projections)
-
-def calculate_unit_economics(mau, arpu, user_growth_rate, arpu_growth_rate, churn_rate,
-                             ltv_method='churn_based', ltv_months=6,
-                             starting_cac=30, cac_monthly_increase=2, months=36):
+    growth_grid = np.linspace(0.0, 20.0, 201)
+    redemption_grid = np.linspace(0.0, 80.0, 161)
+    months_surface = payoff_months_continuous(growth_grid[np.newaxis, :], redemption_grid[:, np.newaxis],
+                                              current_revenue, investment_amount=investment_amount,
+                                              already_paid=already_paid,
+                                              revenue_share_pct=revenue_share_pct)
+    required_growth = iso_repayment_growth(np.array(target_months)[:, np.newaxis],
+                                           redemption_grid[np.newaxis, :],
+                                           current_revenue, investment_amount=investment_amount,
+                                           already_paid=already_paid,
+                                           revenue_share_pct=revenue_share_pct)
+    boundaries = dict(zip(target_months, required_growth))
+    return growth_grid, redemption_grid, months_surface, boundaries
+
+@st.cache_data(show_spinner="Fitting growth to history...", max_entries=CACHE_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS)
+def fit_uploaded_history(csv_bytes):
     """
-    Calculate unit economics over time.
+    Log-linear and robust growth fits with bootstrap intervals for an uploaded history CSV.
 
     Args:
-        mau: Starting Monthly Active Users
-        arpu: Starting Average Revenue Per User (₹)
-        user_growth_rate: Monthly user growth (%)
-        arpu_growth_rate: Monthly ARPU growth (%)
-        churn_rate: Monthly churn rate (%)
-        ltv_method: 'churn_based' or 'fixed_months'
-        ltv_months: Months for LTV if using fixed method
-        starting_cac: Initial Customer Acquisition Cost (₹)
-        cac_monthly_increase: CAC increase per month (₹)
-        months: Months to project
+        csv_bytes: Uploaded file contents
 
     Returns:
-        DataFrame with unit economics metrics
+        Dict of deal name -> fit (see adnexus_fit.fit_growth)
     """
-    data = []
+    return fit_portfolio(load_history(io.BytesIO(csv_bytes)), workers=FIT_WORKERS)
 
-    for month in range(months):
-        month_number = month + 1
+def apply_growth_fit(fit_summary):
+    """Button callback: drive the projections with a fitted growth rate (sidebar toggle on)."""
+    st.session_state.growth_fit = fit_summary
+    st.session_state.use_fitted_growth = True
 
-        # Apply compound growth (consistent with projections)
-        projected_mau = mau * ((1 + user_growth_rate/100) ** month_number)
-        projected_arpu = arpu * ((1 + arpu_growth_rate/100) ** month_number)
+def sensitivity_input_bounds(current_values, range_width):
+    """
+    Sampling ranges for the global sensitivity analysis around current inputs.
 
-        # Calculate LTV based on selected method
-        if ltv_method == 'churn_based':
-            # LTV = ARPU / churn_rate (geometric series)
-            ltv = projected_arpu / (churn_rate / 100) if churn_rate > 0 else projected_arpu * ltv_months
-        else:
-            # Fixed months method
-            ltv = projected_arpu * ltv_months
+    Args:
+        current_values: Dict of current value per sensitivity input
+        range_width: Relative half-width of each range (e.g. 0.25 for ±25%)
 
-        # Calculate CAC with linear increase
-        cac = starting_cac + (month * cac_monthly_increase)
+    Returns:
+        Dict mapping each input to a (low, high) tuple
+    """
+    investment = current_values['Investment (₹L)']
+    # Minimum half-widths keep zero-valued inputs (e.g. nothing paid yet) from collapsing
+    minimum_spread = {
+        'User Growth %': 0.5,
+        'ARPU Growth %': 0.5,
+        'Churn %': 1.0,
+        'Redemption %': 2.0,
+        'Starting Revenue (₹L)': 0.5,
+        'Investment (₹L)': 1.0,
+        'Already Paid (₹L)': investment * range_width,
+    }
+    limits = {
+        'User Growth %': (0.0, 50.0),
+        'ARPU Growth %': (0.0, 50.0),
+        'Churn %': (0.0, 99.0),
+        'Redemption %': (0.0, 95.0),
+        'Starting Revenue (₹L)': (0.1, 10000.0),
+        'Investment (₹L)': (1.0, 50000.0),
+        'Already Paid (₹L)': (0.0, investment),
+    }
+    bounds = {}
+    for name, value in current_values.items():
+        spread = max(abs(value) * range_width, minimum_spread[name])
+        low_limit, high_limit = limits[name]
+        bounds[name] = (max(low_limit, value - spread), min(high_limit, value + spread))
+    return bounds
+
+@st.cache_resource(show_spinner=False)
+def job_runner():
+    """
+    Process-wide background job runner for heavy analyses.
 
-        # Calculate LTV/CAC ratio
-        ltv_cac = ltv / cac if cac > 0 else 0
+    Returns:
+        JobRunner shared by every session (see adnexus_jobs.py)
+    """
+    return JobRunner()
+
+@st.cache_resource(show_spinner=False)
+def live_feed(path):
+    """
+    Process-wide tail of the live event file.
+
+    Args:
+        path: NDJSON or CSV event file (ADNEXUS_LIVE_FEED)
+
+    Returns:
+        LiveFeed shared by every session (see adnexus_live.py)
+    """
+    return LiveFeed(path)
+
+def global_sensitivity_job(job, bounds, fixed, base_samples):
+    """
+    Background task: Sobol indices refined batch by batch, each refinement published as a partial result.
+
+    Args:
+        job: Job handle (progress, partial results, cancellation)
+        bounds: Dict mapping each sensitivity input to (low, high)
+        fixed: Non-varied terms (revenue share, revenue model, cohort acquisitions, schedules)
+        base_samples: Rows per Saltelli matrix
+
+    Returns:
+        DataFrame of first- and total-order indices per input and output
+    """
+    df_sensitivity = None
+    for fraction_done, df_sensitivity in iter_global_sensitivity(bounds, fixed, base_samples=base_samples):
+        job.report(fraction_done, df_sensitivity)
+    return df_sensitivity
 
-        data.append({
-            'Month': month_number,
-            'MAU': int(projected_mau),
-            'ARPU': round(projected_arpu, 2),
-            'LTV': round(ltv, 2),
-            'CAC': round(cac, 2),
-            'LTV/CAC': round(ltv_cac, 2)
-        })
+def spend_optimizer_job(job, model, budget, objective, plan_months, current_plan):
+    """
+    Background task: spend schedule search, the best schedule so far published after every round.
+
+    Args:
+        job: Job handle (progress, partial results, cancellation)
+        model: spend_model terms
+        budget: Total spend over the planning window (₹ Lakhs)
+        objective: 'payoff' or 'ltv_cac'
+        plan_months: Planning window (months)
+        current_plan: The sidebar's spend schedule over the window (seeds the search)
+
+    Returns:
+        Result dict of the last round (see iter_optimize_spend)
+    """
+    result = None
+    for fraction_done, result in iter_optimize_spend(model, budget, objective, plan_months, [current_plan]):
+        job.report(fraction_done, result)
+    return result
+
+def user_simulation_job(job, acquisitions, arpu, churn_rate, arpu_growth_rate, runs, arpu_dispersion):
+    """
+    Background task: user-level microsimulation, the runs finished so far published after every batch.
 
-    return pd.DataFrame(data)
+    Args:
+        job: Job handle (progress, partial results, cancellation)
+        acquisitions: Expected users entering each cohort (index 0 = current base) over the horizon
+        arpu: Current ARPU (₹)
+        churn_rate: Monthly churn rate (%)
+        arpu_growth_rate: Monthly ARPU growth (%)
+        runs: Number of simulated runs
+        arpu_dispersion: Coefficient of variation of per-user ARPU
+
+    Returns:
+        Result dict of the last batch (see iter_simulate_users)
+    """
+    result = None
+    for fraction_done, result in iter_simulate_users(acquisitions, arpu, churn_rate, arpu_growth_rate, runs,
+                                                     arpu_dispersion=arpu_dispersion):
+        job.report(fraction_done, result)
+    return result
+
+def portfolio_reports_job(job, deals, report_format):
+    """
+    Background task: investor reports for every deal, rendered in worker processes.
+
+    Args:
+        job: Job handle (progress, cancellation)
+        deals: List of deal dicts (see adnexus_reports.DEAL_DEFAULTS)
+        report_format: 'html' or 'pdf'
+
+    Returns:
+        ZIP bytes with one report per deal
+    """
+    reports = generate_reports(deals, report_format, workers=REPORT_WORKERS,
+                               progress=lambda done, total: job.report(done / total, f"{done} of {total}"))
+    return reports_archive(reports)
+
+# Per-session results are held in the shared session memory under this ID
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 
 # Initialize session state for assumptions if not already set
 if 'redemption_rate' not in st.session_state:
-    st.session_state.redemption_rate = 50.0
+    # Observed rate of the ingested actuals (trailing 3 months) when available
+    if actuals_start and actuals_start['redemption_rate'] is not None:
+        st.session_state.redemption_rate = float(min(max(round(actuals_start['redemption_rate']), 0), 80))
+    else:
+        st.session_state.redemption_rate = 50.0
 if 'ltv_method' not in st.session_state:
     st.session_state.ltv_method = 'churn_based'
 if 'ltv_months' not in st.session_state:
@@ -275,6 +478,36 @@ if 'starting_cac' not in st.session_state:
     st.session_state.starting_cac = 30
 if 'cac_monthly_increase' not in st.session_state:
     st.session_state.cac_monthly_increase = 2.0
+if 'growth_curve' not in st.session_state:
+    st.session_state.growth_curve = 'constant'
+if 'growth_floor' not in st.session_state:
+    st.session_state.growth_floor = 2.0
+if 'growth_half_life' not in st.session_state:
+    st.session_state.growth_half_life = 18
+if 'mau_capacity' not in st.session_state:
+    st.session_state.mau_capacity = 500000
+if 'revenue_model' not in st.session_state:
+    st.session_state.revenue_model = 'compound'
+if 'acquisition_spend' not in st.session_state:
+    st.session_state.acquisition_spend = 1.0
+if 'spend_growth' not in st.session_state:
+    st.session_state.spend_growth = 5.0
+if 'discount_rate' not in st.session_state:
+    st.session_state.discount_rate = 12.0
+if 'exit_months_ahead' not in st.session_state:
+    st.session_state.exit_months_ahead = 60
+if 'exit_multiple' not in st.session_state:
+    st.session_state.exit_multiple = 3.0
+if 'schedule_segments' not in st.session_state:
+    # Step changes by months ahead; blank cells fall back to the sidebar/assumption values
+    st.session_state.schedule_segments = [
+        {'From Month': 13, 'User Growth %': 5.0, 'Redemption %': None, 'CAC (₹)': None},
+        {'From Month': 37, 'User Growth %': 2.0, 'Redemption %': None, 'CAC (₹)': None},
+    ]
+if 'pinned_baseline' not in st.session_state:
+    # Scenario comparison: pinned inputs (calculate_projections argument names)
+    st.session_state.pinned_baseline = None
+    st.session_state.pinned_variants = {}
 
 # Use session state values
 redemption_rate = st.session_state.redemption_rate
@@ -282,16 +515,87 @@ ltv_method = st.session_state.ltv_method
 ltv_months = st.session_state.ltv_months
 starting_cac = st.session_state.starting_cac
 cac_monthly_increase = st.session_state.cac_monthly_increase
+growth_curve = st.session_state.growth_curve
+growth_floor = st.session_state.growth_floor
+growth_half_life = st.session_state.growth_half_life
+mau_capacity = st.session_state.mau_capacity
+revenue_model = st.session_state.revenue_model
+acquisition_spend = st.session_state.acquisition_spend
+spend_growth = st.session_state.spend_growth
+discount_rate = st.session_state.discount_rate
+exit_months_ahead = st.session_state.exit_months_ahead
+exit_multiple = st.session_state.exit_multiple
 
 # Calculate combined revenue growth rate (Revenue = MAU × ARPU)
 # Revenue growth = (1 + MAU_growth) × (1 + ARPU_growth) - 1
 revenue_growth_rate = ((1 + monthly_user_growth/100) * (1 + monthly_arpu_growth/100) - 1) * 100
 
+# Per-month schedules (months ahead 1..120). The constant curve keeps scalar rates.
+schedule_months = 120
+schedule_columns = ['From Month', 'User Growth %', 'Redemption %', 'CAC (₹)']
+schedule_table = pd.DataFrame(st.session_state.schedule_segments, columns=schedule_columns, dtype=float)
+
+growth_curve_labels = {
+    'constant': 'Constant',
+    'decay': 'Decay to Floor',
+    'logistic': 'S-Curve (MAU Saturation)',
+    'piecewise': 'Piecewise (Schedule Table)'
+}
+if growth_curve == 'decay':
+    user_growth_schedule = decay_schedule(monthly_user_growth, growth_floor, growth_half_life, schedule_months)
+elif growth_curve == 'logistic':
+    user_growth_schedule = logistic_schedule(monthly_user_growth, current_mau, mau_capacity, schedule_months)
+elif growth_curve == 'piecewise':
+    user_growth_schedule = piecewise_schedule(zip(schedule_table['From Month'], schedule_table['User Growth %']),
+                                              schedule_months, default=monthly_user_growth)
+else:
+    user_growth_schedule = monthly_user_growth
+
+if growth_curve == 'constant':
+    revenue_growth_schedule = revenue_growth_rate
+else:
+    revenue_growth_schedule = combine_growth(user_growth_schedule, monthly_arpu_growth)
+
+# Redemption schedule starts with the current month; overrides apply from their month ahead
+if schedule_table['Redemption %'].notna().any():
+    redemption_schedule = np.concatenate([
+        [redemption_rate],
+        piecewise_schedule(zip(schedule_table['From Month'], schedule_table['Redemption %']),
+                           schedule_months, default=redemption_rate)
+    ])
+else:
+    redemption_schedule = redemption_rate
+
+# CAC overrides replace the linear increase only in the months they cover
+if schedule_table['CAC (₹)'].notna().any():
+    cac_override = piecewise_schedule(zip(schedule_table['From Month'], schedule_table['CAC (₹)']),
+                                      schedule_months, default=np.nan)
+    cac_schedule = np.where(np.isnan(cac_override),
+                            starting_cac + np.arange(schedule_months) * cac_monthly_increase,
+                            cac_override)
+else:
+    cac_schedule = None
+
+# Cohort model: spend / CAC acquires users, churn retires them, MAU × ARPU drives revenue
+cohort_projection = calculate_cohort_revenue(current_mau, current_arpu, churn_rate, monthly_arpu_growth,
+                                             acquisition_spend, spend_growth_rate=spend_growth,
+                                             starting_cac=starting_cac,
+                                             cac_monthly_increase=cac_monthly_increase,
+                                             cac_schedule=cac_schedule, periods=schedule_months)
+if revenue_model == 'cohort':
+    revenue_growth_schedule = growth_from_path(cohort_projection['revenue'])
+    user_growth_schedule = growth_from_path(cohort_projection['mau'])
+    revenue_growth_rate = revenue_growth_schedule[0]
+
 # Validation warnings for edge cases
 if redemption_rate >= 100:
     st.error("⚠️ **CRITICAL ERROR**: Redemption rate is 100% or higher. This means no net revenue - repayment is mathematically impossible!")
     st.stop()
 
+if np.max(redemption_schedule) >= 100:
+    st.error("⚠️ **CRITICAL ERROR**: A scheduled redemption rate is 100% or higher. Check the schedule table in Assumptions.")
+    st.stop()
+
 if redemption_rate >= 95:
     st.warning("⚠️ **WARNING**: Redemption rate is very high (≥95%). This will result in extremely long repayment timelines.")
 
@@ -302,6 +606,103 @@ if current_monthly_revenue <= 0:
     st.error("⚠️ **ERROR**: Current monthly revenue must be greater than zero.")
     st.stop()
 
+@st.cache_resource(show_spinner=False)
+def payoff_lookup_table():
+    """
+    Memory-mapped payoff lookup table, opened once per server process.
+
+    The array is read-only and backed by the OS page cache, so sessions and
+    worker processes share it instead of each holding a copy. Workers never
+    build it (the Docker image does); without it lookups are solved exactly.
+
+    Returns:
+        Read-only memory-mapped payoff table (see adnexus_lookup.py), or None
+    """
+    return load_payoff_table()
+
+@st.cache_resource(show_spinner=False)
+def session_memory():
+    """
+    Process-wide session memory manager (per-session budget, LRU eviction, idle TTL).
+
+    Returns:
+        SessionMemory shared by every session (see adnexus_memory.py)
+    """
+    return SessionMemory()
+
+def remember(name, key, compute):
+    """
+    Per-session cached result, computed on a miss and counted against the session budget.
+
+    Args:
+        name: Result name (projections, figure or export payload)
+        key: Hash of the inputs the result depends on
+        compute: Zero-argument callable producing the result
+
+    Returns:
+        Stored or freshly computed result
+    """
+    return session_memory().get_or_compute(st.session_state.session_id, (name, key), compute)
+
+@st.cache_data(show_spinner="Valuing exit scenarios...", max_entries=CACHE_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS)
+def calculate_exit_grid(payments, gross_revenue, equity_stake_pct, investment_amount, already_paid,
+                        current_month, discount_rate):
+    """
+    Revenue-share plus equity returns over every exit month and revenue multiple, cached per inputs.
+
+    Args:
+        payments: Tuple of 'Payment to Vinmo' per month from the current month
+        gross_revenue: Tuple of projected gross revenue per month from the current month
+        equity_stake_pct: Investor's equity stake (%)
+        investment_amount: Total investment (₹ Lakhs)
+        already_paid: Amount already repaid before current month (₹ Lakhs)
+        current_month: Current month number in the timeline
+        discount_rate: Annual discount rate for NPV (%)
+
+    Returns:
+        exit_valuation_grid result dict with float32 arrays
+    """
+    exit_months = current_month + np.arange(1, len(gross_revenue))
+    revenue_multiples = np.arange(0.5, 10.01, 0.25)
+    # Stored as float32 in the cache (compact schema); every session shares the cached copy
+    return compact_arrays(exit_valuation_grid(payments, gross_revenue, exit_months, revenue_multiples,
+                                              equity_stake_pct=equity_stake_pct,
+                                              investment_amount=investment_amount,
+                                              already_paid=already_paid, current_month=current_month,
+                                              discount_rate=discount_rate))
+
+# Free results of idle sessions, then key this run's results by every model input
+session_memory().expire_idle()
+scenario_key = memory_key(
+    current_month, current_mau, current_arpu, current_monthly_revenue, monthly_user_growth,
+    monthly_arpu_growth, churn_rate, investment_amount, already_paid, revenue_share, equity_stake,
+    revenue_growth_schedule, user_growth_schedule, redemption_schedule, cac_schedule,
+    redemption_rate, ltv_method, ltv_months, starting_cac, cac_monthly_increase, revenue_model,
+    discount_rate, exit_months_ahead, exit_multiple
+)
+
+# Derived quantities are recomputed only when one of their own inputs changed (see adnexus_graph.py)
+derived = DASHBOARD.evaluate({
+    'current_revenue': current_monthly_revenue,
+    'revenue_growth_rate': revenue_growth_rate,
+    'revenue_growth_schedule': revenue_growth_schedule,
+    'redemption_rate': redemption_rate,
+    'redemption_schedule': redemption_schedule,
+    'revenue_share': revenue_share,
+    'months': schedule_months,
+    'current_month': current_month,
+    'investment_amount': investment_amount,
+    'already_paid': already_paid,
+    'discount_rate': discount_rate,
+    'start_date': current_month_start,
+    'scenario_probabilities': (
+        scenario_probabilities(growth_fit['revenue_samples'],
+                               {name: SCENARIO_GROWTH_RATES.get(name, revenue_growth_rate)
+                                for name in SCENARIO_PROBABILITIES})
+        if use_fitted_growth else SCENARIO_PROBABILITIES
+    ),
+}, cache=remember, resources={'payoff_table': payoff_lookup_table()})
+
 # Create main tabs
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📈 Overview", "💵 Cash Flow", "👥 Unit Economics", "⚠️ Risk Analysis", "📊 Reports", "🔧 Assumptions"])
 
@@ -310,21 +711,16 @@ with tab1:
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     
     # Calculate key metrics
-    df_projections = calculate_projections(current_monthly_revenue, revenue_growth_rate,
-                                          redemption_rate=redemption_rate,
-                                          revenue_share_pct=revenue_share,
-                                          current_month=current_month,
-                                          investment_amount=investment_amount,
-                                          already_paid=already_paid)
+    df_projections = derived['projections']
     months_to_repay = len(df_projections)
     months_remaining = len(df_projections) - 1  # Exclude current month row
     final_month = df_projections.iloc[-1]['Month'] if len(df_projections) > 0 else current_month
     final_revenue = df_projections.iloc[-1]['Gross Revenue (₹L)'] if len(df_projections) > 0 else 0
     growth_multiple = final_revenue / current_monthly_revenue if current_monthly_revenue > 0 else 0
 
-    # Check if repayment is incomplete
+    # Check if repayment is incomplete (exact: the ledger balance is whole paise)
     final_balance = df_projections.iloc[-1]['Balance (₹L)'] if len(df_projections) > 0 else investment_amount
-    repayment_incomplete = final_balance > 0.01  # Small threshold for floating point
+    repayment_incomplete = not df_projections.attrs['complete']
 
     # Display warning if incomplete
     if repayment_incomplete:
@@ -347,11 +743,66 @@ with tab1:
     col4.metric("Required Multiple", f"{growth_multiple:.1f}x", "From current")
     col5.metric("Current MAU", f"{current_mau:,}", f"+{int(current_mau * monthly_user_growth/100)} monthly")
 
-    # Calculate current monthly payment with correct formula
-    current_net_revenue = current_monthly_revenue * (1 - redemption_rate/100)
-    current_payment = current_net_revenue * (revenue_share/100)
+    current_payment = derived['current_payment']
     col6.metric("Monthly Payment", f"₹{current_payment:.2f}L", "To Vinmo")
-    
+
+    if LIVE_FEED_PATH:
+        st.markdown("---")
+        st.subheader("🔴 Live Revenue Feed")
+        feed = live_feed(LIVE_FEED_PATH)
+        live_refresh = st.select_slider(
+            "Refresh every (seconds)",
+            options=sorted({1.0, 2.0, 5.0, 10.0, 30.0, 60.0, LIVE_REFRESH_SECONDS}),
+            value=LIVE_REFRESH_SECONDS,
+            key="live_refresh"
+        )
+        projected_month_revenue = df_projections['Gross Revenue (₹L)'].iloc[0]
+
+        # Only this fragment reruns on each tick: new events are folded in, the projections are reused
+        @st.fragment(run_every=live_refresh)
+        def show_live_feed():
+            update = feed.poll()
+            live_deals = feed.deals()
+            if not live_deals:
+                st.info(f"Waiting for events in {LIVE_FEED_PATH}...")
+                return
+            live_deal = st.session_state.get('actuals_deal')
+            live_deal = live_deal if live_deal in live_deals else live_deals[0]
+            live_month = feed.latest_month(live_deal)
+            month_to_date = feed.month_totals(live_deal, live_month)
+            live_rate = month_to_date['redemption_rate']
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric(f"Revenue {live_month} (to date)", f"₹{month_to_date['gross']:.2f}L",
+                        f"{month_to_date['gross'] / projected_month_revenue:.0%} of projected month",
+                        delta_color="off")
+            col2.metric("Redemption Rate (to date)", "—" if live_rate is None else f"{live_rate:.1f}%",
+                        None if live_rate is None else f"{live_rate - redemption_rate:+.1f} pts vs assumption",
+                        delta_color="inverse")
+            col3.metric("Payment to Vinmo (to date)",
+                        f"₹{(month_to_date['gross'] - month_to_date['redemptions']) * revenue_share / 100:.2f}L")
+            col4.metric("Events", f"{feed.events:,}", f"+{update['events']} this tick")
+
+            def live_chart():
+                live_months = feed.monthly_frame(live_deal)
+                fig_live = go.Figure()
+                fig_live.add_trace(go.Bar(x=live_months['Month'], y=live_months['Gross Revenue (₹L)'],
+                                          name='Gross Revenue', marker_color='#2ca02c'))
+                fig_live.add_trace(go.Bar(x=live_months['Month'], y=live_months['Redemptions (₹L)'],
+                                          name='Redemptions', marker_color='#d62728'))
+                fig_live.update_layout(barmode='group', height=300, xaxis_title="Month",
+                                       yaxis_title="Amount (₹ Lakhs)", margin=dict(t=20))
+                return fig_live
+
+            # Rebuilt only when events arrived since the last build
+            st.plotly_chart(remember('live_chart', memory_key(LIVE_FEED_PATH, feed.version, live_deal), live_chart),
+                            use_container_width=True, key="live_chart")
+            st.caption(f"Tailing {LIVE_FEED_PATH}: last event {feed.last_event}, {feed.rejected} unreadable lines"
+                       + (f", {feed.backlog_bytes / 2 ** 20:.1f} MB still to read" if feed.backlog_bytes else "")
+                       + f" · updated {datetime.now().strftime('%H:%M:%S')}")
+
+        show_live_feed()
+
     st.markdown("---")
     
     # Growth trajectory chart
@@ -360,32 +811,26 @@ with tab1:
     with col1:
         st.subheader("📈 Revenue Growth Trajectory")
         
-        # Create multiple scenarios (revenue growth rates)
+        # Create multiple scenarios (revenue growth rates), shared with the Risk Analysis scenario table
         scenarios = {
-            'Conservative (5%)': 5.0,
-            f'Current ({revenue_growth_rate:.1f}%)': revenue_growth_rate,
-            'Optimistic (12%)': 12.0
+            'Conservative (5%)': derived['fixed_rate_projections']['Pessimistic'],
+            f'Current ({revenue_growth_rate:.1f}%)': df_projections,
+            'Optimistic (12%)': derived['fixed_rate_projections']['Best Case']
         }
 
         fig = go.Figure()
-        for name, rate in scenarios.items():
-            df_scenario = calculate_projections(current_monthly_revenue, rate,
-                                               redemption_rate=redemption_rate,
-                                               revenue_share_pct=revenue_share,
-                                               current_month=current_month,
-                                               investment_amount=investment_amount,
-                                               already_paid=already_paid)
+        for name, df_scenario in scenarios.items():
             fig.add_trace(go.Scatter(
                 x=df_scenario['Month'],
                 y=df_scenario['Gross Revenue (₹L)'],
                 name=name,
                 mode='lines',
-                line=dict(width=2 if abs(rate - revenue_growth_rate) < 0.01 else 1)
+                line=dict(width=2 if name.startswith('Current') else 1)
             ))
         
         # Dynamic benchmark: flat gross revenue needed to repay in 36 months (given redemption + rev share)
         target_months = 36
-        effective_payment_rate = (1 - redemption_rate / 100) * (revenue_share / 100)
+        effective_payment_rate = derived['effective_payment_rate']
         if effective_payment_rate > 0:
             target_flat_revenue = investment_amount / (target_months * effective_payment_rate)
             fig.add_hline(
@@ -429,32 +874,104 @@ with tab1:
         )
         st.plotly_chart(fig2, use_container_width=True)
 
+    # Scenario comparison against a pinned baseline
+    st.markdown("---")
+    st.subheader("📌 Scenario Comparison")
+
+    comparison_inputs = {
+        'current_revenue': current_monthly_revenue,
+        'growth_rate': revenue_growth_schedule,
+        'redemption_rate': redemption_schedule,
+        'revenue_share_pct': revenue_share,
+        'investment_amount': investment_amount,
+        'already_paid': already_paid,
+    }
+    pinned_variants = st.session_state.pinned_variants
+
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        if st.button("📌 Pin Current as Baseline", key="pin_baseline", use_container_width=True):
+            st.session_state.pinned_baseline = comparison_inputs
+            pinned_variants.clear()
+    with col2:
+        variant_label = st.text_input("Variant Label", value=f"Variant {len(pinned_variants) + 1}",
+                                      key="variant_label", label_visibility="collapsed")
+    with col3:
+        if st.button("➕ Pin Current as Variant", key="pin_variant", use_container_width=True,
+                     disabled=(st.session_state.pinned_baseline is None or
+                               len(pinned_variants) >= MAX_PINNED_VARIANTS)):
+            pinned_variants[variant_label.strip() or f"Variant {len(pinned_variants) + 1}"] = comparison_inputs
+    with col4:
+        if st.button("🗑️ Clear Comparison", key="clear_comparison", use_container_width=True):
+            st.session_state.pinned_baseline = None
+            pinned_variants.clear()
+
+    pinned_baseline = st.session_state.pinned_baseline
+    if pinned_baseline is None:
+        st.info("Pin the current inputs as a baseline, then move the sliders: the current inputs are compared "
+                f"against it live, and up to {MAX_PINNED_VARIANTS} variants can be pinned next to it.")
+    else:
+        # The baseline's full-horizon arrays stay cached; each variant only recomputes the months
+        # from its first difference to the baseline
+        baseline_key = memory_key(pinned_baseline)
+        baseline_state = remember('comparison_baseline', baseline_key, lambda: projection_state(pinned_baseline))
+        compared = dict(pinned_variants)
+        horizon = baseline_state['months'] + 1
+        if divergence(pinned_baseline, comparison_inputs, baseline_state['months']) != (horizon, horizon):
+            compared['Current'] = comparison_inputs
+        compared_states = {
+            label: remember('comparison_variant', memory_key(baseline_key, inputs),
+                            lambda inputs=inputs: variant_state(baseline_state, inputs))
+            for label, inputs in compared.items()
+        }
+
+        st.dataframe(comparison_summary(baseline_state, compared_states).round(2), use_container_width=True)
+
+        fig_compare = go.Figure()
+        shown_months = max([state_months_remaining(state)
+                            for state in [baseline_state, *compared_states.values()]]) + 1
+        for label, state in {'Baseline': baseline_state, **compared_states}.items():
+            fig_compare.add_trace(go.Scatter(
+                x=current_month + np.arange(shown_months),
+                y=from_paise(state['ledger']['balance'][:shown_months]),
+                name=label,
+                mode='lines',
+                line=dict(width=3 if label == 'Baseline' else 2, dash='solid' if label == 'Baseline' else 'dash')
+            ))
+        fig_compare.update_layout(
+            height=350,
+            xaxis_title="Months",
+            yaxis_title="Outstanding Balance (₹ Lakhs)",
+            hovermode='x unified',
+            title="Balance: Baseline vs Variants"
+        )
+        st.plotly_chart(fig_compare, use_container_width=True)
+
+        if compared_states:
+            delta_label = st.selectbox("Monthly Deltas For", list(compared_states), key="comparison_delta")
+            df_delta = comparison_frame(baseline_state, compared_states[delta_label], current_month)
+            st.dataframe(df_delta, height=300, use_container_width=True, hide_index=True,
+                         column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                        for column in df_delta.columns if column.endswith('(₹L)')})
+        st.caption("Deltas are variant − baseline. 'Recomputed From' is the first month (after the current "
+                   "month) whose inputs differ from the baseline; earlier months are reused from the cached "
+                   "baseline.")
+
 # Tab 2: Cash Flow Analysis
 with tab2:
     st.subheader("💵 Detailed Cash Flow Projections")
     
-    # Cash flow table
-    df_cashflow = calculate_projections(current_monthly_revenue, revenue_growth_rate,
-                                       redemption_rate=redemption_rate,
-                                       revenue_share_pct=revenue_share,
-                                       current_month=current_month,
-                                       investment_amount=investment_amount,
-                                       already_paid=already_paid)
-    
-    # Add quarterly summary
-    df_cashflow['Quarter'] = (df_cashflow['Month'] - 1) // 3 + 1
-    df_quarterly = df_cashflow.groupby('Quarter').agg({
-        'Gross Revenue (₹L)': 'sum',
-        'Payment to Vinmo (₹L)': 'sum',
-        'Cumulative Paid (₹L)': 'last',
-        'Balance (₹L)': 'last'
-    }).round(2)
+    # Cash flow table: same Arrow buffers as the Overview projections, plus a Quarter column
+    df_cashflow = derived['cashflow']
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.markdown("### Monthly Projections")
-        st.dataframe(df_cashflow, height=400, use_container_width=True)
+        # Values are exact to the paisa; show them to the nearest ₹1,000 like before
+        st.dataframe(df_cashflow, height=400, use_container_width=True,
+                     column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                    for column in df_cashflow.columns if column.endswith('(₹L)')})
         
         # Download button
         csv = df_cashflow.to_csv(index=False)
@@ -466,13 +983,20 @@ with tab2:
         )
     
     with col2:
-        st.markdown("### Quarterly Summary")
-        st.dataframe(df_quarterly, use_container_width=True)
+        st.markdown("### Fiscal Summary")
+        summary_period = st.radio("Period", ['Quarter', 'Half-Year', 'Fiscal Year'], horizontal=True,
+                                  key="rollup_period", help="April–March fiscal periods from the sidebar's "
+                                                            "Current Month Starts date")
+        # Precomputed with the projections: picking a period is a lookup, not a groupby
+        df_summary = derived['rollups'][summary_period]
+        st.dataframe(df_summary, use_container_width=True, hide_index=True,
+                     column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                    for column in df_summary.columns if column.endswith('(₹L)')})
         
         # Key insights
         st.markdown("### 💡 Key Insights")
         cashflow_final_balance = df_cashflow.iloc[-1]['Balance (₹L)'] if len(df_cashflow) > 0 else investment_amount
-        cashflow_incomplete = cashflow_final_balance > 0.01
+        cashflow_incomplete = repayment_incomplete  # Same projections as the Overview tab
 
         if cashflow_incomplete:
             st.warning(
@@ -489,15 +1013,135 @@ with tab2:
         if break_even_month:
             st.info(f"📊 50% repayment milestone: Month {break_even_month}")
 
+    st.markdown("### 📆 Payoff Date (Daily / Weekly Resolution)")
+    period_start = current_month_start
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        period_resolution = st.radio("Resolution", ['Daily', 'Weekly'], horizontal=True, key="period_granularity")
+    with col2:
+        period_rollup = st.radio("Summarise By", list(ROLLUP_MONTHS), horizontal=True, key="period_rollup")
+
+    granularity = period_resolution.lower()
+    period_name = PERIOD_COLUMNS[granularity]
+    period_key = memory_key(derived.key('projections'), granularity, period_start)
+
+    def project_periods():
+        return calculate_projections(
+            current_monthly_revenue, revenue_growth_schedule, redemption_rate=redemption_schedule,
+            revenue_share_pct=revenue_share, months=schedule_months, current_month=current_month,
+            investment_amount=investment_amount, already_paid=already_paid,
+            granularity=granularity, start_date=period_start
+        )
+
+    def summarise_periods():
+        df = project_periods()
+        return {'periods': compact_frame(df),
+                **{by: aggregate_periods(df, by, period_start) for by in ROLLUP_MONTHS}}
+
+    # Thousands of rows stay server-side in compact form (int32 periods, int16 months, float32 money) next
+    # to the exact rollups; the browser only receives a rollup table and a downsampled chart
+    period_summary = remember('period_projections', period_key, summarise_periods)
+    df_periods, df_period_rollup = display_frame(period_summary['periods']), period_summary[period_rollup]
+
+    period_dates = df_periods['Date'].to_numpy()
+    col1, col2, col3 = st.columns(3)
+    if df_periods.attrs['complete']:
+        col1.metric("Payoff Date", pd.Timestamp(period_dates[-1]).strftime('%d %b %Y'))
+        col2.metric(f"{period_name}s to Payoff", f"{len(df_periods):,}")
+        col3.metric("Payoff Month", f"M{df_periods['Month'].iloc[-1]}",
+                    help=f"The monthly projection repays in month {df_projections['Month'].iloc[-1]}")
+    else:
+        col1.metric("Payoff Date", f"After {pd.Timestamp(period_dates[-1]).strftime('%b %Y')}")
+        col2.metric(f"{period_name}s to Payoff", f">{len(df_periods):,}")
+        col3.metric("Balance at Horizon", f"₹{from_paise(df_periods.attrs['balance_paise']):.2f}L")
+
+    def build_period_chart():
+        payments, balance = df_periods['Payment to Vinmo (₹L)'].to_numpy(), df_periods['Balance (₹L)'].to_numpy()
+        shown = np.union1d(downsample_indices(payments, MAX_CHART_POINTS // 2),
+                           downsample_indices(balance, MAX_CHART_POINTS // 2))
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=period_dates[shown], y=payments[shown],
+                                 name=f'Payment per {period_name}', mode='lines', line=dict(color='green')))
+        fig.add_trace(go.Scatter(x=period_dates[shown], y=balance[shown],
+                                 name='Balance', mode='lines', line=dict(color='red'), yaxis='y2'))
+        fig.update_layout(height=350, hovermode='x unified', xaxis_title="Date",
+                          yaxis=dict(title=f"Payment per {period_name} (₹ Lakhs)"),
+                          yaxis2=dict(title="Balance (₹ Lakhs)", overlaying='y', side='right'))
+        return fig
+
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.plotly_chart(remember('period_chart', period_key, build_period_chart), use_container_width=True)
+    with col2:
+        st.dataframe(df_period_rollup, height=350, use_container_width=True, hide_index=True,
+                     column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                    for column in df_period_rollup.columns if column.endswith('(₹L)')})
+    st.download_button(
+        label=f"📥 Download {period_resolution} Projections",
+        # Full-precision rows, built once per set of inputs and kept with the session's results
+        data=remember('period_csv', period_key, lambda: project_periods().to_csv(index=False)),
+        file_name=f"adnexus_{granularity}_projections_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime='text/csv'
+    )
+    st.caption(f"{len(df_periods):,} {period_name.lower()}s, charted at up to {MAX_CHART_POINTS} points. Months "
+               f"are average calendar months ({PERIODS_PER_MONTH['daily']:.2f} days); each month's revenue "
+               f"matches the monthly projection, spread over its days.")
+
+    if deal_actuals is not None:
+        st.markdown("### 📥 Monthly Actuals (Ingested Transactions)")
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            fig_actuals = go.Figure()
+            fig_actuals.add_trace(go.Bar(x=deal_actuals['Month'], y=deal_actuals['Gross Revenue (₹L)'],
+                                         name='Gross Revenue', marker_color='#2ca02c'))
+            fig_actuals.add_trace(go.Bar(x=deal_actuals['Month'], y=deal_actuals['Redemptions (₹L)'],
+                                         name='Redemptions', marker_color='#d62728'))
+            fig_actuals.update_layout(barmode='group', height=350, xaxis_title="Month",
+                                      yaxis_title="Amount (₹ Lakhs)")
+            st.plotly_chart(fig_actuals, use_container_width=True)
+        with col2:
+            st.dataframe(deal_actuals, height=350, use_container_width=True, hide_index=True,
+                         column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                        for column in deal_actuals.columns
+                                        if column.endswith('(₹L)') or column.endswith('(%)')})
+        if not deal_actuals['Complete'].iloc[-1]:
+            st.caption(f"{deal_actuals['Month'].iloc[-1]} is still in progress and is not used for the "
+                       f"current metrics.")
+
 # Tab 3: Unit Economics
 with tab3:
     st.subheader("👥 Unit Economics & User Metrics")
     
-    df_unit = calculate_unit_economics(current_mau, current_arpu, monthly_user_growth,
+    df_unit = calculate_unit_economics(current_mau, current_arpu, user_growth_schedule,
                                        monthly_arpu_growth, churn_rate,
                                        ltv_method=ltv_method, ltv_months=ltv_months,
                                        starting_cac=starting_cac,
-                                       cac_monthly_increase=cac_monthly_increase)
+                                       cac_monthly_increase=cac_monthly_increase,
+                                       cac_schedule=cac_schedule,
+                                       backend='arrow')
+
+    unit_resolution = st.radio("Chart Resolution", ['Monthly', 'Weekly', 'Daily'], horizontal=True,
+                               key="unit_granularity")
+    if unit_resolution == 'Monthly':
+        unit_months, unit_mau, unit_ltv_cac = df_unit['Month'], df_unit['MAU'], df_unit['LTV/CAC']
+        unit_mode = 'lines+markers'
+    else:
+        unit_granularity = unit_resolution.lower()
+        unit_periods = remember('unit_periods', memory_key(scenario_key, unit_granularity),
+                                lambda: compact_frame(calculate_unit_economics(
+                                    current_mau, current_arpu, user_growth_schedule, monthly_arpu_growth,
+                                    churn_rate, ltv_method=ltv_method, ltv_months=ltv_months,
+                                    starting_cac=starting_cac, cac_monthly_increase=cac_monthly_increase,
+                                    cac_schedule=cac_schedule, granularity=unit_granularity)))
+        df_unit_periods = display_frame(unit_periods)
+        # Plot the end of each day/week in months, at most MAX_CHART_POINTS points per chart
+        shown = np.union1d(downsample_indices(df_unit_periods['MAU'], MAX_CHART_POINTS // 2),
+                           downsample_indices(df_unit_periods['LTV/CAC'], MAX_CHART_POINTS // 2))
+        unit_months = (df_unit_periods[PERIOD_COLUMNS[unit_granularity]].to_numpy()[shown] /
+                       PERIODS_PER_MONTH[unit_granularity])
+        unit_mau = df_unit_periods['MAU'].to_numpy()[shown]
+        unit_ltv_cac = df_unit_periods['LTV/CAC'].to_numpy()[shown]
+        unit_mode = 'lines'
     
     col1, col2 = st.columns(2)
     
@@ -505,9 +1149,9 @@ with tab3:
         st.markdown("### MAU Growth")
         fig3 = go.Figure()
         fig3.add_trace(go.Scatter(
-            x=df_unit['Month'],
-            y=df_unit['MAU'],
-            mode='lines+markers',
+            x=unit_months,
+            y=unit_mau,
+            mode=unit_mode,
             name='Monthly Active Users',
             fill='tozeroy',
             line=dict(color='blue', width=2)
@@ -524,9 +1168,9 @@ with tab3:
         st.markdown("### LTV/CAC Ratio")
         fig4 = go.Figure()
         fig4.add_trace(go.Scatter(
-            x=df_unit['Month'],
-            y=df_unit['LTV/CAC'],
-            mode='lines+markers',
+            x=unit_months,
+            y=unit_ltv_cac,
+            mode=unit_mode,
             name='LTV/CAC',
             line=dict(color='green', width=2)
         ))
@@ -543,13 +1187,8 @@ with tab3:
     # Cohort Analysis
     st.markdown("### 📊 Cohort Retention Analysis")
     
-    # Create sample cohort data
-    cohort_data = []
-    for cohort_month in range(1, 7):
-        retention = [100]
-        for month in range(1, 13):
-            retention.append(retention[-1] * (1 - churn_rate/100))
-        cohort_data.append(retention[:13])
+    # Create sample cohort data (every cohort follows the same retention curve)
+    cohort_data = np.tile(retention_curve(churn_rate, 12) * 100, (6, 1))
     
     cohort_df = pd.DataFrame(cohort_data, 
                              columns=[f'M{i}' for i in range(13)],
@@ -574,6 +1213,221 @@ with tab3:
     )
     st.plotly_chart(fig5, use_container_width=True)
 
+    st.markdown("### 🧱 Cohort-Stacked MAU")
+    if revenue_model == 'cohort':
+        mau_layers = cohort_layers(cohort_projection['acquisitions'], cohort_projection['retention'])
+        fig_layers = go.Figure()
+        for layer_index, layer in enumerate(mau_layers):
+            fig_layers.add_trace(go.Scatter(
+                x=np.arange(current_month, current_month + schedule_months + 1),
+                y=layer,
+                name='Existing Users' if layer_index == 0 else f'Acquired Year {layer_index}',
+                mode='lines',
+                stackgroup='mau'
+            ))
+        fig_layers.update_layout(
+            height=350,
+            xaxis_title="Months",
+            yaxis_title="MAU",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_layers, use_container_width=True)
+        st.caption(f"New users = acquisition spend ÷ CAC; every cohort retains at {100 - churn_rate:.0f}% per month. "
+                   f"This MAU path drives the repayment timeline.")
+    else:
+        st.info("Select the Cohort revenue model in 🔧 Assumptions to project revenue from acquisition spend, "
+                "CAC and churn instead of a compound growth rate.")
+
+    st.markdown("### 🎯 Marketing Spend Optimizer")
+    st.caption("Spreads a fixed acquisition budget over the planning window to repay sooner or to raise blended "
+               "LTV/CAC. Spend ÷ CAC acquires users, cohorts decay with churn and MAU × ARPU drives repayment; "
+               "no spend after the window. CAC also rises with a month's spend (diminishing returns).")
+    col1, col2 = st.columns(2)
+    with col1:
+        optimizer_objective = st.radio("Objective", list(OPTIMIZER_OBJECTIVES), horizontal=True,
+                                       format_func=OPTIMIZER_OBJECTIVES.get, key="optimizer_objective")
+        plan_months = st.slider("Planning Window (months)", min_value=6, max_value=60, value=DEFAULT_PLAN_MONTHS,
+                                key="optimizer_months")
+    # The sidebar plan (acquisition spend growing monthly) over the window is the baseline and the default budget
+    current_plan = acquisition_spend * growth_path(spend_growth, plan_months - 1)
+    with col2:
+        optimizer_budget = st.number_input("Budget (₹ Lakhs over the window)", min_value=0.1, max_value=100000.0,
+                                           value=max(round(float(current_plan.sum()), 1), 0.1), step=1.0,
+                                           key="optimizer_budget")
+        cac_doubling_spend = st.number_input(
+            "Spend that Doubles CAC (₹ Lakhs/month)", min_value=0.1, max_value=10000.0,
+            value=max(round(2 * acquisition_spend, 1), 0.5), step=0.5, key="cac_doubling_spend",
+            help="Diminishing returns: spending this much in one month doubles that month's CAC")
+
+    optimizer_model = spend_model(current_mau, current_arpu, churn_rate, monthly_arpu_growth,
+                                  current_monthly_revenue, redemption_rate=redemption_schedule,
+                                  revenue_share_pct=revenue_share, investment_amount=investment_amount,
+                                  already_paid=already_paid, starting_cac=starting_cac,
+                                  cac_monthly_increase=cac_monthly_increase, cac_schedule=cac_schedule,
+                                  cac_doubling_spend=cac_doubling_spend, months=schedule_months)
+    # Runs in the background; changed inputs cancel the stale search
+    optimizer_key = memory_key(optimizer_model, optimizer_budget, optimizer_objective, plan_months, current_plan)
+    optimizer_job = job_runner().submit(f"{st.session_state.session_id}:optimizer", optimizer_key,
+                                        spend_optimizer_job, optimizer_model, optimizer_budget,
+                                        optimizer_objective, plan_months, current_plan)
+    optimizer_polling = not optimizer_job.finished
+
+    @st.fragment(run_every=1.0 if optimizer_polling else None)
+    def show_spend_optimizer():
+        if optimizer_polling and optimizer_job.finished:
+            st.rerun()  # final result: redraw once without polling
+        if optimizer_job.status == 'cancelled':
+            return
+        if optimizer_job.status == 'failed':
+            st.error(f"⚠️ Spend optimization failed: {optimizer_job.error}")
+            return
+        best = optimizer_job.result if optimizer_job.status == 'done' else optimizer_job.partial
+        if optimizer_job.status != 'done':
+            st.progress(optimizer_job.progress,
+                        text=f"Searching spend schedules... {optimizer_job.progress:.0%} of "
+                             f"{SEARCH_ROUNDS * SEARCH_POPULATION:,} evaluations (best so far shown)")
+        if best is None:
+            return
+
+        plans = {'Current Plan': current_plan * (optimizer_budget / current_plan.sum())
+                 if current_plan.sum() > 0 else np.full(plan_months, optimizer_budget / plan_months),
+                 'Optimized': best['spend']}
+        df_plan_summary, df_plan = spend_plan_frame(plans, optimizer_model, current_month)
+        current, optimized = df_plan_summary.iloc[0], df_plan_summary.iloc[1]
+
+        col1, col2, col3, col4 = st.columns(4)
+        if optimized['Complete'] or current['Complete']:
+            months_saved = int(optimized['Months Remaining'] - current['Months Remaining'])
+            col1.metric("Months to Payoff",
+                        f"{optimized['Months Remaining']}" if optimized['Complete'] else
+                        f">{optimized['Months Remaining']}",
+                        delta=f"{months_saved:+d} vs current plan", delta_color="inverse")
+        else:
+            balance_change = optimized['Final Balance (₹L)'] - current['Final Balance (₹L)']
+            col1.metric("Balance at Horizon", f"₹{optimized['Final Balance (₹L)']:.2f}L",
+                        delta=f"₹{balance_change:+.2f}L vs current plan", delta_color="inverse")
+        col2.metric("Blended LTV/CAC", f"{optimized['LTV/CAC']:.2f}x",
+                    delta=f"{optimized['LTV/CAC'] - current['LTV/CAC']:+.2f}x")
+        col3.metric("Users Acquired", f"{optimized['Users Acquired']:,}",
+                    delta=f"{int(optimized['Users Acquired'] - current['Users Acquired']):+,}")
+        col4.metric("Evaluations", f"{best['evaluations']:,}",
+                    help=f"{best['evaluations_per_second']:,.0f} schedules per second")
+
+        fig_spend = go.Figure()
+        for name, color in [('Current Plan', 'lightgray'), ('Optimized', 'seagreen')]:
+            fig_spend.add_trace(go.Bar(x=df_plan['Month'], y=df_plan[f'{name} Spend (₹L)'], name=f'{name} Spend',
+                                       marker_color=color))
+            fig_spend.add_trace(go.Scatter(x=df_plan['Month'], y=df_plan[f'{name} MAU'], name=f'{name} MAU',
+                                           mode='lines', line=dict(color=color), yaxis='y2'))
+        fig_spend.update_layout(height=350, barmode='group', hovermode='x unified', xaxis_title="Month",
+                                yaxis=dict(title="Acquisition Spend (₹ Lakhs)"),
+                                yaxis2=dict(title="MAU", overlaying='y', side='right'))
+        st.plotly_chart(fig_spend, use_container_width=True)
+        st.dataframe(df_plan_summary, use_container_width=True, hide_index=True,
+                     column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                    for column in df_plan_summary.columns if column.endswith('(₹L)')})
+        st.caption("Both plans spend the same budget; the current plan is the sidebar spend schedule over the "
+                   "window, scaled to the budget.")
+
+    show_spend_optimizer()
+
+    st.markdown("### 🎲 User-Level Simulation")
+    st.caption("Simulates every user instead of the averages: each month's new users are a random draw around "
+               "spend ÷ CAC, each user has their own ARPU and churns at random. The spread across runs shows how "
+               "much luck moves the payoff month - large for small user bases, negligible for large ones.")
+    if st.checkbox("Simulate individual users", key="microsim_enabled",
+                   help="Runs in the background; millions of users take a few seconds per run"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            microsim_runs = st.slider("Runs", min_value=20, max_value=500, value=MICROSIM_RUNS // 2, step=10,
+                                      key="microsim_runs")
+        with col2:
+            microsim_months = st.slider("Horizon (months)", min_value=12, max_value=schedule_months,
+                                        value=min(60, schedule_months), step=6, key="microsim_months")
+        with col3:
+            arpu_dispersion = st.slider("ARPU Spread (CV)", min_value=0.0, max_value=2.0, value=ARPU_DISPERSION,
+                                        step=0.1, key="arpu_dispersion",
+                                        help="Coefficient of variation of ARPU across users (0 = everyone pays "
+                                             "the average)")
+
+        microsim_acquisitions = cohort_projection['acquisitions'][:microsim_months + 1]
+        microsim_key = memory_key(microsim_acquisitions, current_arpu, churn_rate, monthly_arpu_growth,
+                                  microsim_runs, arpu_dispersion)
+        microsim_job = job_runner().submit(f"{st.session_state.session_id}:microsim", microsim_key,
+                                           user_simulation_job, microsim_acquisitions, current_arpu, churn_rate,
+                                           monthly_arpu_growth, microsim_runs, arpu_dispersion)
+        microsim_polling = not microsim_job.finished
+
+        @st.fragment(run_every=1.0 if microsim_polling else None)
+        def show_user_simulation():
+            if microsim_polling and microsim_job.finished:
+                st.rerun()  # final result: redraw once without polling
+            if microsim_job.status == 'cancelled':
+                return
+            if microsim_job.status == 'failed':
+                st.error(f"⚠️ User simulation failed: {microsim_job.error}")
+                return
+            simulation = microsim_job.result if microsim_job.status == 'done' else microsim_job.partial
+            if microsim_job.status != 'done':
+                st.progress(microsim_job.progress,
+                            text=f"Simulating users... {microsim_job.progress:.0%} of {microsim_runs} runs")
+            if simulation is None:
+                return
+
+            outcome = microsim_repayment(simulation, current_monthly_revenue, redemption_rate=redemption_schedule,
+                                         revenue_share_pct=revenue_share, investment_amount=investment_amount,
+                                         already_paid=already_paid)
+            bands = microsim_bands(simulation, current_month)
+
+            def months_label(months):
+                # Runs not repaid within the horizon count at the horizon
+                if months >= microsim_months and not outcome['complete'].all():
+                    return f">{microsim_months}"
+                return f"{months:.0f}"
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Months Remaining (P50)", months_label(outcome['p50']),
+                        f"P10 {months_label(outcome['p10'])} – P90 {months_label(outcome['p90'])}", delta_color="off")
+            col2.metric("Repaid Within 36 Months", f"{outcome['on_target']:.0%}")
+            col3.metric("MAU at Horizon (P50)", f"{bands['MAU P50'].iloc[-1]:,.0f}",
+                        f"P10 {bands['MAU P10'].iloc[-1]:,.0f} – P90 {bands['MAU P90'].iloc[-1]:,.0f}",
+                        delta_color="off")
+            col4.metric("Simulated Users", f"{simulation['users']:,}",
+                        help=f"{simulation['runs']} runs; at most {simulation['peak_users']:,} live users "
+                             f"({simulation['state_mb']:.0f} MB of user state) at once")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                fig_microsim = go.Figure()
+                fig_microsim.add_trace(go.Scatter(x=bands['Month'], y=bands['MAU P90'], mode='lines',
+                                                  line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                fig_microsim.add_trace(go.Scatter(x=bands['Month'], y=bands['MAU P10'], mode='lines',
+                                                  line=dict(width=0), fill='tonexty',
+                                                  fillcolor='rgba(46, 139, 87, 0.25)', name='P10–P90'))
+                fig_microsim.add_trace(go.Scatter(x=bands['Month'], y=bands['MAU P50'], mode='lines',
+                                                  line=dict(color='seagreen'), name='Simulated P50'))
+                fig_microsim.add_trace(go.Scatter(x=bands['Month'], y=cohort_projection['mau'][:len(bands)],
+                                                  mode='lines', line=dict(color='gray', dash='dash'),
+                                                  name='Cohort Model'))
+                fig_microsim.update_layout(height=350, hovermode='x unified', xaxis_title="Month",
+                                           yaxis_title="MAU", title="Simulated MAU")
+                st.plotly_chart(fig_microsim, use_container_width=True)
+            with col2:
+                fig_microsim_payoff = px.histogram(x=outcome['months_remaining'], nbins=40,
+                                                   labels={'x': 'Months Remaining'},
+                                                   title="Months Remaining Across Simulated Runs")
+                fig_microsim_payoff.update_layout(height=350, yaxis_title="Runs", showlegend=False)
+                st.plotly_chart(fig_microsim_payoff, use_container_width=True)
+
+            retention_12 = bands.loc[bands['Age'] == min(12, len(bands) - 1)]
+            st.caption(f"12-month retention across runs: {retention_12['Retention P10 (%)'].iloc[0]:.1f}% – "
+                       f"{retention_12['Retention P90 (%)'].iloc[0]:.1f}% (expected "
+                       f"{retention_curve(churn_rate, 12)[-1] * 100:.1f}%). Each run's revenue path drives the "
+                       f"repayment from the current revenue; runs not repaid within {microsim_months} months "
+                       f"count at the horizon ({np.mean(~outcome['complete']):.0%} of runs).")
+
+        show_user_simulation()
+
 # Tab 4: Risk Analysis
 with tab4:
     st.subheader("⚠️ Risk Scenarios & Sensitivity Analysis")
@@ -583,32 +1437,11 @@ with tab4:
     with col1:
         st.markdown("### Scenario Analysis")
         
-        scenarios_data = {
-            'Scenario': ['Pessimistic', 'Base Case', 'Optimistic', 'Best Case'],
-            'Growth Rate': [5.0, revenue_growth_rate, 10.0, 12.0],
-            'Probability': [20, 50, 25, 5],
-            'Months Remaining': []
-        }
-        
-        # Calculate months for each scenario
-        scenario_months_lower_bound = []
-        scenario_incomplete = []
-        for rate in scenarios_data['Growth Rate']:
-            df_temp = calculate_projections(current_monthly_revenue, rate,
-                                           redemption_rate=redemption_rate,
-                                           revenue_share_pct=revenue_share,
-                                           current_month=current_month,
-                                           investment_amount=investment_amount,
-                                           already_paid=already_paid)
-            months = len(df_temp)
-            months_remaining_scenario = months - 1  # Exclude current month
-            final_bal = df_temp.iloc[-1]['Balance (₹L)'] if len(df_temp) > 0 else investment_amount
-            incomplete = final_bal > 0.01
-            scenarios_data['Months Remaining'].append(f'>{months_remaining_scenario}' if incomplete else months_remaining_scenario)
-            scenario_months_lower_bound.append(months_remaining_scenario)
-            scenario_incomplete.append(incomplete)
-        
-        df_scenarios = pd.DataFrame(scenarios_data)
+        # Base Case follows the selected growth curve; all returns come from one batch
+        scenario_results = derived['scenario_table']
+        scenario_months_lower_bound = scenario_results['months_remaining']
+        scenario_incomplete = scenario_results['incomplete']
+        df_scenarios = scenario_results['table']
         st.dataframe(df_scenarios, use_container_width=True)
         
         # Expected outcome
@@ -627,27 +1460,17 @@ with tab4:
         st.markdown("### Sensitivity Analysis")
         
         # Create sensitivity matrix - Growth Rate vs Redemption Rate
-        growth_rates = [3, 5, 7, 9, 11]
-        redemption_rates = [30, 40, 50, 60, 70]  # More relevant than churn
-
-        sensitivity_matrix = []
-        for redemption in redemption_rates:
-            row = []
-            for growth in growth_rates:
-                df_temp = calculate_projections(current_monthly_revenue, growth,
-                                               redemption_rate=redemption,  # Now uses redemption!
-                                               revenue_share_pct=revenue_share,
-                                               current_month=current_month,
-                                               investment_amount=investment_amount,
-                                               already_paid=already_paid)
-                months = len(df_temp)
-                # Check if incomplete
-                final_bal = df_temp.iloc[-1]['Balance (₹L)'] if len(df_temp) > 0 else investment_amount
-                if final_bal > 0.01:
-                    row.append(f'>{months}')
-                else:
-                    row.append(months)
-            sensitivity_matrix.append(row)
+        growth_rates = SENSITIVITY_GROWTH_RATES
+        redemption_rates = SENSITIVITY_REDEMPTION_RATES  # More relevant than churn
+
+        # Whole grid from the shared payoff lookup table (exact fallback near month boundaries);
+        # independent of the growth curve and redemption slider, so those leave it cached
+        sensitivity_lookup = derived['sensitivity_grid']
+        months_grid = sensitivity_lookup['months_remaining'] + 1  # Include current month
+        sensitivity_matrix = [
+            [months if complete else f'>{months}' for months, complete in zip(months_row, complete_row)]
+            for months_row, complete_row in zip(months_grid.tolist(), sensitivity_lookup['complete'].tolist())
+        ]
 
         fig6 = go.Figure(data=go.Heatmap(
             z=[[float(str(x).replace('>', '')) for x in row] for row in sensitivity_matrix],
@@ -667,31 +1490,287 @@ with tab4:
             title="Months to Repayment (Growth vs Redemption Sensitivity)"
         )
         st.plotly_chart(fig6, use_container_width=True)
-    
+
+    # Iso-repayment contours - exact growth needed per redemption rate for each target
+    st.markdown("### 🧭 Iso-Repayment Contours")
+
+    contour_growth, contour_redemption, contour_months, iso_boundaries = calculate_iso_repayment_surface(
+        current_monthly_revenue, investment_amount, already_paid, revenue_share
+    )
+
+    fig_iso = go.Figure(data=go.Contour(
+        z=np.minimum(contour_months, 120),
+        x=contour_growth,
+        y=contour_redemption,
+        colorscale='RdYlGn_r',
+        contours=dict(start=0, end=120, size=12, showlines=False),
+        colorbar=dict(title="Months"),
+        hovertemplate='Growth: %{x:.1f}%<br>Redemption: %{y:.0f}%<br>Months: %{z:.1f}<extra></extra>'
+    ))
+    for target, required_growth in iso_boundaries.items():
+        fig_iso.add_trace(go.Scatter(
+            x=required_growth,
+            y=contour_redemption,
+            name=f'{target} months',
+            mode='lines',
+            line=dict(width=2, dash='solid' if target == 36 else 'dot'),
+            hovertemplate=f'{target} months: ' + '%{x:.2f}% growth at %{y:.0f}% redemption<extra></extra>'
+        ))
+    fig_iso.add_trace(go.Scatter(
+        x=[revenue_growth_rate],
+        y=[redemption_rate],
+        name='Current',
+        mode='markers',
+        marker=dict(size=12, color='black', symbol='x')
+    ))
+    fig_iso.update_layout(
+        height=450,
+        xaxis_title="Monthly Revenue Growth Rate (%)",
+        yaxis_title="Redemption Rate (%)",
+        xaxis_range=[0, 20],
+        title="Growth Needed to Repay Within 24 / 36 / 48 / 60 Months"
+    )
+    st.plotly_chart(fig_iso, use_container_width=True)
+    st.caption("Each line is the minimum growth rate that completes repayment within the target "
+               "at that redemption rate. Points to the right of a line repay sooner.")
+
     # Risk factors
     st.markdown("### 🎯 Key Risk Factors")
-    
-    risk_data = {
-        'Risk Factor': [
-            'CAC Inflation',
-            'Higher Churn',
-            'Competition',
-            'Regulatory',
-            'Platform Issues'
-        ],
-        'Probability': ['High', 'Medium', 'High', 'Low', 'Low'],
-        'Impact': ['+6 months', '+4 months', '+8 months', '+12 months', '+3 months'],
-        'Mitigation': [
-            'Diversify channels',
-            'Improve retention',
-            'Unique value prop',
-            'Compliance framework',
-            'Tech redundancy'
-        ]
+    st.caption("Global (Sobol) sensitivity: the share of variance in each outcome explained by each input "
+               "when all inputs vary together across the ranges below. Total order includes interactions.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        sensitivity_range = st.slider(
+            "Input Range (± % around current values)",
+            min_value=5,
+            max_value=50,
+            value=25,
+            step=5,
+            help="Each input is sampled uniformly within this band around its current value",
+            key="sensitivity_range"
+        )
+    with col2:
+        sensitivity_samples = st.select_slider(
+            "Samples per Matrix",
+            options=[1024, 2048, 4096, 8192],
+            value=4096,
+            help=f"Model evaluations = {len(SENSITIVITY_INPUTS) + 2} × samples",
+            key="sensitivity_samples"
+        )
+
+    sensitivity_current = {
+        'User Growth %': monthly_user_growth,
+        'ARPU Growth %': monthly_arpu_growth,
+        'Churn %': churn_rate,
+        'Redemption %': redemption_rate,
+        'Starting Revenue (₹L)': current_monthly_revenue,
+        'Investment (₹L)': investment_amount,
+        'Already Paid (₹L)': already_paid,
     }
-    
-    df_risks = pd.DataFrame(risk_data)
-    st.dataframe(df_risks, use_container_width=True)
+    sensitivity_bounds = sensitivity_input_bounds(sensitivity_current, sensitivity_range / 100)
+    # The growth curve and redemption schedule are flexed around the sidebar values, so the
+    # unflexed scenario is the dashboard's own projection
+    sensitivity_fixed = {
+        'revenue_share_pct': revenue_share,
+        'revenue_model': revenue_model,
+        'acquisitions': cohort_projection['acquisitions'] if revenue_model == 'cohort' else None,
+        'months': schedule_months,
+        'user_growth_schedule': user_growth_schedule,
+        'redemption_schedule': redemption_schedule,
+        'current_values': sensitivity_current,
+    }
+    # Runs in the background: partial indices stream in, and changed inputs cancel the stale run
+    sensitivity_key = memory_key(sensitivity_bounds, sensitivity_fixed, sensitivity_samples)
+    sensitivity_owner = f"{st.session_state.session_id}:sensitivity"
+
+    sensitivity_job = job_runner().submit(sensitivity_owner, sensitivity_key, global_sensitivity_job,
+                                          sensitivity_bounds, sensitivity_fixed, sensitivity_samples)
+    sensitivity_polling = not sensitivity_job.finished
+
+    @st.fragment(run_every=0.5 if sensitivity_polling else None)
+    def show_global_sensitivity():
+        if sensitivity_polling and sensitivity_job.finished:
+            st.rerun()  # final result: redraw once without polling
+        if sensitivity_job.status == 'cancelled':
+            return
+        if sensitivity_job.status == 'failed':
+            st.error(f"⚠️ Sensitivity analysis failed: {sensitivity_job.error}")
+            return
+        df_sensitivity = sensitivity_job.result if sensitivity_job.status == 'done' else sensitivity_job.partial
+        if sensitivity_job.status != 'done':
+            evaluations = (len(SENSITIVITY_INPUTS) + 2) * sensitivity_samples
+            st.progress(sensitivity_job.progress,
+                        text=f"Running global sensitivity analysis... {sensitivity_job.progress:.0%} of "
+                             f"{evaluations:,} evaluations (partial estimates shown)")
+        if df_sensitivity is None:
+            return
+
+        col1, col2 = st.columns(2)
+        for column, output_name in zip([col1, col2], SENSITIVITY_OUTPUTS):
+            ranked = df_sensitivity[df_sensitivity['Output'] == output_name].iloc[::-1]
+            fig_sobol = go.Figure()
+            fig_sobol.add_trace(go.Bar(
+                y=ranked['Input'],
+                x=ranked['Total Order'],
+                name='Total Order',
+                orientation='h',
+                marker_color='indianred'
+            ))
+            fig_sobol.add_trace(go.Bar(
+                y=ranked['Input'],
+                x=ranked['First Order'],
+                name='First Order',
+                orientation='h',
+                marker_color='lightsalmon'
+            ))
+            fig_sobol.update_layout(
+                height=350,
+                barmode='group',
+                xaxis_title="Sobol Index (share of variance)",
+                xaxis_range=[0, 1],
+                title=output_name
+            )
+            column.plotly_chart(fig_sobol, use_container_width=True)
+
+        df_risks = df_sensitivity.pivot(index='Input', columns='Output', values='Total Order')
+        df_risks = df_risks[SENSITIVITY_OUTPUTS].sort_values(SENSITIVITY_OUTPUTS[0], ascending=False)
+        df_risks['Range'] = [f"{sensitivity_bounds[name][0]:.2f} – {sensitivity_bounds[name][1]:.2f}"
+                             for name in df_risks.index]
+        df_risks['Mitigation'] = [RISK_MITIGATIONS[name] for name in df_risks.index]
+        st.dataframe(df_risks.round(3), use_container_width=True)
+
+    show_global_sensitivity()
+    if revenue_model != 'cohort':
+        st.caption("Churn only affects repayment under the Cohort revenue model; with compound growth its index is zero.")
+
+    # Tornado: each input flexed to the ends of its range, all others held at current values
+    st.markdown("### 🌪️ One-at-a-Time Impacts (Tornado)")
+    df_tornado = tornado_analysis(sensitivity_current, sensitivity_bounds, sensitivity_fixed)
+    base_months = df_tornado.attrs['base_months']
+    base_target_balance = df_tornado.attrs['base_balance']
+    base_final_balance = df_tornado.attrs['base_final_balance']
+
+    col1, col2, col3 = st.columns(3)
+    tornado_panels = [
+        (col1, 'Months @ Low', 'Months @ High', base_months, "Months Remaining", 'Months Swing'),
+        (col2, 'Final Balance @ Low (₹L)', 'Final Balance @ High (₹L)', base_final_balance,
+         f"Final Balance after {schedule_months} Months (₹ Lakhs)", 'Final Balance Swing (₹L)'),
+        (col3, 'Target Balance @ Low (₹L)', 'Target Balance @ High (₹L)', base_target_balance,
+         f"Balance at Month {RECOVERY_TARGET_MONTHS} (₹ Lakhs)", 'Target Balance Swing (₹L)'),
+    ]
+    for column, low_column, high_column, base_value, axis_title, swing_column in tornado_panels:
+        ranked = df_tornado.sort_values(swing_column).reset_index(drop=True)
+        fig_tornado = go.Figure()
+        fig_tornado.add_trace(go.Bar(
+            y=ranked['Input'],
+            x=ranked[low_column] - base_value,
+            base=base_value,
+            name='Input Low',
+            orientation='h',
+            marker_color='steelblue',
+            customdata=ranked['Low Value'],
+            hovertemplate='%{y} = %{customdata:.2f}<br>' + axis_title + ': %{x:.1f}<extra></extra>'
+        ))
+        fig_tornado.add_trace(go.Bar(
+            y=ranked['Input'],
+            x=ranked[high_column] - base_value,
+            base=base_value,
+            name='Input High',
+            orientation='h',
+            marker_color='darkorange',
+            customdata=ranked['High Value'],
+            hovertemplate='%{y} = %{customdata:.2f}<br>' + axis_title + ': %{x:.1f}<extra></extra>'
+        ))
+        fig_tornado.add_vline(x=base_value, line_dash="dash", line_color="gray")
+        fig_tornado.update_layout(
+            height=350,
+            barmode='overlay',
+            xaxis_title=axis_title,
+            title=f"Swing in {axis_title}"
+        )
+        column.plotly_chart(fig_tornado, use_container_width=True)
+
+    df_impacts = df_tornado[['Input', 'Low Value', 'High Value', 'Months @ Low', 'Months @ High',
+                             'Impact', 'Final Balance Swing (₹L)', 'Target Balance Swing (₹L)']].copy()
+    for side in ['Low', 'High']:
+        df_impacts[f'Months @ {side}'] = [
+            f'{months}' if complete else f'>{months}'
+            for months, complete in zip(df_tornado[f'Months @ {side}'], df_tornado[f'{side} Complete'])
+        ]
+    st.dataframe(df_impacts.round(2), use_container_width=True, hide_index=True)
+    st.caption(f"Base case: {base_months} months remaining. Impact is the delay from the worse side of each input's "
+               f"range. Final balance is what is still unpaid after the {schedule_months}-month projection (zero "
+               f"once repaid); target balance is what is unpaid {RECOVERY_TARGET_MONTHS} months from now.")
+
+    # Stress tests: shock sequences applied month by month to the current schedule
+    st.markdown("### 🧨 Stress Tests")
+    st.caption("Each scenario is a set of shocks: revenue drops (Depth %, closing linearly over Recovery Months), "
+               "redemption spikes (Redemption % while it lasts) and payment holidays. Start Month counts months "
+               "ahead of the current month; rows sharing a Scenario name apply together.")
+    library_shocks = stress_library()
+    custom_shocks = st.data_editor(
+        pd.DataFrame([['Custom: 2-month outage', 'Revenue Drop', 3, 2, 100.0, 3, None],
+                      ['Custom: 2-month outage', 'Payment Holiday', 3, 2, None, None, None]],
+                     columns=SHOCK_COLUMNS),
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key="stress_shocks",
+        column_config={
+            'Shock': st.column_config.SelectboxColumn(options=list(SHOCK_KINDS), required=True),
+            'Start Month': st.column_config.NumberColumn(min_value=0, max_value=schedule_months, step=1),
+            'Months': st.column_config.NumberColumn(min_value=1, max_value=schedule_months, step=1),
+            'Depth %': st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=5.0),
+            'Recovery Months': st.column_config.NumberColumn(min_value=0, max_value=schedule_months, step=1),
+            'Redemption %': st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0),
+        }
+    )
+    custom_shocks = custom_shocks.dropna(subset=['Scenario', 'Shock', 'Start Month'])
+    include_library = st.checkbox(f"Include the built-in library ({library_shocks['Scenario'].nunique()} "
+                                  f"scenarios)", value=True, key="stress_library")
+    stress_shocks = pd.concat([custom_shocks, library_shocks] if include_library else [custom_shocks],
+                              ignore_index=True)
+    stress_inputs = dict(current_revenue=current_monthly_revenue, growth_rate=revenue_growth_schedule,
+                         redemption_rate=redemption_schedule, revenue_share_pct=revenue_share,
+                         months=schedule_months, investment_amount=investment_amount, already_paid=already_paid)
+    stress_key = memory_key(derived.key('projections'), stress_shocks.to_csv(index=False))
+
+    # All scenarios in one batched ledger pass
+    df_stress = remember('stress_test', stress_key, lambda: stress_test(stress_shocks, **stress_inputs))
+    stress_worst = df_stress.attrs
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Base Case", f"{stress_worst['base_months']} months")
+    col2.metric("Worst-Case Payoff",
+                f"{stress_worst['worst_months']}{'' if stress_worst['worst_complete'] else '+'} months",
+                delta=f"+{stress_worst['worst_months'] - stress_worst['base_months']} months", delta_color="inverse",
+                help=stress_worst['worst_scenario'])
+    col3.metric(f"Max Shortfall @ Month {stress_worst['target_months']}", f"₹{stress_worst['max_shortfall']:.2f}L",
+                help=stress_worst['max_shortfall_scenario'])
+    col4.metric(f"Miss Month {stress_worst['target_months']}", f"{stress_worst['missed_target']} of {len(df_stress)}")
+
+    def build_stress_chart():
+        worst = stress_shocks[stress_shocks['Scenario'].isin(df_stress['Scenario'].head(5))]
+        matrices = shock_matrices(worst, schedule_months)
+        ledger = stress_ledger(matrices, **stress_inputs)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=df_projections['Month'], y=df_projections['Balance (₹L)'], name='Base case',
+                                 mode='lines', line=dict(color='gray', dash='dash')))
+        for name, balance, payoff in zip(matrices['scenarios'], ledger['balance'], ledger['payoff_index']):
+            shown = payoff + 1 if payoff >= 0 else len(balance)    # through the payoff month
+            fig.add_trace(go.Scatter(x=current_month + np.arange(shown), y=from_paise(balance[:shown]),
+                                     name=name, mode='lines'))
+        fig.update_layout(height=400, hovermode='x unified', xaxis_title="Month",
+                          yaxis_title="Balance (₹ Lakhs)", title="Balance under the 5 Worst Scenarios")
+        return fig
+
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.plotly_chart(remember('stress_chart', stress_key, build_stress_chart), use_container_width=True)
+    with col2:
+        st.dataframe(df_stress, height=400, use_container_width=True, hide_index=True,
+                     column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                    for column in df_stress.columns if column.endswith('(₹L)')})
 
 # Tab 5: Reports
 with tab5:
@@ -700,9 +1779,7 @@ with tab5:
     # Generate executive summary
     st.markdown("### Executive Summary")
 
-    # Calculate current payment with correct formula
-    exec_current_net_revenue = current_monthly_revenue * (1 - redemption_rate/100)
-    exec_current_payment = exec_current_net_revenue * (revenue_share/100)
+    exec_current_payment = derived['current_payment']
 
     # Format repayment timeline consistently with UI
     repayment_status = "Incomplete - may take longer" if repayment_incomplete else "On track"
@@ -710,6 +1787,15 @@ with tab5:
     # Get actual balance from first row of projections (post-payment, matches table)
     first_row_balance = df_projections.iloc[0]['Balance (₹L)']
 
+    # Investor returns on the projected payment stream (revenue share only)
+    base_returns = derived['base_returns']
+    base_irr = base_returns['annual_irr']
+    base_xirr = base_returns['xirr']
+    base_npv = base_returns['npv']
+    base_moic = base_returns['moic']
+    irr_display = f"{base_irr * 100:.2f}%" if np.isfinite(base_irr) else "N/A"
+    xirr_display = f"{base_xirr * 100:.2f}%" if np.isfinite(base_xirr) else "N/A"
+
     summary = f"""
     **Investment Analysis as of {datetime.now().strftime('%B %d, %Y')}**
 
@@ -719,7 +1805,7 @@ with tab5:
     - Average Revenue per User: ₹{current_arpu}
     - Monthly Payment to Vinmo: ₹{exec_current_payment:.2f} Lakhs
 
-    **Projections (at {revenue_growth_rate:.1f}% monthly revenue growth):**
+    **Projections (at {revenue_growth_rate:.1f}% monthly revenue growth, {growth_curve_labels[growth_curve]} curve):**
     - Months Remaining: {remaining_display} months
     - Completes At: {final_month_display}
     - Status: {repayment_status}
@@ -733,6 +1819,11 @@ with tab5:
     - Revenue Share: {revenue_share}%
     - Equity Stake: {equity_stake}%
 
+    **Investor Returns (revenue share, {discount_rate:g}% discount rate):**
+    - IRR: {irr_display} annualised ({xirr_display} XIRR)
+    - NPV: ₹{base_npv:.2f} Lakhs
+    - MOIC: {base_moic:.2f}x
+
     **Risk Assessment:**
     - {'✅ Low Risk' if (not repayment_incomplete and months_remaining <= 30) else '⚠️ Moderate Risk' if (not repayment_incomplete and months_remaining <= 42) else '🔴 High Risk'}
     - {'On track for target timeline' if (not repayment_incomplete and months_remaining <= 36) else f'Behind target' if not repayment_incomplete else 'Requires longer timeline or improved growth'}
@@ -742,14 +1833,82 @@ with tab5:
     """
     
     st.markdown(summary)
+
+    st.markdown("### 💹 Investor Returns")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("IRR (Annualised)", irr_display,
+                  help="Monthly IRR of the investor cash flows, compounded to a year")
+    with col2:
+        st.metric("XIRR", xirr_display, help="IRR on calendar dates (actual days / 365)")
+    with col3:
+        st.metric(f"NPV @ {discount_rate:g}%", f"₹{base_npv:.2f}L")
+    with col4:
+        st.metric("MOIC", f"{base_moic:.2f}x", help="Total received ÷ total invested")
+    if repayment_incomplete:
+        st.warning("⚠️ Repayment does not complete within the projection horizon; returns cover the projected payments only.")
+    st.caption("Revenue-share payments stop once the investment is repaid, so MOIC tops out at 1.0x and "
+               "IRR is near zero; the equity stake is valued in the exit grid below. Set the discount rate "
+               "and exit assumptions in the Assumptions tab.")
     
+    st.markdown("### 🏁 Equity Exit Valuation")
+    st.caption(f"Revenue-share payments up to the exit (any unpaid balance settled at exit) plus the "
+               f"{equity_stake}% equity stake of a valuation at a multiple of annualised gross revenue.")
+
+    exit_revenue_path = derived['revenue_path']
+    exit_grid = calculate_exit_grid(tuple(df_projections['Payment to Vinmo (₹L)']), tuple(exit_revenue_path),
+                                    equity_stake, investment_amount, already_paid, current_month, discount_rate)
+    exit_row = exit_months_ahead - 1
+    exit_column = int(np.argmin(np.abs(exit_grid['revenue_multiples'] - exit_multiple)))
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Equity Proceeds", f"₹{exit_grid['equity_proceeds'][exit_row, exit_column]:,.2f}L",
+                  f"Exit M{exit_grid['exit_months'][exit_row]} @ {exit_multiple:g}x")
+    with col2:
+        st.metric("Total Return", f"₹{exit_grid['total_return'][exit_row, exit_column]:,.2f}L",
+                  f"₹{exit_grid['revenue_share'][exit_row, exit_column]:,.2f}L revenue share")
+    with col3:
+        exit_irr = exit_grid['annual_irr'][exit_row, exit_column]
+        st.metric("Total IRR (Annualised)", f"{exit_irr * 100:.1f}%" if np.isfinite(exit_irr) else "N/A",
+                  f"MOIC {exit_grid['moic'][exit_row, exit_column]:,.2f}x")
+    with col4:
+        st.metric(f"Total NPV @ {discount_rate:g}%", f"₹{exit_grid['npv'][exit_row, exit_column]:,.2f}L")
+
+    def build_exit_figure():
+        fig_exit = go.Figure(data=go.Heatmap(
+            z=exit_grid['annual_irr'].T * 100,
+            x=exit_grid['exit_months'],
+            y=exit_grid['revenue_multiples'],
+            colorscale='RdYlGn',
+            zmid=0,
+            colorbar=dict(title="IRR %"),
+            customdata=np.dstack([exit_grid['total_return'].T, exit_grid['moic'].T]),
+            hovertemplate="Exit M%{x} @ %{y}x<br>IRR: %{z:.1f}%<br>Total: ₹%{customdata[0]:,.1f}L"
+                          "<br>MOIC: %{customdata[1]:.2f}x<extra></extra>"
+        ))
+        fig_exit.add_trace(go.Scatter(
+            x=[exit_grid['exit_months'][exit_row]], y=[exit_grid['revenue_multiples'][exit_column]],
+            mode='markers', marker=dict(symbol='x', size=12, color='black'), name='Selected Exit'
+        ))
+        fig_exit.update_layout(
+            title=f"Total Annualised IRR by Exit Month and Revenue Multiple ({exit_grid['annual_irr'].size:,} scenarios)",
+            xaxis_title="Exit Month",
+            yaxis_title="Revenue Multiple (× annual revenue)",
+            height=450
+        )
+        return fig_exit
+
+    st.plotly_chart(remember('exit_figure', scenario_key, build_exit_figure), use_container_width=True)
+    df_exit = exit_grid_frame(exit_grid)
+
     # Generate downloadable report
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.download_button(
             label="📥 Download Full Report (CSV)",
-            data=df_projections.to_csv(index=False),
+            data=remember('report_csv', scenario_key, lambda: df_projections.to_csv(index=False)),
             file_name=f"adnexus_full_report_{datetime.now().strftime('%Y%m%d')}.csv",
             mime='text/csv'
         )
@@ -764,20 +1923,109 @@ with tab5:
     
     with col3:
         # Create combined data for download
-        combined_data = {
-            'Projections': df_projections.to_dict(),
-            'Unit Economics': df_unit.to_dict(),
-            'Scenarios': df_scenarios.to_dict()
-        }
-        
+        def build_combined_json():
+            combined_data = {
+                'Projections': df_projections.to_dict(),
+                'Unit Economics': df_unit.to_dict(),
+                'Scenarios': df_scenarios.to_dict(),
+                'Exit Valuation': df_exit.to_dict()
+            }
+            return json.dumps(combined_data, indent=2)
+
         import json
         st.download_button(
             label="📥 Download All Data (JSON)",
-            data=json.dumps(combined_data, indent=2),
+            data=remember('report_json', scenario_key, build_combined_json),
             file_name=f"adnexus_all_data_{datetime.now().strftime('%Y%m%d')}.json",
             mime='application/json'
         )
 
+    # Investor reports: self-contained HTML or PDF with static charts
+    st.markdown("### 📄 Investor Reports")
+    report_format = st.radio("Report Format", REPORT_FORMATS, format_func=str.upper, horizontal=True,
+                             key="report_format")
+    report_mime = 'text/html' if report_format == 'html' else 'application/pdf'
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**This Deal**")
+        current_deal = {
+            'name': 'AdNexus',
+            'current_revenue': current_monthly_revenue,
+            'growth_rate': revenue_growth_schedule,
+            'redemption_rate': redemption_schedule,
+            'revenue_share_pct': revenue_share,
+            'current_month': current_month,
+            'investment_amount': investment_amount,
+            'already_paid': already_paid,
+            'discount_rate': discount_rate,
+        }
+        report_name = f'investor_report_{report_format}'
+        if st.button("Generate Investor Report", key="generate_report"):
+            remember(report_name, scenario_key, lambda: generate_report(current_deal, report_format))
+        current_report = session_memory().get(st.session_state.session_id, (report_name, scenario_key))
+        if current_report is not None:
+            st.download_button(
+                label=f"📥 Download Investor Report ({report_format.upper()})",
+                data=current_report['content'],
+                file_name=current_report['filename'],
+                mime=report_mime
+            )
+
+    with col2:
+        st.markdown("**Portfolio Batch**")
+        portfolio_file = st.file_uploader(
+            "Portfolio CSV (one row per deal)",
+            type='csv',
+            help=f"Columns: {', '.join(DEAL_DEFAULTS)}. Missing columns and blank cells use this dashboard's "
+                 f"baseline deal.",
+            key="portfolio_csv"
+        )
+
+    if portfolio_file is not None:
+        try:
+            portfolio_deals = load_deals(portfolio_file)
+        except ValueError as error:
+            col2.error(f"⚠️ {error}")
+            portfolio_deals = []
+        if portfolio_deals:
+            portfolio_key = memory_key(portfolio_file.getvalue(), report_format)
+            portfolio_job = job_runner().submit(f"{st.session_state.session_id}:reports", portfolio_key,
+                                                portfolio_reports_job, portfolio_deals, report_format)
+            portfolio_polling = not portfolio_job.finished
+
+            @st.fragment(run_every=1.0 if portfolio_polling else None)
+            def show_portfolio_reports():
+                if portfolio_polling and portfolio_job.finished:
+                    st.rerun()  # final result: redraw once without polling
+                if portfolio_job.status == 'failed':
+                    st.error(f"⚠️ Report generation failed: {portfolio_job.error}")
+                elif portfolio_job.status == 'done':
+                    st.download_button(
+                        label=f"📥 Download {len(portfolio_deals)} Investor Reports (ZIP)",
+                        data=portfolio_job.result,
+                        file_name=f"adnexus_investor_reports_{datetime.now().strftime('%Y%m%d')}.zip",
+                        mime='application/zip'
+                    )
+                elif portfolio_job.status != 'cancelled':
+                    st.progress(portfolio_job.progress,
+                                text=f"Rendering {report_format.upper()} reports... "
+                                     f"{portfolio_job.partial or f'0 of {len(portfolio_deals)}'}")
+
+            with col2:
+                show_portfolio_reports()
+
+            st.markdown("**Portfolio Payments by Fiscal Year**")
+            portfolio_period = st.radio("Period", ['Fiscal Year', 'Half-Year', 'Quarter'], horizontal=True,
+                                        key="portfolio_period")
+            # Every deal projected and rolled up in one batch (scalar inputs, current month = sidebar date)
+            df_portfolio = remember('portfolio_rollup',
+                                    memory_key(portfolio_file.getvalue(), portfolio_period, current_month_start),
+                                    lambda: portfolio_rollup(portfolio_deals, portfolio_period, current_month_start))
+            st.dataframe(df_portfolio, use_container_width=True, hide_index=True,
+                         column_config={column: st.column_config.NumberColumn(format="%.2f")
+                                        for column in df_portfolio.columns if column != 'Deal'})
+
 # Tab 6: Assumptions
 with tab6:
     st.subheader("🔧 Business Assumptions & Parameters")
@@ -848,6 +2096,200 @@ with tab6:
             key="cac_monthly_increase"
         )
 
+        st.markdown("#### Investor Returns")
+        st.number_input(
+            "Discount Rate (% per year)",
+            min_value=0.0,
+            max_value=50.0,
+            step=0.5,
+            help="Annual rate used for NPV in the Reports and Risk Analysis tabs",
+            key="discount_rate"
+        )
+        st.slider(
+            "Exit Horizon (months ahead)",
+            min_value=1,
+            max_value=120,
+            step=1,
+            help="Months from the current month to the equity exit",
+            key="exit_months_ahead"
+        )
+        st.slider(
+            "Exit Revenue Multiple (× annual revenue)",
+            min_value=0.5,
+            max_value=10.0,
+            step=0.25,
+            help="Company valuation at exit as a multiple of annualised gross revenue",
+            key="exit_multiple"
+        )
+
+    st.markdown("---")
+    st.markdown("### 📉 Growth Fitted to History")
+    history_file = st.file_uploader(
+        "Historical MAU / ARPU / Revenue (CSV)",
+        type='csv',
+        help="Columns: Month (or Date, e.g. daily), MAU, ARPU and/or Revenue, optional Deal for several deals. "
+             "Growth is fitted by log-linear and robust (Huber) regression with bootstrap confidence intervals.",
+        key="history_csv"
+    )
+    if history_file is not None:
+        try:
+            history_fits = fit_uploaded_history(history_file.getvalue())
+        except ValueError as error:
+            st.error(f"⚠️ {error}")
+            history_fits = {}
+        if history_fits:
+            st.dataframe(growth_table(history_fits), use_container_width=True, hide_index=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                fit_deal = st.selectbox("Deal", list(history_fits), key="fit_deal")
+            with col2:
+                fit_method = st.radio("Fit", list(FIT_METHODS), format_func=FIT_METHODS.get, horizontal=True,
+                                      index=1, key="fit_method")
+            fit = fitted_growth(history_fits[fit_deal], fit_method)
+            fit_outcome = repayment_distribution(fit['revenue_samples'], current_monthly_revenue,
+                                                 redemption_rate=redemption_schedule,
+                                                 revenue_share_pct=revenue_share,
+                                                 investment_amount=investment_amount, already_paid=already_paid)
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Fitted Revenue Growth", f"{fit['revenue_growth']:.2f}%/mo")
+            col2.metric("Months Remaining (P50)", f"{fit_outcome['p50']:.0f}",
+                        f"P10 {fit_outcome['p10']:.0f} – P90 {fit_outcome['p90']:.0f}", delta_color="off")
+            col3.metric("Repaid Within 36 Months", f"{fit_outcome['on_target']:.0%}")
+            col4.metric("Bootstrap Resamples", f"{len(fit['revenue_samples']):,}")
+
+            fig_fit = px.histogram(x=fit_outcome['months_remaining'], nbins=40,
+                                   labels={'x': 'Months Remaining'},
+                                   title="Months Remaining Across Bootstrapped Growth Fits")
+            fig_fit.update_layout(height=300, yaxis_title="Resamples", showlegend=False)
+            st.plotly_chart(fig_fit, use_container_width=True)
+
+            if fit['user_growth'] is None:
+                st.info("💡 Add MAU and ARPU columns to drive the projections with the fitted growth.")
+            else:
+                st.button(
+                    "📈 Use Fitted Growth in Projections",
+                    on_click=apply_growth_fit,
+                    args=({'deal': fit_deal, 'method': FIT_METHODS[fit_method], **fit},),
+                    help="Replaces the sidebar growth sliders (toggle back in the sidebar); scenario "
+                         "probabilities become the shares of bootstrapped growth rates nearest each scenario",
+                    key="apply_growth_fit"
+                )
+
+    st.markdown("---")
+    st.markdown("### 📈 Growth Curve & Monthly Schedules")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        revenue_model_input = st.radio(
+            "Revenue Model",
+            options=['compound', 'cohort'],
+            format_func=lambda x: 'Compound Growth (MAU × ARPU rates)' if x == 'compound' else 'Cohort Model (Acquisition × Retention)',
+            help="Cohort model: monthly new users = acquisition spend ÷ CAC, each cohort decays with churn, "
+                 "revenue = MAU × ARPU. Makes churn and CAC drive the repayment timeline.",
+            key="revenue_model"
+        )
+
+        if revenue_model_input == 'cohort':
+            st.number_input(
+                "Acquisition Spend (₹ Lakhs/month)",
+                min_value=0.0,
+                max_value=500.0,
+                step=0.1,
+                help="Marketing spend in the first projected month",
+                key="acquisition_spend"
+            )
+            st.slider(
+                "Spend Growth (%/month)",
+                min_value=0.0,
+                max_value=20.0,
+                step=0.5,
+                help="Monthly growth of acquisition spend",
+                key="spend_growth"
+            )
+
+        growth_curve_input = st.radio(
+            "User Growth Curve",
+            options=list(growth_curve_labels),
+            format_func=lambda x: growth_curve_labels[x],
+            help="How monthly user growth evolves over the projection horizon. "
+                 "The sidebar growth rate is the starting rate for every curve. "
+                 "Ignored by the Cohort revenue model.",
+            key="growth_curve",
+            disabled=revenue_model_input == 'cohort'
+        )
+
+        if growth_curve_input == 'decay':
+            st.slider(
+                "Long-Run Growth Floor (%)",
+                min_value=0.0,
+                max_value=20.0,
+                step=0.5,
+                help="Monthly user growth the curve decays toward",
+                key="growth_floor"
+            )
+            st.slider(
+                "Growth Half-Life (months)",
+                min_value=1,
+                max_value=60,
+                help="Months for the excess growth over the floor to halve",
+                key="growth_half_life"
+            )
+        elif growth_curve_input == 'logistic':
+            st.number_input(
+                "MAU Capacity",
+                min_value=1000,
+                max_value=100000000,
+                step=10000,
+                help="Addressable MAU where growth saturates (S-curve ceiling)",
+                key="mau_capacity"
+            )
+        elif growth_curve_input == 'piecewise':
+            st.caption("User growth follows the 'User Growth %' column of the schedule table below.")
+
+    with col2:
+        growth_preview = revenue_growth_schedule * np.ones(schedule_months)
+        fig_schedule = go.Figure()
+        fig_schedule.add_trace(go.Scatter(
+            x=np.arange(1, schedule_months + 1),
+            y=growth_preview,
+            mode='lines',
+            name='Revenue Growth',
+            line=dict(color='blue', width=2)
+        ))
+        fig_schedule.update_layout(
+            height=300,
+            xaxis_title="Months Ahead",
+            yaxis_title="Monthly Revenue Growth (%)",
+            title="Revenue Growth Schedule"
+        )
+        st.plotly_chart(fig_schedule, use_container_width=True)
+
+    st.markdown("#### Monthly Schedule Table")
+    st.caption("Each row applies from its month ahead until the next row. Blank cells keep the "
+               "sidebar/assumption value, so Redemption % and CAC (₹) can vary per month independently.")
+    edited_schedule = st.data_editor(
+        schedule_table,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'From Month': st.column_config.NumberColumn(min_value=1, max_value=schedule_months, step=1),
+            'User Growth %': st.column_config.NumberColumn(min_value=-20.0, max_value=50.0, step=0.5),
+            'Redemption %': st.column_config.NumberColumn(min_value=0.0, max_value=95.0, step=1.0),
+            'CAC (₹)': st.column_config.NumberColumn(min_value=0.0, max_value=5000.0, step=5.0),
+        }
+    )
+    # Persist edits and rerun so the projections above pick up the new schedule
+    edited_schedule = edited_schedule.reset_index(drop=True).astype(float)
+    if not edited_schedule.equals(schedule_table):
+        st.session_state.schedule_segments = [
+            {column: (None if pd.isna(value) else value) for column, value in row.items()}
+            for row in edited_schedule.to_dict('records')
+        ]
+        st.rerun()
+
     st.markdown("---")
     st.markdown("### 📋 Current Assumptions Summary")
 
@@ -860,7 +2302,9 @@ with tab6:
 - Effective Rate: {effective_rate:.2f}% of gross revenue
 
 **Growth Assumptions:**
-- User Growth: {monthly_user_growth}% monthly
+- Revenue Model: {"Cohort (spend ₹" + f"{acquisition_spend}L/month, +{spend_growth}%/month)" if revenue_model_input == 'cohort' else "Compound Growth"}
+- Growth Curve: {growth_curve_labels[growth_curve_input]}
+- User Growth: {monthly_user_growth}% monthly (starting rate)
 - ARPU Growth: {monthly_arpu_growth}% monthly
 - Churn Rate: {churn_rate}% monthly
 
@@ -873,6 +2317,8 @@ with tab6:
 - Investment Amount: ₹{investment_amount} Lakhs
 - Revenue Share: {revenue_share}%
 - Equity Stake: {equity_stake}%
+- Discount Rate (NPV): {discount_rate}% per year
+- Exit: {exit_months_ahead} months ahead at {exit_multiple}x annual revenue
 """
 
     st.text(assumptions_summary)
@@ -957,11 +2403,32 @@ with tab6:
 - Payment to Vinmo (5%): ₹0.25L
         """)
 
+# Instrumentation: this session's share of the memory budget, eviction counts and background jobs
+with st.sidebar.expander("🧮 Session Memory & Jobs"):
+    memory_stats = session_memory().stats()
+    own_stats = session_memory().session_stats(st.session_state.session_id)
+    st.progress(min(1.0, own_stats['bytes'] / own_stats['budget_bytes']),
+                text=f"{own_stats['bytes'] / 1024 ** 2:.1f} / {own_stats['budget_bytes'] / 1024 ** 2:.0f} MB "
+                     f"({own_stats['entries']} results)")
+    st.caption(f"This session: {own_stats['evictions']} LRU evictions")
+    st.caption(f"Derived values this run: {len(derived.computed)} recomputed, {len(derived.reused)} reused"
+               + (f" (recomputed: {', '.join(derived.computed)})" if derived.computed else ""))
+    job_stats = job_runner().stats()
+    st.caption(f"Background jobs: {job_stats['running']} running, {job_stats['completed']} completed, "
+               f"{job_stats['cancelled']} cancelled as stale, {job_stats['reused']} served from "
+               f"{job_stats['cached']} cached results")
+    st.caption(f"All sessions: {memory_stats['sessions']} active, {memory_stats['bytes'] / 1024 ** 2:.1f} MB, "
+               f"{memory_stats['evictions']} evictions, {memory_stats['expired_sessions']} expired after "
+               f"{memory_stats['ttl_seconds'] / 60:.0f} min idle, hit rate "
+               f"{memory_stats['hits'] / max(1, memory_stats['hits'] + memory_stats['misses']):.0%}")
+
 # Footer
 st.markdown("---")
 st.markdown("""
     <div style='text-align: center; color: gray; padding: 20px;'>
         <p>AdNexus - Vinmo Ventures Investment Tracker v1.0</p>
-        <p>For internal use only | Data updated in real-time</p>
+        <p>For internal use only | {data_note}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """.format(data_note=(f"Live data from {os.path.basename(LIVE_FEED_PATH)}, updated every "
+                          f"{st.session_state.get('live_refresh', LIVE_REFRESH_SECONDS):g}s" if LIVE_FEED_PATH
+                          else "Projections from the inputs in the sidebar")), unsafe_allow_html=True)
@@ -0,0 +1,146 @@
+"""
+Tests for the projection API (adnexus_api.py).
+
+Drives the ASGI app directly (no server) to check that responses match the
+engine, that identical in-flight requests are coalesced, that concurrent
+requests share one batched engine call, and that repeats are cache hits.
+"""
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from adnexus_api import ProjectionService, create_app
+from adnexus_engine import calculate_projections
+
+print("=" * 80)
+print("PROJECTION API TESTS")
+print("=" * 80)
+
+
+async def call(app, method, path, body=None):
+    """One request through the ASGI app; returns (status, x-cache header, decoded body)."""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'' if body is None else json.dumps(body).encode()}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path}, receive, send)
+    headers = dict(messages[0]['headers'])
+    return messages[0]['status'], headers.get(b'x-cache', b'').decode(), json.loads(messages[1]['body'])
+
+
+# TEST 1: Responses match the engine; bad requests are rejected
+print("\n🔴 TEST 1: Engine parity and validation")
+print("-" * 80)
+
+
+class FailingService(ProjectionService):
+    """Engine failure after validation: ValueError for a negative MAU, any other error otherwise."""
+
+    async def _compute(self, endpoint, params):
+        if params['mau'] < 0:
+            raise ValueError("MAU must not be negative")
+        raise ZeroDivisionError("division by zero")
+
+
+async def parity():
+    app = create_app(ProjectionService())
+    request = {'growth_rate': [9.0, 8.0, 7.0], 'redemption_rate': [50, 40], 'current_month': 37,
+               'already_paid': 10}
+    status, _, body = await call(app, 'POST', '/projections', request)
+    df = calculate_projections(10, [9.0, 8.0, 7.0], [50, 40], current_month=37, already_paid=10)
+    names = ['month', 'gross_revenue', 'redemptions', 'net_revenue', 'payment', 'cumulative_paid', 'balance']
+    matches = all(np.array_equal(df[column].to_numpy(), np.array(body['projections'][name], dtype=float))
+                  for column, name in zip(df.columns, names))
+    _, _, scenarios = await call(app, 'POST', '/scenarios', {})
+    errors = [(await call(app, *args))[0] for args in [
+        ('POST', '/projections', {'revenue': 10}),
+        ('POST', '/projections', {'months': 500}),
+        ('POST', '/projections', {'growth_rate': 'fast'}),
+        ('GET', '/projections'),
+    ]]
+    failing = create_app(FailingService())
+    failures = [await call(failing, 'POST', '/unit-economics', request) for request in ({'mau': -1}, {})]
+    failures.append(await call(failing, 'POST', '/unit-economics', {}))    # not cached: fails again
+    return status, body, len(df), matches, scenarios, errors, failures, failing.service.stats()
+
+status, body, rows, matches, scenarios, errors, failures, failing_stats = asyncio.run(parity())
+failures_ok = ([failure[0] for failure in failures] == [400, 500, 500] and
+               failures[0][2] == {'error': 'MAU must not be negative'} and
+               failures[1][2] == {'error': 'ZeroDivisionError: division by zero'} and
+               failing_stats['errors'] == 3 and failing_stats['cached_responses'] == 0)
+base = next(row for row in scenarios['scenarios'] if row['name'] == 'Base Case')
+
+test1_pass = (status == 200 and matches and body['months_remaining'] == rows - 1 and body['complete'] and
+              base['months_remaining'] == 36 and round(base['npv'], 2) == -17.14 and
+              scenarios['expected_months_remaining'] == 39.75 and errors == [400, 400, 400, 404] and failures_ok)
+print(f"  - Schedule request: {rows - 1} months remaining, columns identical to calculate_projections: {matches}")
+print(f"  - Scenarios: base {base['months_remaining']} months, expected {scenarios['expected_months_remaining']}")
+print(f"  - Invalid requests: {errors}")
+print(f"  - Engine errors answered as JSON {[failure[0] for failure in failures]}, not cached: {failures_ok}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Coalescing, micro-batching and response cache
+print("\n🔴 TEST 2: Coalescing, batching and caching")
+print("-" * 80)
+
+
+async def sharing():
+    service = ProjectionService(max_delay=0.01)
+    app = create_app(service)
+    identical = [call(app, 'POST', '/projections', {'growth_rate': 8}) for _ in range(20)]
+    distinct = [call(app, 'POST', '/projections', {'growth_rate': 5 + index / 10}) for index in range(30)]
+    first = await asyncio.gather(*identical, *distinct)
+    repeat = await call(app, 'POST', '/projections', {'growth_rate': 8.0})
+    return service.stats(), first, repeat
+
+stats, first, repeat = asyncio.run(sharing())
+sources = [source for _, source, _ in first]
+
+test2_pass = (sources.count('coalesced') == 19 and sources.count('miss') == 31 and stats['computed'] == 31 and
+              stats['batches'] == 1 and repeat[1] == 'hit' and repeat[2] == first[0][2] and
+              all(body == first[0][2] for _, _, body in first[:20]))
+print(f"  - 50 concurrent requests: {sources.count('miss')} computed, {sources.count('coalesced')} coalesced, "
+      f"{stats['batches']} engine call(s)")
+print(f"  - Repeat request: {repeat[1]}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Throughput of distinct concurrent requests
+print("\n🔴 TEST 3: Throughput")
+print("-" * 80)
+
+
+async def throughput(count):
+    service = ProjectionService()
+    app = create_app(service)
+    start = time.perf_counter()
+    await asyncio.gather(*(call(app, 'POST', '/projections',
+                                {'growth_rate': 3 + index / count * 10, 'already_paid': index % 20})
+                           for index in range(count)))
+    return count / (time.perf_counter() - start), service.stats()
+
+rate, stats = asyncio.run(throughput(4000))
+
+test3_pass = rate > 1000 and stats['computed'] == 4000 and stats['mean_batch_size'] > 50
+print(f"  - {rate:,.0f} distinct requests/s, mean batch size {stats['mean_batch_size']:.0f}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Engine parity): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Coalescing and caching): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Throughput): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,129 @@
+"""
+Tests for pinned-baseline scenario comparison (adnexus_compare.py).
+
+Checks that variants derived incrementally from a baseline match a full
+calculate_projections run, that only months from the first divergence are
+recomputed, and that the comparison tables report variant - baseline deltas.
+"""
+import time
+
+import numpy as np
+
+from adnexus_compare import (
+    comparison_frame,
+    comparison_summary,
+    divergence,
+    projection_state,
+    state_frame,
+    variant_state,
+)
+from adnexus_engine import calculate_projections, schedule_array
+
+print("=" * 80)
+print("SCENARIO COMPARISON TESTS")
+print("=" * 80)
+
+baseline = {
+    'current_revenue': 10.0,
+    'growth_rate': np.r_[np.full(12, 9.65), np.full(108, 6.0)],
+    'redemption_rate': 50.0,
+    'revenue_share_pct': 5.0,
+    'investment_amount': 75.0,
+    'already_paid': 0.0,
+}
+
+
+# TEST 1: Incremental variants match full projections
+print("\n🔴 TEST 1: Parity with calculate_projections")
+print("-" * 80)
+
+rng = np.random.default_rng(7)
+mismatches = 0
+for case in range(500):
+    base = {**baseline,
+            'growth_rate': rng.uniform(0, 15) if case % 2 else rng.uniform(0, 15, 120).round(1),
+            'already_paid': float(rng.integers(0, 30))}
+    change = case % 5
+    variant = dict(base)
+    if change == 0:
+        variant['redemption_rate'] = np.r_[np.full(int(rng.integers(1, 120)), 50.0), np.full(121, 40.0)]
+    elif change == 1:
+        growth = schedule_array(base['growth_rate'], 120) if np.ndim(base['growth_rate']) else base['growth_rate']
+        variant['growth_rate'] = growth + (np.arange(120) >= rng.integers(0, 120)) if np.ndim(growth) else growth + 1
+    elif change == 2:
+        variant['already_paid'] = base['already_paid'] + 5
+    elif change == 3:
+        variant['current_revenue'] = 12.0
+    base_state = projection_state(base)
+    derived = state_frame(variant_state(base_state, variant), current_month=37)
+    expected = calculate_projections(variant['current_revenue'], variant['growth_rate'], variant['redemption_rate'],
+                                     current_month=37, already_paid=variant['already_paid'])
+    mismatches += not (derived.equals(expected) and derived.attrs == expected.attrs)
+
+test1_pass = mismatches == 0
+print(f"  - 500 baseline/variant pairs, mismatches: {mismatches}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Recomputation starts at the first divergence
+print("\n🔴 TEST 2: Incremental recomputation")
+print("-" * 80)
+
+base_state = projection_state(baseline)
+later_redemption = {**baseline, 'redemption_rate': np.r_[np.full(30, 50.0), 40.0]}
+later_growth = {**baseline, 'growth_rate': np.r_[np.full(12, 9.65), np.full(108, 7.0)]}
+paid = {**baseline, 'already_paid': 10.0}
+
+redemption_state = variant_state(base_state, later_redemption)
+growth_state = variant_state(base_state, later_growth)
+paid_state = variant_state(base_state, paid)
+same_state = variant_state(base_state, dict(baseline))
+
+test2_pass = (divergence(baseline, later_redemption) == (30, 30) and redemption_state['recomputed_from'] == 30 and
+              np.array_equal(redemption_state['ledger']['payment'][:30], base_state['ledger']['payment'][:30]) and
+              growth_state['recomputed_from'] == 13 and
+              np.array_equal(growth_state['gross_revenue'][:13], base_state['gross_revenue'][:13]) and
+              paid_state['recomputed_from'] == 0 and
+              np.array_equal(paid_state['gross_revenue'], base_state['gross_revenue']) and
+              same_state['recomputed_from'] == 121 and same_state['ledger'] is base_state['ledger'])
+print(f"  - Redemption change at +30 recomputes from +{redemption_state['recomputed_from']}, "
+      f"growth change at +13 from +{growth_state['recomputed_from']}, "
+      f"already paid from +{paid_state['recomputed_from']} (revenue path reused)")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Comparison tables and interactive speed with several variants
+print("\n🔴 TEST 3: Comparison tables")
+print("-" * 80)
+
+variants = {f'Redemption {rate}%': {**baseline, 'redemption_rate': np.r_[np.full(12, 50.0), float(rate)]}
+            for rate in (35, 40, 45, 55)}
+start = time.perf_counter()
+for _ in range(100):
+    states = {label: variant_state(base_state, inputs) for label, inputs in variants.items()}
+    summary = comparison_summary(base_state, states)
+per_rerun_ms = (time.perf_counter() - start) * 10
+deltas = comparison_frame(base_state, states['Redemption 40%'], current_month=37)
+
+test3_pass = (list(summary.index) == ['Baseline', *variants] and summary.loc['Baseline', 'Δ Months'] == 0 and
+              summary.loc['Redemption 40%', 'Δ Months'] < 0 < summary.loc['Redemption 55%', 'Δ Months'] and
+              np.allclose(deltas['Δ Balance (₹L)'],
+                          deltas['Variant Balance (₹L)'] - deltas['Baseline Balance (₹L)']) and
+              (deltas['Δ Payment (₹L)'].iloc[:12] == 0).all() and deltas['Month'].iloc[0] == 37 and
+              per_rerun_ms < 50)
+print(f"  - 4 pinned variants compared in {per_rerun_ms:.1f} ms per rerun")
+print(f"  - Δ months: {summary['Δ Months'].tolist()}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Engine parity): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Incremental recomputation): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Comparison tables): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
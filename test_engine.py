@@ -0,0 +1,273 @@
+"""
+Tests for the vectorized projection engine (adnexus_engine.py).
+
+Unlike the app script, the engine has no Streamlit dependency, so these tests
+import it directly and compare it against a reference copy of the
+calculate_projections loop (kept in sync with adnexus_tracker_app.py).
+"""
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import (
+    column_frame,
+    calculate_projections,
+    calculate_unit_economics,
+    calculate_cohort_revenue,
+    cohort_convolution,
+    cohort_layers,
+    decay_schedule,
+    logistic_schedule,
+    piecewise_schedule,
+    payoff_months,
+    payoff_months_continuous,
+    iso_repayment_growth,
+)
+
+
+def reference_months_remaining(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5,
+                               months=120, investment_amount=75.0, already_paid=0.0):
+    """Scalar loop from calculate_projections, reduced to (months_remaining, complete)."""
+    cumulative_payment = already_paid
+    share = (1 - redemption_rate / 100) * (revenue_share_pct / 100)
+    cumulative_payment += min(current_revenue * share, investment_amount - cumulative_payment)
+    if cumulative_payment >= investment_amount:
+        return 0, True
+    rows = 1
+    for month in range(months):
+        gross_revenue = current_revenue * ((1 + growth_rate / 100) ** (month + 1))
+        cumulative_payment += min(gross_revenue * share, investment_amount - cumulative_payment)
+        rows += 1
+        if cumulative_payment >= investment_amount:
+            break
+    return rows - 1, cumulative_payment >= investment_amount
+
+
+def reference_projections(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5, months=120,
+                          current_month=1, investment_amount=75.0, already_paid=0.0):
+    """Row-by-row calculate_projections loop as it was before vectorization."""
+    projections = []
+    cumulative_payment = already_paid
+    for month_number in range(months + 1):
+        gross_revenue = current_revenue * ((1 + growth_rate / 100) ** month_number)
+        redemption_amount = gross_revenue * (redemption_rate / 100)
+        net_revenue = gross_revenue - redemption_amount
+        payment = min(net_revenue * (revenue_share_pct / 100), investment_amount - cumulative_payment)
+        cumulative_payment += payment
+        projections.append({
+            'Month': current_month + month_number,
+            'Gross Revenue (₹L)': round(gross_revenue, 2),
+            'Redemptions (₹L)': round(redemption_amount, 2),
+            'Net Revenue (₹L)': round(net_revenue, 2),
+            'Payment to Vinmo (₹L)': round(payment, 2),
+            'Cumulative Paid (₹L)': round(cumulative_payment, 2),
+            'Balance (₹L)': max(0, investment_amount - cumulative_payment)
+        })
+        if cumulative_payment >= investment_amount:
+            break
+    return pd.DataFrame(projections)
+
+
+print("=" * 80)
+print("VECTORIZED ENGINE TESTS")
+print("=" * 80)
+
+# TEST 1: Closed-form payoff matches the projection loop across a grid
+print("\n🔴 TEST 1: Closed-form payoff months vs projection loop")
+print("-" * 80)
+
+mismatches = []
+for revenue, paid in [(10.0, 0.0), (15.0, 10.0), (3.0, 40.0), (10.0, 74.83)]:
+    growth = np.arange(0.0, 20.5, 0.5)
+    redemption = np.arange(0.0, 85.0, 5.0)
+    months_grid, complete_grid = payoff_months(growth[np.newaxis, :], redemption[:, np.newaxis],
+                                               revenue, already_paid=paid)
+    for i, r in enumerate(redemption):
+        for j, g in enumerate(growth):
+            expected = reference_months_remaining(revenue, g, redemption_rate=r, already_paid=paid)
+            actual = (int(months_grid[i, j]), bool(complete_grid[i, j]))
+            if actual != expected:
+                mismatches.append((revenue, paid, g, r, expected, actual))
+
+test1_pass = len(mismatches) == 0
+print(f"  - Grid points compared: {4 * len(growth) * len(redemption)}")
+print(f"  - Mismatches: {len(mismatches)} {mismatches[:3]}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Iso-repayment boundary is exact on both sides
+print("\n🔴 TEST 2: Iso-repayment growth boundary")
+print("-" * 80)
+
+redemption = np.array([30.0, 50.0, 70.0])
+boundary_ok = True
+for target in [24, 36, 48, 60]:
+    required = iso_repayment_growth(target, redemption, 10.0)
+    for r, g in zip(redemption, required):
+        at_boundary, _ = reference_months_remaining(10.0, g + 1e-9, redemption_rate=r)
+        below_boundary, _ = reference_months_remaining(10.0, g - 1e-3, redemption_rate=r)
+        ok = at_boundary <= target < below_boundary
+        boundary_ok = boundary_ok and ok
+        print(f"  - {target}m @ {r:.0f}% redemption: {g:.4f}% growth "
+              f"(at: {at_boundary}m, just below: {below_boundary}m) {'✓' if ok else '✗'}")
+
+test2_pass = boundary_ok
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Edge cases - already repaid, flat revenue, no net revenue
+print("\n🔴 TEST 3: Edge cases")
+print("-" * 80)
+
+repaid = float(payoff_months_continuous(5.0, 50, 10.0, already_paid=75.0))
+flat_growth = float(iso_repayment_growth(300, 50, 10.0))
+no_net_revenue = float(payoff_months_continuous(5.0, 100, 10.0))
+unreachable = float(iso_repayment_growth(12, 80, 1.0, max_growth=20.0))
+
+test3_pass = repaid == 0 and flat_growth == 0 and np.isinf(no_net_revenue) and np.isnan(unreachable)
+print(f"  - Already repaid: {repaid} months (expected 0)")
+print(f"  - Flat revenue suffices for 300m target: {flat_growth}% (expected 0)")
+print(f"  - 100% redemption: {no_net_revenue} (expected inf)")
+print(f"  - Unreachable target: {unreachable} (expected nan)")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# TEST 4: Vectorized calculate_projections reproduces the row-by-row loop
+print("\n🔴 TEST 4: Vectorized projections vs row-by-row loop")
+print("-" * 80)
+
+cases = [
+    dict(current_revenue=10.0, growth_rate=9.65),
+    dict(current_revenue=15.0, growth_rate=9.65, current_month=6, already_paid=10.0),
+    dict(current_revenue=10.0, growth_rate=5.0, current_month=50, already_paid=74.8),
+    dict(current_revenue=10.0, growth_rate=5.0, current_month=100, already_paid=75.0),
+    dict(current_revenue=200.0, growth_rate=0.0, already_paid=70.0),
+    dict(current_revenue=1.0, growth_rate=0.5, redemption_rate=70),
+]
+frame_mismatches = []
+for case in cases:
+    expected = reference_projections(**case)
+    actual = calculate_projections(**case)
+    same_shape = expected.shape == actual.shape
+    # The reference rounds to 2 decimals per row; the paise ledger is exact to the paisa
+    close = same_shape and np.allclose(expected.to_numpy(dtype=float), actual.to_numpy(dtype=float),
+                                       rtol=0, atol=0.005 + 1e-5)
+    if not close:
+        frame_mismatches.append(case)
+    print(f"  - {case}: {len(actual)} rows {'✓' if close else '✗'}")
+
+test4_pass = len(frame_mismatches) == 0
+print(f"✅ TEST 4 PASSED" if test4_pass else f"❌ TEST 4 FAILED")
+
+
+# TEST 5: Growth schedules
+print("\n🔴 TEST 5: Time-varying growth schedules")
+print("-" * 80)
+
+constant_as_schedule = calculate_projections(10.0, np.full(120, 9.65))
+constant_scalar = calculate_projections(10.0, 9.65)
+schedule_matches_scalar = (constant_as_schedule.shape == constant_scalar.shape and
+                           np.allclose(constant_as_schedule.to_numpy(dtype=float),
+                                       constant_scalar.to_numpy(dtype=float), atol=1e-6))
+
+decay = decay_schedule(10.0, 2.0, 12, 120)
+decay_ok = decay[0] == 10.0 and abs(decay[12] - 6.0) < 1e-12 and decay[-1] > 2.0
+
+s_curve = logistic_schedule(8.0, 10000, 200000, 120)
+mau_path = 10000 * np.cumprod(1 + s_curve / 100)
+logistic_ok = abs(s_curve[0] - 8.0) < 1e-9 and np.all(np.diff(s_curve) < 0) and mau_path[-1] < 200000
+
+steps = piecewise_schedule([(13, 5.0), (37, None), (25, 3.0)], 48, default=7.5)
+piecewise_ok = steps[0] == 7.5 and steps[11] == 7.5 and steps[12] == 5.0 and steps[24] == 3.0 and steps[-1] == 3.0
+
+redemption_path = np.concatenate([[50.0], np.full(120, 60.0)])
+higher_redemption = calculate_projections(10.0, 9.65, redemption_rate=redemption_path)
+redemption_ok = (abs(higher_redemption['Redemptions (₹L)'].iloc[1] - 10.0 * 1.0965 * 0.6) < 1e-7 and
+                 len(higher_redemption) > len(constant_scalar))
+
+cac_path = np.full(36, 45.0)
+unit = calculate_unit_economics(10000, 100, decay, 2.0, 20.0, cac_schedule=cac_path)
+cac_ok = (unit['CAC'] == 45.0).all() and unit['MAU'].iloc[0] == int(10000 * 1.10)
+
+test5_pass = schedule_matches_scalar and decay_ok and logistic_ok and piecewise_ok and redemption_ok and cac_ok
+print(f"  - Constant schedule == scalar growth: {schedule_matches_scalar}")
+print(f"  - Decay halves excess growth after one half-life: {decay_ok}")
+print(f"  - Logistic starts at initial rate, slows, stays below capacity: {logistic_ok}")
+print(f"  - Piecewise steps by month ahead (blank rows skipped): {piecewise_ok}")
+print(f"  - Redemption schedule applied per month: {redemption_ok}")
+print(f"  - CAC schedule overrides linear increase: {cac_ok}")
+print(f"✅ TEST 5 PASSED" if test5_pass else f"❌ TEST 5 FAILED")
+
+
+# TEST 6: Cohort revenue engine
+print("\n🔴 TEST 6: Cohort-stacked revenue model")
+print("-" * 80)
+
+rng = np.random.default_rng(7)
+acquisitions = rng.uniform(0, 1000, size=(3, 400))
+retention = 0.8 ** np.arange(400)
+fft_result = cohort_convolution(acquisitions, retention)
+direct_result = np.array([np.convolve(row, retention)[:400] for row in acquisitions])
+fft_ok = np.allclose(fft_result, direct_result, rtol=1e-9, atol=1e-6)
+
+cohorts = calculate_cohort_revenue(10000, 100, 20.0, 0.0, 1.0, spend_growth_rate=0.0,
+                                   starting_cac=30, cac_monthly_increase=0, periods=120)
+# Loop: users(t) = users(t-1) * (1 - churn) + spend / CAC
+users = 10000.0
+loop_mau = [users]
+for month in range(120):
+    users = users * 0.8 + 100000 / 30
+    loop_mau.append(users)
+recursion_ok = np.allclose(cohorts['mau'], loop_mau)
+steady_state_ok = abs(cohorts['mau'][-1] - (100000 / 30) / 0.2) < 1e-6
+revenue_ok = np.allclose(cohorts['revenue'], cohorts['mau'] * 100 / 100000)
+
+layers = cohort_layers(cohorts['acquisitions'], cohorts['retention'])
+layers_ok = layers.shape == (11, 121) and np.allclose(layers.sum(axis=0), cohorts['mau'])
+
+test6_pass = fft_ok and recursion_ok and steady_state_ok and revenue_ok and layers_ok
+print(f"  - FFT convolution matches direct convolution: {fft_ok}")
+print(f"  - Cohort MAU matches churn/acquisition recursion: {recursion_ok}")
+print(f"  - MAU converges to acquisitions ÷ churn: {steady_state_ok}")
+print(f"  - Revenue = MAU × ARPU: {revenue_ok}")
+print(f"  - Year layers sum to total MAU: {layers_ok}")
+print(f"✅ TEST 6 PASSED" if test6_pass else f"❌ TEST 6 FAILED")
+
+
+# TEST 7: Arrow-backed frames hold the same values without copying buffers
+print("\n🔴 TEST 7: Zero-copy column frames")
+print("-" * 80)
+
+numpy_frame = calculate_projections(10.0, 9.65, redemption_rate=50, current_month=4, already_paid=6.0)
+arrow_frame = calculate_projections(10.0, 9.65, redemption_rate=50, current_month=4, already_paid=6.0,
+                                    backend='arrow')
+unit_arrow = calculate_unit_economics(10000, 25, 5.0, 2.0, 20.0, backend='arrow')
+buffer = np.linspace(0.0, 1.0, 1000)
+arrow_dtypes_ok = all(isinstance(dtype, pd.ArrowDtype) for dtype in arrow_frame.dtypes)
+values_ok = (list(arrow_frame.columns) == list(numpy_frame.columns) and
+             all(np.array_equal(arrow_frame[column].to_numpy(), numpy_frame[column].to_numpy())
+                 for column in numpy_frame.columns) and
+             np.array_equal(unit_arrow.to_numpy(dtype=float),
+                            calculate_unit_economics(10000, 25, 5.0, 2.0, 20.0).to_numpy(dtype=float)))
+zero_copy_ok = (np.shares_memory(column_frame({'x': buffer})['x'].to_numpy(), buffer) and
+                np.shares_memory(column_frame({'x': buffer}, backend='arrow')['x'].to_numpy(), buffer))
+
+test7_pass = arrow_dtypes_ok and values_ok and zero_copy_ok
+print(f"  - Arrow dtypes: {arrow_dtypes_ok}, values match NumPy frame: {values_ok}, zero-copy: {zero_copy_ok}")
+print(f"✅ TEST 7 PASSED" if test7_pass else f"❌ TEST 7 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass and test4_pass and test5_pass and test6_pass and test7_pass
+print(f"Test 1 (Closed-form payoff): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Iso-repayment boundary): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Edge cases): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print(f"Test 4 (Vectorized projections): {'✅ PASS' if test4_pass else '❌ FAIL'}")
+print(f"Test 5 (Growth schedules): {'✅ PASS' if test5_pass else '❌ FAIL'}")
+print(f"Test 6 (Cohort revenue): {'✅ PASS' if test6_pass else '❌ FAIL'}")
+print(f"Test 7 (Zero-copy frames): {'✅ PASS' if test7_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,84 @@
+"""
+Tests for the exit valuation grid (adnexus_exit.py).
+
+Checks the broadcasted grid against cash flows built by hand for single
+exit scenarios.
+"""
+import numpy as np
+
+from adnexus_engine import calculate_projections, growth_path
+from adnexus_returns import investor_returns
+from adnexus_exit import exit_valuation_grid, exit_grid_frame
+
+print("=" * 80)
+print("EXIT VALUATION TESTS")
+print("=" * 80)
+
+current_month, investment, paid, stake = 4, 75.0, 6.0, 17.5
+df = calculate_projections(10.0, 8.0, redemption_rate=50, current_month=current_month,
+                           investment_amount=investment, already_paid=paid)
+payments = df['Payment to Vinmo (₹L)'].to_numpy()
+revenue = 10.0 * growth_path(8.0, 120)
+exit_months = current_month + np.arange(1, 121)
+multiples = np.array([0.5, 2.0, 5.0])
+grid = exit_valuation_grid(payments, revenue, exit_months, multiples, equity_stake_pct=stake,
+                           investment_amount=investment, already_paid=paid, current_month=current_month)
+
+
+def manual_flows(exit_month, multiple):
+    """Investor cash flows for one exit, built month by month."""
+    offset = exit_month - current_month
+    flows = np.zeros(exit_month + 1)
+    flows[0] = -investment
+    flows[1:current_month] = paid / (current_month - 1)
+    received = payments[:offset + 1]
+    flows[current_month:current_month + len(received)] = received
+    flows[exit_month] += max(0.0, investment - paid - received.sum())
+    flows[exit_month] += stake / 100 * multiple * 12 * revenue[offset]
+    return flows
+
+
+# TEST 1: Grid matches hand-built scenarios
+print("\n🔴 TEST 1: Grid vs hand-built cash flows")
+print("-" * 80)
+
+mismatches = 0
+for row in (0, 10, len(df) - 2, len(df) + 5, 119):
+    for column, multiple in enumerate(multiples):
+        flows = manual_flows(exit_months[row], multiple)
+        padded = np.zeros(current_month + 121)
+        padded[:len(flows)] = flows
+        expected = investor_returns(padded[np.newaxis, :], discount_rate=12.0)
+        ok = (np.isclose(grid['total_return'][row, column], flows[1:].sum()) and
+              np.isclose(grid['annual_irr'][row, column], expected['annual_irr'][0]) and
+              np.isclose(grid['npv'][row, column], expected['npv'][0]))
+        mismatches += not ok
+
+test1_pass = mismatches == 0
+print(f"  - Scenarios compared: 15, mismatches: {mismatches}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Revenue share is fully recovered at every exit and returns rise with the multiple
+print("\n🔴 TEST 2: Settlement and monotonicity")
+print("-" * 80)
+
+test2_pass = (np.allclose(grid['revenue_share'], grid['revenue_share'][:, :1]) and
+              np.all(grid['revenue_share'] >= investment - 0.01) and
+              np.all(np.diff(grid['annual_irr'], axis=1) > 0) and
+              len(exit_grid_frame(grid)) == grid['moic'].size)
+print(f"  - Revenue share range: ₹{grid['revenue_share'].min():.2f}L - ₹{grid['revenue_share'].max():.2f}L")
+print(f"  - IRR at M{exit_months[23]}: {np.round(grid['annual_irr'][23] * 100, 1)}%")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass
+print(f"Test 1 (Hand-built scenarios): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Settlement, monotonicity): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,139 @@
+"""
+Tests for growth fitting (adnexus_fit.py).
+
+Checks that the log-linear and robust fits recover known growth rates (the
+robust fit through outliers), that the vectorized bootstrap matches explicit
+resampled fits, and that the fitted distributions feed projections and
+scenario probabilities quickly enough for a portfolio of daily histories.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import calculate_projections
+from adnexus_fit import (
+    DAYS_PER_MONTH,
+    block_bootstrap_counts,
+    fit_growth,
+    fit_portfolio,
+    fitted_growth,
+    growth_table,
+    load_history,
+    repayment_distribution,
+    scenario_probabilities,
+)
+
+
+# Fit workers are spawned and re-import this script, so the tests run only as __main__
+if __name__ == '__main__':
+    print("=" * 80)
+    print("GROWTH FITTING TESTS")
+    print("=" * 80)
+
+    rng = np.random.default_rng(11)
+
+
+    def daily_history(deal, days, user_growth=6.0, arpu_growth=2.0, spikes=0):
+        """Daily MAU/ARPU/Revenue with multiplicative noise and optional MAU spikes."""
+        t = np.arange(days) / DAYS_PER_MONTH
+        mau = 10000 * np.exp(np.log1p(user_growth / 100) * t + rng.normal(0, 0.05, days))
+        arpu = 100 * np.exp(np.log1p(arpu_growth / 100) * t + rng.normal(0, 0.03, days))
+        mau[rng.choice(days, spikes, replace=False)] *= 5
+        return pd.DataFrame({'Deal': deal, 'Date': pd.date_range('2023-01-01', periods=days).strftime('%Y-%m-%d'),
+                             'MAU': mau, 'ARPU': arpu, 'Revenue': mau * arpu / 100000})
+
+
+    # TEST 1: Known growth rates are recovered
+    print("\n🔴 TEST 1: Log-linear and robust fits")
+    print("-" * 80)
+
+    months = np.arange(1, 37)
+    clean_mau = 5000 * 1.07 ** (months - 1) * np.exp(rng.normal(0, 0.02, 36))
+    spiked_mau = clean_mau.copy()
+    spiked_mau[[33, 34, 35]] *= 4
+    monthly = load_history(pd.DataFrame({'Month': months, 'MAU': spiked_mau, 'Payment_to_Vinmo': 0.0}))
+    fit = fit_growth(monthly['Deal 1'])['series']['MAU']
+    polyfit_growth = (np.exp(np.polyfit(months - 1, np.log(spiked_mau), 1)[0]) - 1) * 100
+
+    daily = fit_growth(load_history(daily_history('A', 1095, spikes=15))['A'])['series']
+
+    test1_pass = (abs(fit['loglinear']['growth'] - polyfit_growth) < 1e-9 and
+                  abs(fit['robust']['growth'] - 7.0) < 0.2 < abs(fit['loglinear']['growth'] - 7.0) and
+                  fit['robust']['low'] < 7.0 < fit['robust']['high'] and
+                  abs(daily['MAU']['robust']['growth'] - 6.0) < 0.1 and
+                  abs(daily['ARPU']['robust']['growth'] - 2.0) < 0.1 and
+                  daily['Revenue']['robust']['low'] < 8.12 < daily['Revenue']['robust']['high'])
+    print(f"  - Monthly MAU with 3 closing spikes (true 7%): log-linear {fit['loglinear']['growth']:.2f}%, "
+          f"robust {fit['robust']['growth']:.2f}% "
+          f"(90% CI {fit['robust']['low']:.2f} – {fit['robust']['high']:.2f})")
+    print(f"  - 3 years daily (true 6% / 2%): MAU {daily['MAU']['robust']['growth']:.2f}%, "
+          f"ARPU {daily['ARPU']['robust']['growth']:.2f}%")
+    print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+    # TEST 2: Vectorized bootstrap equals explicit resampled fits
+    print("\n🔴 TEST 2: Bootstrap")
+    print("-" * 80)
+
+    counts = block_bootstrap_counts(36, 500)
+    history = monthly['Deal 1']
+    samples = fit_growth(history, resamples=500)['series']['MAU']['loglinear']['samples']
+    t = history['Months'].to_numpy()
+    explicit = [(np.exp(np.polyfit(np.repeat(t, row.astype(int)), np.log(np.repeat(spiked_mau, row.astype(int))),
+                                   1)[0]) - 1) * 100
+                for row in counts[:50]]
+
+    histories = load_history(pd.concat([daily_history(f'Deal {index}', 400) for index in range(6)]))
+    serial = fit_portfolio(histories, resamples=500)
+    pooled = fit_portfolio(histories, workers=2, resamples=500)
+
+    test2_pass = ((counts.sum(axis=1) == 36).all() and not counts.flags.writeable and
+                  np.allclose(samples[:50], explicit, rtol=0, atol=1e-9) and
+                  list(pooled) == list(histories) and
+                  all(np.array_equal(pooled[deal]['series']['MAU']['robust']['samples'],
+                                     serial[deal]['series']['MAU']['robust']['samples']) for deal in histories) and
+                  len(growth_table(serial)) == 18)
+    print(f"  - 50 resamples match explicit refits: {np.allclose(samples[:50], explicit, rtol=0, atol=1e-9)}")
+    print(f"  - Process pool results identical to in-process: {test2_pass}")
+    print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+    # TEST 3: Fitted distributions drive projections; portfolio speed
+    print("\n🔴 TEST 3: Projections, scenario probabilities and speed")
+    print("-" * 80)
+
+    growth = fitted_growth(fit_growth(load_history(daily_history('B', 730))['B']))
+    outcome = repayment_distribution(growth['revenue_samples'], 10.0, redemption_rate=[50.0] * 13 + [40.0])
+    median_rate = float(np.median(growth['revenue_samples']))
+    median_months = len(calculate_projections(10.0, median_rate, [50.0] * 13 + [40.0])) - 1
+    probabilities = scenario_probabilities(growth['revenue_samples'], {'Pessimistic': 5.0, 'Base Case': 8.0,
+                                                                       'Optimistic': 10.0, 'Best Case': 12.0})
+
+    portfolio = load_history(pd.concat([daily_history(f'Deal {index}', 1095, spikes=10) for index in range(100)]))
+    start = time.perf_counter()
+    fits = fit_portfolio(portfolio)
+    elapsed = time.perf_counter() - start
+
+    test3_pass = (outcome['p10'] <= median_months <= outcome['p90'] and abs(outcome['p50'] - median_months) <= 1 and
+                  len(outcome['months_remaining']) == 2000 and
+                  abs(sum(probabilities.values()) - 100) < 1e-9 and probabilities['Base Case'] > 90 and
+                  len(fits) == 100 and elapsed < 10)
+    print(f"  - Months remaining P10/P50/P90: {outcome['p10']:.0f} / {outcome['p50']:.0f} / {outcome['p90']:.0f} "
+          f"(median growth alone: {median_months})")
+    print(f"  - Scenario probabilities: {({name: round(value, 1) for name, value in probabilities.items()})}")
+    print(f"  - 100 deals × 3 years daily × 2,000 resamples fitted in {elapsed:.1f}s")
+    print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+    # SUMMARY
+    print("\n" + "=" * 80)
+    print("TEST SUMMARY")
+    print("=" * 80)
+    all_pass = test1_pass and test2_pass and test3_pass
+    print(f"Test 1 (Growth fits): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+    print(f"Test 2 (Bootstrap): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+    print(f"Test 3 (Projections and speed): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+    print()
+    print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+    print("=" * 80)
@@ -0,0 +1,136 @@
+"""
+Tests for the derived value graph (adnexus_graph.py).
+
+Checks that derived quantities match the direct engine calls, that only the
+quantities downstream of a changed input are recomputed, and that values
+are computed lazily.
+"""
+import numpy as np
+
+from adnexus_engine import calculate_projections
+from adnexus_graph import DASHBOARD, SCENARIO_PROBABILITIES, DerivedGraph, LatestValues
+
+print("=" * 80)
+print("DERIVED VALUE GRAPH TESTS")
+print("=" * 80)
+
+inputs = {
+    'current_revenue': 10.0,
+    'revenue_growth_rate': 9.65,
+    'revenue_growth_schedule': np.r_[np.full(12, 9.65), np.full(108, 6.0)],
+    'redemption_rate': 50.0,
+    'redemption_schedule': np.r_[50.0, np.full(24, 50.0), np.full(96, 45.0)],
+    'revenue_share': 5.0,
+    'months': 120,
+    'current_month': 37,
+    'investment_amount': 75.0,
+    'already_paid': 0.0,
+    'discount_rate': 12.0,
+    'scenario_probabilities': SCENARIO_PROBABILITIES,
+    'start_date': None,
+}
+
+
+# TEST 1: Derived values match the engine
+print("\n🔴 TEST 1: Parity with calculate_projections")
+print("-" * 80)
+
+derived = DASHBOARD.evaluate(inputs)
+expected = calculate_projections(10.0, inputs['revenue_growth_schedule'], inputs['redemption_schedule'],
+                                 current_month=37)
+pessimistic = calculate_projections(10.0, 5.0, inputs['redemption_schedule'], current_month=37)
+projections = derived['projections']
+table = derived['scenario_table']['table']
+
+test1_pass = (all(np.array_equal(projections[column].to_numpy(), expected[column].to_numpy())
+                  for column in expected.columns) and
+              projections.attrs == expected.attrs and
+              derived['fixed_rate_projections']['Pessimistic'].equals(pessimistic) and
+              table['Months Remaining'].tolist()[:2] == [len(pessimistic) - 1, len(expected) - 1] and
+              derived['rollups']['Quarter']['Cumulative Paid (₹L)'].iloc[-1] == 75.0 and
+              abs(derived['current_payment'] - 0.25) < 1e-12)
+print(f"  - Projections: {len(projections)} rows, identical to calculate_projections: {test1_pass}")
+print(f"  - Scenario months: {table['Months Remaining'].tolist()}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Only quantities downstream of a changed input are recomputed
+print("\n🔴 TEST 2: Selective recomputation")
+print("-" * 80)
+
+cache = LatestValues()
+wanted = ['projections', 'current_payment', 'rollups', 'scenario_table']
+
+
+def rerun(**changes):
+    evaluation = DASHBOARD.evaluate({**inputs, **changes}, cache=cache)
+    for name in wanted:
+        evaluation[name]
+    return evaluation
+
+first = rerun()
+unchanged = rerun()
+paid = rerun(already_paid=10.0)
+rate = rerun(already_paid=10.0, redemption_rate=40.0)
+back = rerun()
+
+test2_pass = ('sensitivity_grid' not in first.computed and 'revenue_path' in first.computed and
+              unchanged.computed == [] and
+              'ledger' in paid.computed and 'revenue_path' not in paid.computed and
+              'payment_path' not in paid.computed and 'current_payment' not in paid.computed and
+              rate.computed == ['effective_payment_rate', 'current_payment'] and
+              back['projections'].equals(first['projections']))
+print(f"  - First run: {len(first.computed)} computed (sensitivity grid not requested, not computed)")
+print(f"  - already_paid changed: recomputed {paid.computed}")
+print(f"  - redemption_rate changed: recomputed {rate.computed}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Declared inputs, resources and unknown names
+print("\n🔴 TEST 3: Graph declarations")
+print("-" * 80)
+
+graph = DerivedGraph()
+calls = []
+
+
+@graph.derive
+def doubled(x):
+    calls.append('doubled')
+    return 2 * x
+
+
+@graph.derive
+def scaled(doubled, factor, table):
+    calls.append('scaled')
+    return doubled * factor * len(table)
+
+graph_cache = LatestValues()
+resources = {'table': [0, 0, 0]}
+a = graph.evaluate({'x': 1, 'factor': 10}, cache=graph_cache, resources=resources)['scaled']
+b = graph.evaluate({'x': 1, 'factor': 20}, cache=graph_cache, resources=resources)['scaled']
+try:
+    graph.evaluate({'x': 1}, cache=graph_cache, resources=resources)['scaled']
+    missing_rejected = False
+except KeyError:
+    missing_rejected = True
+
+test3_pass = (graph.inputs_of('scaled') == ('doubled', 'factor', 'table') and a == 60 and b == 120 and
+              calls == ['doubled', 'scaled', 'scaled'] and missing_rejected and
+              DASHBOARD.inputs_of('ledger') == ('payment_path', 'investment_amount', 'already_paid'))
+print(f"  - Calls across two evaluations: {calls}")
+print(f"  - Missing input rejected: {missing_rejected}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Engine parity): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Selective recomputation): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Graph declarations): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
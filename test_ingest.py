@@ -0,0 +1,147 @@
+"""
+Tests for transaction ingestion (adnexus_ingest.py).
+
+Checks that chunked CSV and memory-mapped Parquet ingestion match a full
+in-memory aggregation to the paisa, that memory use is bounded by the block
+size rather than the file size, and that aggregates are persisted, reused
+for unchanged files and turned into the dashboard's starting values.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from adnexus_ingest import (
+    actuals_summary,
+    aggregate_transactions,
+    ingest,
+    load_actuals,
+    monthly_actuals,
+)
+
+print("=" * 80)
+print("TRANSACTION INGESTION TESTS")
+print("=" * 80)
+
+rng = np.random.default_rng(3)
+workdir = tempfile.mkdtemp()
+
+
+def transactions(rows, days=700, deals=('Alpha', 'Beta', 'Gamma')):
+    """Random revenue/redemption transactions over `days` days from 2024-01-01."""
+    dates = np.datetime64('2024-01-01') + rng.integers(0, days, rows).astype('timedelta64[D]')
+    return pd.DataFrame({
+        'Date': dates.astype(str),
+        'Amount': rng.gamma(2.0, 50.0, rows).round(2),
+        'Type': rng.choice(['revenue', 'Revenue', 'redemption', ' REDEMPTION'], rows, p=[0.4, 0.3, 0.2, 0.1]),
+        'Deal': rng.choice(list(deals), rows),
+    })
+
+
+# TEST 1: Chunked aggregation matches a full in-memory groupby
+print("\n🔴 TEST 1: Chunked CSV and Parquet aggregation")
+print("-" * 80)
+
+raw = transactions(300_000)
+csv_path = os.path.join(workdir, 'transactions.csv')
+parquet_path = os.path.join(workdir, 'transactions.parquet')
+raw.to_csv(csv_path, index=False)
+raw.to_parquet(parquet_path, row_group_size=50_000)
+
+from_csv = aggregate_transactions(csv_path, block_bytes=256 * 1024)    # ~40 blocks
+from_parquet = aggregate_transactions(parquet_path)
+paise = np.rint(raw['Amount'] * 100).astype(np.int64)
+redemption = raw['Type'].str.strip().str.lower() == 'redemption'
+expected = (raw.assign(month=pd.to_datetime(raw['Date']).dt.to_period('M'),
+                       gross=np.where(redemption, 0, paise), redeemed=np.where(redemption, paise, 0))
+            .groupby(['Deal', 'month'])[['gross', 'redeemed']].sum())
+single_deal = raw.drop(columns='Deal').head(1000)
+single_deal.to_csv(os.path.join(workdir, 'single.csv'), index=False)
+
+test1_pass = (np.array_equal(from_csv['gross_paise'], expected['gross']) and
+              np.array_equal(from_csv['redemption_paise'], expected['redeemed']) and
+              from_csv['transactions'].sum() == len(raw) and
+              from_csv.equals(from_parquet) and
+              set(aggregate_transactions(os.path.join(workdir, 'single.csv'))['deal']) == {'Deal 1'})
+print(f"  - 300,000 transactions -> {len(from_csv)} deal-months, exact to the paisa: {test1_pass}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Memory is bounded by the block size, not the file size
+print("\n🔴 TEST 2: Bounded memory")
+print("-" * 80)
+
+large_path = os.path.join(workdir, 'large.csv')
+pd.concat([raw] * 6).to_csv(large_path, index=False)
+probe = ("import resource, sys; from adnexus_ingest import aggregate_transactions; "
+         "aggregate_transactions(sys.argv[1], block_bytes=1 << 20); "
+         "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+
+
+def peak_rss_mb(path):
+    output = subprocess.run([sys.executable, '-c', probe, path], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return int(output.stdout.split()[-1]) / 1024
+
+
+small_peak, large_peak = peak_rss_mb(csv_path), peak_rss_mb(large_path)
+large_size = os.path.getsize(large_path) / 2 ** 20
+
+test2_pass = large_peak - small_peak < 0.25 * large_size
+print(f"  - Peak RSS: {small_peak:.0f} MB for {os.path.getsize(csv_path) / 2 ** 20:.0f} MB, "
+      f"{large_peak:.0f} MB for {large_size:.0f} MB (1 MB blocks)")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Persistence, reuse and dashboard starting values
+print("\n🔴 TEST 3: Persisted actuals")
+print("-" * 80)
+
+store = os.path.join(workdir, 'actuals.parquet')
+first, first_reused = ingest(csv_path, store)
+second, second_reused = ingest(csv_path, store)
+partial = transactions(5000, days=10, deals=('Alpha',))
+partial['Date'] = (pd.to_datetime(partial['Date']) + pd.Timedelta(days=700)).dt.strftime('%Y-%m-%d')
+partial.to_csv(csv_path, mode='a', header=False, index=False)    # log grows into a new month
+grown, grown_reused = ingest(csv_path, store)
+
+alpha = monthly_actuals(load_actuals(store), 'Alpha')
+summary = actuals_summary(alpha)
+last_full = alpha.iloc[-2]
+recent = alpha[alpha['Complete']].tail(3)
+bad_type = os.path.join(workdir, 'bad.csv')
+pd.DataFrame({'Date': ['2024-01-01'], 'Amount': [1.0], 'Type': ['refund']}).to_csv(bad_type, index=False)
+try:
+    aggregate_transactions(bad_type)
+    rejected = False
+except ValueError:
+    rejected = True
+
+test3_pass = (not first_reused and second_reused and second.equals(first) and not grown_reused and
+              grown['transactions'].sum() == len(raw) + len(partial) and
+              not alpha['Complete'].iloc[-1] and summary['current_month'] == len(alpha) - 1 and
+              summary['current_revenue'] == last_full['Gross Revenue (₹L)'] and
+              abs(summary['redemption_rate'] - recent['Redemptions (₹L)'].sum() /
+                  recent['Gross Revenue (₹L)'].sum() * 100) < 1e-9 and
+              rejected)
+print(f"  - Re-ingest unchanged file reused: {second_reused}; appended file re-ingested: {not grown_reused}")
+print(f"  - Starting values: month {summary['current_month']} ({summary['latest_month']}), "
+      f"revenue ₹{summary['current_revenue']:.2f}L, redemption {summary['redemption_rate']:.1f}% "
+      f"(partial {alpha['Month'].iloc[-1]} excluded)")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Chunked aggregation): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Bounded memory): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Persisted actuals): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
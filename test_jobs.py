@@ -0,0 +1,115 @@
+"""
+Tests for the background job runner (adnexus_jobs.py) and the progressive
+global sensitivity it runs in the Risk Analysis tab.
+"""
+import threading
+import time
+
+from adnexus_jobs import JobRunner
+from adnexus_risk import global_sensitivity, iter_global_sensitivity
+
+print("=" * 80)
+print("BACKGROUND JOB TESTS")
+print("=" * 80)
+
+
+def stepped_task(job, steps, gate=None):
+    """Reports one partial result per step, optionally waiting on a gate between steps."""
+    for step in range(1, steps + 1):
+        if gate is not None:
+            gate.wait(5)
+        job.report(step / steps, list(range(step)))
+    return steps
+
+
+# TEST 1: Progress, partial results and reuse of finished results
+print("\n🔴 TEST 1: Progress, partial results and result reuse")
+print("-" * 80)
+
+runner = JobRunner(workers=2)
+gate = threading.Event()
+job = runner.submit('s1:grid', 'key-a', stepped_task, 4, gate)
+time.sleep(0.05)
+queued_progress, submit_returned = job.progress, not job.finished
+gate.set()
+job.wait(5)
+again = runner.submit('s2:grid', 'key-a', stepped_task, 4)
+
+test1_pass = (submit_returned and queued_progress == 0 and job.status == 'done' and job.result == 4 and
+              job.partial == [0, 1, 2, 3] and job.progress == 1.0 and again is job and
+              runner.stats()['reused'] == 1 and runner.stats()['running'] == 0)
+print(f"  - Submit returned before completion: {submit_returned}, final status: {job.status}")
+print(f"  - Second owner served from the finished result: {again is job}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: New inputs cancel the stale job at its next checkpoint
+print("\n🔴 TEST 2: Stale job cancellation")
+print("-" * 80)
+
+runner = JobRunner(workers=2)
+slow_gate = threading.Event()
+stale = runner.submit('s1:grid', 'old', stepped_task, 100, slow_gate)
+same = runner.submit('s1:grid', 'old', stepped_task, 100, slow_gate)
+fresh = runner.submit('s1:grid', 'new', stepped_task, 3)
+fresh.wait(5)
+slow_gate.set()
+stale.wait(5)
+failing = runner.submit('s1:other', 'bad', lambda job: 1 / 0)
+failing.wait(5)
+# A rerun with unchanged inputs gets the failure back instead of resubmitting; new inputs run again
+resubmitted = runner.submit('s1:other', 'bad', lambda job: 1 / 0)
+stats = runner.stats()
+changed = runner.submit('s1:other', 'fixed', lambda job: 1)
+changed.wait(5)
+
+test2_pass = (same is stale and stale.status == 'cancelled' and stale.progress < 0.05 and
+              fresh.status == 'done' and failing.status == 'failed' and
+              isinstance(failing.error, ZeroDivisionError) and stats['cancelled'] == 1 and
+              stats['failed'] == 1 and stats['running'] == 0 and resubmitted is failing and
+              stats['submitted'] == 3 and changed.status == 'done' and changed.result == 1)
+print(f"  - Stale job: {stale.status} at {stale.progress:.0%}, fresh job: {fresh.status}")
+print(f"  - Failing task: {failing.status} ({type(failing.error).__name__}); stats: {stats}")
+print(f"  - Same inputs reuse the failed job: {resubmitted is failing}; new inputs: {changed.status}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Progressive sensitivity converges to the one-shot result
+print("\n🔴 TEST 3: Progressive global sensitivity")
+print("-" * 80)
+
+bounds = {
+    'User Growth %': (5.0, 10.0),
+    'ARPU Growth %': (1.5, 2.5),
+    'Churn %': (15.0, 25.0),
+    'Redemption %': (45.0, 55.0),
+    'Starting Revenue (₹L)': (9.0, 11.0),
+    'Investment (₹L)': (70.0, 80.0),
+    'Already Paid (₹L)': (0.0, 5.0),
+}
+fixed = {'revenue_share_pct': 5}
+steps = list(iter_global_sensitivity(bounds, fixed, base_samples=2048, batch_rows=256))
+one_shot = global_sensitivity(bounds, fixed, base_samples=2048)
+fractions = [fraction for fraction, _ in steps]
+final = steps[-1][1]
+
+test3_pass = (len(steps) == 8 and fractions[-1] == 1.0 and fractions == sorted(fractions) and
+              final[['Input', 'Output']].equals(one_shot[['Input', 'Output']]) and
+              (final[['First Order', 'Total Order']] - one_shot[['First Order', 'Total Order']]).abs().max().max()
+              < 1e-12 and steps[0][1]['Input'].iloc[0] == 'User Growth %')
+print(f"  - Partial results: {len(steps)}, top input after the first batch: {steps[0][1]['Input'].iloc[0]}")
+print(f"  - Final indices match global_sensitivity: {test3_pass}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Progress and reuse): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Stale cancellation): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Progressive sensitivity): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
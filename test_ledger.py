@@ -0,0 +1,123 @@
+"""
+Tests for the integer-paise repayment ledger (adnexus_engine.repayment_ledger).
+
+Re-runs the overpayment scenarios from test_critical_bugs.py against the
+engine, checks that capped payments add up to the investment exactly, and
+times the ledger against the original float loop.
+"""
+import time
+
+import numpy as np
+
+from adnexus_engine import calculate_projections, batch_projections, repayment_ledger
+from adnexus_schema import to_paise
+
+print("=" * 80)
+print("PAISE LEDGER TESTS")
+print("=" * 80)
+
+
+def float_loop_projections(current_revenue, growth_rate, redemption_rate=50, revenue_share_pct=5, months=120,
+                           investment_amount=75.0, already_paid=0.0):
+    """Original float loop, reduced to the payment column."""
+    payments = []
+    cumulative_payment = already_paid
+    for month_number in range(months + 1):
+        gross_revenue = current_revenue * ((1 + growth_rate / 100) ** month_number)
+        net_revenue = gross_revenue - gross_revenue * (redemption_rate / 100)
+        payment = min(net_revenue * (revenue_share_pct / 100), investment_amount - cumulative_payment)
+        cumulative_payment += payment
+        payments.append(round(payment, 2))
+        if cumulative_payment >= investment_amount:
+            break
+    return payments
+
+
+# TEST 1: Overpayment scenarios from test_critical_bugs.py
+print("\n🔴 TEST 1: Critical-bug scenarios on the engine")
+print("-" * 80)
+
+near_paid = calculate_projections(10.0, 5.0, redemption_rate=50.0, current_month=50, already_paid=74.8)
+fully_paid = calculate_projections(10.0, 5.0, current_month=100, already_paid=75.0)
+spike = calculate_projections(200.0, 0.0, redemption_rate=50.0, already_paid=70.0)
+prior = calculate_projections(15.0, 9.65, current_month=6, already_paid=10.0)
+default = calculate_projections(10.0, 9.65)
+
+checks = {
+    'Overpayment capped (0.2L of 0.25L)': (near_paid.iloc[0]['Payment to Vinmo (₹L)'] == 0.2 and
+                                           near_paid.iloc[0]['Cumulative Paid (₹L)'] == 75.0 and
+                                           near_paid.attrs['complete'] and len(near_paid) == 1),
+    'Fully repaid: 0 payment, 0 balance, 1 row': (fully_paid.iloc[0]['Payment to Vinmo (₹L)'] == 0 and
+                                                  fully_paid.iloc[0]['Balance (₹L)'] == 0 and len(fully_paid) == 1),
+    'Revenue spike capped to 5L': (spike.iloc[0]['Payment to Vinmo (₹L)'] == 5.0 and
+                                   spike.iloc[0]['Cumulative Paid (₹L)'] == 75.0),
+    'Post-payment balance after prior payments': prior.iloc[0]['Balance (₹L)'] == 75.0 - 10.0 - 15.0 * 0.5 * 0.05,
+    'Default case first payment 0.25L': (default.iloc[0]['Payment to Vinmo (₹L)'] == 0.25 and
+                                         default.iloc[0]['Balance (₹L)'] == 74.75),
+}
+for name, ok in checks.items():
+    print(f"  - {name}: {'✓' if ok else '✗'}")
+test1_pass = all(checks.values())
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Capped payments add up to the investment exactly, in paise
+print("\n🔴 TEST 2: Exact capping and completion")
+print("-" * 80)
+
+rng = np.random.default_rng(17)
+n = 20_000
+investment = np.round(rng.uniform(20, 200, n), 2)
+paid = np.round(rng.uniform(0, 0.9, n) * investment, 2)
+due = rng.uniform(0.01, 20, (n, 121)) * rng.uniform(0, 1, (n, 1))
+ledger = repayment_ledger(due, investment, paid)
+
+total_paise = to_paise(paid) + ledger['payment'].sum(axis=1)
+exact_total = np.all(np.where(ledger['complete'], total_paise == to_paise(investment), True))
+no_overpayment = np.all(ledger['payment'] >= 0) and np.all(ledger['cumulative_paid'] <= to_paise(investment)[:, None])
+payoff_rows = ledger['payoff_index'][ledger['complete']]
+first_zero = np.all(ledger['balance'][ledger['complete'], payoff_rows] == 0) and np.all(
+    ledger['balance'][ledger['complete'], np.maximum(payoff_rows - 1, 0)][payoff_rows > 0] > 0)
+
+test2_pass = bool(exact_total and no_overpayment and first_zero and ledger['complete'].any()
+                  and (~ledger['complete']).any())
+print(f"  - Scenarios: {n:,}, completed: {ledger['complete'].sum():,}")
+print(f"  - Already paid + payments == investment (paise): {exact_total}")
+print(f"  - No overpayment: {no_overpayment}, payoff month is the first zero balance: {first_zero}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Faster than the float loop
+print("\n🔴 TEST 3: Ledger vs float loop timing")
+print("-" * 80)
+
+cases = [(rng.uniform(1, 20), rng.uniform(0, 10), rng.uniform(0, 50)) for _ in range(300)]
+start = time.perf_counter()
+loop_payments = [float_loop_projections(revenue, growth, already_paid=prior_paid)
+                 for revenue, growth, prior_paid in cases]
+loop_seconds = time.perf_counter() - start
+
+start = time.perf_counter()
+revenue, growth, prior_paid = map(np.array, zip(*cases))
+batched = batch_projections(revenue, growth, already_paid=prior_paid)
+ledger_seconds = time.perf_counter() - start
+
+same_months = all(len(payments) - 1 == months for payments, months in zip(loop_payments, batched['months_remaining']))
+test3_pass = same_months and ledger_seconds < loop_seconds
+print(f"  - Float loop: {loop_seconds * 1000:.1f} ms, paise ledger (batched): {ledger_seconds * 1000:.1f} ms "
+      f"({loop_seconds / ledger_seconds:.0f}x)")
+print(f"  - Same payoff months: {same_months}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Critical-bug scenarios): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Exact capping): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Ledger timing): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
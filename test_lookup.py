@@ -0,0 +1,113 @@
+"""
+Tests for the payoff lookup table (adnexus_lookup.py).
+
+Checks interpolated lookups against the closed-form engine and the
+row-by-row calculate_projections, including off-lattice fallbacks, and that
+rebuilding the table never disturbs a process that has it mapped.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from adnexus_engine import calculate_projections, payoff_months
+from adnexus_lookup import build_payoff_table, load_payoff_table, lookup_payoff
+
+print("=" * 80)
+print("PAYOFF LOOKUP TABLE TESTS")
+print("=" * 80)
+
+table_path = os.path.join(tempfile.mkdtemp(), 'payoff_lookup.npy')
+build_payoff_table(table_path)
+table = load_payoff_table(table_path)
+
+# TEST 1: Table is a read-only memory map
+print("\n🔴 TEST 1: Read-only memory map")
+print("-" * 80)
+
+# A rebuild swaps in a new file: the open map keeps its data and no temporary file is left behind
+before = np.array(table[:, ::97, ::97])
+build_payoff_table(table_path)
+rebuilt = load_payoff_table(table_path)
+swap_ok = (np.array_equal(table[:, ::97, ::97], before) and np.array_equal(rebuilt[:, ::97, ::97], before) and
+           os.listdir(os.path.dirname(table_path)) == ['payoff_lookup.npy'])
+missing = load_payoff_table(os.path.join(os.path.dirname(table_path), 'missing.npy'))
+
+test1_pass = isinstance(table, np.memmap) and not table.flags.writeable and swap_ok and missing is None
+print(f"  - Type: {type(table).__name__}, shape: {table.shape}, writeable: {table.flags.writeable}")
+print(f"  - Atomic rebuild under an open map: {swap_ok}; missing table loads as None: {missing is None}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Lookup matches the closed-form engine on random scenarios
+print("\n🔴 TEST 2: Lookup vs closed-form payoff months")
+print("-" * 80)
+
+rng = np.random.default_rng(11)
+n = 200_000
+growth = rng.uniform(0, 20, n)
+redemption = rng.uniform(0, 90, n)
+revenue = rng.uniform(0.5, 50, n)
+investment = rng.uniform(20, 200, n)
+paid = rng.uniform(0, 0.5, n) * investment
+lookup = lookup_payoff(table, growth, redemption, revenue, investment, paid)
+expected_months, expected_complete = payoff_months(growth, redemption, revenue, investment, paid)
+mismatches = int(np.sum(lookup['months_remaining'] != expected_months) +
+                 np.sum(lookup['complete'] != expected_complete))
+
+# Final balances are exact, also for the incomplete scenarios closest to repaying within the horizon
+incomplete = np.flatnonzero(~lookup['complete'])
+nearest = incomplete[np.argsort(lookup['final_balance'][incomplete] / investment[incomplete])[:100]]
+balance_error = max(abs(lookup['final_balance'][i] -
+                        calculate_projections(revenue[i], growth[i], redemption_rate=redemption[i],
+                                              investment_amount=investment[i],
+                                              already_paid=paid[i]).iloc[-1]['Balance (₹L)'])
+                    for i in nearest)
+
+test2_pass = mismatches == 0 and len(incomplete) > 1000 and balance_error < 1e-3
+print(f"  - Scenarios: {n:,}, mismatches: {mismatches}, exact fallbacks: {lookup['exact'].mean():.1%}")
+print(f"  - Final balance of the 100 incomplete scenarios nearest completion: max error ₹{balance_error:.6f}L")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Final balance, growth multiple and off-lattice cases vs calculate_projections
+print("\n🔴 TEST 3: Lookup vs calculate_projections (incl. off-lattice)")
+print("-" * 80)
+
+cases = [
+    # (revenue, growth, redemption, investment, already paid)
+    (10.0, 9.65, 50, 75.0, 0.0),     # default dashboard
+    (10.0, 3.0, 95, 200.0, 0.0),     # incomplete: balance left at the horizon
+    (10.0, 60.0, 50, 75.0, 0.0),     # growth above the lattice
+    (0.0, 5.0, 50, 75.0, 0.0),       # no revenue: never repays
+    (10.0, 5.0, 50, 75.0, 75.0),     # already repaid
+]
+test3_pass = True
+for revenue, growth, redemption, investment, paid in cases:
+    df = calculate_projections(revenue, growth, redemption_rate=redemption, investment_amount=investment,
+                               already_paid=paid)
+    result = lookup_payoff(table, growth, redemption, revenue, investment, paid)
+    # Without a table every point is solved exactly, with the same answer
+    untabled = lookup_payoff(None, growth, redemption, revenue, investment, paid)
+    final_revenue = df.iloc[-1]['Gross Revenue (₹L)']
+    ok = (int(result['months_remaining']) == len(df) - 1 and bool(untabled['exact']) and
+          int(untabled['months_remaining']) == len(df) - 1 and
+          abs(float(result['final_balance']) - df.iloc[-1]['Balance (₹L)']) < 1e-3 and
+          (revenue == 0 or abs(float(result['growth_multiple']) * revenue - final_revenue) < 0.01))
+    test3_pass = test3_pass and ok
+    print(f"  - ₹{revenue}L @ {growth}%: {int(result['months_remaining'])} months, "
+          f"balance ₹{float(result['final_balance']):.2f}L, exact={bool(result['exact'])} {'✓' if ok else '✗'}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Memory map): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Closed-form agreement): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Projection agreement): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
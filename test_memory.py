@@ -0,0 +1,108 @@
+"""
+Tests for the session memory manager (adnexus_memory.py).
+
+Checks the per-session byte budget with LRU eviction, idle-session expiry
+and the size estimates and keys used by the dashboard.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from adnexus_engine import calculate_projections
+from adnexus_memory import SessionMemory, estimate_size, memory_key
+
+print("=" * 80)
+print("SESSION MEMORY TESTS")
+print("=" * 80)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# TEST 1: Budget enforced with least-recently-used eviction
+print("\n🔴 TEST 1: Per-session budget and LRU eviction")
+print("-" * 80)
+
+block = np.zeros(125_000)  # 1 MB
+memory = SessionMemory(budget_bytes=3_500_000)
+for name in ('a', 'b', 'c'):
+    memory.put('s1', name, block.copy())
+memory.get('s1', 'a')                       # 'a' becomes most recent, 'b' is next out
+memory.put('s1', 'd', block.copy())
+kept = list(memory.session_stats('s1')['sizes'])
+memory.put('s1', 'huge', np.zeros(1_000_000))  # larger than the budget: not stored
+
+for session in range(50):
+    for result in range(10):
+        memory.put(f'analyst{session}', result, block.copy())
+stats = memory.stats()
+
+test1_pass = (kept == ['c', 'a', 'd'] and memory.get('s1', 'b') is None and memory.get('s1', 'huge') is None and
+              memory.session_stats('s1')['evictions'] == 1 and stats['oversized'] == 1 and
+              stats['bytes'] <= stats['sessions'] * memory.budget_bytes and
+              stats['evictions'] == 1 + 50 * 7)
+print(f"  - Kept after eviction (LRU first): {kept}")
+print(f"  - 51 sessions: {stats['bytes'] / 1024 ** 2:.1f} MB held, {stats['evictions']} evictions")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Idle sessions are freed after the TTL
+print("\n🔴 TEST 2: Idle-session expiry")
+print("-" * 80)
+
+clock = FakeClock()
+memory = SessionMemory(budget_bytes=10_000_000, ttl_seconds=600, clock=clock)
+memory.put('idle', 'x', block)
+memory.put('active', 'x', block)
+clock.now = 500
+memory.get('active', 'x')
+clock.now = 700
+expired = memory.expire_idle()
+stats = memory.stats()
+
+test2_pass = (expired == 1 and stats['sessions'] == 1 and memory.session_stats('idle')['entries'] == 0 and
+              memory.session_stats('active')['entries'] == 1 and stats['expired_bytes'] == block.nbytes)
+print(f"  - Expired: {expired}, remaining sessions: {stats['sessions']}, freed {stats['expired_bytes']:,} bytes")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Size estimates, keys and compute-once
+print("\n🔴 TEST 3: Size estimates, keys and get_or_compute")
+print("-" * 80)
+
+df = calculate_projections(10.0, 9.65, backend='arrow')
+figure = go.Figure(go.Heatmap(z=np.zeros((100, 100))))
+payload = df.to_csv(index=False)
+calls = []
+memory = SessionMemory()
+first = memory.get_or_compute('s', 'csv', lambda: calls.append(1) or payload)
+second = memory.get_or_compute('s', 'csv', lambda: calls.append(1) or payload)
+schedule = np.full(120, 9.65)
+
+test3_pass = (estimate_size(df) >= df.shape[0] * 8 * 7 and estimate_size(figure) >= 80_000 and
+              estimate_size(payload) >= len(payload) and first is second and len(calls) == 1 and
+              memory_key(1.0, schedule, {'a': 1}) == memory_key(1.0, schedule.copy(), {'a': 1}) and
+              memory_key(1.0, schedule) != memory_key(1.0, schedule + 1e-9) and
+              memory_key((1, 2)) != memory_key([1, 2]) and memory_key('1') != memory_key(1))
+print(f"  - Projections: {estimate_size(df):,} B, heatmap: {estimate_size(figure):,} B, "
+      f"CSV: {estimate_size(payload):,} B")
+print(f"  - Computed once across two calls: {len(calls) == 1}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Budget and LRU eviction): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Idle-session expiry): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Sizes, keys, compute-once): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,108 @@
+"""
+Tests for the user-level microsimulation (adnexus_microsim.py).
+
+Checks that simulated users average out to the aggregate cohort model (MAU,
+revenue and retention, also with a per-age churn schedule) and reproduce
+calculate_projections exactly when nothing is random, that the spread of the
+payoff month shrinks as the user base grows, and that a million users are
+simulated within a bounded memory budget.
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from adnexus_engine import (
+    calculate_cohort_revenue,
+    calculate_projections,
+    cohort_acquisitions,
+    growth_path,
+)
+from adnexus_microsim import iter_simulate_users, microsim_bands, microsim_repayment, simulate_users
+
+print("=" * 80)
+print("USER-LEVEL MICROSIMULATION TESTS")
+print("=" * 80)
+
+
+# TEST 1: Simulated users average out to the cohort model
+print("\n🔴 TEST 1: Agreement with the cohort model")
+print("-" * 80)
+
+churn_schedule = np.r_[np.full(3, 15.0), np.full(45, 4.0)]
+cohort = calculate_cohort_revenue(5000, 100, churn_schedule, 2.0, 0.5, spend_growth_rate=3.0, periods=48)
+simulation = simulate_users(cohort['acquisitions'], 100, churn_schedule, 2.0, runs=200)
+mean_ok = (np.allclose(simulation['mau'].mean(axis=0), cohort['mau'], rtol=0.01) and
+           np.allclose(simulation['revenue'].mean(axis=0), cohort['revenue'], rtol=0.02) and
+           np.allclose(np.nanmean(simulation['retention'], axis=0)[:37], cohort['retention'][:37], atol=0.01))
+
+# No randomness left: one cohort, no churn, every user at the average ARPU
+fixed = simulate_users(np.r_[5000.0, np.zeros(60)], 200, 0.0, 3.0, runs=3, arpu_dispersion=0.0)
+reference = calculate_projections(10.0, 3.0, 50, revenue_share_pct=20, months=60)
+exact = microsim_repayment(fixed, 10.0, redemption_rate=50, revenue_share_pct=20)
+exact_ok = (np.all(fixed['mau'] == 5000) and np.allclose(fixed['revenue'], 10.0 * growth_path(3.0, 60)) and
+            np.all(exact['months_remaining'] == len(reference) - 1))
+
+test1_pass = mean_ok and exact_ok
+print(f"  - 200 runs ({simulation['users']:,} users): mean MAU, revenue and retention match the cohort model "
+      f"with a 15%→4% churn schedule: {mean_ok}")
+print(f"  - Without randomness the payoff is calculate_projections' month {len(reference) - 1}: {exact_ok}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Small deals are less predictable than large ones
+print("\n🔴 TEST 2: Payoff spread by deal size")
+print("-" * 80)
+
+spreads, shares = {}, {}
+for users in (200, 20000):
+    acquisitions = cohort_acquisitions(users, 0.005 * users / 100, 2.0, starting_cac=30, periods=60)
+    runs = simulate_users(acquisitions, 100, 5.0, 1.0, runs=200, seed=1)
+    outcome = microsim_repayment(runs, users * 100 / 100000, redemption_rate=50, revenue_share_pct=20,
+                                 investment_amount=users * 100 / 100000 * 4)
+    spreads[users] = outcome['p90'] - outcome['p10']
+    shares[users] = np.percentile(runs['mau'][:, -1], 90) / np.percentile(runs['mau'][:, -1], 10) - 1
+
+progress = [fraction for fraction, _ in iter_simulate_users(cohort['acquisitions'], 100, 4.0, 2.0, runs=10,
+                                                            batch_users=3.5 * cohort['acquisitions'].sum())]
+bands = microsim_bands(simulation, current_month=37)
+
+test2_pass = (spreads[200] > spreads[20000] and shares[200] > 5 * shares[20000] and
+              progress == [0.3, 0.6, 0.9, 1.0] and bands['Month'].iloc[0] == 37 and
+              np.all(bands['MAU P10'] <= bands['MAU P50']) and np.all(bands['MAU P50'] <= bands['MAU P90']))
+print(f"  - P10–P90 payoff spread: {spreads[200]:.0f} months with 200 users vs {spreads[20000]:.0f} with 20,000")
+print(f"  - P90/P10 MAU at month 60: +{shares[200]:.1%} vs +{shares[20000]:.1%}")
+print(f"  - Batches of 3 runs report progress {progress}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: A million users in a bounded memory budget
+print("\n🔴 TEST 3: Scale")
+print("-" * 80)
+
+large = cohort_acquisitions(100000, 10.0, starting_cac=30, cac_monthly_increase=0, periods=120)
+tracemalloc.start()
+start = time.perf_counter()
+result = simulate_users(large, 100, 3.0, 2.0, runs=1)
+elapsed = time.perf_counter() - start
+peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+tracemalloc.stop()
+
+test3_pass = (result['users'] > 4_000_000 and result['peak_users'] > 1_000_000 and peak_mb < 300 and
+              result['state_mb'] == result['peak_users'] * 8 / 1e6 and elapsed < 10)
+print(f"  - {result['users']:,} users over 120 months ({result['peak_users']:,} live at once) in {elapsed:.1f} s")
+print(f"  - Peak memory {peak_mb:.0f} MB ({result['state_mb']:.0f} MB of user state)")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Agreement with the cohort model): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Payoff spread by deal size): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Scale): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,116 @@
+"""
+Tests for the marketing spend optimizer (adnexus_optimize.py).
+
+Checks that a batch of spend schedules evaluates to the same repayment as the
+cohort model feeding calculate_projections one schedule at a time, that the
+search spends exactly the budget and never does worse than the plans it
+starts from, and that it evaluates thousands of schedules per second.
+"""
+import time
+
+import numpy as np
+
+from adnexus_engine import calculate_cohort_revenue, calculate_projections, growth_from_path, growth_path
+from adnexus_optimize import evaluate_spend, optimize_spend, spend_model
+from adnexus_schema import to_paise
+
+print("=" * 80)
+print("MARKETING SPEND OPTIMIZER TESTS")
+print("=" * 80)
+
+COHORT = dict(mau=10000, arpu=100, churn_rate=5, arpu_growth_rate=2.0)
+TERMS = dict(current_revenue=10.0, redemption_rate=50, revenue_share_pct=5, investment_amount=75.0,
+             already_paid=0.0)
+
+
+# TEST 1: Batched evaluation matches the cohort model and calculate_projections
+print("\n🔴 TEST 1: Reference projections")
+print("-" * 80)
+
+# Without diminishing returns the spend model is the dashboard's cohort model
+flat_model = spend_model(**COHORT, **TERMS, cac_doubling_spend=1e12)
+plans = np.array([1.0 * growth_path(5.0, 23), np.r_[np.full(6, 4.0), np.zeros(18)], np.full(24, 0.5)])
+batch = evaluate_spend(plans, flat_model, paths=True)
+
+matches = []
+for index, plan in enumerate(plans):
+    # the optimizer's plans stop spending after their window; a schedule would repeat its last month
+    cohort = calculate_cohort_revenue(**COHORT, acquisition_spend=np.pad(plan, (0, 120 - len(plan))))
+    df = calculate_projections(growth_rate=growth_from_path(cohort['revenue']), **TERMS)
+    payments = to_paise(df['Payment to Vinmo (₹L)'])
+    matches.append(batch['complete'][index] == df.attrs['complete'] and
+                   batch['months_remaining'][index] == len(df) - 1 and
+                   np.abs(to_paise(batch['payments'][index, :len(df)]) - payments).max() <= 1 and
+                   np.allclose(batch['mau'][index], cohort['mau']))
+fractional_ok = np.all((batch['payoff'] > batch['months_remaining'] - 1) &
+                       (batch['payoff'] <= batch['months_remaining']) | ~batch['complete'])
+
+test1_pass = all(matches) and fractional_ok
+print(f"  - 3 schedules in one batch match calculate_cohort_revenue + calculate_projections: {sum(matches)}/3 "
+      f"({', '.join(str(months) for months in batch['months_remaining'])} months)")
+print(f"  - Fractional payoff within the payoff month: {fractional_ok} "
+      f"({', '.join(f'{payoff:.2f}' for payoff in batch['payoff'])})")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: The search spends the budget and beats its starting plans
+print("\n🔴 TEST 2: Search")
+print("-" * 80)
+
+model = spend_model(**dict(COHORT, arpu_growth_rate=3.0), **TERMS, cac_doubling_spend=2.0)
+current = 1.0 * growth_path(5.0, 23)
+budget = current.sum()
+results = {objective: optimize_spend(model, budget, objective, initial=[current])
+           for objective in ('payoff', 'ltv_cac')}
+seeds = evaluate_spend(np.vstack([current, np.full(24, budget / 24)]), model)
+
+best = {objective: evaluate_spend(result['spend'], model) for objective, result in results.items()}
+budget_ok = all(np.isclose(result['spend'].sum(), budget) and np.all(result['spend'] >= 0)
+                for result in results.values())
+payoff_ok = (best['payoff']['payoff'][0] <= seeds['payoff'].min() and
+             best['ltv_cac']['ltv_cac'][0] >= seeds['ltv_cac'].max() and
+             best['payoff']['payoff'][0] <= best['ltv_cac']['payoff'][0] and
+             best['ltv_cac']['ltv_cac'][0] >= best['payoff']['ltv_cac'][0])
+history = results['payoff']['history']
+monotone = all(later <= earlier for earlier, later in zip(history, history[1:]))
+
+test2_pass = budget_ok and payoff_ok and monotone
+print(f"  - Both objectives spend exactly ₹{budget:.2f}L: {budget_ok}")
+print(f"  - Payoff month {seeds['payoff'][0]:.2f} (current plan) -> {best['payoff']['payoff'][0]:.2f}; "
+      f"LTV/CAC {seeds['ltv_cac'][0]:.2f}x -> {best['ltv_cac']['ltv_cac'][0]:.2f}x: {payoff_ok}")
+print(f"  - Best score never worsens across {len(history)} rounds: {monotone}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Throughput and validation
+print("\n🔴 TEST 3: Throughput")
+print("-" * 80)
+
+population = np.random.default_rng(3).dirichlet(np.ones(24), 1000) * budget
+start = time.perf_counter()
+evaluate_spend(population, model)
+batch_ms = (time.perf_counter() - start) * 1000
+rate = results['payoff']['evaluations_per_second']
+try:
+    optimize_spend(model, budget, 'revenue')
+    rejected = False
+except ValueError:
+    rejected = True
+
+test3_pass = batch_ms < 200 and rate > 5000 and rejected
+print(f"  - 1,000 schedules evaluated in {batch_ms:.1f} ms; search ran at {rate:,.0f} schedules per second")
+print(f"  - Unknown objective rejected: {rejected}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Reference projections): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Search): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Throughput): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
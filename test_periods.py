@@ -0,0 +1,131 @@
+"""
+Tests for daily and weekly projections (granularity mode of adnexus_engine.py).
+
+Checks that splitting months into days or weeks keeps every month's revenue
+and the repayment totals of the monthly model while moving the payoff to a
+specific day, that 10-year daily horizons stay fast and compact and roll up
+to months and quarters exactly, and that chart downsampling keeps the
+shape of a series in a bounded number of points.
+"""
+import time
+
+import numpy as np
+
+from adnexus_engine import (
+    MAX_CHART_POINTS,
+    PERIODS_PER_MONTH,
+    aggregate_periods,
+    calculate_projections,
+    calculate_unit_economics,
+    downsample_indices,
+    growth_integral,
+    growth_path,
+)
+from adnexus_schema import compact_frame, display_frame, to_paise
+
+print("=" * 80)
+print("DAILY / WEEKLY PROJECTION TESTS")
+print("=" * 80)
+
+
+# TEST 1: Sub-monthly periods agree with the monthly model
+print("\n🔴 TEST 1: Consistency with monthly projections")
+print("-" * 80)
+
+schedule = np.r_[np.full(12, 9.0), np.full(24, 4.0), np.full(84, 1.5)]
+month_sums_ok = all(np.allclose(np.diff(growth_integral(rate, np.arange(122))), growth_path(rate, 120),
+                                rtol=1e-12, atol=0) for rate in (0.0, 3.5, -2.0, schedule))
+
+payoff_checks = []
+for growth in (0.0, 2.0, 5.0, 9.65, 15.0):
+    monthly = calculate_projections(10.0, growth, 50, months=120, current_month=37)
+    for granularity in ('weekly', 'daily'):
+        periods = calculate_projections(10.0, growth, 50, months=120, current_month=37,
+                                        granularity=granularity, start_date='2026-01-01')
+        payoff_checks.append(
+            periods.attrs['complete'] == monthly.attrs['complete'] and
+            # each day's/week's payment is rounded to the paisa: at most half a paisa per period apart
+            abs(to_paise(periods['Payment to Vinmo (₹L)']).sum() -
+                to_paise(monthly['Payment to Vinmo (₹L)']).sum()) <= len(periods) / 2 and
+            abs(int(periods['Month'].iloc[-1]) - int(monthly['Month'].iloc[-1])) <= 1)
+daily = calculate_projections(10.0, 9.65, 50, months=120, current_month=37, granularity='daily',
+                              start_date='2026-01-01')
+monthly = calculate_projections(10.0, 9.65, 50, months=120, current_month=37)
+
+unit_daily = aggregate_periods(calculate_unit_economics(10000, 100, 6, 2, 5, granularity='daily'))
+unit_monthly = calculate_unit_economics(10000, 100, 6, 2, 5)
+unit_ok = (np.allclose(unit_daily['MAU'], unit_monthly['MAU'], rtol=0.07 / PERIODS_PER_MONTH['daily']) and
+           np.array_equal(unit_daily['CAC'], unit_monthly['CAC']) and len(unit_daily) == 36)
+
+test1_pass = month_sums_ok and all(payoff_checks) and unit_ok
+print(f"  - Whole-month revenue equals the monthly path (flat, growing, shrinking, schedule): {month_sums_ok}")
+print(f"  - Same total repaid (within per-period paise rounding), payoff in the same month ±1: "
+      f"{sum(payoff_checks)}/{len(payoff_checks)}")
+print(f"  - 9.65% growth: monthly model repays in month {monthly['Month'].iloc[-1]}, daily on day "
+      f"{daily['Day'].iloc[-1]:,} ({daily['Date'].iloc[-1]:%d %b %Y}, month {daily['Month'].iloc[-1]})")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: 10-year daily horizons are fast, compact and roll up exactly
+print("\n🔴 TEST 2: Long daily horizons")
+print("-" * 80)
+
+start = time.perf_counter()
+for _ in range(20):
+    flat = calculate_projections(10.0, 0.0, 60, months=120, granularity='daily', start_date='2026-01-01')
+elapsed_ms = (time.perf_counter() - start) / 20 * 1000
+
+compact = compact_frame(flat)
+restored = display_frame(compact)
+by_month = aggregate_periods(flat)
+by_quarter = aggregate_periods(flat, by='Quarter')
+float_bytes = flat.drop(columns='Date').memory_usage(index=False).sum()
+compact_bytes = compact.drop(columns='Date').memory_usage(index=False).sum()
+
+test2_pass = (len(flat) >= 3650 and not flat.attrs['complete'] and not compact.attrs['complete'] and
+              np.allclose(restored['Balance (₹L)'], flat['Balance (₹L)'], rtol=1e-6, atol=0) and
+              restored['Day'].equals(flat['Day'].astype(np.int64)) and restored.attrs['complete'] is False and
+              len(by_month) == 121 and by_month['Days'].sum() == len(flat) and len(by_quarter) == 41 and
+              to_paise(by_month['Payment to Vinmo (₹L)']).sum() == to_paise(flat['Payment to Vinmo (₹L)']).sum() and
+              by_quarter['Balance (₹L)'].iloc[-1] == flat['Balance (₹L)'].iloc[-1] and
+              compact_bytes < 0.6 * float_bytes and elapsed_ms < 20)
+print(f"  - {len(flat):,} days (current month + 120 months) in {elapsed_ms:.1f} ms; rolled up to "
+      f"{len(by_month)} months and {len(by_quarter)} quarters with exact totals")
+print(f"  - Compact storage (float32 money) {compact_bytes / 1024:.0f} KB vs {float_bytes / 1024:.0f} KB")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Chart downsampling
+print("\n🔴 TEST 3: Downsampling")
+print("-" * 80)
+
+stepped = calculate_projections(10.0, 0.5, [30.0] * 40 + [80.0], months=120, granularity='daily')
+payments = stepped['Payment to Vinmo (₹L)'].to_numpy()
+shown = downsample_indices(payments)
+noise = np.random.default_rng(1).normal(size=50_000)
+noise_shown = downsample_indices(noise, 200)
+step_day = int(np.argmax(np.diff(payments) < 0)) + 1
+
+test3_pass = (len(shown) <= MAX_CHART_POINTS and shown[0] == 0 and shown[-1] == len(payments) - 1 and
+              np.all(np.diff(shown) > 0) and
+              payments[shown].max() == payments.max() and payments[shown].min() == payments.min() and
+              np.any((shown >= step_day - 1) & (shown <= step_day)) and
+              len(noise_shown) <= 200 and noise.argmax() in noise_shown and noise.argmin() in noise_shown and
+              np.array_equal(downsample_indices(payments[:100]), np.arange(100)))
+print(f"  - {len(payments):,} daily payments drawn with {len(shown)} points; extremes and the day-{step_day} "
+      f"redemption step kept")
+print(f"  - 50,000 noisy points -> {len(noise_shown)} with the global min and max")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Consistency): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Long horizons): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Downsampling): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,114 @@
+"""
+Tests for investor report generation (adnexus_reports.py).
+
+Checks that reports are self-contained, that chart renders are cached by
+input fingerprint with least-recently-used eviction, and that parallel
+portfolio runs match in-process ones.
+"""
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+
+from adnexus_reports import generate_report, generate_reports, load_deals, prune_chart_cache, reports_archive
+
+
+# Report workers are spawned and re-import this script, so the tests run only as __main__
+if __name__ == '__main__':
+    print("=" * 80)
+    print("INVESTOR REPORT TESTS")
+    print("=" * 80)
+
+    cache_dir = tempfile.mkdtemp(prefix='adnexus_charts_')
+
+
+    # TEST 1: Self-contained HTML and PDF reports
+    print("\n🔴 TEST 1: Self-contained HTML and PDF")
+    print("-" * 80)
+
+    html_report = generate_report({'name': 'Beta & Co'}, 'html', cache_dir)
+    pdf_report = generate_report({'name': 'Beta & Co'}, 'pdf', cache_dir)
+    document = html_report['content'].decode('utf-8')
+    embedded = re.findall(r'src="data:image/png;base64,', document)
+    external = re.findall(r'(?:src|href)="https?://', document)
+
+    test1_pass = (len(embedded) == 2 and not external and 'Beta &amp; Co - Investor Report' in document and
+                  '<td>M37</td>' in document and html_report['filename'].startswith('beta___co_investor_report_') and
+                  pdf_report['content'].startswith(b'%PDF') and pdf_report['filename'].endswith('.pdf'))
+    print(f"  - HTML: {len(html_report['content']):,} bytes, {len(embedded)} embedded charts, "
+          f"{len(external)} external links")
+    print(f"  - PDF: {len(pdf_report['content']):,} bytes")
+    print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+    # TEST 2: Chart renders cached by input fingerprint
+    print("\n🔴 TEST 2: Chart render cache")
+    print("-" * 80)
+
+    renamed = generate_report({'name': 'Renamed'}, 'html', cache_dir)
+    changed = generate_report({'name': 'Beta & Co', 'already_paid': 5.0}, 'html', cache_dir)
+    uncached = generate_report({'name': 'Beta & Co'}, 'html', None)
+
+    # A hit marks the charts as recently used, so pruning to 2 files evicts the changed deal's charts
+    refreshed = generate_report({'name': 'Beta & Co'}, 'html', cache_dir)
+    evicted = prune_chart_cache(cache_dir, keep=2)
+    remaining = len(os.listdir(cache_dir))
+    kept = generate_report({'name': 'Beta & Co'}, 'html', cache_dir)
+    recached = generate_report({'name': 'Beta & Co', 'already_paid': 5.0}, 'html', cache_dir)
+    eviction_ok = (refreshed['chart_hits'] == 2 and evicted == 2 and kept['chart_hits'] == 2 and
+                   recached['chart_hits'] == 0 and remaining == 2)
+
+    test2_pass = (html_report['chart_hits'] == 0 and pdf_report['chart_hits'] == 2 and renamed['chart_hits'] == 2 and
+                  changed['chart_hits'] == 0 and uncached['chart_hits'] == 0 and eviction_ok)
+    print(f"  - Hits: first {html_report['chart_hits']}, same inputs {pdf_report['chart_hits']}, "
+          f"renamed {renamed['chart_hits']}, changed input {changed['chart_hits']}")
+    print(f"  - Pruned to 2 files: {evicted} least recently used evicted, recently used charts kept: {eviction_ok}")
+    print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+    # TEST 3: Parallel portfolio run matches in-process rendering
+    print("\n🔴 TEST 3: Parallel portfolio generation")
+    print("-" * 80)
+
+    deals = load_deals(io.StringIO("name,current_revenue,growth_rate,already_paid\n"
+                                   "Alpha,10,9.65,0\nBeta,5,12,10\nGamma,20,,\nAlpha,10,9.65,0\n"))
+    progress = []
+    start = time.perf_counter()
+    parallel = generate_reports(deals, 'html', workers=2, cache_dir=cache_dir,
+                                progress=lambda done, total: progress.append((done, total)))
+    parallel_seconds = time.perf_counter() - start
+    serial = generate_reports(deals, 'html', cache_dir=None)
+    archive = zipfile.ZipFile(io.BytesIO(reports_archive(parallel)))
+
+    try:
+        load_deals(io.StringIO("name,revenue\nAlpha,10\n"))
+        unknown_rejected = False
+    except ValueError:
+        unknown_rejected = True
+
+    images = lambda report: re.findall(rb'base64,([^"]+)', report['content'])
+    test3_pass = (deals[2]['growth_rate'] == 9.65 and deals[2]['already_paid'] == 0.0 and unknown_rejected and
+                  [report['filename'] for report in parallel] == [report['filename'] for report in serial] and
+                  all(images(a) == images(b) for a, b in zip(parallel, serial)) and
+                  progress[-1] == (4, 4) and len(progress) == 4 and len(set(archive.namelist())) == 4)
+    print(f"  - {len(parallel)} reports in {parallel_seconds:.2f}s with 2 workers, archive: {archive.namelist()}")
+    print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+    # SUMMARY
+    print("\n" + "=" * 80)
+    print("TEST SUMMARY")
+    print("=" * 80)
+    all_pass = test1_pass and test2_pass and test3_pass
+    print(f"Test 1 (Self-contained reports): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+    print(f"Test 2 (Chart render cache): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+    print(f"Test 3 (Parallel portfolio): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+    print()
+    print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+    print("=" * 80)
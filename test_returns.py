@@ -0,0 +1,97 @@
+"""
+Tests for the investor return metrics (adnexus_returns.py).
+
+Checks the batched IRR/NPV solver against known cash flows and a
+row-by-row scalar bisection reference.
+"""
+import numpy as np
+
+from adnexus_engine import batch_projections
+from adnexus_returns import (
+    investor_cash_flows,
+    batch_npv,
+    batch_irr,
+    investor_returns,
+)
+
+print("=" * 80)
+print("INVESTOR RETURNS TESTS")
+print("=" * 80)
+
+# TEST 1: Known IRR cases
+print("\n🔴 TEST 1: Known IRR cases")
+print("-" * 80)
+
+known = np.array([
+    [-100, 10, 10, 10, 110],   # 10% coupon bond at par
+    [-100, 60, 60, 0, 0],      # (√69 - 7) / 10 ≈ 13.07%
+    [-100, 0, 0, 0, 0],        # nothing back: no root
+], dtype=float)
+irr = batch_irr(known)
+expected = np.array([0.10, (np.sqrt(69) - 7) / 10])
+test1_pass = np.allclose(irr[:2], expected, atol=1e-9) and np.isnan(irr[2])
+print(f"  - IRRs: {irr} (expected {expected}, nan)")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Batched IRR matches a scalar bisection on projected payments
+print("\n🔴 TEST 2: Batched IRR vs scalar reference")
+print("-" * 80)
+
+
+def scalar_irr(flows, low=-0.9, high=1.0):
+    """Plain bisection on one cash-flow row."""
+    def npv(rate):
+        return sum(flow / (1 + rate) ** t for t, flow in enumerate(flows))
+    for _ in range(200):
+        mid = (low + high) / 2
+        if (npv(mid) > 0) == (npv(low) > 0):
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+rng = np.random.default_rng(7)
+growth = rng.uniform(2, 12, 300)
+outcome = batch_projections(10.0, growth, redemption_rate=50, investment_amount=75.0, already_paid=10.0)
+flows = investor_cash_flows(outcome['payments'], 75.0, 10.0, current_month=4)
+flows[:, -1] += rng.uniform(0, 150, 300)  # exit proceeds so the IRR is non-trivial
+
+batched = batch_irr(flows)
+reference = np.array([scalar_irr(row) for row in flows])
+max_error = np.max(np.abs(batched - reference))
+npv_at_irr = np.max(np.abs(batch_npv(batched, flows)))
+test2_pass = max_error < 1e-8 and npv_at_irr < 1e-6
+print(f"  - Scenarios: {len(flows)}, max |IRR error|: {max_error:.2e}, max |NPV @ IRR|: {npv_at_irr:.2e}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Cash flow layout, NPV and MOIC
+print("\n🔴 TEST 3: Cash flow layout, NPV and MOIC")
+print("-" * 80)
+
+layout = investor_cash_flows([np.array([5.0, 5.0]), np.array([7.0])], investment_amount=20.0,
+                             already_paid=6.0, current_month=3)
+expected_layout = np.array([[-20, 3, 3, 5, 5], [-20, 3, 3, 7, 0]], dtype=float)
+returns = investor_returns(layout, discount_rate=0.0, current_month=3)
+test3_pass = (np.array_equal(layout, expected_layout) and
+              np.allclose(returns['npv'], [-4.0, -7.0]) and
+              np.allclose(returns['moic'], [16 / 20, 13 / 20]) and
+              np.all(returns['annual_irr'] < 0))
+print(f"  - Layout:\n{layout}")
+print(f"  - NPV @ 0%: {returns['npv']}, MOIC: {returns['moic']}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Known IRR cases): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Scalar reference): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Layout, NPV, MOIC): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,208 @@
+"""
+Tests for the risk analytics module (adnexus_risk.py).
+
+Checks the batched repayment model against the row-by-row calculate_projections
+(flat rates, and flexed growth curves and redemption schedules) and the Sobol estimators against a model with known analytic indices.
+"""
+import numpy as np
+
+from adnexus_engine import calculate_projections, combine_growth, decay_schedule
+from adnexus_risk import (
+    SENSITIVITY_INPUTS,
+    repayment_outcomes,
+    evaluate_in_batches,
+    saltelli_samples,
+    sobol_indices,
+    global_sensitivity,
+    tornado_analysis,
+)
+
+print("=" * 80)
+print("RISK ANALYTICS TESTS")
+print("=" * 80)
+
+# TEST 1: Batched repayment outcomes match calculate_projections
+print("\n🔴 TEST 1: Batched repayment outcomes vs calculate_projections")
+print("-" * 80)
+
+rng = np.random.default_rng(3)
+samples = np.column_stack([
+    rng.uniform(0, 15, 200),     # user growth
+    rng.uniform(0, 5, 200),      # ARPU growth
+    rng.uniform(5, 30, 200),     # churn
+    rng.uniform(20, 80, 200),    # redemption
+    rng.uniform(2, 30, 200),     # starting revenue
+    rng.uniform(50, 100, 200),   # investment
+    rng.uniform(0, 40, 200),     # already paid
+])
+outcomes = repayment_outcomes(samples, {'revenue_share_pct': 5, 'recovery_months': 120})
+
+mismatches = 0
+for row, (months_remaining, recovered) in zip(samples, outcomes):
+    user_growth, arpu_growth, _, redemption, revenue, investment, paid = row
+    growth = ((1 + user_growth / 100) * (1 + arpu_growth / 100) - 1) * 100
+    df = calculate_projections(revenue, growth, redemption_rate=redemption, investment_amount=investment,
+                               already_paid=paid)
+    expected_recovered = investment - df.iloc[-1]['Balance (₹L)']
+    if months_remaining != len(df) - 1 or abs(recovered - expected_recovered) > 1e-6:
+        mismatches += 1
+
+# Sobol samples under a growth curve and redemption schedule flex the schedules, not flat rates
+current_values = {'User Growth %': 8.0, 'Redemption %': 50.0}
+growth_curve = decay_schedule(8.0, 2.0, 18, 120)
+redemption_steps = np.r_[np.full(25, 50.0), np.full(96, 40.0)]
+scheduled_outcomes = repayment_outcomes(samples[:30], {
+    'revenue_share_pct': 5, 'recovery_months': 120, 'months': 120, 'user_growth_schedule': growth_curve,
+    'redemption_schedule': redemption_steps, 'current_values': current_values})
+schedule_mismatches = 0
+for row, (months_remaining, _) in zip(samples[:30], scheduled_outcomes):
+    user_growth, arpu_growth, _, redemption, revenue, investment, paid = row
+    df = calculate_projections(revenue, combine_growth(growth_curve * user_growth / 8.0, arpu_growth),
+                               redemption_rate=redemption_steps * redemption / 50.0, investment_amount=investment,
+                               already_paid=paid)
+    schedule_mismatches += months_remaining != len(df) - 1
+
+test1_pass = mismatches == 0 and schedule_mismatches == 0
+print(f"  - Scenarios compared: {len(samples)}, mismatches: {mismatches}")
+print(f"  - With a decay curve and redemption schedule: 30 compared, mismatches: {schedule_mismatches}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Sobol indices of an additive model match the analytic values
+print("\n🔴 TEST 2: Sobol indices on y = x1 + 2·x2 (+ unused x3)")
+print("-" * 80)
+
+bounds = [(0, 1), (0, 1), (0, 1)]
+linear_samples = saltelli_samples(bounds, base_samples=8192, seed=1)
+linear_outputs = linear_samples[:, 0] + 2 * linear_samples[:, 1]
+first_order, total_order = sobol_indices(linear_outputs, 3)
+expected = np.array([0.2, 0.8, 0.0])  # Var contributions 1/12 and 4/12 out of 5/12
+
+test2_pass = np.allclose(first_order, expected, atol=0.02) and np.allclose(total_order, expected, atol=0.02)
+print(f"  - First order: {np.round(first_order, 3)} (expected {expected})")
+print(f"  - Total order: {np.round(total_order, 3)} (expected {expected})")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Process pool gives identical results to in-process evaluation
+print("\n🔴 TEST 3: Process pool evaluation")
+print("-" * 80)
+
+pool_samples = np.repeat(samples, 50, axis=0)
+in_process = evaluate_in_batches(repayment_outcomes, pool_samples, {'revenue_share_pct': 5}, chunk_size=2500)
+pooled = evaluate_in_batches(repayment_outcomes, pool_samples, {'revenue_share_pct': 5}, workers=2,
+                             chunk_size=2500)
+test3_pass = np.array_equal(in_process, pooled)
+print(f"  - Rows: {len(pool_samples)}, identical: {test3_pass}")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# TEST 4: Global sensitivity ranks growth above churn under compound growth
+print("\n🔴 TEST 4: Global sensitivity ranking")
+print("-" * 80)
+
+sensitivity = global_sensitivity({
+    'User Growth %': (5.0, 10.0),
+    'ARPU Growth %': (1.5, 2.5),
+    'Churn %': (15.0, 25.0),
+    'Redemption %': (45.0, 55.0),
+    'Starting Revenue (₹L)': (9.0, 11.0),
+    'Investment (₹L)': (70.0, 80.0),
+    'Already Paid (₹L)': (0.0, 5.0),
+}, {'revenue_share_pct': 5}, base_samples=2048)
+payoff = sensitivity[sensitivity['Output'] == 'Months Remaining'].set_index('Input')
+
+test4_pass = (payoff.index[0] == 'User Growth %' and payoff.loc['Churn %', 'Total Order'] == 0 and
+              len(payoff) == len(SENSITIVITY_INPUTS))
+print(payoff.round(3))
+print(f"✅ TEST 4 PASSED" if test4_pass else f"❌ TEST 4 FAILED")
+
+
+# TEST 5: Tornado swings match individual projections
+print("\n🔴 TEST 5: Tornado one-at-a-time swings")
+print("-" * 80)
+
+current = {'User Growth %': 7.5, 'ARPU Growth %': 2.0, 'Churn %': 20.0, 'Redemption %': 50.0,
+           'Starting Revenue (₹L)': 10.0, 'Investment (₹L)': 75.0, 'Already Paid (₹L)': 5.0}
+flex = {'User Growth %': (5.0, 10.0), 'ARPU Growth %': (1.0, 3.0), 'Churn %': (15.0, 25.0),
+        'Redemption %': (40.0, 60.0), 'Starting Revenue (₹L)': (7.0, 13.0),
+        'Investment (₹L)': (60.0, 90.0), 'Already Paid (₹L)': (0.0, 20.0)}
+tornado = tornado_analysis(current, flex, {'revenue_share_pct': 5}).set_index('Input')
+
+
+def months_for(values):
+    growth = ((1 + values['User Growth %'] / 100) * (1 + values['ARPU Growth %'] / 100) - 1) * 100
+    df = calculate_projections(values['Starting Revenue (₹L)'], growth, redemption_rate=values['Redemption %'],
+                               investment_amount=values['Investment (₹L)'],
+                               already_paid=values['Already Paid (₹L)'])
+    return len(df) - 1
+
+
+tornado_ok = True
+for name, (low, high) in flex.items():
+    expected_low = months_for({**current, name: low})
+    expected_high = months_for({**current, name: high})
+    row = tornado.loc[name]
+    ok = row['Months @ Low'] == expected_low and row['Months @ High'] == expected_high
+    tornado_ok = tornado_ok and ok
+    print(f"  - {name}: {row['Months @ Low']} / {row['Months @ High']} months "
+          f"(expected {expected_low} / {expected_high}) {'✓' if ok else '✗'}")
+
+# A deal that does not repay within the horizon: the final balance swings like the projections' last balance
+slow = {**current, 'User Growth %': 1.0, 'ARPU Growth %': 0.5, 'Investment (₹L)': 150.0}
+slow_flex = {**flex, 'User Growth %': (0.5, 2.0), 'ARPU Growth %': (0.0, 1.0), 'Investment (₹L)': (120.0, 180.0)}
+slow_tornado = tornado_analysis(slow, slow_flex, {'revenue_share_pct': 5}).set_index('Input')
+
+
+def final_balance_for(values):
+    growth = ((1 + values['User Growth %'] / 100) * (1 + values['ARPU Growth %'] / 100) - 1) * 100
+    df = calculate_projections(values['Starting Revenue (₹L)'], growth, redemption_rate=values['Redemption %'],
+                               investment_amount=values['Investment (₹L)'],
+                               already_paid=values['Already Paid (₹L)'])
+    return df.iloc[-1]['Balance (₹L)']
+
+
+final_ok = slow_tornado.attrs['base_final_balance'] == final_balance_for(slow) > 0 and all(
+    slow_tornado.loc[name, 'Final Balance @ Low (₹L)'] == final_balance_for({**slow, name: low}) and
+    slow_tornado.loc[name, 'Final Balance @ High (₹L)'] == final_balance_for({**slow, name: high})
+    for name, (low, high) in slow_flex.items()
+)
+print(f"  - Unrepaid deal: base final balance ₹{slow_tornado.attrs['base_final_balance']:.2f}L, largest swing "
+      f"₹{slow_tornado['Final Balance Swing (₹L)'].max():.2f}L ({slow_tornado.index[0]}), "
+      f"matches calculate_projections: {final_ok}")
+
+# With a growth curve and a redemption schedule the base case is the dashboard's projection
+curve = decay_schedule(current['User Growth %'], 1.0, 12, 120)
+redemptions = np.r_[np.full(13, 50.0), np.full(108, 65.0)]
+scheduled = tornado_analysis(current, flex, {'revenue_share_pct': 5, 'months': 120, 'user_growth_schedule': curve,
+                                             'redemption_schedule': redemptions, 'current_values': current})
+
+
+def scheduled_months(user_scale=1.0):
+    df = calculate_projections(10.0, combine_growth(curve * user_scale, 2.0), redemption_rate=redemptions,
+                               already_paid=5.0)
+    return len(df) - 1
+
+
+schedule_ok = (scheduled.attrs['base_months'] == scheduled_months() != tornado.attrs['base_months'] and
+               scheduled.set_index('Input').loc['User Growth %', 'Months @ High'] == scheduled_months(10.0 / 7.5))
+print(f"  - Decay curve + redemption step: base case {scheduled.attrs['base_months']} months, as in "
+      f"calculate_projections (flat rates: {tornado.attrs['base_months']}): {schedule_ok}")
+
+test5_pass = tornado_ok and final_ok and schedule_ok and tornado.index[0] == 'User Growth %'
+print(f"✅ TEST 5 PASSED" if test5_pass else f"❌ TEST 5 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass and test4_pass and test5_pass
+print(f"Test 1 (Batched outcomes): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Sobol estimators): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Process pool): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print(f"Test 4 (Sensitivity ranking): {'✅ PASS' if test4_pass else '❌ FAIL'}")
+print(f"Test 5 (Tornado swings): {'✅ PASS' if test5_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
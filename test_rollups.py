@@ -0,0 +1,132 @@
+"""
+Tests for quarter, half-year and fiscal-year rollups (adnexus_engine.py).
+
+Checks that segment-sum rollups match a pandas groupby on a label column,
+that April–March fiscal labels follow the calendar of the current month,
+that daily and monthly projections roll up to the same fiscal totals, and
+that a whole portfolio rolls up in one batch to the per-deal tables.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import (
+    aggregate_periods,
+    batch_projections,
+    batch_rollups,
+    calculate_projections,
+    projection_rollups,
+    rollup_segments,
+)
+from adnexus_reports import load_deals, portfolio_rollup
+from adnexus_schema import to_paise
+
+print("=" * 80)
+print("FISCAL ROLLUP TESTS")
+print("=" * 80)
+
+
+# TEST 1: Segment sums match a groupby; fiscal labels follow the calendar
+print("\n🔴 TEST 1: Segments and labels")
+print("-" * 80)
+
+df = calculate_projections(10.0, 3.0, 50, months=120, current_month=37)
+rollups = projection_rollups(df, start_date='2026-02-10')
+reference = (df.assign(Quarter=pd.PeriodIndex(pd.period_range('2026-02', periods=len(df), freq='M'), freq='Q-MAR'))
+             .groupby('Quarter', sort=True)
+             .agg(months=('Month', 'size'), payment=('Payment to Vinmo (₹L)', 'sum'),
+                  balance=('Balance (₹L)', 'last')))
+quarters = rollups['Quarter']
+
+groupby_ok = (quarters['Months'].tolist() == reference['months'].tolist() and
+              np.array_equal(to_paise(quarters['Payment to Vinmo (₹L)']), to_paise(reference['payment'])) and
+              np.array_equal(quarters['Balance (₹L)'], reference['balance']))
+labels_ok = (quarters['Quarter'].iloc[:2].tolist() == ['FY2025-26 Q4', 'FY2026-27 Q1'] and
+             rollups['Half-Year']['Half-Year'].iloc[:2].tolist() == ['FY2025-26 H2', 'FY2026-27 H1'] and
+             rollups['Fiscal Year']['Fiscal Year'].iloc[:2].tolist() == ['FY2025-26', 'FY2026-27'] and
+             rollups['Fiscal Year']['Months'].iloc[:2].tolist() == [2, 12] and
+             rollup_segments(np.arange(37, 44), 'Quarter')[1] == ['Q13', 'Q14', 'Q15'] and
+             rollup_segments(np.arange(1, 14), 'Fiscal Year')[1] == ['Year 1', 'Year 2'])
+try:
+    rollup_segments(np.arange(1, 5), 'Week')
+    rejected = False
+except ValueError:
+    rejected = True
+
+test1_pass = groupby_ok and labels_ok and rejected
+print(f"  - {len(quarters)} fiscal quarters equal a pandas Q-MAR groupby to the paisa: {groupby_ok}")
+print(f"  - Labels from Feb 2026 (month 37): {quarters['Quarter'].iloc[0]}, {quarters['Quarter'].iloc[1]}, ...; "
+      f"without a date: Q13, Year 1: {labels_ok}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Daily and monthly projections give the same fiscal totals
+print("\n🔴 TEST 2: Daily vs monthly fiscal years")
+print("-" * 80)
+
+monthly = calculate_projections(10.0, 0.0, 60, months=120, current_month=1)
+daily = calculate_projections(10.0, 0.0, 60, months=120, current_month=1, granularity='daily',
+                              start_date='2026-10-01')
+monthly_years = aggregate_periods(monthly, 'Fiscal Year', '2026-10-01')
+daily_years = aggregate_periods(daily, 'Fiscal Year', '2026-10-01')
+# days are assigned to whole months, so a year boundary can move by part of a day's revenue
+one_day = daily['Gross Revenue (₹L)'].max()
+
+test2_pass = (monthly_years['Fiscal Year'].tolist() == daily_years['Fiscal Year'].tolist() and
+              monthly_years['Months'].tolist() == [6] + [12] * 9 + [7] and
+              np.all(np.abs(daily_years['Gross Revenue (₹L)'] - monthly_years['Gross Revenue (₹L)']) <= one_day) and
+              abs(to_paise(daily_years['Gross Revenue (₹L)']).sum() -
+                  to_paise(monthly_years['Gross Revenue (₹L)']).sum()) <= len(daily) / 2 and
+              daily_years['Days'].sum() == len(daily))
+print(f"  - {len(daily):,} days -> {len(daily_years)} fiscal years ({daily_years['Fiscal Year'].iloc[0]} to "
+      f"{daily_years['Fiscal Year'].iloc[-1]}), each within a day's revenue of the monthly rollup: {test2_pass}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Portfolio rollups in one batch
+print("\n🔴 TEST 3: Batch rollups")
+print("-" * 80)
+
+rng = np.random.default_rng(7)
+deals = load_deals(pd.DataFrame({
+    'current_revenue': rng.uniform(2, 20, 1000).round(2),
+    'growth_rate': rng.uniform(-1, 12, 1000).round(2),
+    'redemption_rate': rng.uniform(20, 70, 1000).round(1),
+}))
+start = time.perf_counter()
+portfolio = portfolio_rollup(deals, 'Fiscal Year', start_date='2026-10-01')
+batch_ms = (time.perf_counter() - start) * 1000
+
+matches = []
+for index in rng.choice(len(deals), 10, replace=False):
+    deal = deals[index]
+    single = calculate_projections(deal['current_revenue'], deal['growth_rate'], deal['redemption_rate'],
+                                   deal['revenue_share_pct'], investment_amount=deal['investment_amount'])
+    years = aggregate_periods(single, 'Fiscal Year', '2026-10-01')
+    row = portfolio.loc[index, years['Fiscal Year']].to_numpy(dtype=float)
+    matches.append(np.array_equal(to_paise(row), to_paise(years['Payment to Vinmo (₹L)'])) and
+                   to_paise(portfolio.loc[index, 'Total']) == to_paise(single['Payment to Vinmo (₹L)']).sum())
+
+result = batch_projections(np.array([10.0, 5.0]), np.array([9.65, 3.0]), columns=True)
+halves = batch_rollups(result, 'Half-Year', current_month=37)
+
+test3_pass = (all(matches) and batch_ms < 500 and len(portfolio) == 1000 and
+              halves['labels'][:2] == ['H7', 'H8'] and
+              np.array_equal(to_paise(halves['payments'].sum(axis=1)), to_paise(result['total_recovered'])))
+print(f"  - 1,000 deals rolled up to {portfolio.shape[1] - 3} fiscal years in {batch_ms:.1f} ms; 10 sampled deals "
+      f"match their own projections to the paisa: {sum(matches)}/10")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Segments and labels): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Daily vs monthly): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Batch rollups): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
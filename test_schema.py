@@ -0,0 +1,109 @@
+"""
+Tests for the compact frame schema (adnexus_schema.py).
+
+Checks compact dtypes, round trips back to display frames, exact fixed-point
+paise, and the memory saved on the long frames and result arrays the
+dashboard keeps cached.
+"""
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import calculate_projections, calculate_unit_economics
+from adnexus_exit import exit_valuation_grid
+from adnexus_schema import (
+    COLUMN_SCHEMA,
+    PAISE_PER_LAKH,
+    to_paise,
+    from_paise,
+    compact_arrays,
+    compact_frame,
+    display_frame,
+)
+
+print("=" * 80)
+print("COMPACT SCHEMA TESTS")
+print("=" * 80)
+
+rng = np.random.default_rng(5)
+frames = {
+    f'DEAL-{deal:04d}': calculate_projections(rng.uniform(1, 20), rng.uniform(0, 6), redemption_rate=50,
+                                              current_month=int(rng.integers(1, 12)))
+    for deal in range(200)
+}
+money_columns = [column for column in frames['DEAL-0000'].columns if column.endswith('(₹L)')]
+
+# TEST 1: Compact dtypes and display round trip
+print("\n🔴 TEST 1: Compact dtypes and round trip")
+print("-" * 80)
+
+df = frames['DEAL-0000']
+compact = compact_frame(df, deal_id='DEAL-0000')
+restored = display_frame(compact)
+dtypes_ok = (compact['month'].dtype == np.int16 and compact['payment'].dtype == np.float32 and
+             isinstance(compact['deal_id'].dtype, pd.CategoricalDtype))
+names_ok = (list(compact.columns) == ['deal_id'] + [COLUMN_SCHEMA[column][0] for column in df.columns] and
+            list(restored.columns) == ['Deal'] + list(df.columns))
+values_ok = (np.array_equal(restored['Month'].to_numpy(), df['Month'].to_numpy()) and
+             np.allclose(restored[money_columns].to_numpy(), df[money_columns].to_numpy(), rtol=1e-6, atol=1e-5) and
+             restored.attrs['complete'] == df.attrs['complete'] and 'money' not in restored.attrs)
+unit = calculate_unit_economics(10000, 25, 5.0, 2.0, 20.0)
+unit_ok = np.allclose(display_frame(compact_frame(unit))[unit.columns].to_numpy(dtype=float),
+                      unit.to_numpy(dtype=float), rtol=1e-6)
+
+test1_pass = dtypes_ok and names_ok and values_ok and unit_ok
+print(f"  - Compact dtypes: {dict(compact.dtypes.astype(str))}")
+print(f"  - Display names restored: {names_ok}, values within float32 precision: {values_ok}, unit economics: {unit_ok}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: Paise are exact fixed point
+print("\n🔴 TEST 2: Fixed-point paise")
+print("-" * 80)
+
+paise_error = 0.0
+ledger_exact = True
+for deal, df in frames.items():
+    paise = compact_frame(df, money='paise')
+    restored = display_frame(paise)
+    paise_error = max(paise_error, np.max(np.abs(restored[money_columns].to_numpy() - df[money_columns].to_numpy())))
+    # Payments, cumulative paid and balance come from the paise ledger: stored without rounding
+    ledger_exact &= restored['Payment to Vinmo (₹L)'].equals(df['Payment to Vinmo (₹L)'])
+test2_pass = (paise['payment'].dtype == np.int64 and ledger_exact and
+              paise_error <= 0.501 / PAISE_PER_LAKH and
+              np.array_equal(to_paise(from_paise(to_paise([0.01, 74.83, 75.0]))), [100_000, 748_300_000, 750_000_000]))
+print(f"  - {len(frames)} deals: max error {paise_error * PAISE_PER_LAKH:.3f} paise, ledger columns exact: {ledger_exact}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Cached long frames and result arrays take about half the memory
+print("\n🔴 TEST 3: Cached result memory")
+print("-" * 80)
+
+daily = calculate_projections(10.0, 3.0, 50, months=120, granularity='daily', start_date='2026-01-01')
+daily_compact = compact_frame(daily)
+daily_ratio = (daily.drop(columns='Date').memory_usage(index=False).sum() /
+               daily_compact.drop(columns='Date').memory_usage(index=False).sum())
+df = calculate_projections(10.0, 5.0, 50)
+grid = exit_valuation_grid(df['Payment to Vinmo (₹L)'].to_numpy(), df['Gross Revenue (₹L)'].to_numpy(),
+                           1 + np.arange(1, len(df)), np.arange(0.5, 10.01, 0.25))
+grid_compact = compact_arrays(grid)
+array_bytes = lambda arrays: sum(value.nbytes for value in arrays.values() if isinstance(value, np.ndarray))
+grid_ratio = array_bytes(grid) / array_bytes(grid_compact)
+
+test3_pass = (daily_ratio >= 1.75 and grid_ratio >= 1.9 and
+              all(value.dtype != np.float64 for value in grid_compact.values() if isinstance(value, np.ndarray)))
+print(f"  - {len(daily):,}-day frame: {daily_ratio:.1f}x smaller; exit grid arrays: {grid_ratio:.1f}x smaller")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Round trip): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Fixed-point paise): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Cached result memory): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)
@@ -0,0 +1,151 @@
+"""
+Tests for stress testing (adnexus_stress.py).
+
+Checks that shocked schedules match a month-by-month reference loop and that
+a scenario without shocks reproduces calculate_projections, that a whole
+library evaluated as one batch gives the same results as scenario-by-scenario
+runs, and that shock shapes, worst-case reporting and validation behave.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from adnexus_engine import calculate_projections, growth_path
+from adnexus_schema import to_paise
+from adnexus_stress import SHOCK_COLUMNS, shock_matrices, stress_library, stress_test
+
+print("=" * 80)
+print("STRESS TEST ENGINE TESTS")
+print("=" * 80)
+
+TERMS = dict(current_revenue=10.0, growth_rate=4.0, redemption_rate=50, revenue_share_pct=5,
+             investment_amount=75.0, already_paid=0.0)
+
+
+def shocks(*rows):
+    """Shock table from (scenario, shock, start, months, depth, recovery, redemption) tuples."""
+    return pd.DataFrame(list(rows), columns=SHOCK_COLUMNS)
+
+
+def reference_months(revenue_factor, redemption_floor, holiday, months=120):
+    """Payoff month of a shocked schedule, one month at a time."""
+    balance = to_paise(TERMS['investment_amount'])
+    for month, factor in enumerate(growth_path(TERMS['growth_rate'], months)):
+        gross = TERMS['current_revenue'] * factor * revenue_factor(month)
+        rate = max(TERMS['redemption_rate'], redemption_floor(month))
+        payment = 0.0 if holiday(month) else (gross - gross * (rate / 100)) * (TERMS['revenue_share_pct'] / 100)
+        balance -= min(to_paise(payment), balance)
+        if balance == 0:
+            return month
+    return months
+
+
+# TEST 1: Shocked schedules match a month-by-month reference
+print("\n🔴 TEST 1: Reference schedules")
+print("-" * 80)
+
+table = shocks(
+    ('Drop', 'Revenue Drop', 6, 3, 80.0, 4, np.nan),
+    ('Spike', 'Redemption Spike', 2, 10, np.nan, np.nan, 95.0),
+    ('Holiday', 'Payment Holiday', 12, 6, np.nan, np.nan, np.nan),
+    ('Combined', 'Revenue Drop', 3, 2, 50.0, 0, np.nan),
+    ('Combined', 'Revenue Drop', 4, 2, 50.0, 0, np.nan),
+    ('Combined', 'Payment Holiday', 20, 1, np.nan, np.nan, np.nan),
+)
+result = stress_test(table, **TERMS).set_index('Scenario')
+
+
+def drop(start, months, depth, recovery):
+    def factor(month):
+        if start <= month < start + months:
+            return 1 - depth
+        return 1 - depth * max(0.0, 1 - (month - start - months + 1) / (recovery + 1)) if month >= start else 1.0
+    return factor
+
+
+never, normal = (lambda month: False), (lambda month: 1.0)
+expected = {
+    'Drop': reference_months(drop(6, 3, 0.8, 4), lambda month: 0, never),
+    'Spike': reference_months(normal, lambda month: 95 if 2 <= month < 12 else 0, never),
+    'Holiday': reference_months(normal, lambda month: 0, lambda month: 12 <= month < 18),
+    'Combined': reference_months(lambda month: drop(3, 2, 0.5, 0)(month) * drop(4, 2, 0.5, 0)(month),
+                                 lambda month: 0, lambda month: month == 20),
+}
+base = calculate_projections(**TERMS)
+reference_ok = all(result.loc[name, 'Months Remaining'] == months for name, months in expected.items())
+base_ok = (result.attrs['base_months'] == len(base) - 1 and result.attrs['base_complete'] and
+           stress_test(shocks(('None', 'Payment Holiday', 0, 0, np.nan, np.nan, np.nan)),
+                       **TERMS)['Delay (Months)'].iloc[0] == 0)
+
+test1_pass = reference_ok and base_ok
+print(f"  - Drop, spike, holiday and compound scenarios match a month-by-month loop: {reference_ok} "
+      f"({', '.join(f'{name} {months}' for name, months in expected.items())} months)")
+print(f"  - Without shocks the engine reproduces calculate_projections ({len(base) - 1} months): {base_ok}")
+print(f"✅ TEST 1 PASSED" if test1_pass else f"❌ TEST 1 FAILED")
+
+
+# TEST 2: One batch equals scenario-by-scenario runs
+print("\n🔴 TEST 2: Batched library")
+print("-" * 80)
+
+library = stress_library()
+start = time.perf_counter()
+batched = stress_test(library, **TERMS)
+batch_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+single = pd.concat([stress_test(rows, **TERMS) for _, rows in library.groupby('Scenario', sort=False)])
+loop_ms = (time.perf_counter() - start) * 1000
+single = single.set_index('Scenario').loc[batched['Scenario']].reset_index()
+
+test2_pass = (len(batched) == library['Scenario'].nunique() >= 200 and
+              batched.equals(single) and batch_ms < loop_ms / 10)
+print(f"  - {len(batched)} scenarios in one pass: {batch_ms:.1f} ms vs {loop_ms:.0f} ms one by one, "
+      f"identical results: {batched.equals(single)}")
+print(f"✅ TEST 2 PASSED" if test2_pass else f"❌ TEST 2 FAILED")
+
+
+# TEST 3: Shock shapes, worst case and validation
+print("\n🔴 TEST 3: Shapes and worst case")
+print("-" * 80)
+
+ramp = shock_matrices(shocks(('Ramp', 'Revenue Drop', 2, 2, 60.0, 3, np.nan)), months=8)['revenue_factor'][0]
+shape_ok = np.allclose(ramp, [1, 1, 0.4, 0.4, 0.55, 0.7, 0.85, 1, 1])
+depths = stress_test(shocks(*[(f'{depth}%', 'Revenue Drop', 3, 6, depth, 6, np.nan) for depth in (0, 25, 50, 100)]),
+                     **TERMS).set_index('Scenario').loc[['0%', '25%', '50%', '100%']]
+monotone = (np.all(np.diff(depths['Months Remaining']) >= 0) and depths['Delay (Months)'].iloc[0] == 0 and
+            np.all(np.diff(depths['Shortfall @ Target (₹L)']) > 0))
+worst = batched.attrs
+worst_ok = (worst['worst_months'] == batched['Months Remaining'].max() and
+            worst['max_shortfall'] == batched['Shortfall @ Target (₹L)'].max() and
+            worst['missed_target'] == (batched['Shortfall @ Target (₹L)'] > 0).sum() and
+            batched['Months Remaining'].is_monotonic_decreasing)
+forever = stress_test(shocks(('Stopped', 'Payment Holiday', 0, 200, np.nan, np.nan, np.nan)), **TERMS)
+try:
+    stress_test(shocks(('Bad', 'Meteor', 1, 1, np.nan, np.nan, np.nan)), **TERMS)
+    rejected = False
+except ValueError:
+    rejected = True
+
+test3_pass = (shape_ok and monotone and worst_ok and rejected and not forever['Complete'].iloc[0] and
+              forever['Final Balance (₹L)'].iloc[0] == TERMS['investment_amount'])
+print(f"  - 60% drop with a 3-month recovery: {np.round(ramp, 2).tolist()}")
+print(f"  - Deeper drops never repay earlier: {depths['Months Remaining'].tolist()} months")
+print(f"  - Worst case: {worst['worst_months']} months ({worst['worst_scenario']}), max shortfall "
+      f"₹{worst['max_shortfall']:.2f}L at month {worst['target_months']}; {worst['missed_target']} of "
+      f"{len(batched)} scenarios miss it")
+print(f"✅ TEST 3 PASSED" if test3_pass else f"❌ TEST 3 FAILED")
+
+
+# SUMMARY
+print("\n" + "=" * 80)
+print("TEST SUMMARY")
+print("=" * 80)
+all_pass = test1_pass and test2_pass and test3_pass
+print(f"Test 1 (Reference schedules): {'✅ PASS' if test1_pass else '❌ FAIL'}")
+print(f"Test 2 (Batched library): {'✅ PASS' if test2_pass else '❌ FAIL'}")
+print(f"Test 3 (Shapes and worst case): {'✅ PASS' if test3_pass else '❌ FAIL'}")
+print()
+print(f"{'🎉 ALL TESTS PASSED!' if all_pass else '⚠️  SOME TESTS FAILED'}")
+print("=" * 80)